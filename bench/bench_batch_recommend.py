@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+일괄 추천 벤치마크: recommend_hybrid_skin_filtered 사용자별 반복(기존) vs BatchRecommender (블록 행렬 연산 + 프로세스 풀)
+- 합성 리뷰 N행(bench_skin_index 생성기 + 평점), 상품 임베딩은 무작위 단위 벡터, CF 는 Surprise SVD (없으면 무작위 요인)
+- 기존 방식은 추천 노트북 3~6 셀 함수 그대로 (print 제외) --legacy-users 명만 재서 전체로 환산
+- 출력: 사용자/s (기존, 일괄 workers=1, 일괄 workers=--workers), 결과 파일 크기, 기존 결과와 top-k 일치율
+
+실행: python bench/bench_batch_recommend.py [--rows 200000] [--users 50000] [--items 1000] [--workers 4]
+"""
+
+import os, sys, time, argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench.bench_skin_index import synth
+from pipeline.batch_recommend import BatchRecommender, load_recommendations
+from pipeline.cf_score import SVDScorer
+from pipeline.skin_index import SkinIndex
+
+import numpy as np
+import pandas as pd
+
+try:
+    from surprise import Dataset, Reader, SVD
+    HAS_SURPRISE = True
+except ImportError:
+    HAS_SURPRISE = False
+
+
+def legacy_recommender(df, item_ids, X_item_txt, svd_model, skin_idx):
+    """추천 노트북 함수 (콘텐츠 / CF / 하이브리드). 피부 후보는 skin_idx(기존과 같은 결과, bench_skin_index)."""
+    from sklearn.metrics.pairwise import cosine_similarity
+    item_to_idx = {it: i for i, it in enumerate(item_ids)}
+    idx_to_item = {i: it for it, i in item_to_idx.items()}
+
+    def recommend_content_based(user_id, k=1000):
+        liked_reviews = df[(df.user_id == user_id) & (df.rating >= 4.0)]
+        item_indices = [item_to_idx[i] for i in liked_reviews.item_id if i in item_to_idx]
+        if not item_indices:
+            return {}
+        weights = liked_reviews.loc[liked_reviews.item_id.isin(item_to_idx), "rating"].values
+        weights = (weights / (weights.sum() + 1e-8))[:, None]
+        profile = (X_item_txt[item_indices] * weights).sum(0, keepdims=True)
+        profile = profile / (np.linalg.norm(profile, axis=1, keepdims=True) + 1e-9)
+        sims = cosine_similarity(profile, X_item_txt).ravel()
+        return {idx_to_item[i]: float(sims[i]) for i in np.argsort(sims)[::-1][:k]}
+
+    def normalize_scores(score_dict):
+        if not score_dict:
+            return {}
+        values = np.array(list(score_dict.values()), dtype=float)
+        min_val, max_val = values.min(), values.max()
+        if max_val - min_val < 1e-8:
+            return {k: 0.5 for k in score_dict}
+        return {k: float((v - min_val) / (max_val - min_val)) for k, v in score_dict.items()}
+
+    def recommend(user_id, k=10, content_weight=0.5, skin_filter_threshold=0.1):
+        candidate_items = skin_idx.candidates(user_id, skin_filter_threshold)
+        seen_items = set(df.loc[df.user_id == user_id, "item_id"])
+        candidate_items = list(candidate_items - seen_items)
+        content_scores_all = recommend_content_based(user_id)
+        cf_scores_all = {item: float(svd_model.predict(user_id, item).est) for item in item_ids}
+        content_norm = normalize_scores({i: s for i, s in content_scores_all.items() if i in candidate_items})
+        cf_norm = normalize_scores({i: s for i, s in cf_scores_all.items() if i in candidate_items})
+        final = [(i, content_weight * content_norm.get(i, 0) + (1 - content_weight) * cf_norm.get(i, 0))
+                 for i in candidate_items]
+        final.sort(key=lambda x: x[1], reverse=True)
+        return pd.DataFrame(final[:k], columns=["item_id", "final_score"])
+
+    return recommend
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=200_000)
+    ap.add_argument("--users", type=int, default=50_000)
+    ap.add_argument("--items", type=int, default=1000)
+    ap.add_argument("--dim", type=int, default=768)
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--block", type=int, default=512)
+    ap.add_argument("--legacy-users", type=int, default=50)
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--out", default="/tmp/batch_recommend_bench")
+    args = ap.parse_args()
+
+    df = synth(args.rows, args.users, args.items)
+    rng = np.random.default_rng(0)
+    df["rating"] = rng.choice([1.0, 2.0, 3.0, 4.0, 5.0, 5.0, 5.0, 4.0], len(df))
+    df["rating_aug"] = df["rating"]
+    item_ids = sorted(df["item_id"].unique())
+    X = rng.normal(size=(len(item_ids), args.dim)).astype(np.float32)
+    X /= np.linalg.norm(X, axis=1, keepdims=True)
+    n_users = df["user_id"].nunique()
+    print(f"▶ 합성 리뷰 {len(df):,}행 / 사용자 {n_users:,} / 상품 {len(item_ids):,}, CPU {os.cpu_count()}개")
+
+    t = time.perf_counter()
+    if HAS_SURPRISE:
+        data = Dataset.load_from_df(df[["user_id", "item_id", "rating_aug"]], Reader(rating_scale=(0.5, 5.0)))
+        svd_model = SVD(n_factors=64, n_epochs=20, random_state=42)
+        svd_model.fit(data.build_full_trainset())
+        cf = SVDScorer.from_surprise(svd_model)
+    else:
+        svd_model = None
+        U = df["user_id"].unique().tolist()
+        cf = SVDScorer(rng.normal(0, .1, (len(U), 64)), rng.normal(0, .1, (len(item_ids), 64)), rng.normal(0, .3, len(U)),
+                       rng.normal(0, .3, len(item_ids)), 4.2, U, item_ids)
+    skin_idx = SkinIndex.build(df, items=item_ids)
+    print(f"  준비(SVD 학습 + 피부 인덱스) {time.perf_counter() - t:.1f}s")
+
+    sample = df["user_id"].drop_duplicates().sample(args.legacy_users, random_state=1).tolist()
+    results = {}
+    if svd_model is not None:
+        legacy = legacy_recommender(df, item_ids, X, svd_model, skin_idx)
+        t = time.perf_counter()
+        want = {u: legacy(u, k=args.k) for u in sample}
+        per_user = (time.perf_counter() - t) / len(sample)
+        results["기존(사용자별, 환산)"] = (n_users * per_user, 1 / per_user)
+
+    for workers in sorted({1, args.workers}):
+        out = os.path.join(args.out, f"recs_w{workers}.parquet")
+        with BatchRecommender.from_frame(df, item_ids, X, cf, skin_idx, workers=workers, block=args.block) as rec:
+            t = time.perf_counter()
+            n_rows = rec.run(out, k=args.k)
+            sec = time.perf_counter() - t
+        results[f"일괄 workers={workers}"] = (sec, n_users / sec)
+    print(f"\n{'방식':<22}{'전체 s':>10}{'사용자/s':>12}")
+    for name, (sec, rate) in results.items():
+        print(f"{name:<22}{sec:>10.1f}{rate:>12.0f}")
+    print(f"결과 파일 {os.path.getsize(out) / 1e6:.1f}MB ({n_rows:,}행)")
+
+    if svd_model is not None:
+        got = load_recommendations(out, users=sample)
+        same_items = same_scores = 0
+        for u in sample:
+            g = got[got["user"] == u].sort_values("rank")
+            same_items += g["item"].tolist() == want[u]["item_id"].tolist()
+            same_scores += np.allclose(g["score"].to_numpy(), want[u]["final_score"].to_numpy(), atol=1e-5)
+        print(f"기존 결과와 같음: 상품 순서 {same_items}/{len(sample)}명, 점수 {same_scores}/{len(sample)}명")
+
+
+if __name__ == "__main__":
+    main()
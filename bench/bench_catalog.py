@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+크롤 계획(키워드 × 카테고리) 벤치마크 — 쿼리별 스크립트 복사본 vs 계획 + 전역 goodsNo 중복 제거
+- 로컬 서버: 검색 목록(getSearchMain.do)은 합성 카드 HTML, 리뷰 목록은 replay_server 저장본(A000000001)
+    · 쿼리마다 상품 --per-query 개를 인기도(Zipf) 순으로 뽑아 쿼리끼리 상품이 겹치게 만든다
+- 쿼리별: 쿼리 1개씩 목록 → 그 상품 전부 리뷰 크롤링 (기존처럼 키워드마다 스크립트를 돌린 경우)
+- 계획: 모든 쿼리 목록을 동시에 → 고유 상품만 리뷰 크롤링 1번
+- 카탈로그가 정답(쿼리별로 뽑은 goodsNo 집합)과 같은지, 상품별 queries 태그가 맞는지 확인
+
+실행: python bench/bench_catalog.py [--queries 12] [--per-query 96] [--products 400] [--delay 0.02]
+"""
+
+import os, sys, time, random, asyncio, argparse, threading
+from http.server import ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline.catalog import make_plan, crawl_catalog_http, SEARCH_PATH, ITEMS_PER_PAGE
+from pipeline.review_http import crawl_products_http
+from bench.replay_server import make_handler, RECORDED_DIR
+
+KEYWORDS = ["여드름", "진정", "트러블", "수분", "장벽", "재생", "미백", "모공", "각질", "보습", "민감", "시카"]
+CATEGORIES = [("100000100010015", "크림"), ("100000100010014", "에센스"), ("100000100010013", "스킨"), (None, None)]
+
+
+def make_queries(n_queries, per_query, n_products, seed=0):
+    """쿼리 계획 + 쿼리별 정답 goodsNo 목록 (순위 순). 상품 i 가 뽑힐 확률 ∝ 1/(i+1)."""
+    pairs = [(KEYWORDS[i % len(KEYWORDS)], *CATEGORIES[(i // len(KEYWORDS)) % len(CATEGORIES)]) for i in range(n_queries)]
+    plan = make_plan(pairs, pages=(per_query + ITEMS_PER_PAGE - 1) // ITEMS_PER_PAGE)
+    weights = [1.0 / (i + 1) for i in range(n_products)]
+    truth = {}
+    for qi, q in enumerate(plan):
+        rng, picked = random.Random(seed * 1000 + qi), {}
+        while len(picked) < min(per_query, n_products):
+            picked.setdefault(rng.choices(range(n_products), weights)[0], None)
+        truth[(q["keyword"], q["cate_id2"])] = [f"A{i:012d}" for i in picked]
+    return plan, truth
+
+def card_html(goods_no):
+    return (f'<li class="flag li_result"><div class="prd_info">'
+            f'<a href="/store/goods/getGoodsDetail.do?goodsNo={goods_no}&dispCatNo=9&trackingCd=bench" class="prd_thumb">'
+            f'<img src="x.jpg"></a><div class="prd_name"><a href="javascript:;">'
+            f'<span class="tx_brand">bench</span><p class="tx_name">상품 {goods_no}</p></a></div></div></li>')
+
+def start_bench_server(truth, delay=0.0):
+    """검색 목록은 truth 에서, 나머지(리뷰 목록)는 replay 핸들러로. 반환: (server, base_url, 요청 카운터)."""
+    hits = {"list": 0, "review": 0}
+    base = make_handler(RECORDED_DIR, alias="A000000001", delay=delay)
+
+    class Handler(base):
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            if parts.path != SEARCH_PATH:
+                hits["review"] += 1
+                return super().do_GET()
+            hits["list"] += 1
+            q = {k: v[0] for k, v in parse_qs(parts.query, keep_blank_values=True).items()}
+            goods = truth.get((q.get("query", ""), q.get("cateId2", "")), [])
+            start, n = int(q.get("startCount", 0)), int(q.get("listnum", ITEMS_PER_PAGE))
+            body = ('<ul id="w_cate_prd_list">' + "".join(card_html(g) for g in goods[start:start + n])
+                    + "</ul>").encode("utf-8")
+            if delay:
+                time.sleep(delay)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}", hits
+
+
+async def run_per_query(plan, kw):
+    n_products = 0
+    for q in plan:
+        table = await crawl_catalog_http([q], **kw)
+        products = table.products()
+        await crawl_products_http(products, **kw)
+        n_products += len(products)
+    return n_products
+
+async def run_planned(plan, kw):
+    table = await crawl_catalog_http(plan, **kw)
+    await crawl_products_http(table.products(), **kw)
+    return table
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--queries", type=int, default=12)
+    ap.add_argument("--per-query", type=int, default=96)
+    ap.add_argument("--products", type=int, default=400, help="전체 상품 풀 크기 (작을수록 쿼리끼리 더 겹침)")
+    ap.add_argument("--delay", type=float, default=0.02)
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    plan, truth = make_queries(args.queries, args.per_query, args.products, args.seed)
+    server, base_url, hits = start_bench_server(truth, args.delay)
+    kw = {"base_url": base_url, "max_concurrency": args.concurrency, "host_min_interval": 0.0}
+
+    t0 = time.perf_counter()
+    n_naive = asyncio.run(run_per_query(plan, kw))
+    t_naive, naive_hits = time.perf_counter() - t0, dict(hits)
+    hits.update(list=0, review=0)
+    t0 = time.perf_counter()
+    table = asyncio.run(run_planned(plan, kw))
+    t_plan, plan_hits = time.perf_counter() - t0, dict(hits)
+    server.shutdown()
+
+    expect = {}
+    for q in plan:
+        for g in truth[(q["keyword"], q["cate_id2"])]:
+            expect.setdefault(g, []).append(q["label"])
+    got = {p["goods_no"]: p["queries"] for p in table.products()}
+
+    print(f"\n쿼리 {len(plan)}개 × 쿼리당 상품 {args.per_query} (상품 풀 {args.products}) / 지연 {args.delay}s")
+    print(f"  쿼리별 : 리뷰 크롤링 상품 {n_naive:5d} / 요청 목록 {naive_hits['list']:4d} + 리뷰 {naive_hits['review']:6d} / {t_naive:.2f}s")
+    print(f"  계획   : 리뷰 크롤링 상품 {len(table):5d} / 요청 목록 {plan_hits['list']:4d} + 리뷰 {plan_hits['review']:6d} / {t_plan:.2f}s")
+    print(f"  리뷰 요청 {naive_hits['review'] / max(1, plan_hits['review']):.1f}배 감소, 벽시계 {t_naive / max(t_plan, 1e-9):.1f}배")
+    print(f"  카탈로그 = 정답 goodsNo 집합: {set(got) == set(expect)} / queries 태그 일치: {got == expect}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+협업 필터링 채점 벤치마크: svd_model.predict 반복(기존) vs SVDScorer 행렬곱 + argpartition top-k
+- 1) 정확도: 합성 평점으로 Surprise SVD 학습 → 아는/모르는 사용자·상품 조합에서 predict().est 와 비교
+- 2) 처리량: 사용자 --users × 상품 --items (기본 10,000 × 10,000, 요인 64) 전체 top-10
+     · 기존 방식은 정확도 확인용 모델로 사용자 20명만 재서 --users 명으로 환산
+- Surprise 가 없으면 1) 은 건너뛰고 무작위 요인 행렬로 2) 만
+
+실행: python bench/bench_cf_score.py [--users 10000] [--items 10000] [--factors 64] [--block 1024]
+"""
+
+import os, sys, time, argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline.cf_score import SVDScorer, recommend_collaborative_filtering_legacy
+
+import numpy as np
+import pandas as pd
+
+try:
+    from surprise import Dataset, Reader, SVD
+    HAS_SURPRISE = True
+except ImportError:
+    HAS_SURPRISE = False
+
+
+def synth_ratings(n_users, n_items, n_ratings, seed=0):
+    rng = np.random.default_rng(seed)
+    u = rng.integers(0, n_users, n_ratings)
+    i = np.minimum(rng.zipf(1.3, n_ratings) - 1, n_items - 1)  # 인기 상품 쏠림
+    r = np.clip(np.round(rng.normal(4.2, 0.9, n_ratings) * 2) / 2, 0.5, 5.0)
+    return pd.DataFrame({"user_id": [f"u{x}" for x in u], "item_id": [f"i{x}" for x in i], "rating_aug": r})
+
+
+def check_equal():
+    df = synth_ratings(3000, 800, 60_000)
+    data = Dataset.load_from_df(df[["user_id", "item_id", "rating_aug"]], Reader(rating_scale=(0.5, 5.0)))
+    algos = {"biased": SVD(n_factors=64, n_epochs=20, random_state=42),
+             "unbiased": SVD(n_factors=16, n_epochs=5, biased=False, random_state=42)}
+    for name, algo in algos.items():
+        algo.fit(data.build_full_trainset())
+        cf = SVDScorer.from_surprise(algo)
+        users = df["user_id"].unique()[:200].tolist() + ["신규사용자1", "신규사용자2"]
+        items = cf.item_ids[:300] + ["신규상품"]
+        want = np.array([[algo.predict(u, it).est for it in items] for u in users])
+        got = cf.scores_batch(users, items)
+        print(f"  {name:<9} predict().est 와 최대 차이 {np.abs(want - got).max():.1e} "
+              f"({len(users)}명 × {len(items)}개, 모르는 사용자/상품 포함)")
+
+    t = time.perf_counter()
+    for u in users[:20]:
+        recommend_collaborative_filtering_legacy(algo, u, cf.item_ids)
+    per_pred = (time.perf_counter() - t) / (20 * cf.n_items)
+    return per_pred
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--users", type=int, default=10_000)
+    ap.add_argument("--items", type=int, default=10_000)
+    ap.add_argument("--factors", type=int, default=64)
+    ap.add_argument("--block", type=int, default=1024)
+    ap.add_argument("--k", type=int, default=10)
+    args = ap.parse_args()
+
+    per_pred = None
+    if HAS_SURPRISE:
+        print("▶ 정확도 (Surprise SVD)")
+        per_pred = check_equal()
+
+    rng = np.random.default_rng(0)
+    U, I, k = args.users, args.items, args.factors
+    cf = SVDScorer(rng.normal(0, 0.1, (U, k)), rng.normal(0, 0.1, (I, k)), rng.normal(0, 0.3, U),
+                   rng.normal(0, 0.3, I), 4.2, [f"u{x}" for x in range(U)], [f"i{x}" for x in range(I)])
+    users = cf.user_ids
+    print(f"\n▶ 처리량: 사용자 {U:,} × 상품 {I:,} (요인 {k}), top-{args.k}")
+
+    cf.scores(users[0])  # 첫 호출(BLAS 초기화)은 재지 않음
+    t = time.perf_counter()
+    for u in users[:200]:
+        s = cf.scores(u)
+        np.argpartition(-s, args.k - 1)[:args.k]
+    one_loop = (time.perf_counter() - t) / 200
+    t = time.perf_counter()
+    idx, val = cf.topk(users, k=args.k, block=args.block)
+    batch = time.perf_counter() - t
+
+    print(f"{'방식':<22}{'사용자당 ms':>12}{'전체 s':>10}{'사용자/s':>12}")
+    if per_pred is not None:
+        legacy = per_pred * I
+        print(f"{'predict 반복(환산)':<22}{legacy * 1e3:>12.2f}{legacy * U:>10.0f}{1 / legacy:>12.0f}")
+    print(f"{'scores 1명씩':<22}{one_loop * 1e3:>12.3f}{one_loop * U:>10.1f}{1 / one_loop:>12.0f}")
+    print(f"{'topk 일괄(block)':<22}{batch / U * 1e3:>12.3f}{batch:>10.1f}{U / batch:>12.0f}")
+
+    # top-k 가 전체 정렬 결과와 같은지 (사용자 50명)
+    S = cf.scores_batch(users[:50])
+    ref = np.argsort(-S, axis=1, kind="stable")[:, :args.k]
+    print(f"top-{args.k} 점수 = 전체 정렬 점수: {np.allclose(np.take_along_axis(S, ref, 1), val[:50])}")
+
+
+if __name__ == "__main__":
+    main()
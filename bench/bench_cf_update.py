@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+SVD 증분 갱신 벤치마크: 전체 재학습 vs fold-in + warm start (pipeline/cf_update.py) vs 갱신 안 함
+- 데이터: 저랭크 합성 평점 r = μ + bu + bi + pu·qi + 잡음 (사용자/상품 인기도 Zipf)
+    · 기존: 앞쪽 사용자·상품의 오래된 상호작용 → 전체 학습 1번 (SVD 64 요인, 20 epochs — 추천 노트북과 같은 설정)
+    · 새 배치: 새 사용자 전부 + 새 상품 전부 + 기존 사용자의 최근 상호작용 --recent 비율
+    · 새 배치 사용자마다 새 상호작용의 20% 를 평가용으로 떼어 둠 (나머지가 갱신 입력)
+- 비교: 갱신 소요 시간 / 평가 RMSE / 순위 상관 ρ(사용자별 평가 상품 3개 이상, Spearman) / Recall@10(평가 상품 중 r≥4.5)
+    · 새 사용자 / 기존 사용자 따로
+- 드리프트: 새 배치를 --batches 개로 나눠 차례로 갱신 → 배치마다 지표와 재학습 판정
+
+실행: python bench/bench_cf_update.py [--users 5000] [--items 800] [--new-users 0.1] [--batches 3]
+"""
+
+import os, sys, time, argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline.cf_score import SVDScorer
+from pipeline.cf_update import IncrementalSVD
+
+import numpy as np
+import pandas as pd
+
+try:
+    from surprise import Dataset, Reader, SVD
+    HAS_SURPRISE = True
+except ImportError:
+    HAS_SURPRISE = False
+
+
+def synth(n_users, n_items, per_user=20, k=8, seed=0):
+    rng = np.random.default_rng(seed)
+    P, Q = rng.normal(0, 0.35, (n_users, k)), rng.normal(0, 0.35, (n_items, k))
+    bu, bi = rng.normal(0, 0.3, n_users), rng.normal(0, 0.3, n_items)
+    n_u = np.maximum(3, rng.geometric(1.0 / per_user, n_users))
+    u = np.repeat(np.arange(n_users), n_u)
+    p_item = 1.0 / np.arange(1, n_items + 1) ** 0.8
+    i = rng.choice(n_items, len(u), p=p_item / p_item.sum())
+    r = np.clip(4.0 + bu[u] + bi[i] + np.einsum("ij,ij->i", P[u], Q[i]) + rng.normal(0, 0.3, len(u)), 0.5, 5.0)
+    df = pd.DataFrame({"user_id": [f"u{x}" for x in u], "item_id": [f"i{x}" for x in i], "rating_aug": r,
+                       "uu": u, "ii": i, "t": rng.random(len(u))})
+    df = df.drop_duplicates(["uu", "ii"]).reset_index(drop=True)
+    df["review_id"] = [f"{x:016x}" for x in range(len(df))]
+    return df
+
+def split(df, n_users, n_items, new_users, new_items, recent, seed=0):
+    """(기존, 새 배치 갱신 입력, 평가) — 새 사용자/상품은 인덱스 끝쪽."""
+    rng = np.random.default_rng(seed + 1)
+    is_new = (df["uu"] >= n_users * (1 - new_users)) | (df["ii"] >= n_items * (1 - new_items)) | (df["t"] < recent)
+    base, batch = df[~is_new], df[is_new]
+    test_mask = np.zeros(len(batch), dtype=bool)
+    for _, g in batch.groupby("uu").indices.items():
+        if len(g) >= 3:
+            test_mask[rng.choice(g, max(1, len(g) // 5), replace=False)] = True
+    return base, batch[~test_mask], batch[test_mask]
+
+def fit_full(df, seed=42):
+    data = Dataset.load_from_df(df[["user_id", "item_id", "rating_aug"]], Reader(rating_scale=(0.5, 5.0)))
+    algo = SVD(n_factors=64, n_epochs=20, random_state=seed)
+    t = time.perf_counter()
+    algo.fit(data.build_full_trainset())
+    return SVDScorer.from_surprise(algo), time.perf_counter() - t
+
+def spearman(a, b):
+    ra, rb = np.argsort(np.argsort(a)), np.argsort(np.argsort(b))
+    return float(np.corrcoef(ra, rb)[0, 1]) if ra.std() and rb.std() else 0.0
+
+def evaluate(cf, train, test, users):
+    """users 의 평가 행: RMSE, 순위 상관(사용자별 평가 상품끼리 Spearman), Recall@10(학습에 없던 전체 상품 중)."""
+    t = test[test["user_id"].isin(users)]
+    est = np.array([cf.predict(u, i) for u, i in zip(t["user_id"], t["item_id"])])
+    rmse = float(np.sqrt(np.mean((t["rating_aug"].to_numpy() - est) ** 2)))
+    t = t.assign(est=est)
+    rho = [spearman(g["rating_aug"].to_numpy(), g["est"].to_numpy()) for _, g in t.groupby("user_id") if len(g) >= 3]
+    seen = train.groupby("user_id")["item_id"].apply(list).to_dict()
+    rel = t[t["rating_aug"] >= 4.5].groupby("user_id")["item_id"].apply(set)
+    rel_users = list(rel.index)
+    idx, _ = cf.topk(rel_users, k=10, exclude={u: seen.get(u, []) for u in rel_users})
+    rec = [len({cf.item_ids[j] for j in row if j >= 0} & rel[u]) / len(rel[u]) for u, row in zip(rel_users, idx)]
+    return rmse, float(np.mean(rho)) if rho else float("nan"), float(np.mean(rec)) if rec else float("nan")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--users", type=int, default=5000)
+    ap.add_argument("--items", type=int, default=800)
+    ap.add_argument("--per-user", type=int, default=20, help="사용자당 평균 상호작용 수 (기하분포)")
+    ap.add_argument("--new-users", type=float, default=0.1, help="새 배치에만 나오는 사용자 비율")
+    ap.add_argument("--new-items", type=float, default=0.03, help="새 배치에만 나오는 상품 비율")
+    ap.add_argument("--recent", type=float, default=0.05, help="기존 사용자 상호작용 중 새 배치로 보낼 비율")
+    ap.add_argument("--batches", type=int, default=3)
+    ap.add_argument("--epochs", type=int, default=3)
+    args = ap.parse_args()
+    if not HAS_SURPRISE:
+        print("Surprise 가 없어 건너뜀 (pip install scikit-surprise)")
+        return
+
+    df = synth(args.users, args.items, args.per_user)
+    base, new_train, test = split(df, args.users, args.items, args.new_users, args.new_items, args.recent)
+    new_u = sorted(set(test["user_id"]) - set(base["user_id"]))
+    old_u = sorted(set(test["user_id"]) & set(base["user_id"]))
+    print(f"상호작용 {len(df):,} = 기존 {len(base):,} + 갱신 입력 {len(new_train):,} + 평가 {len(test):,} "
+          f"/ 평가 사용자: 새 {len(new_u)} · 기존 {len(old_u)}")
+
+    cf0, t_base = fit_full(base)
+    full_train = pd.concat([base, new_train])
+    cf_full, t_full = fit_full(full_train)
+
+    upd = IncrementalSVD.from_fit(cf0, base)
+    t_inc, reps = 0.0, []
+    ordered = new_train.sample(frac=1.0, random_state=0)  # 새 사용자/상품/기존 사용자 리뷰가 배치마다 섞이게
+    bounds = np.linspace(0, len(ordered), args.batches + 1).astype(int)
+    for b in range(1, args.batches + 1):
+        chunk = ordered.iloc[bounds[b - 1]:bounds[b]]
+        seen_so_far = pd.concat([base, new_train[new_train["review_id"].isin(upd.review_ids)], chunk])
+        rep = upd.update(seen_so_far, epochs=args.epochs, force=True)
+        IncrementalSVD.report(rep, f"  배치 {b}: ")
+        t_inc += rep["sec"]
+        reps.append(rep)
+
+    print(f"\n{'':<14}{'갱신 시간':>10}   {'새 사용자 RMSE / ρ / R@10':>28}   {'기존 사용자 RMSE / ρ / R@10':>30}")
+    for name, cf, sec in (("갱신 안 함", cf0, 0.0), ("증분(fold-in)", upd.scorer, t_inc), ("전체 재학습", cf_full, t_full)):
+        a = evaluate(cf, full_train, test, new_u)
+        o = evaluate(cf, full_train, test, old_u)
+        print(f"{name:<14}{sec:>9.2f}s   {a[0]:>10.3f} / {a[1]:.3f} / {a[2]:.3f}        {o[0]:>10.3f} / {o[1]:.3f} / {o[2]:.3f}")
+    print(f"(기존 데이터 전체 학습 {t_base:.2f}s, 1 프로세스)")
+    print(f"드리프트 판정(강제 갱신과 별개): {['재학습' if r['retrain'] else '증분' for r in reps]}")
+
+
+if __name__ == "__main__":
+    main()
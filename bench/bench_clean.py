@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+전처리 load_and_clean 벤치마크: 기존 .apply(행 단위) vs 벡터화 vs 청크 스트리밍
+- 합성 리뷰 CSV(기본 12,000행)에 실제 데이터처럼 잡음을 섞음: \\r\\n, 연속 공백, 영문/이모지, 빈 피부타입,
+  형식이 다른 날짜, 중복 리뷰
+- 단계별(normalize_text 7컬럼 / 날짜 / 평점 / 한글 추출 / 피부타입 추출) 시간과 배속 출력
+- 세 방식 결과가 기존 구현과 완전히 같은지 assert_frame_equal 로 확인
+
+실행: python bench/bench_clean.py [--rows 12000] [--chunksize 200000]
+"""
+
+import os, sys, time, random, argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline import clean
+from bench.bench_review_store import synth_rows
+from pipeline.oy_reviews import REVIEW_FIELDS
+
+import pandas as pd
+
+NOISE = ["\r\n", "  ", "\r\n\r\n\r\n\r\n", " GOOD!! ", " 😀 ", " 100ml ", "  ㅋㅋ  ", "\r"]
+
+
+def make_csv(path, n_rows, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for i, r in enumerate(synth_rows(rng, n_rows)):
+        r = dict(r, product_name=f"여드름 크림  {i % 120:03d}", product_brand="bench",
+                 product_link=f"https://example.com/?goodsNo=A{i % 120:09d}")
+        if rng.random() < 0.3:
+            r["review"] = rng.choice(NOISE) + r["review"] + rng.choice(NOISE)
+        if rng.random() < 0.02:
+            r["review"] = "GOOD 👍 100%"           # 한글이 없어 제거되는 리뷰
+        if rng.random() < 0.01:
+            r["date"] = rng.choice(["N/A", "2024-03-05", "2024.3.5", " 2023.12.01 "])
+        if rng.random() < 0.03 and rows:
+            r = dict(rows[rng.randrange(len(rows))])  # 중복 리뷰
+        rows.append(r)
+    pd.DataFrame(rows, columns=REVIEW_FIELDS).to_csv(path, index=False, encoding="utf-8-sig")
+
+
+def timed(fn):
+    t = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t, out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=12_000)
+    ap.add_argument("--chunksize", type=int, default=200_000)
+    ap.add_argument("--csv", default="/tmp/bench_clean_reviews.csv")
+    args = ap.parse_args()
+
+    make_csv(args.csv, args.rows)
+    raw = pd.read_csv(args.csv, encoding="utf-8-sig")
+    print(f"▶ 합성 리뷰 {len(raw):,}행 ({os.path.getsize(args.csv) / 1e6:.1f}MB)")
+
+    steps = [
+        ("normalize_text x7",
+         lambda: {c: raw[c].apply(clean.normalize_text) for c in clean.TEXT_COLS},
+         lambda: {c: clean.normalize_text_col(raw[c]) for c in clean.TEXT_COLS}),
+        ("parse_date_to_dot", lambda: raw["date"].apply(clean.parse_date_to_dot), lambda: clean.parse_date_col(raw["date"])),
+        ("to_float_safe", lambda: raw["rating"].apply(clean.to_float_safe), lambda: clean.to_float_col(raw["rating"])),
+        ("extract_hangul", lambda: raw["review"].apply(clean.extract_hangul), lambda: clean.extract_hangul_col(raw["review"])),
+    ]
+    print(f"{'단계':<20}{'기존 s':>10}{'벡터 s':>10}{'배속':>8}  동일")
+    for name, old_fn, new_fn in steps:
+        t_old, a = timed(old_fn)
+        t_new, b = timed(new_fn)
+        if isinstance(a, dict):
+            same = all(a[c].equals(b[c]) for c in a)
+        else:
+            same = a.equals(b)
+        print(f"{name:<20}{t_old:>10.3f}{t_new:>10.3f}{t_old / max(t_new, 1e-9):>7.1f}x  {same}")
+
+    t_old, want = timed(lambda: clean.load_and_clean_legacy(args.csv))
+    t_new, got = timed(lambda: clean.load_and_clean(args.csv))
+    t_chunk, got_chunk = timed(lambda: clean.load_and_clean(args.csv, chunksize=args.chunksize))
+
+    t_sk_old, sk_old = timed(lambda: clean.advanced_skin_type_extraction_legacy(want.copy()))
+    t_sk_new, sk_new = timed(lambda: clean.advanced_skin_type_extraction(got.copy()))
+    print(f"{'skin_type 추출':<20}{t_sk_old:>10.3f}{t_sk_new:>10.3f}{t_sk_old / max(t_sk_new, 1e-9):>7.1f}x  "
+          f"{sk_old['skin_type'].equals(sk_new['skin_type'])}")
+
+    print(f"\nload_and_clean 전체: 기존 {t_old:.3f}s / 벡터 {t_new:.3f}s ({t_old / max(t_new, 1e-9):.1f}x) / "
+          f"청크 {t_chunk:.3f}s ({t_old / max(t_chunk, 1e-9):.1f}x)")
+    for name, df in (("벡터", got), ("청크", got_chunk)):
+        try:
+            pd.testing.assert_frame_equal(want, df)
+            print(f"✅ {name} 결과 = 기존 결과 ({df.shape})")
+        except AssertionError as e:
+            print(f"❌ {name} 결과 다름: {e}")
+
+
+if __name__ == "__main__":
+    main()
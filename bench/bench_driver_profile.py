@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+드라이버 프로필 비교: full(기존 창 모드) vs light(headless + 리소스 차단)
+- 프로필마다: 드라이버 시작 시간, 페이지 로드 시간, 페이지당 전송 바이트/요청 수, Chrome 프로세스 RSS(psutil)
+- 같은 페이지에서 추출한 리뷰 행(rows_from_raw)이 프로필 간에 같은지 확인 (CSS 차단 시 innerText 차이 점검)
+- 기본 대상은 bench/fixtures/review_list_*.html (file:// — 전송 바이트는 0). 실제 비교는 --url 로 상품 상세 URL 지정
+
+실행: python bench/bench_driver_profile.py [--url https://...goodsNo=...] [--profiles full,light] [--repeat 3]
+"""
+
+import os, sys, glob, time, argparse
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline.chrome_profile import start_driver, drain_network_bytes, browser_rss, DriverMetrics, HAS_PSUTIL
+from pipeline.oy_reviews import extract_review_page, rows_from_raw
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def run_profile(profile, urls, repeat, block_css=None):
+    metrics = DriverMetrics()
+    driver, _ = start_driver(profile, block_css=block_css, metrics=metrics)
+    rows_by_url = {}
+    try:
+        for url in urls:
+            for _ in range(repeat):
+                drain_network_bytes(driver)
+                t = time.monotonic()
+                driver.get(url)
+                metrics.add_page_load(time.monotonic() - t)
+                if "goodsNo=" in url:
+                    # 상세 페이지면 리뷰 탭 AJAX 까지 기다린다
+                    tab = WebDriverWait(driver, 15).until(EC.element_to_be_clickable((By.CSS_SELECTOR, "#reviewInfo > a")))
+                    driver.execute_script("arguments[0].click();", tab)
+                    WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.CSS_SELECTOR, "#gdasList > li")))
+                rows_by_url[url] = rows_from_raw(extract_review_page(driver), "여성", set())
+                metrics.end_product(driver, 1)
+        rss = browser_rss(driver)
+    finally:
+        driver.quit()
+    return metrics.summary(), rss, rows_by_url
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--url", action="append", default=[])
+    ap.add_argument("--profiles", default="full,light")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--keep-css", action="store_true", help="light 프로필에서 CSS 는 차단하지 않음")
+    args = ap.parse_args()
+
+    urls = args.url or [Path(p).resolve().as_uri() for p in sorted(glob.glob(os.path.join(FIXTURE_DIR, "review_list_*.html")))]
+    if not urls:
+        print("❌ 대상 페이지 없음")
+        return
+    if not HAS_PSUTIL:
+        print("ℹ️ psutil 없음 → RSS 는 생략")
+
+    results = {}
+    for profile in args.profiles.split(","):
+        block_css = False if (args.keep_css and profile != "full") else None
+        summary, rss, rows = run_profile(profile, urls, args.repeat, block_css)
+        results[profile] = rows
+        print(f"\n▶ {profile}")
+        DriverMetrics.report(summary, "  ")
+        if rss:
+            print(f"  종료 직전 Chrome RSS {rss/1e6:.0f}MB")
+
+    names = list(results)
+    for other in names[1:]:
+        same = results[names[0]] == results[other]
+        print(f"\n결과 행 동일({names[0]} vs {other}): {same}")
+        if not same:
+            for url in urls:
+                a, b = results[names[0]].get(url, []), results[other].get(url, [])
+                for ra, rb in zip(a, b):
+                    if ra != rb:
+                        print(f"  {url}\n    {names[0]}: {ra}\n    {other}: {rb}")
+                        break
+
+
+if __name__ == "__main__":
+    main()
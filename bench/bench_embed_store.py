@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+임베딩 저장소 벤치마크: 매번 전체 인코딩 vs 저장소(새 리뷰만 인코딩 + 상품 벡터 증분 갱신)
+- 합성 리뷰 N행(bench_review_embed 생성기) → 1회차: 전체 인코딩 후 저장
+- 2회차: 변경 없음 (모델 로드 여부 확인), 3회차: 리뷰 --new 비율 추가 + 일부 평점 수정
+- 증분 갱신한 상품 벡터가 전체 재집계(aggregate_items)와 같은지 확인
+- 오프라인이면 --local (무작위 가중치 BERT, 층 수 --layers)
+
+실행: python bench/bench_embed_store.py [--rows 3000] [--new 0.02] [--model monologg/kobert | --local --layers 2]
+"""
+
+import os, sys, time, shutil, argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench.bench_review_embed import make_local_bert, synth
+
+import numpy as np
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=3000)
+    ap.add_argument("--items", type=int, default=60)
+    ap.add_argument("--new", type=float, default=0.02)
+    ap.add_argument("--model", default="monologg/kobert")
+    ap.add_argument("--local", action="store_true")
+    ap.add_argument("--layers", type=int, default=2)
+    ap.add_argument("--out", default="/tmp/embed_store_bench")
+    args = ap.parse_args()
+
+    from pipeline.review_embed import ReviewEncoder, aggregate_items
+    from pipeline.embed_store import EmbeddingStore
+
+    model_name = make_local_bert(f"/tmp/bench_embed_store_bert{args.layers}", layers=args.layers) \
+        if args.local else args.model
+    shutil.rmtree(args.out, ignore_errors=True)
+    reviews, items, ratings = synth(args.rows, args.items)
+    n_new = int(args.rows * args.new)
+    more_r, more_i, more_w = synth(n_new, args.items, seed=1)
+    loads = []
+
+    def make_encoder():
+        loads.append(1)
+        return ReviewEncoder(model_name, device="cpu")
+
+    def run(revs, its, ws):
+        t = time.perf_counter()
+        store = EmbeddingStore.open(args.out, model_name)
+        rows = store.ensure(revs, make_encoder)
+        got_items, X = store.update_items(its, rows, weights=ws)
+        return time.perf_counter() - t, store, rows, got_items, X
+
+    print(f"▶ 합성 리뷰 {args.rows:,}건 / 상품 {args.items}개, 모델 {model_name}")
+    sec1, store, _, _, _ = run(reviews, items, ratings)
+    print(f"  1회차(전체 인코딩)     {sec1:8.2f}s  모델 로드 {len(loads)}회")
+    loads.clear()
+    sec2, store, _, _, _ = run(reviews, items, ratings)
+    print(f"  2회차(변경 없음)       {sec2:8.2f}s  모델 로드 {len(loads)}회")
+    loads.clear()
+    reviews3, items3 = reviews + more_r, items + more_i
+    ratings3 = ratings + more_w
+    ratings3[:n_new] = [5.0] * n_new
+    sec3, store, rows, got_items, X = run(reviews3, items3, ratings3)
+    print(f"  3회차(+{n_new}건, 평점 {n_new}건 수정) {sec3:8.2f}s  모델 로드 {len(loads)}회")
+    store.report()
+    print(f"  저장소 크기 {sum(os.path.getsize(os.path.join(dp, f)) for dp, _, fs in os.walk(args.out) for f in fs) / 1e6:.1f}MB"
+          f", 재실행 속도 {sec1 / max(sec2, 1e-9):.0f}x / 증분 {sec1 / sec3:.1f}x")
+
+    _, want = aggregate_items(np.asarray(store.vectors)[rows], items3, weights=ratings3, items=got_items)
+    print(f"  증분 상품 벡터 = 전체 재집계: 최대 차이 {np.abs(np.asarray(X) - want).max():.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+HTTP 리뷰 엔진 벤치마크 (재생 서버 상대로)
+- 상품 N개(모두 저장본 A000000001 로 응답)를 크롤링하고 상품당 CPU 시간 / 최대 RSS / 요청 수를 출력
+- 결과 행이 bench/fixtures/recorded 저장본을 직접 파싱한 것과 같은지 확인
+- 비교 기준: 같은 상품을 Chrome 으로 크롤링하면 브라우저 프로세스만 보통 수백 MB RSS
+
+실행: python bench/bench_http_engine.py [--products 200] [--delay 0.05]
+"""
+
+import os, sys, time, asyncio, argparse, resource
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline.review_http import crawl_products_http, GENDERS, MAX_PAGES
+from pipeline.oy_reviews import parse_review_list_html, rows_from_raw
+from bench.replay_server import start_replay_server, RECORDED_DIR
+
+
+def expected_rows(record_dir, goods_no):
+    """저장본을 직접 파싱한 정답 행 (crawl_gender 와 같은 규칙: 여성 → 남성, 빈 페이지/새 리뷰 없는 페이지에서 멈춤)."""
+    rows = []
+    for gcode, glabel in GENDERS:
+        seen = set()
+        for page_idx in range(1, MAX_PAGES + 1):
+            path = os.path.join(record_dir, f"{goods_no}_{gcode}_{page_idx}.html")
+            html = ""
+            if os.path.exists(path):  # 저장본이 없는 페이지 = 재생 서버의 빈 응답
+                with open(path, encoding="utf-8") as fr:
+                    html = fr.read()
+            new_rows = rows_from_raw(parse_review_list_html(html), glabel, seen)
+            if not new_rows:
+                break
+            rows.extend(new_rows)
+    return rows
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--products", type=int, default=200)
+    ap.add_argument("--delay", type=float, default=0.05)
+    ap.add_argument("--concurrency", type=int, default=8)
+    args = ap.parse_args()
+
+    server, base_url = start_replay_server(record_dir=RECORDED_DIR, alias="A000000001", delay=args.delay)
+    products = [{
+        "product_name": f"상품{i}", "product_brand": "bench",
+        "product_link": f"{base_url}/store/goods/getGoodsDetail.do?goodsNo=A{i:09d}",
+    } for i in range(args.products)]
+
+    ru0 = resource.getrusage(resource.RUSAGE_SELF)
+    t0 = time.perf_counter()
+    results = asyncio.run(crawl_products_http(
+        products, base_url=base_url, max_concurrency=args.concurrency, host_min_interval=0.0))
+    wall = time.perf_counter() - t0
+    ru1 = resource.getrusage(resource.RUSAGE_SELF)
+    server.shutdown()
+
+    cpu = (ru1.ru_utime - ru0.ru_utime) + (ru1.ru_stime - ru0.ru_stime)
+    rss_mb = ru1.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    n_rows = sum(len(r) for r in results)
+    print(f"상품 {len(products)}개 / 리뷰 {n_rows}건 / {wall:.2f}s")
+    print(f"  CPU {cpu:.2f}s (상품당 {cpu / len(products) * 1000:.1f}ms) / 최대 RSS {rss_mb:.0f}MB (프로세스 전체)")
+    want = expected_rows(RECORDED_DIR, "A000000001")
+    bad = [i for i, r in enumerate(results) if r != want]
+    print(f"  저장본 직접 파싱({len(want)}건)과 같은 상품: {len(results) - len(bad)}/{len(results)}"
+          + (f" ❌ 다른 상품 예: {bad[:5]}" if bad else " ✅"))
+
+
+if __name__ == "__main__":
+    main()
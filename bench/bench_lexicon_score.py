@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+감성사전 채점 처리량 벤치마크: 기존 predict_lexicon 루프 vs LexiconBatchScorer(워커 1/4/...)
+- 합성 리뷰 N개(기본 200,000)에 URL/해시태그/이모지/반복문자 잡음을 섞고, 리뷰 단어로 합성 감성사전 구성
+- 기존: 행마다 normalize_text(정규식 6번) → 간이 토크나이저 → apply_syn_map → greedy_longest_match
+        → adjust_by_rules, 리스트 append
+- 배치: 정규식 2번 + LexiconScorer(trie), 워커 프로세스에서 청크 단위, numpy 배열로 반환
+- 스트리밍(write_scores) 처리량도 출력. 모든 경우 점수/라벨이 기존과 같은지 확인
+
+실행: python bench/bench_lexicon_score.py [--rows 200000] [--workers 1,4]
+"""
+
+import os, sys, time, random, argparse, tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline import lexicon_score as ls
+from pipeline import token_match as tm
+from bench.bench_review_store import synth_rows
+from bench.bench_token_match import SYN_MAP, NEGATIONS, INT_POS, INT_NEG
+
+import numpy as np
+import pandas as pd
+
+NOISE = [" www.oliveyoung.co.kr/event ", " #보습크림 ", " 😀😀 ", "!!!!!", " ㅋㅋㅋㅋㅋ ", " @user_1 ", " 👍 ", "~~~~"]
+
+
+def make_data(n_rows, seed=0):
+    rng = random.Random(seed)
+    texts = []
+    for r in synth_rows(rng, n_rows):
+        t = r["review"]
+        if rng.random() < 0.4:
+            t = rng.choice(NOISE) + t + rng.choice(NOISE)
+        if rng.random() < 0.2:
+            t += " " + rng.choice(sorted(NEGATIONS | INT_POS | INT_NEG | set(SYN_MAP)))
+        texts.append(t)
+    words = sorted({w for t in texts[:5000] for w in t.split() if "." not in w})
+    lexicon = {}
+    for _ in range(5000):
+        n = rng.choice([1, 1, 1, 2, 2, 3])
+        lexicon[tuple(rng.sample(words, n))] = rng.choice([1.0, -1.0])
+    return texts, lexicon
+
+
+def legacy_predict(texts, ng_idx, max_n):
+    scores, labels = [], []
+    for s in texts:
+        toks = ls.simple_tokenize(ls.normalize_text_legacy(s))
+        sc = tm.score_by_lexicon_legacy(toks, ng_idx, max_n, SYN_MAP, NEGATIONS, INT_POS, INT_NEG)
+        scores.append(sc)
+        labels.append(0 if sc > 0 else 1)
+    return np.array(scores), np.array(labels)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=200_000)
+    ap.add_argument("--workers", default="1,4")
+    ap.add_argument("--chunksize", type=int, default=50_000)
+    args = ap.parse_args()
+
+    texts, lexicon = make_data(args.rows)
+    max_n = 3
+    ng_idx = tm.build_ngram_index_legacy(lexicon, max_n)
+    scorer = tm.LexiconScorer(lexicon, max_n=max_n, syn_map=SYN_MAP,
+                              negations=NEGATIONS, int_pos=INT_POS, int_neg=INT_NEG)
+    print(f"▶ 리뷰 {len(texts):,}건 / 사전 {len(lexicon):,}개")
+
+    t = time.perf_counter()
+    want_s, want_l = legacy_predict(texts, ng_idx, max_n)
+    base = time.perf_counter() - t
+    print(f"{'기존 루프':<16}{base:8.2f}s  {len(texts) / base:9.0f}건/s")
+
+    for w in [int(x) for x in args.workers.split(",")]:
+        with ls.LexiconBatchScorer(scorer, workers=w) as bs:
+            bs.score(texts[:100])  # 워커 기동
+            t = time.perf_counter()
+            got_s, got_l = bs.score(texts)
+            sec = time.perf_counter() - t
+        same = np.array_equal(want_s, got_s) and np.array_equal(want_l, got_l)
+        print(f"{'배치 워커 ' + str(w):<16}{sec:8.2f}s  {len(texts) / sec:9.0f}건/s  ({base / sec:4.1f}x)  동일 {same}")
+
+    w = max(int(x) for x in args.workers.split(","))
+    chunks = (pd.DataFrame({"review": texts[i:i + args.chunksize]}) for i in range(0, len(texts), args.chunksize))
+    with tempfile.TemporaryDirectory() as d, ls.LexiconBatchScorer(scorer, workers=w) as bs:
+        out = os.path.join(d, "lex_scores.csv")
+        t = time.perf_counter()
+        bs.write_scores(chunks, out, text_col="review")
+        sec = time.perf_counter() - t
+        back = pd.read_csv(out, float_precision="round_trip")
+        same = np.array_equal(back["lex_score"].to_numpy(), want_s) and np.array_equal(back["lex_pred"].to_numpy(), want_l)
+    print(f"{'스트리밍 워커 ' + str(w):<16}{sec:8.2f}s  {len(texts) / sec:9.0f}건/s  ({base / sec:4.1f}x)  동일 {same}")
+
+
+if __name__ == "__main__":
+    main()
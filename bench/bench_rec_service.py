@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+추천 서버 부하 테스트 (로컬): 합성 모델 게시 → pipeline.rec_service 를 별도 프로세스로 띄우고 동시 요청
+- 합성 리뷰(bench_batch_recommend 와 같은 생성기) → BatchRecommender → publish_model
+- 동시 연결 --conns 개(keep-alive)가 --seconds 초 동안 /recommend 요청. user_id 는 Zipf 분포(인기 사용자 반복 → 캐시)
+- 중간에 새 모델을 게시(--swap-at 초) → 교체 전후 실패 요청 수 / 버전 확인
+- 출력: 클라이언트 기준 요청/s, p50/p99 지연, 오류 수, 서버 /stats (캐시 적중률, 서버 p50/p99)
+- 오프라인 결과 확인: 서버 응답이 BatchRecommender.recommend 와 같은지 (사용자 20명)
+
+실행: python bench/bench_rec_service.py [--users 20000] [--items 1000] [--conns 32] [--seconds 20]
+      python bench/bench_rec_service.py --url http://127.0.0.1:8080   # 이미 떠 있는 서버에 부하만
+"""
+
+import os, sys, json, time, shutil, random, asyncio, argparse, subprocess
+from urllib.parse import urlsplit, quote
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+
+def build_model(args, seed=0):
+    from bench.bench_skin_index import synth
+    from pipeline.batch_recommend import BatchRecommender
+    from pipeline.cf_score import SVDScorer
+    from pipeline.skin_index import SkinIndex
+
+    df = synth(args.rows, args.users, args.items, seed=seed)
+    rng = np.random.default_rng(seed)
+    df["rating"] = rng.choice([1.0, 2.0, 3.0, 4.0, 5.0, 5.0, 5.0, 4.0], len(df))
+    items = sorted(df["item_id"].unique())
+    users = df["user_id"].unique().tolist()
+    X = rng.normal(size=(len(items), 768)).astype(np.float32)
+    cf = SVDScorer(rng.normal(0, .1, (len(users), 64)), rng.normal(0, .1, (len(items), 64)),
+                   rng.normal(0, .3, len(users)), rng.normal(0, .3, len(items)), 4.2, users, items)
+    return BatchRecommender.from_frame(df, items, X, cf, SkinIndex.build(df, items=items), workers=1), users
+
+
+async def http_get(reader, writer, host, path):
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+    await writer.drain()
+    status = (await reader.readline()).split(b" ")[1]
+    length = 0
+    while True:
+        h = await reader.readline()
+        if h in (b"\r\n", b""):
+            break
+        if h.lower().startswith(b"content-length:"):
+            length = int(h.split(b":")[1])
+    return int(status), json.loads(await reader.readexactly(length))
+
+
+async def load(url, users, conns, seconds, zipf_a, swap=None, swap_at=None):
+    parts = urlsplit(url)
+    rng = random.Random(0)
+    weights = [1 / (r + 1) ** zipf_a for r in range(len(users))]
+    stop = time.perf_counter() + seconds
+    lat, errors, versions = [], [0], set()
+
+    async def client(cid):
+        reader, writer = await asyncio.open_connection(parts.hostname, parts.port)
+        picks = rng.choices(users, weights=weights, k=20_000)
+        n = 0
+        while time.perf_counter() < stop:
+            u = picks[n % len(picks)]
+            n += 1
+            path = f"/recommend?user_id={quote(u)}&k=10"
+            t = time.perf_counter()
+            try:
+                status, body = await http_get(reader, writer, parts.hostname, path)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                errors[0] += 1
+                reader, writer = await asyncio.open_connection(parts.hostname, parts.port)
+                continue
+            lat.append(time.perf_counter() - t)
+            if status != 200:
+                errors[0] += 1
+            else:
+                versions.add(body["version"])
+        writer.close()
+
+    async def swapper():
+        await asyncio.sleep(swap_at)
+        await asyncio.get_running_loop().run_in_executor(None, swap)
+
+    t0 = time.perf_counter()
+    tasks = [client(i) for i in range(conns)] + ([swapper()] if swap else [])
+    await asyncio.gather(*tasks)
+    sec = time.perf_counter() - t0
+    ms = np.array(lat) * 1e3
+    return {"requests": len(lat), "rps": len(lat) / sec, "p50": float(np.percentile(ms, 50)),
+            "p99": float(np.percentile(ms, 99)), "errors": errors[0], "versions": sorted(versions)}
+
+
+async def get_json(url, path):
+    parts = urlsplit(url)
+    reader, writer = await asyncio.open_connection(parts.hostname, parts.port)
+    try:
+        return (await http_get(reader, writer, parts.hostname, path))[1]
+    finally:
+        writer.close()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=100_000)
+    ap.add_argument("--users", type=int, default=20_000)
+    ap.add_argument("--items", type=int, default=1000)
+    ap.add_argument("--conns", type=int, default=32)
+    ap.add_argument("--seconds", type=float, default=20)
+    ap.add_argument("--swap-at", type=float, default=8)
+    ap.add_argument("--zipf", type=float, default=1.1)
+    ap.add_argument("--port", type=int, default=8791)
+    ap.add_argument("--root", default="/tmp/rec_service_bench")
+    ap.add_argument("--url", default=None, help="이미 떠 있는 서버 (모델 게시/교체 생략)")
+    args = ap.parse_args()
+
+    from pipeline.rec_service import publish_model
+
+    if args.url:
+        url, proc = args.url, None
+        users = [f"user{x:07d}" for x in range(args.users)]
+        swap = None
+    else:
+        shutil.rmtree(args.root, ignore_errors=True)
+        t = time.perf_counter()
+        rec, users = build_model(args)
+        v1 = publish_model(args.root, rec)
+        print(f"▶ 합성 모델 {v1} 게시 (사용자 {len(users):,} / 상품 {len(rec.items):,}, {time.perf_counter() - t:.1f}s)")
+        proc = subprocess.Popen([sys.executable, "-m", "pipeline.rec_service", "--root", args.root,
+                                 "--port", str(args.port), "--poll", "1"], cwd=ROOT)
+        url = f"http://127.0.0.1:{args.port}"
+        for _ in range(100):
+            try:
+                if asyncio.run(get_json(url, "/health"))["ok"]:
+                    break
+            except OSError:
+                time.sleep(0.2)
+
+        def swap():
+            rec2, _ = build_model(args, seed=1)
+            print(f"  ↳ 새 모델 게시 {publish_model(args.root, rec2)}")
+
+    try:
+        if proc is not None:
+            want = {u: rec.recommend(u, 10) for u in users[:20]}
+            got = {u: asyncio.run(get_json(url, f"/recommend?user_id={quote(u)}&k=10"))["items"] for u in users[:20]}
+            same = all([g["item"] for g in got[u]] == [i for i, _ in want[u]] for u in want)
+            print(f"  서버 응답 = BatchRecommender.recommend: {same}")
+        res = asyncio.run(load(url, users, args.conns, args.seconds, args.zipf,
+                               swap=swap if proc is not None else None, swap_at=args.swap_at))
+        stats = asyncio.run(get_json(url, "/stats"))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    print(f"\n동시 연결 {args.conns}, {args.seconds:.0f}s, Zipf a={args.zipf}")
+    print(f"  클라이언트: {res['requests']:,}건, {res['rps']:.0f}건/s, p50 {res['p50']:.2f}ms, p99 {res['p99']:.2f}ms, "
+          f"오류 {res['errors']}")
+    print(f"  서버: p50 {stats['p50_ms']:.2f}ms, p99 {stats['p99_ms']:.2f}ms, 캐시 적중률 {stats['cache_hit_rate']:.1%}, "
+          f"모델 교체 {stats['reloads']}회, 응답 버전 {len(res['versions'])}개")
+
+
+if __name__ == "__main__":
+    main()
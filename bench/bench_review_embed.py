@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+KoBERT 상품 임베딩 벤치마크: 기존 상품 문자열 인코딩 vs 리뷰 단위(길이 정렬 + 토큰 예산) fp32 / int8 동적 양자화
+- 합성 리뷰 N행(기본 3,000), 상품 M개(기본 60)
+    · legacy: 상품별로 리뷰를 이어 붙인 문자열 → encode_texts_legacy (128 토큰에서 잘림 → 반영된 리뷰 비율도 출력)
+    · fp32 / int8: ReviewEncoder.encode(리뷰) → aggregate_items(평점 가중)
+- 출력: 시간, 리뷰/초, 패딩 비율, fp32 대비 int8 상품 벡터 코사인(평균/최소)과 상품별 top-10 이웃 겹침
+- --model 이 없거나 내려받을 수 없으면(오프라인) --local: KoBERT 와 같은 구조(12층, 768차원, 어휘 8002)의
+  무작위 가중치 BERT 를 만들어 씀 → 속도 비교용 (벡터 품질은 의미 없음)
+
+실행: python bench/bench_review_embed.py [--rows 3000] [--items 60] [--model monologg/kobert | --local]
+"""
+
+import os, sys, time, random, argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench.bench_review_store import SYLLABLES
+
+import numpy as np
+
+
+def make_local_bert(path, layers=12, hidden=768, vocab_size=8002, chars=SYLLABLES):
+    """오프라인용 무작위 BERT + 음절 WordPiece 토크나이저 (KoBERT 와 같은 크기). chars: 어휘에 넣을 음절."""
+    from transformers import BertConfig, BertModel, BertTokenizerFast
+    if os.path.exists(os.path.join(path, "config.json")):
+        return path
+    os.makedirs(path, exist_ok=True)
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]
+    vocab += [ch for ch in dict.fromkeys(chars)] + ["##" + ch for ch in dict.fromkeys(chars)]
+    vocab += [f"[unused{i}]" for i in range(vocab_size - len(vocab))]
+    with open(os.path.join(path, "vocab.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(vocab) + "\n")
+    BertTokenizerFast(os.path.join(path, "vocab.txt"), do_lower_case=False).save_pretrained(path)
+    cfg = BertConfig(vocab_size=vocab_size, hidden_size=hidden, num_hidden_layers=layers,
+                     num_attention_heads=hidden // 64, intermediate_size=hidden * 4)
+    BertModel(cfg).save_pretrained(path)
+    return path
+
+
+def synth(n_rows, n_items, seed=0):
+    rng = random.Random(seed)
+    reviews, items, ratings = [], [], []
+    for _ in range(n_rows):
+        k = min(int(rng.expovariate(1 / 12)) + 3, 80)  # 짧은 리뷰가 많고 긴 리뷰는 드묾
+        reviews.append(" ".join("".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))) for _ in range(k)))
+        items.append(f"상품{rng.randrange(n_items):04d}")
+        ratings.append(float(rng.choice([1, 2, 3, 4, 5, 5, 5, 4])))
+    return reviews, items, ratings
+
+
+def topk_overlap(A, B, k=10):
+    sa, sb = A @ A.T, B @ B.T
+    np.fill_diagonal(sa, -np.inf)
+    np.fill_diagonal(sb, -np.inf)
+    ta, tb = np.argsort(-sa, axis=1)[:, :k], np.argsort(-sb, axis=1)[:, :k]
+    return float(np.mean([len(set(a) & set(b)) / k for a, b in zip(ta, tb)]))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=3000)
+    ap.add_argument("--items", type=int, default=60)
+    ap.add_argument("--model", default="monologg/kobert")
+    ap.add_argument("--local", action="store_true", help="무작위 가중치 BERT 사용 (오프라인)")
+    ap.add_argument("--layers", type=int, default=12)
+    ap.add_argument("--threads", type=int, default=None)
+    ap.add_argument("--modes", default="legacy,fp32,int8")
+    args = ap.parse_args()
+
+    import torch
+    from transformers import AutoTokenizer, AutoModel
+    from pipeline.review_embed import ReviewEncoder, aggregate_items, encode_texts_legacy
+
+    model_name = make_local_bert("/tmp/bench_review_embed_bert", layers=args.layers) if args.local else args.model
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    reviews, items, ratings = synth(args.rows, args.items)
+    order = sorted(set(items))
+    print(f"▶ 합성 리뷰 {args.rows:,}건 / 상품 {len(order)}개, 모델 {model_name}, torch 스레드 {torch.get_num_threads()}")
+
+    results, vecs = {}, {}
+    for mode in args.modes.split(","):
+        if mode == "legacy":
+            tok = AutoTokenizer.from_pretrained(model_name)
+            model = AutoModel.from_pretrained(model_name).eval()
+            by_item = {k: [] for k in order}
+            for r, it in zip(reviews, items):
+                by_item[it].append(r)
+            texts = [" ".join(by_item[k]) for k in order]
+            t = time.perf_counter()
+            vecs[mode] = encode_texts_legacy(texts, tok, model, "cpu")
+            sec = time.perf_counter() - t
+            # 128 토큰 안에 들어간 리뷰 비율 (앞에서부터 누적 길이)
+            used = 0
+            for k in order:
+                lens = np.cumsum([len(tok.tokenize(r)) for r in by_item[k]])
+                used += int(np.searchsorted(lens, 126, side="right"))
+            results[mode] = {"sec": sec, "rate": args.rows / sec, "pad": float("nan"), "covered": used / args.rows}
+        else:
+            enc = ReviewEncoder(model_name, device="cpu", quantize=(mode == "int8"))
+            t = time.perf_counter()
+            rv = enc.encode(reviews)
+            _, vecs[mode] = aggregate_items(rv, items, weights=ratings, items=order)
+            sec = time.perf_counter() - t
+            enc.report()
+            s = enc.stats
+            if mode == "fp32":  # 같은 리뷰를 입력 순서 16건 배치로 묶었을 때의 패딩 (정렬 효과)
+                lens = np.array([len(x) for x in enc.tokenizer(reviews, truncation=True, max_length=128)["input_ids"]])
+                padded = sum(len(b) * b.max() for b in np.array_split(lens, -(-len(lens) // 16)))
+                print(f"   (입력 순서 16건 배치였다면 패딩 {1 - lens.sum() / padded:.1%})")
+            results[mode] = {"sec": sec, "rate": args.rows / sec, "pad": 1 - s["tokens"] / s["padded"], "covered": 1.0}
+
+    print(f"\n{'방식':<8}{'시간 s':>9}{'리뷰/s':>10}{'패딩':>8}{'반영 리뷰':>10}")
+    for mode, r in results.items():
+        pad = "-" if np.isnan(r["pad"]) else f"{r['pad']:.1%}"
+        print(f"{mode:<8}{r['sec']:>9.1f}{r['rate']:>10.1f}{pad:>8}{r['covered']:>10.1%}")
+    if "fp32" in vecs and "int8" in vecs:
+        cos = np.sum(vecs["fp32"] * vecs["int8"], axis=1)
+        print(f"int8 vs fp32 상품 벡터 코사인: 평균 {cos.mean():.4f}, 최소 {cos.min():.4f}, "
+              f"top-10 이웃 겹침 {topk_overlap(vecs['fp32'], vecs['int8']):.1%}")
+    if "fp32" in results and "int8" in results:
+        print(f"int8 / fp32 속도: {results['int8']['rate'] / results['fp32']['rate']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+리뷰 페이지 추출 벤치마크: 기존 요소별 find_element vs execute_script 1회
+- bench/fixtures/review_list_*.html 을 headless Chrome 에 file:// 로 띄워서 비교
+- WebDriver 왕복 수는 driver.execute 호출 횟수로 센다 (find_element / .text / get_attribute 모두 1회씩)
+- 두 방식의 결과 행(split_skin_tags / parse_rating_to_float 적용 후)이 같은지도 확인
+
+실행: python bench/bench_review_extract.py [--repeat 20]
+"""
+
+import os, sys, glob, time, argparse
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline.oy_reviews import extract_review_page, extract_review_page_legacy, rows_from_raw
+
+from selenium import webdriver
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def make_bench_driver():
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    return webdriver.Chrome(options=options)
+
+
+def count_round_trips(driver):
+    """driver.execute 를 감싸 호출 수를 센다. 반환: 카운터 dict."""
+    counter = {"n": 0}
+    orig = driver.execute
+
+    def wrapped(*args, **kwargs):
+        counter["n"] += 1
+        return orig(*args, **kwargs)
+
+    driver.execute = wrapped
+    return counter
+
+
+def run_one(driver, counter, fn, repeat):
+    times, calls, rows = [], [], None
+    for _ in range(repeat):
+        counter["n"] = 0
+        t0 = time.perf_counter()
+        raw = fn(driver)
+        rows = rows_from_raw(raw, "여성", set())
+        times.append(time.perf_counter() - t0)
+        calls.append(counter["n"])
+    times.sort()
+    return {
+        "median_ms": times[len(times) // 2] * 1000,
+        "min_ms": times[0] * 1000,
+        "round_trips": calls[-1],
+        "rows": rows,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--fixtures", default=os.path.join(FIXTURE_DIR, "review_list_*.html"))
+    args = ap.parse_args()
+
+    paths = sorted(glob.glob(args.fixtures))
+    if not paths:
+        print(f"❌ 픽스처 없음: {args.fixtures}")
+        return
+
+    driver = make_bench_driver()
+    counter = count_round_trips(driver)
+    try:
+        print(f"{'fixture':<24}{'mode':<8}{'reviews':>8}{'trips':>8}{'median ms':>12}{'min ms':>10}")
+        for path in paths:
+            driver.get(Path(path).resolve().as_uri())
+            name = os.path.basename(path)
+            legacy = run_one(driver, counter, extract_review_page_legacy, args.repeat)
+            fast = run_one(driver, counter, extract_review_page, args.repeat)
+            for mode, r in (("legacy", legacy), ("js", fast)):
+                print(f"{name:<24}{mode:<8}{len(r['rows']):>8}{r['round_trips']:>8}"
+                      f"{r['median_ms']:>12.1f}{r['min_ms']:>10.1f}")
+            same = legacy["rows"] == fast["rows"]
+            speed = legacy["median_ms"] / max(fast["median_ms"], 1e-9)
+            print(f"  ↳ 결과 동일: {same} / 왕복 {legacy['round_trips']} → {fast['round_trips']} / {speed:.1f}배")
+            if not same:
+                for a, b in zip(legacy["rows"], fast["rows"]):
+                    if a != b:
+                        print("    legacy:", a)
+                        print("    js    :", b)
+                        break
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+리뷰 저장 형식 벤치마크: 기존 CSV(utf-8-sig) vs 컬럼형 저장소(Parquet, 수집일 파티션 + 상품별 정렬)
+- 합성 리뷰 N행(기본 12,000 = 현재 데이터 규모)을 두 형식으로 써서 파일 크기 / 읽기 시간 비교
+    · CSV  : pd.read_csv 전체
+    · store: 전체 / load_and_clean 이 쓰는 컬럼만 / 3컬럼 / 상품 1개
+- 쓰기는 크롤러 증분 모드처럼 상품마다 flush 한 뒤 compact
+- csv_compat 로 읽은 결과가 pd.read_csv 결과와 같은지 확인 (--no-check 로 생략)
+
+실행: python bench/bench_review_store.py [--rows 12000] [--products 120] [--out /tmp/review_store_bench]
+      python bench/bench_review_store.py --rows 10000000 --products 500 --no-check
+"""
+
+import os, sys, csv, time, shutil, random, argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline.oy_reviews import REVIEW_FIELDS, SKIN_TYPE_SET, SKIN_TONE_SET, SKIN_CONCERN_SET
+from pipeline.review_store import ReviewStore, compact, load_reviews
+
+import pandas as pd
+
+SYLLABLES = list("가나다라마바사아자차카타파하수분크림진정트러블피부보습좋아요촉촉순해향기없")
+CLEAN_COLS = ["product_name","customer_name","skin_type","skin_tone","skin_concerns","review","date","rating","gender"]
+
+
+def synth_rows(rng, n):
+    types, tones, concerns = sorted(SKIN_TYPE_SET), sorted(SKIN_TONE_SET), sorted(SKIN_CONCERN_SET)
+    for _ in range(n):
+        words = ["".join(rng.choices(SYLLABLES, k=rng.randint(2, 5))) for _ in range(rng.randint(5, 40))]
+        rating = rng.choice([1, 2, 3, 4, 5, 5, 5, 4])
+        yield {
+            "customer_name": f"user{rng.randint(0, n // 3):07d}" if rng.random() > 0.02 else "Anonymous",
+            "skin_type": rng.choice(types) if rng.random() > 0.1 else "",
+            "skin_tone": rng.choice(tones) if rng.random() > 0.3 else "",
+            "skin_concerns": " / ".join(rng.sample(concerns, rng.randint(0, 3))),
+            "review": " ".join(words),
+            "date": f"20{rng.randint(21, 25)}.{rng.randint(1, 12):02d}.{rng.randint(1, 28):02d}",
+            "rating_text": f"5점만점에 {rating}점",
+            "rating": float(rating),
+            "gender": rng.choice(["여성", "여성", "여성", "남성"]),
+        }
+
+
+def write_both(n_rows, n_products, out_dir, seed=0):
+    rng = random.Random(seed)
+    csv_path = os.path.join(out_dir, "reviews.csv")
+    store_dir = os.path.join(out_dir, "store")
+    per = max(1, n_rows // n_products)
+    t_csv = t_store = 0.0
+    with open(csv_path, "w", newline="", encoding="utf-8-sig") as fw, \
+            ReviewStore(store_dir, crawl_date="2025-01-01", flush_rows=per) as store:
+        writer = csv.DictWriter(fw, fieldnames=REVIEW_FIELDS)
+        writer.writeheader()
+        written = 0
+        for i in range(n_products):
+            k = per if i < n_products - 1 else n_rows - written
+            product = {"product_name": f"여드름 크림 {i:04d}", "product_brand": f"브랜드{i % 40}",
+                       "product_link": f"https://www.oliveyoung.co.kr/store/goods/getGoodsDetail.do?goodsNo=A{i:09d}"}
+            rows = list(synth_rows(rng, k))
+            t = time.perf_counter()
+            for r in rows:
+                writer.writerow({**{f: product[f] for f in ("product_name", "product_brand", "product_link")}, **r})
+            t_csv += time.perf_counter() - t
+            t = time.perf_counter()
+            store.append(product, rows)
+            t_store += time.perf_counter() - t
+            written += k
+    t = time.perf_counter()
+    compact(store_dir)
+    t_store += time.perf_counter() - t
+    return csv_path, store_dir, t_csv, t_store
+
+
+def dir_size(path):
+    return sum(os.path.getsize(os.path.join(d, f)) for d, _, fs in os.walk(path) for f in fs)
+
+
+def timed(fn, repeat):
+    best, out = None, None
+    for _ in range(repeat):
+        t = time.perf_counter()
+        out = fn()
+        dt = time.perf_counter() - t
+        best = dt if best is None else min(best, dt)
+    return best, out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=12_000)
+    ap.add_argument("--products", type=int, default=120)
+    ap.add_argument("--out", default="/tmp/review_store_bench")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--no-check", action="store_true")
+    args = ap.parse_args()
+
+    shutil.rmtree(args.out, ignore_errors=True)
+    os.makedirs(args.out)
+    print(f"▶ 합성 리뷰 {args.rows:,}행 / 상품 {args.products}개 생성")
+    csv_path, store_dir, t_csv_w, t_store_w = write_both(args.rows, args.products, args.out)
+    csv_mb, store_mb = os.path.getsize(csv_path) / 1e6, dir_size(store_dir) / 1e6
+    print(f"  쓰기: CSV {t_csv_w:.2f}s / store {t_store_w:.2f}s")
+    print(f"  크기: CSV {csv_mb:.1f}MB / store {store_mb:.1f}MB ({store_mb / csv_mb:.0%})")
+
+    one = "A000000000"
+    cases = [
+        ("csv 전체", lambda: pd.read_csv(csv_path, encoding="utf-8-sig")),
+        ("store 전체", lambda: load_reviews(store_dir)),
+        ("store 전처리 컬럼", lambda: load_reviews(store_dir, columns=CLEAN_COLS, csv_compat=True)),
+        ("store 3컬럼", lambda: load_reviews(store_dir, columns=["product_name", "rating", "gender"])),
+        ("store 상품 1개", lambda: load_reviews(store_dir, products=[one])),
+    ]
+    results = {}
+    base = None
+    for name, fn in cases:
+        sec, df = timed(fn, args.repeat)
+        results[name] = df
+        base = base or sec
+        print(f"  {name:<16} {sec:8.3f}s  ({base / sec:5.1f}배)  행 {len(df):,}")
+
+    if not args.no_check:
+        want = results["csv 전체"]
+        got = load_reviews(store_dir, csv_compat=True)
+        try:
+            pd.testing.assert_frame_equal(want, got, check_dtype=True)
+            print("✅ csv_compat 결과 = pd.read_csv 결과")
+        except AssertionError as e:
+            print(f"❌ 결과 다름: {e}")
+
+
+if __name__ == "__main__":
+    main()
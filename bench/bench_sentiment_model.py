@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+감성 모델 저장소 벤치마크: 노트북 재실행(학습) vs 저장된 모델 로드 후 채점
+- 합성 리뷰(bench_sentiment_train 과 같은 생성기)로 TF-IDF + LogisticRegression 학습 → save_sentiment_model
+- 새 프로세스에서: import + load 시간, 첫 채점, 배치(1/100/1000건) 채점 지연, sklearn import 여부
+- 저장 모델 확률이 sklearn predict_proba 와 같은지 확인
+
+실행: python bench/bench_sentiment_model.py [--rows 50000] [--out /tmp/sentiment_model_bench]
+"""
+
+import os, sys, json, time, shutil, argparse, subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+COLD = r"""
+import sys, time, json
+t0 = time.perf_counter()
+sys.path.insert(0, {root!r})
+from pipeline.sentiment_model import SentimentModel
+m = SentimentModel.load({path!r})
+t1 = time.perf_counter()
+m.score(["촉촉하고 순해요"])
+t2 = time.perf_counter()
+lat = {{}}
+for n in (1, 100, 1000):
+    batch = ["촉촉하고 순해요 재구매 의사 있어요 진짜 좋아요 트러블 없음"] * n
+    t = time.perf_counter(); m.score(batch); lat[n] = time.perf_counter() - t
+print(json.dumps({{"load": t1 - t0, "first": t2 - t1, "lat": lat, "sklearn": "sklearn" in sys.modules}}))
+"""
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=50_000)
+    ap.add_argument("--out", default="/tmp/sentiment_model_bench")
+    args = ap.parse_args()
+
+    import numpy as np
+    import pandas as pd
+    from bench.bench_sentiment_train import make_csv
+    from pipeline import sentiment_train as st
+    from pipeline.sentiment_model import save_sentiment_model, SentimentModel
+    from pipeline.lexicon_score import normalize_text
+    from pipeline.token_match import LexiconScorer
+    from bench.bench_sentiment_train import POS, NEG
+
+    shutil.rmtree(args.out, ignore_errors=True)
+    os.makedirs(args.out)
+    csv_path = os.path.join(args.out, "reviews.csv")
+    make_csv(csv_path, args.rows)
+    df = pd.read_csv(csv_path)
+    texts = df["review"].map(normalize_text).tolist()
+    y = (df["rating"] < 4).astype(int).to_numpy()
+
+    t = time.perf_counter()
+    res = st.train_parallel_folds(texts, y, n_jobs=1, fit_full=True)
+    t_train = time.perf_counter() - t
+    lex = LexiconScorer({**{(w,): 1.0 for w in POS}, **{(w,): -1.0 for w in NEG}}, max_n=3)
+    model_dir = os.path.join(args.out, "model")
+    t = time.perf_counter()
+    version = save_sentiment_model(model_dir, res["vect"], res["full_model"], threshold=0.5, lex_scorer=lex)
+    t_save = time.perf_counter() - t
+    print(f"▶ {args.rows:,}행 학습(TF-IDF + 5-fold + 전체 모델) {t_train:.1f}s / 저장 {t_save:.2f}s → {version}")
+
+    m = SentimentModel.load(model_dir)
+    want = res["full_model"].predict_proba(res["vect"].transform(texts[:5000]))[:, 1]
+    got = m.predict_proba(texts[:5000], normalized=True)
+    print(f"  확률 최대 차이(sklearn 대비) {np.abs(want - got).max():.2e}")
+
+    out = subprocess.run([sys.executable, "-c", COLD.format(root=ROOT, path=model_dir)], capture_output=True, text=True)
+    r = json.loads(out.stdout.strip().splitlines()[-1])
+    print(f"  새 프로세스: import+load {r['load'] * 1e3:.0f}ms, 첫 채점(어휘/사전 로드) {r['first'] * 1e3:.0f}ms, "
+          f"sklearn import {r['sklearn']}")
+    for n, sec in r["lat"].items():
+        print(f"  배치 {n:>5}건: {sec * 1e3:8.1f}ms ({sec * 1e3 / int(n):.3f}ms/건)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+감성 ML 학습 벤치마크: 기존 순차 5-fold(liblinear) vs 병렬 fold vs 스트리밍(해싱 + SGD)
+- 합성 리뷰 CSV N행(기본 200,000): 긍/부정 단어가 라벨과 상관되게 섞인 리뷰, rating 으로 라벨(<4 → 1)
+- 방식마다 별도 프로세스로 실행 → 최대 RSS 가 서로 섞이지 않음
+- 출력: 전체 시간, fold 별 F1/시간, 최대 RSS, macro F1 / ROC-AUC, 최적 임계값(find_best_threshold 와 같은 계산)
+
+실행: python bench/bench_sentiment_train.py [--rows 200000] [--modes seq,parallel,stream] [--chunksize 50000]
+"""
+
+import os, sys, json, time, random, argparse, subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench.bench_review_store import SYLLABLES
+
+POS = ["촉촉", "순해요", "좋아요", "진정", "흡수", "재구매", "추천", "보습", "만족", "산뜻"]
+NEG = ["따가워요", "건조", "트러블", "별로", "끈적", "자극", "뒤집어", "실망", "냄새", "환불"]
+
+
+def make_csv(path, n_rows, seed=0):
+    import pandas as pd
+    rng = random.Random(seed)
+    filler = ["".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))) for _ in range(20_000)]
+    rows = []
+    for _ in range(n_rows):
+        neg = rng.random() < 0.25
+        words = rng.choices(filler, k=rng.randint(5, 40))
+        for _ in range(rng.randint(1, 4)):
+            src = NEG if (neg if rng.random() < 0.8 else not neg) else POS
+            words.insert(rng.randrange(len(words) + 1), rng.choice(src))
+        rating = rng.choice([1, 2, 3]) if neg else rng.choice([4, 5])
+        rows.append({"review": " ".join(words), "rating": rating})
+    pd.DataFrame(rows).to_csv(path, index=False, encoding="utf-8-sig")
+
+
+def best_threshold(y, p):
+    from sklearn.metrics import precision_recall_curve
+    pr, rc, th = precision_recall_curve(y, p)
+    f1s = (2 * pr * rc / (pr + rc + 1e-12))[:-1]
+    return float(th[f1s.argmax()]) if len(th) else 0.5
+
+
+def run_mode(mode, csv_path, chunksize):
+    import pandas as pd
+    from sklearn.metrics import f1_score, roc_auc_score
+    from pipeline import sentiment_train as st
+    from pipeline.lexicon_score import normalize_text
+
+    def prepare(chunk):
+        texts = chunk["review"].fillna("").astype(str).map(normalize_text).tolist()
+        return texts, (chunk["rating"].astype(float) < 4).astype(int).to_numpy()
+
+    t0 = time.perf_counter()
+    if mode == "stream":
+        res = st.train_streaming(lambda: pd.read_csv(csv_path, chunksize=chunksize), prepare)
+        y = res["y"]
+    else:
+        texts, y = prepare(pd.read_csv(csv_path))
+        res = st.train_parallel_folds(texts, y, n_jobs=1 if mode == "seq" else -1)
+    sec = time.perf_counter() - t0
+    st.report_folds(res, title=mode)
+    return {"mode": mode, "sec": sec, "peak_rss_mb": max(res["peak_rss_mb"], st.peak_rss_mb(children=True)),
+            "f1": f1_score(y, res["preds"], average="macro"), "auc": roc_auc_score(y, res["probs"]),
+            "thr": best_threshold(y, res["probs"]), "probs_head": res["probs"][:1000].tolist()}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=200_000)
+    ap.add_argument("--modes", default="seq,parallel,stream")
+    ap.add_argument("--chunksize", type=int, default=50_000)
+    ap.add_argument("--csv", default="/tmp/bench_sentiment_train.csv")
+    ap.add_argument("--run", default=None, help=argparse.SUPPRESS)  # 내부용: 한 방식만 실행하고 JSON 출력
+    args = ap.parse_args()
+
+    if args.run:
+        print("@@" + json.dumps(run_mode(args.run, args.csv, args.chunksize)))
+        return
+
+    make_csv(args.csv, args.rows)
+    print(f"▶ 합성 리뷰 {args.rows:,}행 ({os.path.getsize(args.csv) / 1e6:.0f}MB), CPU {os.cpu_count()}개")
+    results = {}
+    for mode in args.modes.split(","):
+        out = subprocess.run([sys.executable, __file__, "--run", mode, "--csv", args.csv,
+                              "--chunksize", str(args.chunksize)], capture_output=True, text=True)
+        lines = out.stdout.splitlines()
+        for line in lines:
+            if not line.startswith("@@"):
+                print("   " + line)
+        payload = [line[2:] for line in lines if line.startswith("@@")]
+        if not payload:
+            print(f"❌ {mode} 실패:\n{out.stderr[-2000:]}")
+            continue
+        results[mode] = json.loads(payload[0])
+
+    print(f"\n{'방식':<10}{'시간 s':>9}{'최대 RSS MB':>13}{'macro F1':>10}{'ROC-AUC':>9}{'최적 임계값':>12}")
+    for mode, r in results.items():
+        print(f"{mode:<10}{r['sec']:>9.1f}{r['peak_rss_mb']:>13.0f}{r['f1']:>10.4f}{r['auc']:>9.4f}{r['thr']:>12.3f}")
+    if "seq" in results and "parallel" in results:
+        print(f"병렬 fold 확률 = 순차 확률: {results['seq']['probs_head'] == results['parallel']['probs_head']}")
+
+
+if __name__ == "__main__":
+    main()
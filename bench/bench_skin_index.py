@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+피부 적합도 필터 벤치마크: 기존 filter_items_by_skin_compatibility + seen_items (DataFrame 스캔) vs SkinIndex
+- 합성 리뷰 N행(기본 500,000), 사용자 --users, 상품 --items
+- 기존 함수는 추천 노트북 코드 그대로 (get_ratio_pivot 3개 + 요청마다 df 스캔)
+- 출력: 인덱스 생성/저장/로드 시간, 사용자당 후보 선택 시간, 후보/본 상품이 기존과 같은지
+
+실행: python bench/bench_skin_index.py [--rows 500000] [--users 100000] [--items 2000] [--queries 200]
+"""
+
+import os, sys, time, argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline.skin_index import SkinIndex, FACETS
+
+import numpy as np
+import pandas as pd
+
+TYPES = ["건성", "지성", "복합성", "중성", "민감성", "Unknown"]
+TONES = ["쿨톤", "웜톤", "봄웜톤", "여름쿨톤", "가을웜톤", "겨울쿨톤", "Unknown"]
+CONCERNS = ["잡티", "미백", "주름", "각질", "트러블", "블랙헤드", "피지과다", "민감성", "모공", "탄력", "홍조", "아토피", "다크서클", "Unknown"]
+
+
+def synth(n_rows, n_users, n_items, seed=0):
+    rng = np.random.default_rng(seed)
+    users = rng.integers(0, n_users, n_rows)
+    return pd.DataFrame({
+        "user_id": [f"user{x:07d}" for x in users],
+        "item_id": [f"상품{x:05d}" for x in np.minimum(rng.zipf(1.2, n_rows) - 1, n_items - 1)],
+        "skin_type": np.array(TYPES)[(users + rng.integers(0, 2, n_rows)) % len(TYPES)],
+        "skin_tone": np.array(TONES)[users % len(TONES)],
+        "skin_concerns": np.array(CONCERNS)[rng.integers(0, len(CONCERNS), n_rows)],
+    })
+
+
+def legacy_filter(df, item_ids, threshold=0.1):
+    """추천 노트북 5./6. 셀의 기존 코드."""
+    def get_ratio_pivot(column_name):
+        counts = df.groupby(["item_id", column_name])["user_id"].count().reset_index(name="count")
+        totals = counts.groupby("item_id")["count"].transform("sum").clip(lower=1)
+        counts["ratio"] = counts["count"] / totals
+        pivot = counts.pivot(index="item_id", columns=column_name, values="ratio").fillna(0.0)
+        return pivot.reindex(item_ids).fillna(0.0)
+
+    R_skin_type, R_skin_tone, R_skin_concerns = (get_ratio_pivot(c) for c in FACETS)
+
+    def filter_items(user_id):
+        user_info = df[df.user_id == user_id].tail(1)
+        if user_info.empty:
+            return set(item_ids)
+        candidate_items = set()
+        for R, col in ((R_skin_type, "skin_type"), (R_skin_tone, "skin_tone"), (R_skin_concerns, "skin_concerns")):
+            v = str(user_info[col].values[0])
+            if v in R.columns:
+                candidate_items.update(R[R[v] >= threshold].index)
+        candidate_items = candidate_items if candidate_items else set(item_ids)
+        seen_items = set(df.loc[df.user_id == user_id, "item_id"])
+        return candidate_items - seen_items
+
+    return filter_items
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=500_000)
+    ap.add_argument("--users", type=int, default=100_000)
+    ap.add_argument("--items", type=int, default=2000)
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--threshold", type=float, default=0.1)
+    ap.add_argument("--out", default="/tmp/skin_index_bench/skin_index.npz")
+    args = ap.parse_args()
+
+    df = synth(args.rows, args.users, args.items)
+    item_ids = sorted(df["item_id"].unique())
+    users = df["user_id"].drop_duplicates().sample(args.queries, random_state=0).tolist() + ["신규사용자"]
+    print(f"▶ 합성 리뷰 {args.rows:,}행 / 사용자 {df['user_id'].nunique():,} / 상품 {len(item_ids):,}, 조회 {len(users)}명")
+
+    t = time.perf_counter()
+    legacy = legacy_filter(df, item_ids, args.threshold)
+    t_pivot = time.perf_counter() - t
+    t = time.perf_counter()
+    want = [legacy(u) for u in users]
+    t_legacy = (time.perf_counter() - t) / len(users)
+
+    t = time.perf_counter()
+    idx = SkinIndex.build(df, items=item_ids)
+    t_build = time.perf_counter() - t
+    t = time.perf_counter()
+    idx.save(args.out)
+    t_save = time.perf_counter() - t
+    t = time.perf_counter()
+    idx = SkinIndex.load_or_build(args.out, df, items=item_ids)
+    t_load = time.perf_counter() - t
+    t = time.perf_counter()
+    masks = [idx.candidate_mask(u, args.threshold) & ~idx.seen_mask(u) for u in users]
+    t_index = (time.perf_counter() - t) / len(users)
+    got = [{idx.items[i] for i in np.flatnonzero(m)} for m in masks]
+
+    print(f"  피봇 3개(기존)   {t_pivot:8.2f}s")
+    print(f"  인덱스 생성      {t_build:8.2f}s / 저장 {t_save:.2f}s ({os.path.getsize(args.out) / 1e6:.1f}MB) / "
+          f"load_or_build(fingerprint 확인 포함) {t_load:.2f}s")
+    print(f"  사용자당 후보     기존 {t_legacy * 1e3:8.2f}ms  →  인덱스 {t_index * 1e3:.3f}ms "
+          f"({t_legacy / t_index:.0f}x)")
+    print(f"  후보 - 본 상품 = 기존 결과: {got == want}")
+
+
+if __name__ == "__main__":
+    main()
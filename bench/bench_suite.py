@@ -0,0 +1,388 @@
+# -*- coding: utf-8 -*-
+"""
+파이프라인 전 단계 규모별 벤치마크 (합성 데이터) + 실행 이력(JSON)으로 성능 회귀 확인
+- 데이터: bench/synth_data.py (크롤러 CSV 스키마, Zipf 인기도). 규모마다 1번 생성해서 --work 에 보관
+    · 규모 N 리뷰 → 사용자 N/10, 상품 min(N/100, 10,000)  (1m → 100k 사용자 / 10k 상품)
+- 단계 (노트북 흐름 순서, 앞 단계 결과를 다음 단계 입력으로)
+    clean     : load_and_clean(CSV)                          → 정제 결과를 parquet 으로 저장 (뒤 단계 입력)
+    tokenize  : TokenizeService.pos_many (Komoran)           — konlpy/JVM 이 없으면 건너뜀
+    lexicon   : LexiconBatchScorer.score (predict_lexicon)   — 감성 단어 목록으로 만든 사전
+    tfidf_cv  : train_parallel_folds (TF-IDF + 5-fold)       — 라벨 = rating < 4
+    embed     : ReviewEncoder.encode + aggregate_items       — KoBERT 대신 작은 무작위 BERT (로컬, 2층 128차원)
+    svd       : Surprise SVD(64, 20 epochs) 학습             → SVDScorer 저장 (recommend 입력)
+    recommend : BatchRecommender.run (전체 사용자) + recommend 1명 지연(p50)  — 상품 벡터는 무작위 단위 벡터
+- 단계마다 별도 프로세스 → 시간(입력 로드 제외), 처리량, 최대 RSS(입력 로드 후 / 전체)가 단계끼리 섞이지 않음
+- 처리 행이 많은 단계는 --cap 으로 상한 (기본 tokenize 20k, embed 20k: 1 CPU 에서도 끝나게). 상한도 기록
+- 이력: --history 파일(JSON 목록)에 실행마다 git 커밋 / 시각 / 호스트 / CPU 수 / 결과 추가
+  → 같은 호스트의 직전 실행과 (단계, 규모, 처리 행) 별로 비교, --tol(기본 20%) 넘게 느려지거나 메모리가 늘면 표시
+    (--fail-on-regression: 회귀가 있으면 종료 코드 1)
+
+실행: python bench/bench_suite.py [--scales 10k,100k,1m] [--stages clean,lexicon,...] [--workers 1]
+      python bench/bench_suite.py --scales 10k --cap embed=2000 --history /tmp/suite_history.json
+"""
+
+import os, sys, json, time, socket, platform, argparse, subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:  # Windows
+    HAS_RESOURCE = False
+
+STAGES = ["clean", "tokenize", "lexicon", "tfidf_cv", "embed", "svd", "recommend"]
+DEFAULT_CAPS = {"tokenize": 20_000, "embed": 20_000}
+
+
+class StageSkipped(Exception):
+    pass
+
+
+# =========================
+# 1) 공용
+# =========================
+def parse_scale(s):
+    s = s.strip().lower()
+    mult = {"k": 1_000, "m": 1_000_000}.get(s[-1], 1)
+    return int(float(s[:-1] if mult > 1 else s) * mult)
+
+def scale_name(n):
+    return f"{n // 1_000_000}m" if n % 1_000_000 == 0 else f"{n // 1_000}k" if n % 1_000 == 0 else str(n)
+
+def peak_rss_mb():
+    """이 프로세스와 종료된 자식 프로세스 중 최대 RSS(MB)."""
+    if not HAS_RESOURCE:
+        return float("nan")
+    rss = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return rss / 1e6 if sys.platform == "darwin" else rss / 1e3
+
+def paths_for(work, n, seed):
+    d = os.path.join(work, f"{scale_name(n)}-s{seed}")
+    return {"dir": d, "csv": os.path.join(d, "reviews.csv"), "clean": os.path.join(d, "clean.parquet"),
+            "svd": os.path.join(d, "svd.npz"), "recs": os.path.join(d, "recs.parquet"),
+            "bert": os.path.join(work, "tiny_bert")}
+
+class Timed:
+    """with 블록 = 측정 구간. 들어갈 때 RSS(입력 로드 후), 나올 때 시간."""
+
+    def __enter__(self):
+        self.rss_in = peak_rss_mb()
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.sec = time.perf_counter() - self.t0
+
+def load_clean(p):
+    """정제 결과 (clean 단계가 저장한 parquet, 없으면 지금 정제) + 추천 노트북 컬럼 이름."""
+    import pandas as pd
+    if os.path.exists(p["clean"]):
+        df = pd.read_parquet(p["clean"])
+    else:
+        from pipeline.clean import load_and_clean
+        df = load_and_clean(p["csv"])
+        df.to_parquet(p["clean"], index=False)
+    return df.rename(columns={"customer_name": "user_id", "product_name": "item_id"})
+
+# =========================
+# 2) 단계
+# =========================
+def stage_clean(p, cap, args):
+    from pipeline.clean import load_and_clean
+    with Timed() as tm:
+        df = load_and_clean(p["csv"], chunksize=args.clean_chunksize or None)
+    df.to_parquet(p["clean"], index=False)
+    with open(p["csv"], "rb") as f:
+        n_raw = sum(1 for _ in f) - 1
+    return tm, n_raw, "리뷰", {"kept": len(df)}
+
+def stage_tokenize(p, cap, args):
+    from pipeline.tokenize_service import TokenizeService, HAS_KONLPY
+    from pipeline.clean import extract_hangul_col
+    if not HAS_KONLPY:
+        raise StageSkipped("konlpy 없음")
+    texts = extract_hangul_col(load_clean(p)["review"]).tolist()[:cap]
+    with TokenizeService(None, workers=args.workers) as tok:
+        t = time.perf_counter()
+        try:
+            tok.warm_up()  # 워커 전부 JVM 기동
+        except Exception as e:
+            raise StageSkipped(f"Komoran 기동 실패: {e!r}")
+        startup = time.perf_counter() - t
+        with Timed() as tm:
+            out = tok.pos_many(texts)
+    return tm, len(texts), "리뷰", {"startup_sec": round(startup, 3), "morphs": sum(map(len, out))}
+
+def stage_lexicon(p, cap, args):
+    from pipeline.lexicon_score import LexiconBatchScorer
+    from pipeline.token_match import LexiconScorer
+    from bench.bench_token_match import NEGATIONS, INT_POS, INT_NEG
+    from bench.synth_data import load_vocab
+    pos, neg, _ = load_vocab()
+    scorer = LexiconScorer({**{(w,): 1.0 for w in pos}, **{(w,): -1.0 for w in neg}}, max_n=3,
+                           negations=NEGATIONS, int_pos=INT_POS, int_neg=INT_NEG)
+    texts = load_clean(p)["review"].fillna("").astype(str).tolist()[:cap]
+    with LexiconBatchScorer(scorer, workers=args.workers) as bs:
+        bs.score(texts[:100])  # 워커 기동
+        with Timed() as tm:
+            _, labels = bs.score(texts)
+    return tm, len(texts), "리뷰", {"neg_ratio": round(float(labels.mean()), 4)}
+
+def stage_tfidf_cv(p, cap, args):
+    from pipeline.sentiment_train import train_parallel_folds
+    from pipeline.lexicon_score import normalize_text
+    df = load_clean(p).iloc[:cap]
+    texts = df["review"].fillna("").astype(str).map(normalize_text).tolist()
+    y = (df["rating"].astype(float) < 4).astype(int).to_numpy()
+    with Timed() as tm:
+        res = train_parallel_folds(texts, y, n_jobs=args.workers)
+    f1 = sum(f["f1"] for f in res["folds"]) / len(res["folds"])
+    return tm, len(texts), "리뷰", {"f1": round(f1, 4), "features": res["X"].shape[1]}
+
+def stage_embed(p, cap, args):
+    from pipeline.review_embed import ReviewEncoder, aggregate_items, HAS_TORCH
+    if not HAS_TORCH:
+        raise StageSkipped("torch 없음")
+    try:
+        from bench.bench_review_embed import make_local_bert
+        from bench.synth_data import load_vocab, COMMON, CATEGORIES
+    except ImportError as e:
+        raise StageSkipped(f"transformers 없음: {e}")
+    pos, neg, _ = load_vocab()
+    chars = sorted({ch for w in COMMON + CATEGORIES + pos + neg for ch in w if not ch.isspace()})
+    path = make_local_bert(p["bert"] + f"-{args.bert_layers}x{args.bert_hidden}", layers=args.bert_layers,
+                           hidden=args.bert_hidden, vocab_size=max(8002, 2 * len(chars) + 5), chars=chars)
+    df = load_clean(p).iloc[:cap]
+    texts = df["review"].fillna("").astype(str).tolist()
+    enc = ReviewEncoder(path, device="cpu", quantize=args.quantize)
+    enc.encode(texts[:64])  # 스레드/커널 준비
+    enc.stats = {k: 0 for k in enc.stats}
+    with Timed() as tm:
+        V = enc.encode(texts)
+        items, _ = aggregate_items(V, df["item_id"].to_numpy(), weights=df["rating"].to_numpy())
+    s = enc.stats
+    return tm, len(texts), "리뷰", {"items": len(items), "tokens": int(s["tokens"]),
+                                   "pad_ratio": round(1 - s["tokens"] / max(1, s["padded"]), 4)}
+
+def stage_svd(p, cap, args):
+    try:
+        from surprise import Dataset, Reader, SVD
+    except ImportError:
+        raise StageSkipped("scikit-surprise 없음")
+    from pipeline.cf_score import SVDScorer
+    df = load_clean(p).iloc[:cap]
+    df["rating_aug"] = df["rating"].astype(float).clip(0.5, 5.0)
+    data = Dataset.load_from_df(df[["user_id", "item_id", "rating_aug"]], Reader(rating_scale=(0.5, 5.0)))
+    with Timed() as tm:
+        svd_model = SVD(n_factors=64, n_epochs=20, random_state=42)
+        svd_model.fit(data.build_full_trainset())
+    SVDScorer.from_surprise(svd_model).save(p["svd"])
+    ts = svd_model.trainset
+    return tm, len(df), "평점", {"users": ts.n_users, "items": ts.n_items}
+
+def stage_recommend(p, cap, args):
+    import numpy as np
+    from pipeline.batch_recommend import BatchRecommender
+    from pipeline.cf_score import SVDScorer
+    from pipeline.skin_index import SkinIndex
+    df = load_clean(p)
+    items = sorted(df["item_id"].unique())
+    users = df["user_id"].unique().tolist()
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(len(items), 768)).astype(np.float32)
+    X /= np.linalg.norm(X, axis=1, keepdims=True)
+    if os.path.exists(p["svd"]):
+        cf = SVDScorer.load(p["svd"])
+    else:  # svd 단계를 안 돌렸으면 같은 크기의 무작위 요인
+        cf = SVDScorer(rng.normal(0, .1, (len(users), 64)), rng.normal(0, .1, (len(items), 64)),
+                       rng.normal(0, .3, len(users)), rng.normal(0, .3, len(items)), 4.2, users, items)
+    t = time.perf_counter()
+    skin_idx = SkinIndex.build(df, items=items)
+    skin_sec = time.perf_counter() - t
+    targets = users[:cap]
+    with BatchRecommender.from_frame(df, items, X, cf, skin_idx, workers=args.workers) as rec:
+        with Timed() as tm:
+            rec.run(p["recs"], users=targets, k=10)
+        lat = []
+        for u in rng.choice(users, min(200, len(users)), replace=False).tolist():
+            t = time.perf_counter()
+            rec.recommend(u, 10)
+            lat.append(time.perf_counter() - t)
+    return tm, len(targets), "사용자", {"items": len(items), "skin_index_sec": round(skin_sec, 3),
+                                      "single_p50_ms": round(float(np.percentile(lat, 50)) * 1e3, 3)}
+
+STAGE_FNS = {name: globals()[f"stage_{name}"] for name in STAGES}
+
+def run_child(args):
+    """--child: 단계 1개 실행 → 결과 JSON 을 --result 파일에."""
+    n = parse_scale(args.scale)
+    p = paths_for(args.work, n, args.seed)
+    cap = args.cap_value
+    try:
+        tm, rows, unit, extra = STAGE_FNS[args.child](p, cap, args)
+        out = {"stage": args.child, "scale": scale_name(n), "rows": rows, "unit": unit, "cap": cap,
+               "sec": round(tm.sec, 4), "rate": round(rows / tm.sec, 1) if tm.sec else None,
+               "rss_input_mb": round(tm.rss_in, 1), "peak_rss_mb": round(peak_rss_mb(), 1), "extra": extra}
+    except StageSkipped as e:
+        out = {"stage": args.child, "scale": scale_name(n), "skipped": str(e)}
+    with open(args.result, "w", encoding="utf-8") as f:
+        json.dump(out, f, ensure_ascii=False)
+
+# =========================
+# 3) 이력 / 비교
+# =========================
+def git_rev():
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True).stdout.strip()
+        return rev + ("-dirty" if dirty else "")
+    except OSError:
+        return ""
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def save_history(path, history):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(history, f, ensure_ascii=False, indent=1)
+    os.replace(path + ".tmp", path)
+
+def previous_result(history, run, res):
+    """같은 호스트/CPU 수의 이전 실행 중 가장 최근의 같은 (단계, 규모, 처리 행) 결과."""
+    for old in reversed(history):
+        if (old["host"], old["cpus"]) != (run["host"], run["cpus"]):
+            continue
+        for r in old["results"]:
+            if "skipped" not in r and (r["stage"], r["scale"], r["rows"]) == (res["stage"], res["scale"], res["rows"]):
+                return old, r
+    return None, None
+
+def compare(history, run, tol):
+    """결과마다 비교 문구 + 회귀 목록."""
+    notes, regressions = {}, []
+    for r in run["results"]:
+        if "skipped" in r:
+            continue
+        old, prev = previous_result(history, run, r)
+        if prev is None:
+            notes[(r["stage"], r["scale"])] = "(첫 기록)"
+            continue
+        dt = r["sec"] / prev["sec"] - 1 if prev["sec"] else 0.0
+        dm = r["peak_rss_mb"] / prev["peak_rss_mb"] - 1 if prev["peak_rss_mb"] else 0.0
+        flag = []
+        if dt > tol:
+            flag.append(f"⚠️ 시간 +{dt:.0%}")
+        if dm > tol:
+            flag.append(f"⚠️ 메모리 +{dm:.0%}")
+        if flag:
+            regressions.append((r["stage"], r["scale"], old["git"], flag))
+        notes[(r["stage"], r["scale"])] = " ".join(flag) or f"시간 {dt:+.0%} / 메모리 {dm:+.0%} (vs {old['git']})"
+    return notes, regressions
+
+# =========================
+# 4) 실행
+# =========================
+def parse_caps(specs):
+    caps = dict(DEFAULT_CAPS)
+    for spec in specs or []:
+        stage, _, val = spec.partition("=")
+        caps[stage] = parse_scale(val) if val and val.lower() != "none" else None
+    return caps
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--scales", default="10k,100k,1m")
+    ap.add_argument("--stages", default=",".join(STAGES))
+    ap.add_argument("--cap", action="append", help="단계별 처리 행 상한 (예: embed=5k, tokenize=none)")
+    ap.add_argument("--workers", type=int, default=1)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--work", default="/tmp/bench_suite")
+    ap.add_argument("--history", default=os.path.join(ROOT, "bench", "results", "suite_history.json"))
+    ap.add_argument("--tol", type=float, default=0.2)
+    ap.add_argument("--fail-on-regression", action="store_true")
+    ap.add_argument("--note", default="", help="이력에 같이 남길 메모")
+    ap.add_argument("--clean-chunksize", type=int, default=0)
+    ap.add_argument("--bert-layers", type=int, default=2)
+    ap.add_argument("--bert-hidden", type=int, default=128)
+    ap.add_argument("--quantize", action="store_true", help="embed 단계 int8 동적 양자화")
+    # 내부용 (단계 1개를 자식 프로세스로)
+    ap.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    ap.add_argument("--scale", default=None, help=argparse.SUPPRESS)
+    ap.add_argument("--cap-value", type=int, default=None, help=argparse.SUPPRESS)
+    ap.add_argument("--result", default=None, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        return run_child(args)
+
+    from bench.synth_data import write_reviews_csv, scale_shape, load_vocab
+    scales = [parse_scale(s) for s in args.scales.split(",")]
+    stages = [s for s in args.stages.split(",") if s]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        ap.error(f"알 수 없는 단계: {sorted(unknown)} (가능: {STAGES})")
+    caps = parse_caps(args.cap)
+    vocab_src = load_vocab()[2]
+    run = {"time": time.strftime("%Y-%m-%d %H:%M:%S"), "git": git_rev(), "host": socket.gethostname(),
+           "cpus": os.cpu_count(), "python": platform.python_version(), "workers": args.workers,
+           "seed": args.seed, "vocab": vocab_src, "note": args.note, "results": []}
+    print(f"▶ 규모 {[scale_name(n) for n in scales]} / 단계 {stages} / workers {args.workers} / "
+          f"CPU {run['cpus']}개 / 감성 단어 {vocab_src} / 커밋 {run['git']}")
+
+    forward = ["--workers", str(args.workers), "--seed", str(args.seed), "--work", args.work,
+               "--clean-chunksize", str(args.clean_chunksize), "--bert-layers", str(args.bert_layers),
+               "--bert-hidden", str(args.bert_hidden)] + (["--quantize"] if args.quantize else [])
+    for n in scales:
+        p = paths_for(args.work, n, args.seed)
+        os.makedirs(p["dir"], exist_ok=True)
+        if not os.path.exists(p["csv"]):
+            t = time.perf_counter()
+            n_users, n_items = scale_shape(n)
+            write_reviews_csv(p["csv"], n, n_users, n_items, seed=args.seed)
+            print(f"  합성 리뷰 {n:,}행 (사용자 {n_users:,} / 상품 {n_items:,}) 생성 {time.perf_counter() - t:.1f}s")
+        for stage in stages:
+            cap = caps.get(stage)
+            result = os.path.join(p["dir"], f"{stage}.result.json")
+            cmd = [sys.executable, os.path.abspath(__file__), "--child", stage, "--scale", str(n),
+                   "--result", result] + forward + (["--cap-value", str(cap)] if cap else [])
+            print(f"  ⏳ {scale_name(n)} {stage}", flush=True)
+            proc = subprocess.run(cmd, cwd=ROOT, stdout=subprocess.DEVNULL)
+            if proc.returncode != 0 or not os.path.exists(result):
+                res = {"stage": stage, "scale": scale_name(n), "skipped": f"실패 (종료 코드 {proc.returncode})"}
+            else:
+                with open(result, encoding="utf-8") as f:
+                    res = json.load(f)
+                os.remove(result)
+            run["results"].append(res)
+
+    history = load_history(args.history)
+    notes, regressions = compare(history, run, args.tol)
+    history.append(run)
+    save_history(args.history, history)
+
+    print(f"\n{'단계':<11}{'규모':>6}{'처리':>14}{'시간 s':>9}{'처리량/s':>12}{'입력 RSS':>10}{'최대 RSS':>10}  이전 대비")
+    for r in run["results"]:
+        if "skipped" in r:
+            print(f"{r['stage']:<11}{r['scale']:>6}  건너뜀: {r['skipped']}")
+            continue
+        print(f"{r['stage']:<11}{r['scale']:>6}{r['rows']:>11,} {r['unit']:<3}{r['sec']:>9.2f}{r['rate']:>12,.0f}"
+              f"{r['rss_input_mb']:>9.0f}M{r['peak_rss_mb']:>9.0f}M  {notes.get((r['stage'], r['scale']), '')}")
+        if r["extra"]:
+            print(f"{'':<17}{json.dumps(r['extra'], ensure_ascii=False)}")
+    print(f"이력 {args.history} ({len(history)}회)")
+    if regressions:
+        print(f"⚠️ 회귀 {len(regressions)}건 (허용 {args.tol:.0%}): " +
+              ", ".join(f"{s}@{sc} {' '.join(f)}" for s, sc, _, f in regressions))
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+토큰 매칭 벤치마크: 기존 n-gram 사전 최장일치 / compound_words vs 토큰 trie (pipeline/token_match.py)
+- 합성 리뷰 토큰 N개(기본 100,000, 길이 3~200)와 합성 감성사전(1~MAX_N-gram)으로
+    · 감성 채점   : score_by_lexicon(기존)  vs  LexiconScorer.score    — MAX_N 3/5/8
+    · 단어 합성   : compound_words + 불용어(기존)  vs  CompoundMerger  — 긴 리뷰에서 O(n²) 차이
+- 모든 경우 결과가 기존 함수와 같은지 확인
+
+실행: python bench/bench_token_match.py [--rows 100000] [--max-n 3,5,8]
+"""
+
+import os, sys, time, random, argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline import token_match as tm
+from bench.bench_review_store import SYLLABLES
+
+SYN_MAP = {"흡수해요": "흡수", "스며들어": "흡수", "스며듦": "흡수", "따갑": "자극", "촉촉": "보습", "건조함": "건조"}
+NEGATIONS = {"안", "못", "별로", "그다지", "전혀", "아니", "않"}
+INT_POS = {"매우", "진짜", "정말", "완전", "엄청", "굉장히"}
+INT_NEG = {"약간", "조금", "그냥"}
+PATTERNS_3 = {("아", "벤", "느"): "아벤느", ("리얼", "베리", "어"): "리얼베리어", ("수분", "부족", "지성"): "수부지",
+              ("피부", "진정", "효과"): "진정", ("민", "감성", "피부"): "민감성"}
+PATTERNS_2 = {("수분", "크림"): "수분크림", ("수분", "감"): "수분감", ("진정", "효과"): "진정효과",
+              ("속", "건조"): "속건조", ("좁쌀", "여드름"): "좁쌀여드름"}
+
+
+def synth(n_rows, max_n, seed=0):
+    rng = random.Random(seed)
+    vocab = ["".join(rng.choices(SYLLABLES, k=rng.randint(1, 3))) for _ in range(3000)]
+    vocab += list(SYN_MAP) + list(NEGATIONS) + list(INT_POS) + list(INT_NEG)
+    vocab += [t for g in list(PATTERNS_3) + list(PATTERNS_2) for t in g]
+    lexicon = {}
+    for _ in range(20_000):
+        n = min(max_n, 1 + int(rng.expovariate(0.8)))
+        lexicon[tuple(rng.choices(vocab[:800], k=n))] = rng.choice([1.0, -1.0])
+    docs = [rng.choices(vocab, k=rng.choice([rng.randint(3, 40), rng.randint(40, 200)])) for _ in range(n_rows)]
+    return lexicon, docs
+
+
+def timed(fn):
+    t = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t, out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=100_000)
+    ap.add_argument("--max-n", default="3,5,8")
+    args = ap.parse_args()
+
+    print(f"{'감성 채점':<14}{'기존 s':>9}{'trie s':>9}{'배속':>8}  동일")
+    for max_n in [int(x) for x in args.max_n.split(",")]:
+        lexicon, docs = synth(args.rows, max_n)
+        ng_idx = tm.build_ngram_index_legacy(lexicon, max_n)
+        t_old, want = timed(lambda: [tm.score_by_lexicon_legacy(d, ng_idx, max_n, SYN_MAP, NEGATIONS, INT_POS, INT_NEG)
+                                     for d in docs])
+        t_build, scorer = timed(lambda: tm.LexiconScorer(lexicon, max_n=max_n, syn_map=SYN_MAP, negations=NEGATIONS,
+                                                         int_pos=INT_POS, int_neg=INT_NEG))
+        t_new, got = timed(lambda: scorer.score_many(docs))
+        same_m = all(scorer.trie.matches(d) == tm.greedy_longest_match_legacy(d, ng_idx, max_n) for d in docs[:2000])
+        print(f"{'MAX_N=' + str(max_n):<14}{t_old:>9.2f}{t_new:>9.2f}{t_old / max(t_new, 1e-9):>7.1f}x  "
+              f"{want == got} (매칭 {same_m}, 컴파일 {t_build:.2f}s)")
+
+    _, docs = synth(args.rows, 3)
+    sw = {"아벤느", "리얼베리어"} | set(docs[0][:50])
+    merger = tm.CompoundMerger([PATTERNS_3, PATTERNS_2], stopwords=sw)
+    print(f"\n{'단어 합성':<14}{'기존 s':>9}{'trie s':>9}{'배속':>8}  동일")
+    for name, sub in (("전체", docs), ("긴 리뷰 x20", [d * 20 for d in docs[:2000]])):
+        t_old, want = timed(lambda: [[t for t in tm.compound_words_legacy(list(d), PATTERNS_3, PATTERNS_2)
+                                      if t not in sw and len(t) > 1] for d in sub])
+        t_new, got = timed(lambda: [merger(d) for d in sub])
+        print(f"{name:<14}{t_old:>9.2f}{t_new:>9.2f}{t_old / max(t_new, 1e-9):>7.1f}x  {want == got}")
+
+
+if __name__ == "__main__":
+    main()
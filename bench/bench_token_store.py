@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+토큰 저장 형식 벤치마크: CSV 리스트 문자열 + literal_eval vs 토큰 저장소(공유 어휘 + CSR int32, memmap)
+- 합성 토큰 N행(기본 1,000,000): tokens=[(형태소, 품사), ...], Ntoken_review=[명사, ...]
+- 비교 항목
+    · 로드      : pd.read_csv + 행마다 literal_eval  vs  TokenCorpus.open (memmap, 행 객체 생성 없음)
+    · 추천 text : join_tokens(literal_eval) 전체     vs  Ntoken_review.iter_joined()
+    · 감성 sen  : _to_token_list 전체                 vs  tokens.iter_words()
+- 결과가 literal_eval 결과와 같은지 확인, 디스크 크기 출력
+
+실행: python bench/bench_token_store.py [--rows 1000000] [--out /tmp/token_store_bench]
+"""
+
+import os, sys, time, random, shutil, argparse
+from ast import literal_eval
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline.token_store import TokenCorpus, save_token_columns
+from bench.bench_review_store import SYLLABLES
+
+import pandas as pd
+
+TAGS = ["NNG", "NNG", "NNG", "NNP", "VV", "VA", "XSV", "EP", "EC", "JKS", "JX", "MAG", "SN", "NA"]
+
+
+def synth_tokens(n_rows, seed=0):
+    rng = random.Random(seed)
+    words = ["".join(rng.choices(SYLLABLES, k=rng.randint(1, 3))) for _ in range(30_000)]
+    tokens, nouns = [], []
+    for _ in range(n_rows):
+        toks = [(rng.choice(words), rng.choice(TAGS)) for _ in range(rng.randint(3, 30))]
+        tokens.append(toks)
+        nouns.append([w for w, t in toks if t in ("NNG", "NNP") and len(w) > 1])
+    return pd.DataFrame({"tokens": tokens, "Ntoken_review": nouns})
+
+
+def timed(fn):
+    t = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t, out
+
+
+def dir_size(path):
+    return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--out", default="/tmp/token_store_bench")
+    args = ap.parse_args()
+
+    shutil.rmtree(args.out, ignore_errors=True)
+    os.makedirs(args.out)
+    csv_path = os.path.join(args.out, "Ntoken_review.csv")
+    store_dir = os.path.join(args.out, "Ntoken_review_tokens")
+
+    t = time.perf_counter()
+    df = synth_tokens(args.rows)
+    print(f"▶ 합성 토큰 {len(df):,}행 ({time.perf_counter() - t:.1f}s)")
+    df.to_csv(csv_path, index=False, encoding="utf-8-sig")
+    t = time.perf_counter()
+    save_token_columns(df, store_dir)
+    print(f"  저장소 쓰기 {time.perf_counter() - t:.1f}s / 크기: CSV {os.path.getsize(csv_path) / 1e6:.0f}MB, "
+          f"저장소 {dir_size(store_dir) / 1e6:.0f}MB")
+    del df
+
+    def load_csv():
+        raw = pd.read_csv(csv_path, encoding="utf-8-sig")
+        return [literal_eval(x) for x in raw["tokens"]], [literal_eval(x) for x in raw["Ntoken_review"]]
+
+    t_csv, (want_tok, want_n) = timed(load_csv)
+    t_open, corpus = timed(lambda: TokenCorpus.open(store_dir))
+    print(f"{'로드':<12} literal_eval {t_csv:7.2f}s  저장소 {t_open:7.3f}s  "
+          f"{t_csv / max(t_open, 1e-9):6.0f}x")
+
+    t_a, a = timed(lambda: [" ".join(map(str, x)) for x in want_n])
+    t_b, b = timed(lambda: list(corpus["Ntoken_review"].iter_joined()))
+    print(f"{'추천 text':<12} 리스트→join  {t_a:7.2f}s  저장소 {t_b:7.3f}s  "
+          f"(literal_eval 포함 기준 {(t_csv + t_a) / max(t_open + t_b, 1e-9):.1f}x)  동일 {a == b}")
+
+    t_a, a = timed(lambda: [[w for w, _ in x] for x in want_tok])
+    t_b, b = timed(lambda: list(corpus["tokens"].iter_words()))
+    print(f"{'감성 sen':<12} 리스트→단어  {t_a:7.2f}s  저장소 {t_b:7.3f}s  "
+          f"(literal_eval 포함 기준 {(t_csv + t_a) / max(t_open + t_b, 1e-9):.1f}x)  동일 {a == b}")
+
+    same = all(corpus["tokens"].pairs(i) == want_tok[i] for i in range(0, len(want_tok), 997))
+    print(f"{'(형태소, 품사)':<12} 표본 동일 {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+형태소 분석 처리량 벤치마크: 기존 komoran.pos 1코어 vs TokenizeService(워커 1/4/16) vs 캐시 적중
+- 입력: --csv 의 리뷰 컬럼(기본 review) 또는 합성 리뷰
+- 워커 수별로 캐시 없이(콜드) 처리량(리뷰/초)을 재고, 마지막으로 디스크 캐시를 채운 뒤 다시 읽는 시간을 잰다
+- 모든 경우 결과가 기존 komoran.pos 결과와 같은지 확인
+- 워커 기동(JVM 시작) 시간은 처리량과 따로 출력
+
+실행: python bench/bench_tokenize.py [--csv Ntoken_review.csv] [--rows 5000] [--workers 1,4,16]
+"""
+
+import os, sys, time, random, tempfile, argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline.tokenize_service import TokenizeService, _make_komoran
+from pipeline.clean import extract_hangul
+from bench.bench_review_store import synth_rows
+
+
+def load_texts(args):
+    if args.csv:
+        import pandas as pd
+        col = pd.read_csv(args.csv, encoding="utf-8-sig", usecols=[args.col])[args.col]
+        texts = [extract_hangul(t) for t in col.tolist()]
+    else:
+        texts = [extract_hangul(r["review"]) for r in synth_rows(random.Random(0), args.rows)]
+    return [t for t in texts if t][: args.rows]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--csv", default=None)
+    ap.add_argument("--col", default="review")
+    ap.add_argument("--rows", type=int, default=5000)
+    ap.add_argument("--workers", default="1,4,16")
+    args = ap.parse_args()
+
+    texts = load_texts(args)
+    print(f"▶ 리뷰 {len(texts):,}건 (고유 {len(set(texts)):,})")
+
+    komoran = _make_komoran(None)
+    t = time.perf_counter()
+    want = [komoran.pos(x) for x in texts]
+    base = time.perf_counter() - t
+    print(f"{'기존 komoran.pos':<22}{base:8.2f}s  {len(texts) / base:8.0f}건/s")
+
+    for w in [int(x) for x in args.workers.split(",")]:
+        with TokenizeService(None, workers=w) as tok:
+            t = time.perf_counter()
+            tok.warm_up()  # 워커 전부 JVM 기동 (1개만 띄우면 나머지 기동 시간이 처리량에 섞임)
+            warm = time.perf_counter() - t
+            t = time.perf_counter()
+            got = tok.pos_many(texts)
+            sec = time.perf_counter() - t
+        same = [list(map(tuple, p)) for p in want] == got
+        print(f"{'워커 ' + str(w):<22}{sec:8.2f}s  {len(texts) / sec:8.0f}건/s  ({base / sec:4.1f}x, 기동 {warm:.1f}s)  동일 {same}")
+
+    with tempfile.TemporaryDirectory() as d:
+        cache = os.path.join(d, "pos.sqlite")
+        with TokenizeService(cache, workers=1) as tok:
+            tok.pos_many(texts)
+        with TokenizeService(cache, workers=1) as tok:
+            t = time.perf_counter()
+            got = tok.pos_many(texts)
+            sec = time.perf_counter() - t
+            hits = tok.stats["cache_hits"]
+        print(f"{'캐시 적중(재실행)':<22}{sec:8.2f}s  {len(texts) / sec:8.0f}건/s  ({base / sec:4.1f}x, 적중 {hits})  "
+              f"동일 {[list(map(tuple, p)) for p in want] == got}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+리뷰 목록 AJAX 재생 서버 (HTTP 엔진 로컬 테스트용, 표준 라이브러리만)
+- ReviewHttpEngine(record_dir=...) 로 저장한 {goodsNo}_{F|M}_{pageIdx}.html 을 같은 경로로 돌려준다
+- 저장본이 없는 페이지는 빈 200 응답(= 목록 끝)
+- --alias GOODSNO: 어떤 goodsNo 요청이든 지정 상품의 저장본으로 응답 (상품 수를 늘린 부하 테스트용)
+
+실행: python bench/replay_server.py --port 8765 [--dir bench/fixtures/recorded] [--alias A000000001]
+"""
+
+import os, time, argparse, threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+RECORDED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "recorded")
+REVIEW_LIST_PATH = "/store/goods/getGdasList.do"
+
+
+def make_handler(record_dir, alias=None, delay=0.0):
+    class ReplayHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            if parts.path != REVIEW_LIST_PATH:
+                self.send_error(404)
+                return
+            q = {k: v[0] for k, v in parse_qs(parts.query, keep_blank_values=True).items()}
+            goods_no = alias or q.get("goodsNo", "")
+            name = f"{goods_no}_{q.get('sati_type5', '')}_{q.get('pageIdx', '1')}.html"
+            path = os.path.join(record_dir, os.path.basename(name))
+            body = b""
+            if os.path.exists(path):
+                with open(path, "rb") as fr:
+                    body = fr.read()
+            if delay:
+                time.sleep(delay)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return ReplayHandler
+
+
+def start_replay_server(port=0, record_dir=RECORDED_DIR, alias=None, delay=0.0):
+    """백그라운드 스레드로 서버 시작. 반환: (server, base_url)."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(record_dir, alias, delay))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--dir", default=RECORDED_DIR)
+    ap.add_argument("--alias", default=None)
+    ap.add_argument("--delay", type=float, default=0.0, help="응답 지연(초) — 실제 사이트 RTT 흉내")
+    args = ap.parse_args()
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(args.dir, args.alias, args.delay))
+    print(f"▶ replay server: http://127.0.0.1:{args.port}{REVIEW_LIST_PATH} (dir={args.dir})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
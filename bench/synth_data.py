@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+합성 리뷰 데이터 생성기 (시드 고정) — 크롤러 CSV(init_reviews_csv 의 REVIEW_FIELDS) 와 같은 스키마
+- 사용자/상품 인기도는 Zipf 분포 (순위 r 의 확률 ∝ 1 / r^a) → 소수 사용자/상품에 리뷰가 몰림
+- 사용자마다 피부 프로필 고정: SKIN_TYPE_SET / SKIN_TONE_SET / SKIN_CONCERN_SET 에서 (일부는 빈칸, 실제 크롤링처럼)
+- 평점 = 4.2 + 상품 품질 + 사용자 성향 + 잡음 → 1~5 (실제 데이터처럼 4~5점 위주)
+- 리뷰 문장: 화장품 일반 단어 + 감성 단어 (평점 ≤ 3 이면 부정 단어 위주, 아니면 긍정 단어 위주, 20% 는 반대)
+    · 감성 단어는 감성분석/combined_pos_words.txt, combined_neg_words.txt (한 줄에 한 단어)
+    · 파일이 없거나 텍스트가 아니면 (저장소의 두 파일은 macOS 별칭) 내장 단어 목록으로
+- 날짜 "YYYY.MM.DD", rating_text "5점만점에 N점" (크롤러 출력 그대로)
+
+사용 예)
+    from bench.synth_data import write_reviews_csv, scale_shape
+    n_users, n_items = scale_shape(1_000_000)          # 100,000 / 10,000
+    write_reviews_csv("/tmp/reviews_1m.csv", 1_000_000, n_users, n_items, seed=0)
+    df = load_and_clean("/tmp/reviews_1m.csv")
+"""
+
+import os, sys, csv, unicodedata
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline.oy_reviews import REVIEW_FIELDS, SKIN_TYPE_SET, SKIN_TONE_SET, SKIN_CONCERN_SET
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+POS_FALLBACK = [
+    "촉촉", "순해요", "좋아요", "진정", "흡수", "재구매", "추천", "보습", "만족", "산뜻", "부드러워요", "편안",
+    "가벼워요", "효과", "진정돼요", "좋네요", "최고", "향좋아요", "쫀쫀", "개선", "맑아졌어요", "윤기", "탄탄",
+    "매끈", "무난", "저자극", "괜찮아요", "들어갔어요", "깔끔", "사랑",
+]
+NEG_FALLBACK = [
+    "따가워요", "건조", "트러블", "별로", "끈적", "자극", "뒤집어", "실망", "냄새", "환불", "가려워요", "올라왔어요",
+    "무거워요", "답답", "번들", "속당김", "밀려요", "아쉬워요", "비싸요", "화끈", "붉어졌어요", "각질", "뾰루지",
+    "좁쌀", "애매", "효과없", "후회", "기름져요", "따끔", "안맞아요",
+]
+COMMON = [
+    "크림", "제형", "피부", "아침", "저녁", "세안", "후에", "바르고", "사용", "한달", "정도", "계속", "느낌", "용량",
+    "가격", "배송", "포장", "토너", "앰플", "세럼", "수분", "여드름", "패드", "같아요", "그리고", "진짜", "조금", "많이",
+    "얼굴", "이마", "볼", "턱", "흡수력", "발림성", "마무리", "향", "색", "두번째", "구매", "올리브영", "세일", "할인",
+    "기초", "단계", "마지막", "듬뿍", "얇게", "여러번", "덧발라", "자기전", "메이크업", "전에", "겨울", "여름",
+]
+CATEGORIES = ["수분크림", "진정크림", "여드름 크림", "장벽크림", "재생크림", "앰플", "토너", "세럼", "로션", "젤크림"]
+
+
+# =========================
+# 1) 단어 목록
+# =========================
+def _find_words_dir():
+    """'감성분석' 폴더 (macOS 에서 복사된 저장소는 폴더 이름이 NFD 라 정규화해서 비교)."""
+    for name in os.listdir(ROOT):
+        if unicodedata.normalize("NFC", name) == "감성분석":
+            return os.path.join(ROOT, name)
+    return None
+
+def load_words(path, fallback):
+    """한 줄에 한 단어인 txt → 목록. 없음 / 텍스트가 아님 / 비어 있음 → fallback."""
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+        words = [w.strip() for w in raw.decode("utf-8-sig").splitlines()]
+    except (OSError, UnicodeDecodeError):
+        return list(fallback)
+    words = [w for w in words if w and "\x00" not in w]
+    return words or list(fallback)
+
+def load_vocab(words_dir=None):
+    """(긍정 단어, 부정 단어, 출처). 출처: 'file' 또는 'builtin'."""
+    words_dir = words_dir or _find_words_dir()
+    if not words_dir:
+        return list(POS_FALLBACK), list(NEG_FALLBACK), "builtin"
+    pos = load_words(os.path.join(words_dir, "combined_pos_words.txt"), POS_FALLBACK)
+    neg = load_words(os.path.join(words_dir, "combined_neg_words.txt"), NEG_FALLBACK)
+    return pos, neg, "builtin" if pos == POS_FALLBACK and neg == NEG_FALLBACK else "file"
+
+# =========================
+# 2) 생성
+# =========================
+def scale_shape(n_rows):
+    """리뷰 수 → (사용자 수, 상품 수) 기본값: 1M 리뷰 → 100k 사용자 / 10k 상품 (사용자당 ~10, 상품당 ~100)."""
+    return max(10, n_rows // 10), min(10_000, max(20, n_rows // 100))
+
+def zipf_probs(n, a):
+    p = 1.0 / np.arange(1, n + 1) ** a
+    return p / p.sum()
+
+def generate_reviews(n_rows, n_users, n_items, seed=0, zipf_users=1.05, zipf_items=1.1, words_dir=None,
+                     chunk=100_000):
+    """REVIEW_FIELDS dict 를 n_rows 개 yield (상품 순서로 묶지 않음, 같은 seed → 같은 결과)."""
+    rng = np.random.default_rng(seed)
+    pos, neg, _ = load_vocab(words_dir)
+    types, tones, concerns = sorted(SKIN_TYPE_SET), sorted(SKIN_TONE_SET), sorted(SKIN_CONCERN_SET)
+
+    # 사용자: 피부 프로필 / 성별 / 평점 성향
+    u_type = np.where(rng.random(n_users) < 0.1, -1, rng.integers(0, len(types), n_users))
+    u_tone = np.where(rng.random(n_users) < 0.3, -1, rng.integers(0, len(tones), n_users))
+    u_conc = [" / ".join(concerns[j] for j in sorted(rng.choice(len(concerns), k, replace=False)))
+              for k in rng.integers(0, 4, n_users)]
+    u_gender = np.where(rng.random(n_users) < 0.8, "여성", "남성")
+    u_bias = rng.normal(0, 0.4, n_users)
+    u_name = [f"user{u:07d}" for u in range(n_users)]
+    # 상품: 이름 / 브랜드 / 링크 / 품질
+    i_brand = [f"브랜드{i % max(1, n_items // 20):03d}" for i in range(n_items)]
+    i_name = [f"{i_brand[i]} {CATEGORIES[i % len(CATEGORIES)]} {i:05d}" for i in range(n_items)]
+    i_link = [f"https://www.oliveyoung.co.kr/store/goods/getGoodsDetail.do?goodsNo=A{i:012d}" for i in range(n_items)]
+    i_qual = rng.normal(0, 0.5, n_items)
+
+    p_user, p_item = zipf_probs(n_users, zipf_users), zipf_probs(n_items, zipf_items)
+    days = np.datetime64("2021-01-01") + np.arange(5 * 365)
+    for c0 in range(0, n_rows, chunk):
+        m = min(chunk, n_rows - c0)
+        u = rng.choice(n_users, m, p=p_user)
+        i = rng.choice(n_items, m, p=p_item)
+        rating = np.clip(np.rint(4.2 + i_qual[i] + u_bias[u] + rng.normal(0, 0.9, m)), 1, 5).astype(int)
+        flip = rng.random(m) < 0.2
+        use_neg = (rating <= 3) ^ flip
+        n_common = rng.integers(4, 30, m)
+        n_senti = rng.integers(1, 4, m)
+        common_idx = rng.integers(0, len(COMMON), n_common.sum())
+        pos_idx = rng.integers(0, len(pos), n_senti.sum())
+        neg_idx = rng.integers(0, len(neg), n_senti.sum())
+        date = days[rng.integers(0, len(days), m)].astype(str)
+        cc, sc = 0, 0
+        for r in range(m):
+            words = [COMMON[j] for j in common_idx[cc:cc + n_common[r]]]
+            src, idx = (neg, neg_idx) if use_neg[r] else (pos, pos_idx)
+            for j, s in enumerate(idx[sc:sc + n_senti[r]]):
+                words.insert((j * 7 + r) % (len(words) + 1), src[s])
+            cc += n_common[r]
+            sc += n_senti[r]
+            uu, ii = u[r], i[r]
+            yield {
+                "product_name": i_name[ii], "product_brand": i_brand[ii], "product_link": i_link[ii],
+                "customer_name": u_name[uu],
+                "skin_type": types[u_type[uu]] if u_type[uu] >= 0 else "",
+                "skin_tone": tones[u_tone[uu]] if u_tone[uu] >= 0 else "",
+                "skin_concerns": u_conc[uu],
+                "review": " ".join(words),
+                "date": date[r].replace("-", "."),
+                "rating_text": f"5점만점에 {rating[r]}점",
+                "rating": float(rating[r]),
+                "gender": u_gender[uu],
+            }
+
+def write_reviews_csv(path, n_rows, n_users=None, n_items=None, seed=0, **kw):
+    """init_reviews_csv 와 같은 헤더(utf-8-sig)로 CSV 작성. 반환: 경로."""
+    du, di = scale_shape(n_rows)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.DictWriter(f, fieldnames=REVIEW_FIELDS)
+        writer.writeheader()
+        writer.writerows(generate_reviews(n_rows, n_users or du, n_items or di, seed=seed, **kw))
+    os.replace(tmp, path)
+    return path
@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+"""
+크롤링 → 전처리 → 감성분석 → 추천 노트북/스크립트가 함께 쓰는 공용 모듈.
+- 각 단계 폴더(한글 경로)에서는 레포 루트를 sys.path 에 추가한 뒤 `from pipeline... import` 로 사용
+"""
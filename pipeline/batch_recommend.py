@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""
+전체 사용자 일괄 추천 (야간 배치) — recommend_hybrid_skin_filtered 를 사용자 블록 단위 행렬 연산으로
+- 사용자 블록(block 명)마다
+    · 콘텐츠: 좋아한 리뷰(평점 4 이상) 평점 가중 행렬 W (희소, 행 합 = 1) @ X_item → 프로필 → 코사인 (B, 상품)
+      recommend_content_based 의 k=1000 처럼 사용자별 유사도 상위 content_topn 개만 점수가 있음
+    · CF: SVDScorer 점수 행렬 (B, 상품) (pipeline/cf_score.py)
+    · 후보: SkinIndex 후보 마스크 & ~본 상품 마스크 (pipeline/skin_index.py)
+    · normalize_scores 와 같은 사용자별 min-max (후보 안에서, 폭 < 1e-8 이면 0.5) → 가중합 → argpartition top-k
+- 블록은 spawn 프로세스 풀(workers)로 나눠 계산, 결과는 Parquet (user, rank, item, score) 로 블록 순서대로 이어 씀
+  (user/item 은 dictionary 인코딩, rank int16, score float32)
+- 점수가 같은 상품의 순서는 상품 인덱스 순 (기존은 set 순서라 정해져 있지 않음)
+
+사용 예)
+    rec = BatchRecommender.from_frame(df, item_text_df["item_id"], X_item_txt, cf_scorer, skin_idx, workers=4)
+    rec.run("recs.parquet", k=10)                # 전체 리뷰어
+    rec.report()
+    load_recommendations("recs.parquet", users=["user01"])
+"""
+
+import os, json, time
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from scipy import sparse
+
+# =========================
+# 1) 워커
+# =========================
+_worker_rec = None
+
+def _init_worker(rec):
+    global _worker_rec
+    _worker_rec = rec
+
+def _block_job(args):
+    users, k = args
+    return _worker_rec.recommend_block(users, k)
+
+def minmax_rows(S, valid):
+    """normalize_scores 를 행마다: valid 안에서 min-max, 폭 < 1e-8 이면 0.5, valid 밖은 0."""
+    lo = np.where(valid, S, np.inf).min(axis=1, keepdims=True)
+    hi = np.where(valid, S, -np.inf).max(axis=1, keepdims=True)
+    span = hi - lo
+    flat = span < 1e-8
+    out = np.where(flat, 0.5, (S - lo) / np.where(flat, 1.0, span))
+    return np.where(valid, out, 0.0)
+
+# =========================
+# 2) 일괄 추천
+# =========================
+class BatchRecommender:
+    def __init__(self, items, X_item, liked, users, cf_scorer=None, skin_idx=None, content_weight=0.5,
+                 skin_threshold=0.1, content_topn=1000, workers=4, block=512):
+        """
+        items: 상품 순서 (X_item 행, skin_idx.items 와 같아야 함), liked: (len(users), n_items) 희소 가중치 행렬
+        users: liked 의 행 순서 = 추천 대상 기본 목록
+        """
+        self.items = list(items)
+        if skin_idx is not None and skin_idx.items != [str(i) for i in self.items] and skin_idx.items != self.items:
+            raise ValueError("skin_idx 상품 순서가 items 와 다릅니다")
+        X = np.asarray(X_item, dtype=np.float64)
+        norm = np.linalg.norm(X, axis=1, keepdims=True)
+        self.X = X / np.where(norm == 0, 1.0, norm)                   # cosine_similarity 와 같은 정규화
+        self.liked = sparse.csr_matrix(liked)
+        self.users = list(users)
+        self.user_index = {u: i for i, u in enumerate(self.users)}
+        self.cf = cf_scorer
+        self.cf_items = cf_scorer.iidx(self.items) if cf_scorer is not None else None
+        self.skin = skin_idx
+        self.content_weight, self.skin_threshold = content_weight, skin_threshold
+        self.content_topn = content_topn
+        self.workers, self.block = max(1, int(workers)), block
+        self.stats = {"users": 0, "rows": 0, "sec": 0.0}
+        self._pool = None
+
+    @classmethod
+    def from_frame(cls, df, items, X_item, cf_scorer=None, skin_idx=None, min_rating=4.0, **kw):
+        """df(user_id, item_id, rating) 에서 get_user_text_profile 과 같은 가중치 행렬을 만듦. 대상 = 리뷰어 전체."""
+        items = list(items)
+        item_index = {it: i for i, it in enumerate(items)}
+        ucodes, users = pd.factorize(df["user_id"])
+        icode = df["item_id"].map(item_index).fillna(-1).to_numpy(dtype=np.int64)
+        rating = df["rating"].to_numpy(dtype=np.float64)
+        keep = (ucodes >= 0) & (icode >= 0) & (rating >= min_rating)
+        W = sparse.csr_matrix((rating[keep], (ucodes[keep], icode[keep])), shape=(len(users), len(items)))
+        W.sum_duplicates()
+        row_sum = np.asarray(W.sum(axis=1)).ravel()
+        W = sparse.diags(1.0 / (row_sum + 1e-8)) @ W
+        return cls(items, X_item, W, users.tolist(), cf_scorer=cf_scorer, skin_idx=skin_idx, **kw)
+
+    # ---- 블록 계산 ----
+    def recommend_block(self, users, k=10, content_weight=None, skin_threshold=None):
+        """사용자 목록 → (블록 내 사용자 위치, 순위(1~), 상품 인덱스, 점수) 배열 4개. 가중치/threshold 는 요청마다 바꿀 수 있음."""
+        B, n = len(users), len(self.items)
+        w = self.content_weight if content_weight is None else content_weight
+        thr = self.skin_threshold if skin_threshold is None else skin_threshold
+
+        rows = np.fromiter((self.user_index.get(u, -1) for u in users), dtype=np.int64, count=B)
+        P = np.zeros((B, self.X.shape[1]))
+        known = rows >= 0
+        if known.any():
+            P[known] = self.liked[rows[known]] @ self.X
+        pn = np.linalg.norm(P, axis=1, keepdims=True)
+        has_profile = pn[:, 0] > 0
+        P = P / np.where(pn == 0, 1.0, pn)
+        content = P @ self.X.T
+        content_valid = np.repeat(has_profile[:, None], n, axis=1)
+        if n > self.content_topn:  # recommend_content_based(k=1000): 상위 content_topn 개만
+            top = np.argpartition(-content, self.content_topn - 1, axis=1)[:, :self.content_topn]
+            in_top = np.zeros((B, n), dtype=bool)
+            np.put_along_axis(in_top, top, True, axis=1)
+            content_valid &= in_top
+
+        if self.skin is not None:
+            cand = self.skin.candidate_masks(users, thr) & ~self.skin.seen_masks(users)
+        else:
+            cand = np.ones((B, n), dtype=bool)
+
+        score = w * minmax_rows(content, content_valid & cand)
+        if self.cf is not None:
+            cf = self.cf._block(self.cf.uidx(list(users)), self.cf_items)
+            score += (1 - w) * minmax_rows(cf, cand)
+        score[~cand] = -np.inf
+
+        kk = min(k, n)
+        part = np.argpartition(-score, kk - 1, axis=1)[:, :kk]
+        val = np.take_along_axis(score, part, axis=1)
+        order = np.lexsort((part, -val), axis=1)                      # 점수 내림차순, 같으면 상품 인덱스 순
+        idx, val = np.take_along_axis(part, order, axis=1), np.take_along_axis(val, order, axis=1)
+        ok = np.isfinite(val)
+        upos = np.repeat(np.arange(B), kk).reshape(B, kk)
+        rank = np.tile(np.arange(1, kk + 1, dtype=np.int16), (B, 1))
+        return upos[ok], rank[ok], idx[ok], val[ok]
+
+    def recommend(self, user_id, k=10, content_weight=None, skin_threshold=None):
+        """사용자 1명 → [(상품, 점수), ...] 점수 내림차순 (recommend_hybrid_skin_filtered 와 같은 결과)."""
+        _, _, idx, val = self.recommend_block([user_id], k, content_weight, skin_threshold)
+        return [(self.items[i], float(v)) for i, v in zip(idx.tolist(), val.tolist())]
+
+    # ---- 저장 / 로드 ----
+    def save(self, path):
+        """디렉터리 1개: 상품 벡터 / 좋아요 가중치 / 사용자 / CF 요인 / 피부 인덱스 / 설정."""
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "X_item.npy"), self.X)
+        sparse.save_npz(os.path.join(path, "liked.npz"), self.liked)
+        np.save(os.path.join(path, "users.npy"), np.array([str(u) for u in self.users], dtype=str))
+        np.save(os.path.join(path, "items.npy"), np.array([str(i) for i in self.items], dtype=str))
+        if self.cf is not None:
+            self.cf.save(os.path.join(path, "cf.npz"))
+        if self.skin is not None:
+            self.skin.save(os.path.join(path, "skin_index.npz"))
+        with open(os.path.join(path, "config.json"), "w", encoding="utf-8") as f:
+            json.dump({"content_weight": self.content_weight, "skin_threshold": self.skin_threshold,
+                       "content_topn": self.content_topn, "block": self.block}, f)
+
+    @classmethod
+    def load(cls, path, workers=1):
+        from pipeline.cf_score import SVDScorer
+        from pipeline.skin_index import SkinIndex
+        with open(os.path.join(path, "config.json"), encoding="utf-8") as f:
+            cfg = json.load(f)
+        p = lambda name: os.path.join(path, name)
+        cf = SVDScorer.load(p("cf.npz")) if os.path.exists(p("cf.npz")) else None
+        skin = SkinIndex.load(p("skin_index.npz")) if os.path.exists(p("skin_index.npz")) else None
+        return cls(np.load(p("items.npy")).tolist(), np.load(p("X_item.npy")),
+                   sparse.load_npz(p("liked.npz")), np.load(p("users.npy")).tolist(), cf_scorer=cf, skin_idx=skin,
+                   workers=workers, **cfg)
+
+    # ---- 실행 ----
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=mp.get_context("spawn"),
+                                             initializer=_init_worker, initargs=(self,))
+        return self._pool
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["_pool"] = None
+        return state
+
+    def iter_blocks(self, users=None, k=10):
+        """블록마다 (사용자 목록, 결과 배열 4개) — 입력 순서대로."""
+        users = self.users if users is None else list(users)
+        jobs = [(users[b:b + self.block], k) for b in range(0, len(users), self.block)]
+        if self.workers == 1:
+            _init_worker(self)
+            results = map(_block_job, jobs)
+        else:
+            results = self._get_pool().map(_block_job, jobs)
+        for (block_users, _), res in zip(jobs, results):
+            yield block_users, res
+
+    def run(self, out_path, users=None, k=10):
+        """추천 결과를 Parquet (user, rank, item, score) 로 기록. 반환: 행 수."""
+        t0 = time.perf_counter()
+        item_dict = pa.array([str(i) for i in self.items], type=pa.string())
+        schema = pa.schema([("user", pa.dictionary(pa.int32(), pa.string())), ("rank", pa.int16()),
+                            ("item", pa.dictionary(pa.int32(), pa.string())), ("score", pa.float32())])
+        os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+        tmp = os.path.join(os.path.dirname(os.path.abspath(out_path)), "." + os.path.basename(out_path))
+        n_rows = n_users = 0
+        with pq.ParquetWriter(tmp, schema, compression="zstd") as writer:
+            for block_users, (upos, rank, idx, val) in self.iter_blocks(users, k):
+                user_dict = pa.array([str(u) for u in block_users], type=pa.string())
+                writer.write_table(pa.table({
+                    "user": pa.DictionaryArray.from_arrays(pa.array(upos.astype(np.int32)), user_dict),
+                    "rank": pa.array(rank),
+                    "item": pa.DictionaryArray.from_arrays(pa.array(idx.astype(np.int32)), item_dict),
+                    "score": pa.array(val.astype(np.float32)),
+                }, schema=schema))
+                n_rows += len(rank)
+                n_users += len(block_users)
+                self.stats["users"] += len(block_users)
+                print(f"  ↳ 추천 {n_users:,}명 ({n_users / (time.perf_counter() - t0):.0f}명/s)")
+        os.replace(tmp, out_path)
+        self.stats["rows"] += n_rows
+        self.stats["sec"] += time.perf_counter() - t0
+        return n_rows
+
+    def rate(self):
+        return self.stats["users"] / self.stats["sec"] if self.stats["sec"] else 0.0
+
+    def report(self):
+        print(f"📦 일괄 추천: {self.stats['users']:,}명 / {self.stats['sec']:.1f}s, {self.rate():.0f}명/s, "
+              f"{self.stats['rows']:,}행, 워커 {self.workers}")
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def load_recommendations(path, users=None):
+    """run() 결과 → DataFrame(user, rank, item, score). users 를 주면 그 사용자만 읽음."""
+    filters = [("user", "in", [str(u) for u in users])] if users is not None else None
+    df = pq.read_table(path, filters=filters).to_pandas()
+    for col in ("user", "item"):
+        df[col] = df[col].astype(str)
+    return df
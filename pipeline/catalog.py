@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+검색 계획(키워드 × 카테고리) 기반 상품 카탈로그 수집 + 전역 goodsNo 중복 제거
+- 크롤 계획 = (keyword, cateId2[, 카테고리 이름]) 목록 → 쿼리마다 검색 URL / 목록 페이지 수
+    · cateId2 가 None/"" 이면 카테고리 필터 없이 키워드 전체 검색
+- 상품 목록 페이지는 ReviewHttpEngine 세션 1개로 동시에 요청 (같은 세마포어 + 호스트별 적응형 속도 제한)
+    · 쿼리마다 1페이지를 먼저 받고, 꽉 찬 경우에만 나머지 페이지를 한꺼번에
+- CatalogTable: goodsNo(product_key) 기준 전역 중복 제거 → 상품 1행 + 그 상품이 나온 쿼리 목록(queries)
+    · 링크는 goodsNo 만 남긴 정규 링크로 (추적 파라미터가 달라도 같은 상품 → 리뷰는 상품당 1번만 크롤링)
+    · 행 순서는 응답 도착 순서와 무관하게 계획 순서 → 페이지 → 카드 순 (같은 응답이면 같은 표)
+- 쿼리 태그는 상품 단위로만 (상품 목록 CSV 의 queries). 리뷰 CSV/저장소는 기존 컬럼 그대로
+    · 리뷰별로 필요하면 product_link 의 goodsNo 로 상품 목록 CSV 와 조인
+
+사용 예)
+    plan = make_plan([("여드름", "100000100010015", "크림"), ("진정", "100000100010015", "크림"), ("트러블", None)])
+    table = asyncio.run(crawl_catalog_http(plan))
+    write_catalog_csv(table.products(), PRODUCT_LIST_CSV)
+    asyncio.run(crawl_products_http(table.products(), on_product=append_fn))   # 상품 수 = 고유 상품 수
+"""
+
+import csv, asyncio
+from urllib.parse import urlencode
+
+from pipeline.oy_reviews import extract_goods_no, parse_product_list_html
+from pipeline.crawl_state import product_key
+
+# =========================
+# 1) 검색 계획
+# =========================
+BASE_URL = "https://www.oliveyoung.co.kr"
+SEARCH_PATH = "/store/search/getSearchMain.do"
+DETAIL_PATH = "/store/goods/getGoodsDetail.do"
+ITEMS_PER_PAGE = 48
+LIST_PAGES = 1  # 쿼리당 startCount 페이지 수 기본값
+CATALOG_FIELDS = ["product_name","product_brand","product_link","goods_no","queries","first_query","first_rank"]
+QUERY_SEP = "|"
+
+def make_plan(pairs, pages=LIST_PAGES):
+    """
+    (keyword, cateId2) 또는 (keyword, cateId2, 카테고리 이름) 목록 → 쿼리 dict 목록 (같은 쌍은 1번만).
+    쿼리 dict: keyword, cate_id2, cate_name, pages, label("키워드@카테고리").
+    """
+    plan, seen = [], set()
+    for pair in pairs:
+        keyword, cate_id2, cate_name = (tuple(pair) + (None, None))[:3]
+        cate_id2 = str(cate_id2 or "")
+        if (keyword, cate_id2) in seen:
+            continue
+        seen.add((keyword, cate_id2))
+        plan.append({
+            "keyword": keyword, "cate_id2": cate_id2, "cate_name": cate_name or "", "pages": pages,
+            "label": f"{keyword}@{cate_name or cate_id2 or '전체'}",
+        })
+    return plan
+
+def search_params(query, start_count=0, items_per_page=ITEMS_PER_PAGE):
+    # 기존 build_search_url 과 같은 파라미터. cateId 는 cateId2 의 상위(대분류) 11자리
+    cate_id2 = query["cate_id2"]
+    return {
+        "startCount": start_count,
+        "sort": "RANK/DESC", "goods_sort": "WEIGHT/DESC,RANK/DESC",
+        "collection": "ALL", "reQuery": "",
+        "viewtype": "image", "category": "", "catename": "LCTG_ID", "catedepth": 1, "rt": "",
+        "listnum": items_per_page, "tmp_requery": "", "tmp_requery2": "",
+        "categoryDepthValue": 2 if cate_id2 else "", "cateId": cate_id2[:11], "cateId2": cate_id2,
+        "BenefitAll_CHECK": "",
+        "query": query["keyword"], "realQuery": query["keyword"],
+        "selectCateNm": f"{query['cate_name']} 카테고리에" if query["cate_name"] else "",
+        "typeChk": "thum",
+    }
+
+def build_search_url(query, start_count=0, items_per_page=ITEMS_PER_PAGE, base_url=BASE_URL):
+    return f"{base_url}{SEARCH_PATH}?{urlencode(search_params(query, start_count, items_per_page))}"
+
+def canonical_link(product, base_url=BASE_URL):
+    """goodsNo 만 남긴 상세 링크 (goodsNo 가 없으면 원래 링크)."""
+    goods_no = extract_goods_no(product.get("product_link", ""))
+    return f"{base_url}{DETAIL_PATH}?goodsNo={goods_no}" if goods_no else product.get("product_link", "")
+
+# =========================
+# 2) 전역 중복 제거 표
+# =========================
+class CatalogTable:
+    """goodsNo(없으면 링크) → 상품 1행. add 순서대로 행이 쌓이고, 다시 나온 상품은 queries 에만 추가."""
+
+    def __init__(self, base_url=BASE_URL):
+        self.base_url = base_url
+        self._rows = {}
+        self.stats = {"cards": 0, "duplicates": 0}
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, product):
+        return product_key(product) in self._rows
+
+    def add(self, product, label, rank):
+        """새 상품이면 True. rank 는 그 쿼리 결과 안에서의 순위(1부터)."""
+        self.stats["cards"] += 1
+        key = product_key(product)
+        row = self._rows.get(key)
+        if row is not None:
+            self.stats["duplicates"] += 1
+            if label not in row["queries"]:
+                row["queries"].append(label)
+            return False
+        self._rows[key] = {
+            "product_name": product.get("product_name", ""),
+            "product_brand": product.get("product_brand", ""),
+            "product_link": canonical_link(product, self.base_url),
+            "goods_no": extract_goods_no(product.get("product_link", "")),
+            "queries": [label], "first_query": label, "first_rank": rank,
+        }
+        return True
+
+    def add_many(self, products, label, start_rank=1):
+        return sum(self.add(p, label, start_rank + i) for i, p in enumerate(products))
+
+    def products(self):
+        """리뷰 크롤링 대상 (상품 dict 에 goods_no/queries 가 더 붙어 있어도 기존 writer 는 3컬럼만 씀)."""
+        return [dict(r, queries=list(r["queries"])) for r in self._rows.values()]
+
+    def summary(self):
+        n = len(self._rows)
+        return {"cards": self.stats["cards"], "unique": n, "duplicates": self.stats["duplicates"],
+                "multi_query": sum(len(r["queries"]) > 1 for r in self._rows.values())}
+
+def write_catalog_csv(products, path):
+    with open(path, "w", newline="", encoding="utf-8-sig") as fw:
+        writer = csv.DictWriter(fw, fieldnames=CATALOG_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        for p in products:
+            writer.writerow(dict(p, queries=QUERY_SEP.join(p.get("queries") or [])))
+
+# =========================
+# 3) 동시 목록 수집 (HTTP)
+# =========================
+async def fetch_query_pages(engine, query, items_per_page=ITEMS_PER_PAGE):
+    """쿼리 1개의 목록 페이지들 → 페이지별 카드 목록. 1페이지가 덜 차면 나머지는 요청하지 않음."""
+    async def page(i):
+        params = search_params(query, i * items_per_page, items_per_page)
+        body = await engine.fetch_text(SEARCH_PATH, params, referer=engine.base_url + "/")
+        if body is None:
+            print(f"❌ 목록 요청 실패 ({query['label']} / startCount={i * items_per_page})")
+        return parse_product_list_html(body or "", engine.base_url)
+
+    pages = [await page(0)]
+    if len(pages[0]) >= items_per_page and query["pages"] > 1:
+        pages += await asyncio.gather(*(page(i) for i in range(1, query["pages"])))
+    for i, cards in enumerate(pages):  # 덜 찬 페이지 뒤는 끝 (사이트가 마지막 페이지를 반복해도 무시)
+        if len(cards) < items_per_page:
+            return pages[:i + 1]
+    return pages
+
+async def crawl_catalog_http(plan, table=None, items_per_page=ITEMS_PER_PAGE, **engine_kwargs):
+    """계획의 모든 쿼리 목록을 동시에 받아 CatalogTable 로 합친다 (병합은 계획 순서대로)."""
+    from pipeline.review_http import ReviewHttpEngine
+
+    table = table if table is not None else CatalogTable(engine_kwargs.get("base_url", BASE_URL))
+    async with ReviewHttpEngine(**engine_kwargs) as eng:
+        results = await asyncio.gather(*(fetch_query_pages(eng, q, items_per_page) for q in plan))
+        for q, pages in zip(plan, results):
+            added = sum(table.add_many(cards, q["label"], 1 + i * items_per_page) for i, cards in enumerate(pages))
+            print(f"✅ [{q['label']}] 카드 {sum(map(len, pages))}개 / 페이지 {len(pages)} (신규 {added})")
+        s = table.summary()
+        print(f"✅ 카탈로그: 쿼리 {len(plan)}개 / 카드 {s['cards']} → 고유 상품 {s['unique']} "
+              f"(중복 {s['duplicates']}, 여러 쿼리에 나온 상품 {s['multi_query']}) / 요청 {eng.stats['requests']}")
+    return table
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+협업 필터링(Surprise SVD) 일괄 채점 — 상품마다 svd_model.predict 를 부르는 대신 행렬곱 1번
+- 학습된 SVD 에서 pu, qi, bu, bi, 전체 평균을 연속 numpy 배열로 꺼내고 user/item raw id → 정수 인덱스
+- 점수 = 전체 평균 + bu[u] + bi[i] + pu[u]·qi[i] → rating_scale 로 clip (predict().est 와 같은 값)
+    · 모르는 사용자/상품은 predict 와 같은 대체값: 모르는 쪽의 편향/요인을 0 으로 (배열 끝에 0 행 1개 → 인덱스 -1)
+    · biased=False 모델은 둘 다 알 때만 내적, 아니면 전체 평균 (default_prediction)
+- 사용자 여러 명은 (B, k) @ (k, n_items) 1번, top-k 는 argpartition (전체 정렬 없음)
+- 사용자 블록(block) 단위로 계산 → 1만 × 1만도 점수 행렬 전체를 만들지 않음
+
+사용 예)
+    cf = SVDScorer.from_surprise(svd_model)
+    cf.scores("user01")                               # 모든 상품 점수 (cf.item_ids 순서)
+    cf.scores("user01", items=["크림A", "크림B"])
+    idx, val = cf.topk(["user01", "user02"], k=10, exclude={"user01": ["크림A"]})
+"""
+
+import numpy as np
+
+# =========================
+# 1) 채점기
+# =========================
+class SVDScorer:
+    def __init__(self, pu, qi, bu, bi, global_mean, user_ids, item_ids, rating_scale=(0.5, 5.0), biased=True,
+                 dtype=np.float64):
+        """pu (n_users, k), qi (n_items, k), bu, bi: 인덱스 = user_ids / item_ids 위치."""
+        k = pu.shape[1]
+        # 마지막 행 = 모르는 사용자/상품 (요인 0, 편향 0)
+        self.pu = np.ascontiguousarray(np.vstack([pu, np.zeros((1, k))]), dtype=dtype)
+        self.qi = np.ascontiguousarray(np.vstack([qi, np.zeros((1, k))]), dtype=dtype)
+        self.bu = np.append(np.asarray(bu, dtype=dtype), 0.0) if biased else np.zeros(len(pu) + 1, dtype=dtype)
+        self.bi = np.append(np.asarray(bi, dtype=dtype), 0.0) if biased else np.zeros(len(qi) + 1, dtype=dtype)
+        self.global_mean = float(global_mean)
+        self.biased = biased
+        self.lo, self.hi = rating_scale
+        self.user_ids, self.item_ids = list(user_ids), list(item_ids)
+        self.user_index = {u: i for i, u in enumerate(self.user_ids)}
+        self.item_index = {it: i for i, it in enumerate(self.item_ids)}
+
+    @classmethod
+    def from_surprise(cls, algo, dtype=np.float64):
+        ts = algo.trainset
+        return cls(algo.pu, algo.qi, algo.bu, algo.bi, ts.global_mean,
+                   [ts.to_raw_uid(u) for u in range(ts.n_users)], [ts.to_raw_iid(i) for i in range(ts.n_items)],
+                   rating_scale=ts.rating_scale, biased=algo.biased, dtype=dtype)
+
+    def save(self, path):
+        """npz 1개로 저장 (Surprise 없이 load 가능)."""
+        np.savez(path, pu=self.pu[:-1], qi=self.qi[:-1], bu=self.bu[:-1], bi=self.bi[:-1],
+                 global_mean=self.global_mean, rating_scale=np.array([self.lo, self.hi]), biased=self.biased,
+                 user_ids=np.array(self.user_ids, dtype=str), item_ids=np.array(self.item_ids, dtype=str))
+
+    @classmethod
+    def load(cls, path, dtype=np.float64):
+        with np.load(path) as z:
+            return cls(z["pu"], z["qi"], z["bu"], z["bi"], float(z["global_mean"]), z["user_ids"].tolist(),
+                       z["item_ids"].tolist(), rating_scale=tuple(z["rating_scale"].tolist()),
+                       biased=bool(z["biased"]), dtype=dtype)
+
+    @property
+    def n_users(self):
+        return len(self.user_ids)
+
+    @property
+    def n_items(self):
+        return len(self.item_ids)
+
+    def uidx(self, users):
+        return np.fromiter((self.user_index.get(u, -1) for u in users), dtype=np.int64, count=len(users))
+
+    def iidx(self, items):
+        return np.fromiter((self.item_index.get(it, -1) for it in items), dtype=np.int64, count=len(items))
+
+    # ---- 점수 ----
+    def _block(self, u, i):
+        """u: 사용자 인덱스 (B,), i: 상품 인덱스 (m,) 또는 None(전체) → (B, m) clip 된 점수."""
+        pu, bu = self.pu[u], self.bu[u]
+        qi, bi = (self.qi[:-1], self.bi[:-1]) if i is None else (self.qi[i], self.bi[i])
+        est = pu @ qi.T
+        if self.biased:
+            est += self.global_mean + bu[:, None] + bi[None, :]
+        else:
+            known = (u >= 0)[:, None] & ((np.ones(qi.shape[0], dtype=bool) if i is None else i >= 0)[None, :])
+            est = np.where(known, est, self.global_mean)
+        return np.clip(est, self.lo, self.hi, out=est)
+
+    def scores(self, user, items=None):
+        """사용자 1명 → 점수 배열 (items 순서, 없으면 item_ids 순서)."""
+        i = None if items is None else self.iidx(list(items))
+        return self._block(self.uidx([user]), i)[0]
+
+    def scores_batch(self, users, items=None):
+        """사용자 여러 명 → (len(users), m) 점수 행렬."""
+        i = None if items is None else self.iidx(list(items))
+        return self._block(self.uidx(list(users)), i)
+
+    def predict(self, user, item):
+        return float(self._block(self.uidx([user]), self.iidx([item]))[0, 0])
+
+    # ---- top-k ----
+    def topk(self, users, k=10, exclude=None, block=1024):
+        """
+        사용자별 상위 k 개 (상품 인덱스, 점수) — 점수 내림차순. 둘 다 (len(users), k) 배열
+        exclude: {user: [이미 본 상품, ...]} → 후보에서 제외 (제외 후 k 개가 안 되면 -1 / -inf)
+        """
+        users = list(users)
+        k = min(k, self.n_items)
+        out_idx = np.full((len(users), k), -1, dtype=np.int64)
+        out_val = np.full((len(users), k), -np.inf)
+        for b0 in range(0, len(users), block):
+            bu = users[b0:b0 + block]
+            S = self._block(self.uidx(bu), None)
+            if exclude:
+                for r, u in enumerate(bu):
+                    seen = self.iidx(list(exclude.get(u, ())))
+                    S[r, seen[seen >= 0]] = -np.inf
+            part = np.argpartition(-S, k - 1, axis=1)[:, :k]
+            val = np.take_along_axis(S, part, axis=1)
+            order = np.argsort(-val, axis=1, kind="stable")
+            idx, val = np.take_along_axis(part, order, axis=1), np.take_along_axis(val, order, axis=1)
+            idx[np.isneginf(val)] = -1
+            out_idx[b0:b0 + len(bu)], out_val[b0:b0 + len(bu)] = idx, val
+        return out_idx, out_val
+
+# =========================
+# 2) 기존 방식 (벤치 비교용)
+# =========================
+def recommend_collaborative_filtering_legacy(svd_model, user_id, all_items):
+    """추천 노트북 기존 함수: 상품마다 svd_model.predict."""
+    return dict((item, float(svd_model.predict(user_id, item).est)) for item in all_items)
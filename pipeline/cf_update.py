@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""
+협업 필터링(SVD) 증분 갱신 — 새 사용자/상품/리뷰가 들어올 때마다 Surprise SVD 를 처음부터 다시 학습하지 않음
+- 새 리뷰 판정: review_id (마지막 학습/갱신에 쓴 id 집합에 없는 행만)
+- fold-in: 새 상품 → 새 사용자 순서로, 상대편 요인을 고정하고 [b, p] 를 릿지 회귀로 구함
+    · 사용자 u: min Σ(r - μ - bi - bu - pu·qi)² + λ(bu² + |pu|²)  → (k+1)×(k+1) 연립방정식 1개
+    · λ = fold_reg × (평점 수 + fold_prior) — 평점이 적은 사용자는 0 벡터(= 편향만) 쪽으로 수축
+    · 새 상품은 기존 사용자 평점으로, 그다음 새 사용자는 (새 상품 포함) 전체 상품으로 → 새 상품만 본 사용자도 벡터가 생김
+- warm start: 새 rating_aug 상호작용만 SGD 몇 epoch (Surprise SVD 와 같은 갱신식, lr_all=0.005 / reg_all=0.02)
+    · 상호작용 batch 개씩 벡터 연산 + np.add.at (파이썬 순차 루프 대비 수십 배, 결과는 순차 SGD 와 거의 같음)
+    · 전체 평균 μ 는 마지막 전체 학습 값 고정 (평균 이동은 드리프트로 봄)
+- 드리프트 (갱신 전에 계산): 하나라도 임계값을 넘으면 전체 재학습 (update 는 아무것도 바꾸지 않고 retrain=True)
+    · 누적 새 상호작용 / 전체 학습 때 상호작용 수 > max_new_frac
+    · 누적 새 사용자 / 전체 학습 때 사용자 수 > max_new_user_frac  (fold-in 벡터 비중이 커짐)
+    · 새 상호작용 중 아는 사용자×아는 상품의 갱신 전 RMSE / 기준 RMSE > max_rmse_ratio
+      (기준 = 전체 학습 뒤 첫 배치의 같은 값 — 학습 RMSE 는 일반화 오차보다 늘 작아서 기준으로 못 씀)
+    · |지금까지 본 평균 평점 - μ| > max_mean_shift
+- 상태 디렉터리: svd.npz (SVDScorer.save) + cf_state.json (드리프트 누적값) + review_ids.npy
+
+사용 예)
+    upd = IncrementalSVD.from_fit(SVDScorer.from_surprise(algo), df)       # 전체 학습 직후
+    upd.save("./cf_state")
+    ...
+    upd = IncrementalSVD.load("./cf_state")
+    rep = upd.update(df_all)            # df_all: review_id, user_id, item_id, rating_aug (이미 반영된 행은 건너뜀)
+    if rep["retrain"]: ...전체 학습 → from_fit
+    else: upd.save("./cf_state"); upd.scorer.save(out_path)
+"""
+
+import os, json, time
+
+import numpy as np
+
+from pipeline.cf_score import SVDScorer
+
+DRIFT_LIMITS = {"max_new_frac": 0.3, "max_new_user_frac": 0.5, "max_rmse_ratio": 1.25, "max_mean_shift": 0.15}
+STATE_FILES = ("svd.npz", "cf_state.json", "review_ids.npy")
+
+# =========================
+# 1) 배열 단위 연산
+# =========================
+def _params(scorer):
+    """SVDScorer → 수정 가능한 (pu, qi, bu, bi) 복사본 (끝의 '모르는 id' 0 행 제외)."""
+    return scorer.pu[:-1].copy(), scorer.qi[:-1].copy(), scorer.bu[:-1].copy(), scorer.bi[:-1].copy()
+
+def pair_est(pu, qi, bu, bi, mu, u, i, biased=True):
+    """(u, i) 쌍별 예측 (clip 전). u, i: 정수 인덱스 배열."""
+    est = np.einsum("ij,ij->i", pu[u], qi[i])
+    return est + mu + bu[u] + bi[i] if biased else est
+
+def fold_in(fixed_f, fixed_b, idx_fixed, idx_new, y, n_new, reg=0.02, prior=5.0, biased=True):
+    """
+    고정된 반대편 요인(fixed_f, fixed_b)에 대해 새 행 n_new 개의 (bias, factor) 릿지 해.
+    idx_new: 상호작용별 새 행 번호 (0..n_new-1), idx_fixed: 반대편 인덱스, y: r - μ (biased) 또는 r.
+    """
+    k = fixed_f.shape[1]
+    out_f, out_b = np.zeros((n_new, k)), np.zeros(n_new)
+    order = np.argsort(idx_new, kind="stable")
+    bounds = np.searchsorted(idx_new[order], np.arange(n_new + 1))
+    for r in range(n_new):
+        sel = order[bounds[r]:bounds[r + 1]]
+        if not len(sel):
+            continue
+        F = fixed_f[idx_fixed[sel]]
+        t = y[sel] - (fixed_b[idx_fixed[sel]] if biased else 0.0)
+        A = np.hstack([np.ones((len(sel), 1)), F]) if biased else F
+        lam = reg * (len(sel) + prior)
+        x = np.linalg.solve(A.T @ A + lam * np.eye(A.shape[1]), A.T @ t)
+        if biased:
+            out_b[r], out_f[r] = x[0], x[1:]
+        else:
+            out_f[r] = x
+    return out_f, out_b
+
+def sgd_epochs(pu, qi, bu, bi, mu, u, i, r, epochs=3, lr=0.005, reg=0.02, biased=True, seed=0, batch=256):
+    """
+    Surprise SVD.sgd 와 같은 갱신식을 주어진 상호작용에만 (제자리 갱신).
+    batch 개씩 묶어 한 번에 계산하고 np.add.at 으로 더함 (batch=1 이면 Surprise 와 같은 순차 SGD).
+    """
+    rng = np.random.default_rng(seed)
+    for _ in range(epochs):
+        perm = rng.permutation(len(r))
+        for b0 in range(0, len(perm), batch):
+            sel = perm[b0:b0 + batch]
+            uu, ii = u[sel], i[sel]
+            p, q = pu[uu], qi[ii]
+            err = r[sel] - pair_est(pu, qi, bu, bi, mu, uu, ii, biased)
+            if biased:
+                np.add.at(bu, uu, lr * (err - reg * bu[uu]))
+                np.add.at(bi, ii, lr * (err - reg * bi[ii]))
+            np.add.at(pu, uu, lr * (err[:, None] * q - reg * p))
+            np.add.at(qi, ii, lr * (err[:, None] * p - reg * q))
+
+# =========================
+# 2) 증분 갱신기
+# =========================
+class IncrementalSVD:
+    def __init__(self, scorer, state, review_ids=()):
+        self.scorer = scorer
+        self.state = state
+        self.review_ids = set(review_ids)
+
+    @classmethod
+    def from_fit(cls, scorer, df, rating_col="rating_aug"):
+        """전체 학습 직후: 학습에 쓴 df (review_id, user_id, item_id, rating_col) 로 기준값 기록."""
+        state = {"n_ratings": int(len(df)), "n_users": scorer.n_users, "n_items": scorer.n_items,
+                 "global_mean": scorer.global_mean, "new_ratings": 0, "new_users": 0, "new_items": 0,
+                 "rating_sum": float(df[rating_col].sum()), "ref_rmse": None, "updates": 0,
+                 "fit_at": time.time()}
+        return cls(scorer, state, df["review_id"].astype(str) if "review_id" in df.columns else ())
+
+    @classmethod
+    def load(cls, state_dir):
+        """상태가 없거나 일부만 있으면 None (→ 전체 학습)."""
+        paths = [os.path.join(state_dir, f) for f in STATE_FILES]
+        if not all(os.path.exists(p) for p in paths):
+            return None
+        with open(paths[1], encoding="utf-8") as f:
+            state = json.load(f)
+        return cls(SVDScorer.load(paths[0]), state, np.load(paths[2]).tolist())
+
+    def save(self, state_dir):
+        os.makedirs(state_dir, exist_ok=True)
+        npz, js, ids = (os.path.join(state_dir, f) for f in STATE_FILES)
+        self.scorer.save(npz + ".tmp.npz")
+        np.save(ids + ".tmp.npy", np.array(sorted(self.review_ids), dtype=str))
+        with open(js + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        for path, tmp in ((npz, npz + ".tmp.npz"), (ids, ids + ".tmp.npy"), (js, js + ".tmp")):
+            os.replace(tmp, path)
+
+    def new_rows(self, df):
+        """review_id 기준 아직 반영 안 된 행 (review_id 컬럼이 없으면 ValueError)."""
+        if "review_id" not in df.columns:
+            raise ValueError("증분 갱신에는 review_id 컬럼이 필요합니다 (전처리 add_review_id)")
+        ids = self.review_ids  # list → set 조회 (Series.isin / 컬럼 직접 순회는 문자열 컬럼에서 몇 배 느림)
+        col = df["review_id"].astype(str).tolist()
+        return df[np.fromiter((x not in ids for x in col), dtype=bool, count=len(col))]
+
+    # ---- 드리프트 ----
+    def drift(self, new, rating_col="rating_aug"):
+        """갱신 전 드리프트 지표와 재학습 여부. new: new_rows 결과."""
+        s, cf = self.state, self.scorer
+        uidx, iidx = cf.uidx(new["user_id"].tolist()), cf.iidx(new["item_id"].tolist())
+        r = new[rating_col].to_numpy(dtype=np.float64)
+        known = (uidx >= 0) & (iidx >= 0)
+        rmse = None
+        if known.sum() >= 20:  # 너무 적으면 잡음
+            est = np.clip(pair_est(cf.pu, cf.qi, cf.bu, cf.bi, cf.global_mean, uidx[known], iidx[known], cf.biased),
+                          cf.lo, cf.hi)
+            rmse = float(np.sqrt(np.mean((r[known] - est) ** 2)))
+        n_new_users = new.loc[uidx < 0, "user_id"].nunique()
+        n_total = s["n_ratings"] + s["new_ratings"] + len(new)
+        m = {
+            "new_frac": (s["new_ratings"] + len(new)) / max(1, s["n_ratings"]),
+            "new_user_frac": (s["new_users"] + n_new_users) / max(1, s["n_users"]),
+            "rmse_known": rmse,
+            "rmse_ratio": (rmse / s["ref_rmse"]) if rmse is not None and s["ref_rmse"] else None,
+            "mean_shift": abs((s["rating_sum"] + float(r.sum())) / max(1, n_total) - s["global_mean"]),
+        }
+        lim = DRIFT_LIMITS
+        reasons = [name for name, over in (
+            ("new_frac", m["new_frac"] > lim["max_new_frac"]),
+            ("new_user_frac", m["new_user_frac"] > lim["max_new_user_frac"]),
+            ("rmse_ratio", m["rmse_ratio"] is not None and m["rmse_ratio"] > lim["max_rmse_ratio"]),
+            ("mean_shift", m["mean_shift"] > lim["max_mean_shift"]),
+        ) if over]
+        return dict(m, retrain=bool(reasons), reasons=reasons)
+
+    # ---- 갱신 ----
+    def update(self, df, epochs=3, lr=0.005, reg=0.02, fold_reg=0.1, fold_prior=5.0, rating_col="rating_aug",
+               seed=0, force=False):
+        """
+        df 중 새 행만 반영. 반환: 드리프트 지표 + n_new / 새 사용자·상품 수 / 소요 시간.
+        retrain=True 면 (force 가 아니면) 아무것도 바꾸지 않음 → 호출 쪽에서 전체 학습.
+        """
+        t0 = time.perf_counter()
+        new = self.new_rows(df)
+        rep = self.drift(new, rating_col)
+        rep.update(n_new=len(new), new_users=0, new_items=0)
+        if not len(new) or (rep["retrain"] and not force):
+            rep["sec"] = time.perf_counter() - t0
+            return rep
+
+        cf = self.scorer
+        pu, qi, bu, bi = _params(cf)
+        mu, biased = cf.global_mean, cf.biased
+        user_ids, item_ids = list(cf.user_ids), list(cf.item_ids)
+        user_index, item_index = dict(cf.user_index), dict(cf.item_index)
+        users, items = new["user_id"].tolist(), new["item_id"].tolist()
+        r = new[rating_col].to_numpy(dtype=np.float64)
+        y = r - mu if biased else r
+
+        # 1) 새 상품: 기존 사용자 평점으로
+        fresh_items = list(dict.fromkeys(it for it in items if it not in item_index))
+        if fresh_items:
+            pos = {it: j for j, it in enumerate(fresh_items)}
+            sel = np.array([it in pos and u in user_index for u, it in zip(users, items)], dtype=bool)
+            f, b = fold_in(pu, bu, np.array([user_index[u] for u, s in zip(users, sel) if s], dtype=np.int64),
+                           np.array([pos[it] for it, s in zip(items, sel) if s], dtype=np.int64), y[sel],
+                           len(fresh_items), fold_reg, fold_prior, biased)
+            qi, bi = np.vstack([qi, f]), np.append(bi, b)
+            for it in fresh_items:
+                item_index[it] = len(item_ids)
+                item_ids.append(it)
+        # 2) 새 사용자: 새 상품 포함 전체 상품으로
+        fresh_users = list(dict.fromkeys(u for u in users if u not in user_index))
+        if fresh_users:
+            pos = {u: j for j, u in enumerate(fresh_users)}
+            sel = np.array([u in pos for u in users], dtype=bool)
+            f, b = fold_in(qi, bi, np.array([item_index[it] for it, s in zip(items, sel) if s], dtype=np.int64),
+                           np.array([pos[u] for u, s in zip(users, sel) if s], dtype=np.int64), y[sel],
+                           len(fresh_users), fold_reg, fold_prior, biased)
+            pu, bu = np.vstack([pu, f]), np.append(bu, b)
+            for u in fresh_users:
+                user_index[u] = len(user_ids)
+                user_ids.append(u)
+        # 3) 새 상호작용만 warm start (기존 사용자의 새 리뷰도 여기서 반영)
+        u = np.array([user_index[x] for x in users], dtype=np.int64)
+        i = np.array([item_index[x] for x in items], dtype=np.int64)
+        if epochs:
+            sgd_epochs(pu, qi, bu, bi, mu, u, i, r, epochs, lr, reg, biased, seed)
+
+        self.scorer = SVDScorer(pu, qi, bu, bi, mu, user_ids, item_ids, rating_scale=(cf.lo, cf.hi), biased=biased,
+                                dtype=cf.pu.dtype)
+        s = self.state
+        if s["ref_rmse"] is None and rep["rmse_known"] is not None:
+            s["ref_rmse"] = rep["rmse_known"]
+        s["new_ratings"] += len(new)
+        s["new_users"] += len(fresh_users)
+        s["new_items"] += len(fresh_items)
+        s["rating_sum"] += float(r.sum())
+        s["updates"] += 1
+        self.review_ids.update(new["review_id"].astype(str))
+        rep.update(new_users=len(fresh_users), new_items=len(fresh_items), sec=time.perf_counter() - t0)
+        return rep
+
+    @staticmethod
+    def report(rep, prefix=""):
+        rr = "-" if rep["rmse_ratio"] is None else f"{rep['rmse_ratio']:.2f}"
+        print(f"{prefix}새 상호작용 {rep['n_new']} (새 사용자 {rep['new_users']}, 새 상품 {rep['new_items']}) / "
+              f"누적 비율 {rep['new_frac']:.1%} / RMSE 비 {rr} / 평균 이동 {rep['mean_shift']:.3f} / "
+              f"{rep.get('sec', 0):.2f}s")
+        if rep["retrain"]:
+            print(f"{prefix}⚠️ 드리프트 임계 초과 {rep['reasons']} → 전체 재학습")
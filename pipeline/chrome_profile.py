@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+크롤링용 Chrome 프로필 + 드라이버 지표
+- "full" : 기존 make_driver 와 같은 창 모드 Chrome (모든 리소스 다운로드)
+- "light": headless + 이미지 끔 + DevTools(Network.setBlockedURLs)로 분석/광고/미디어/폰트(+CSS) 요청 차단
+    · 리뷰 추출은 DOM 셀렉터/속성만 쓰므로 이미지·폰트가 없어도 결과 행은 같다
+    · CSS 차단은 block_css 로 끌 수 있음 (innerText 는 렌더링 기준이라 CSS 로 숨긴 글자가 섞일 수 있음
+      → bench/bench_driver_profile.py 로 full 과 결과 행이 같은지 먼저 확인)
+- 복구: 세션이 살아 있으면 새 탭으로 갈아타고(fresh_tab), 안 되면 그때 브라우저를 새로 띄움
+- DriverMetrics: 드라이버 시작 시간, 페이지 로드 시간, 상품당 전송 바이트(performance 로그의
+  Network.loadingFinished.encodedDataLength 합), 워커당 Chrome 프로세스 RSS(psutil 있으면)
+"""
+
+import json, time
+
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119 Safari/537.36"
+)
+
+# =========================
+# 1) 차단 URL 패턴 (Network.setBlockedURLs 와일드카드)
+# =========================
+BLOCK_MEDIA = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.bmp",
+    "*.mp4", "*.webm", "*.m3u8", "*.mp3",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+]
+BLOCK_TRACKERS = [
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*facebook.net*", "*facebook.com/tr*",
+    "*criteo.*", "*analytics.kakao.com*", "*t1.daumcdn.net/kas*", "*wcs.naver.net*",
+    "*mixpanel.com*", "*hotjar.com*", "*amplitude.com*", "*braze.com*",
+]
+BLOCK_CSS = ["*.css"]
+
+PROFILES = {
+    "full":  {"headless": False, "images": True,  "block": [],                           "block_css": False},
+    "light": {"headless": True,  "images": False, "block": BLOCK_MEDIA + BLOCK_TRACKERS, "block_css": True},
+}
+
+# =========================
+# 2) 옵션 / 드라이버 생성
+# =========================
+def chrome_options(profile="full", metrics=False):
+    from selenium import webdriver
+
+    cfg = PROFILES[profile]
+    options = webdriver.ChromeOptions()
+    if cfg["headless"]:
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1280,2000")  # 기본 800x600 은 레이아웃이 달라질 수 있음
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--lang=ko-KR")
+    options.add_argument(f"user-agent={USER_AGENT}")
+    if profile != "full":
+        for arg in ("--disable-extensions", "--disable-background-networking", "--mute-audio",
+                    "--no-first-run", "--disable-sync", "--disable-default-apps"):
+            options.add_argument(arg)
+        # load 이벤트(이미지/광고 스크립트 완료)까지 기다리지 않음 → 필요한 요소는 명시적으로 대기
+        options.page_load_strategy = "eager"
+    if not cfg["images"]:
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    if metrics:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return options
+
+def blocked_patterns(profile="full", block_css=None):
+    cfg = PROFILES[profile]
+    if block_css is None:
+        block_css = cfg["block_css"]
+    return cfg["block"] + (BLOCK_CSS if block_css else [])
+
+def apply_url_blocking(driver, patterns):
+    """현재 탭(target)에 차단 목록 적용. 새 탭을 열면 다시 호출해야 한다."""
+    if not patterns:
+        return
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+def start_driver(profile="full", block_css=None, metrics=None, timeout=12):
+    """반환: (driver, wait). metrics(DriverMetrics) 가 있으면 시작 시간을 기록."""
+    from selenium import webdriver
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    t = time.monotonic()
+    d = webdriver.Chrome(options=chrome_options(profile, metrics is not None))
+    d._crawl_profile = (profile, block_css)
+    apply_url_blocking(d, blocked_patterns(profile, block_css))
+    if metrics is not None:
+        metrics.add_startup(time.monotonic() - t)
+    return d, WebDriverWait(d, timeout)
+
+def fresh_tab(driver):
+    """
+    같은 브라우저에서 새 탭으로 갈아타고 나머지 탭은 닫는다(콜드 스타트 대신).
+    세션 자체가 죽었으면 예외 → 호출 측에서 브라우저를 새로 띄운다.
+    """
+    old = driver.window_handles
+    driver.switch_to.new_window("tab")
+    keep = driver.current_window_handle
+    for h in old:
+        if h != keep:
+            driver.switch_to.window(h)
+            driver.close()
+    driver.switch_to.window(keep)
+    profile, block_css = getattr(driver, "_crawl_profile", ("full", None))
+    apply_url_blocking(driver, blocked_patterns(profile, block_css))
+
+# =========================
+# 3) 지표
+# =========================
+def drain_network_bytes(driver):
+    """performance 로그를 비우면서 완료된 요청 수/전송 바이트 합을 반환. 로그가 꺼져 있으면 (0, 0)."""
+    try:
+        entries = driver.get_log("performance")
+    except Exception:
+        return 0, 0
+    n, total = 0, 0
+    for e in entries:
+        msg = json.loads(e["message"]).get("message", {})
+        if msg.get("method") == "Network.loadingFinished":
+            n += 1
+            total += int(msg.get("params", {}).get("encodedDataLength", 0))
+    return n, total
+
+def browser_rss(driver):
+    """chromedriver 아래 Chrome 프로세스 트리 RSS 합(byte). psutil 없으면 None."""
+    if not HAS_PSUTIL:
+        return None
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        procs = [root] + root.children(recursive=True)
+        return sum(p.memory_info().rss for p in procs if p.is_running())
+    except Exception:
+        return None
+
+
+class DriverMetrics:
+    def __init__(self):
+        self.startups = []
+        self.page_loads = []
+        self.products = 0
+        self.pages = 0
+        self.requests = 0
+        self.bytes = 0
+        self.tab_recoveries = 0
+        self.cold_restarts = 0
+        self.rss_peak = 0
+
+    def add_startup(self, sec):
+        self.startups.append(sec)
+
+    def add_page_load(self, sec):
+        self.page_loads.append(sec)
+
+    def end_product(self, driver, pages):
+        """상품 1개(상세 페이지 + 리뷰 목록 pages 장)가 끝나면 호출."""
+        n, b = drain_network_bytes(driver)
+        self.products += 1
+        self.pages += pages
+        self.requests += n
+        self.bytes += b
+        rss = browser_rss(driver)
+        if rss:
+            self.rss_peak = max(self.rss_peak, rss)
+
+    def summary(self):
+        return {
+            "startups": list(self.startups), "page_loads": list(self.page_loads),
+            "products": self.products, "pages": self.pages,
+            "requests": self.requests, "bytes": self.bytes,
+            "tab_recoveries": self.tab_recoveries, "cold_restarts": self.cold_restarts,
+            "rss_peak": self.rss_peak,
+        }
+
+    @staticmethod
+    def merge(summaries):
+        out = DriverMetrics().summary()
+        for s in summaries:
+            for k in ("startups", "page_loads"):
+                out[k] += s[k]
+            for k in ("products", "pages", "requests", "bytes", "tab_recoveries", "cold_restarts"):
+                out[k] += s[k]
+            out["rss_peak"] = max(out["rss_peak"], s["rss_peak"])  # 워커당 최대
+        return out
+
+    @staticmethod
+    def report(s, tag=""):
+        def avg(xs):
+            return sum(xs) / len(xs) if xs else 0.0
+        print(f"{tag}🚗 드라이버 시작 {len(s['startups'])}회, 평균 {avg(s['startups']):.2f}s / "
+              f"페이지 로드 평균 {avg(s['page_loads']):.2f}s ({len(s['page_loads'])}회)")
+        if s["requests"]:
+            print(f"{tag}   전송 {s['bytes']/1e6:.1f}MB, 요청 {s['requests']} / "
+                  f"상품당 {s['bytes']/max(s['products'],1)/1e3:.0f}KB, "
+                  f"페이지당 {s['bytes']/max(s['pages'],1)/1e3:.0f}KB")
+        if s["rss_peak"]:
+            print(f"{tag}   워커당 Chrome RSS 최대 {s['rss_peak']/1e6:.0f}MB")
+        print(f"{tag}   복구: 새 탭 {s['tab_recoveries']}회 / 브라우저 재시작 {s['cold_restarts']}회")
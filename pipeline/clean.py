@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+전처리 (3)~(4) 단계: 로드 & 기본 정제 + 피부타입 자동 추출 (벡터화 + 청크 스트리밍)
+- 셀 단위 .apply 대신 pandas .str 벡터 연산, 날짜는 컬럼 전체를 '%Y.%m.%d' 형식으로 한 번에 파싱
+    · 형식이 다른 값(드묾)만 기존 parse_date_to_dot / to_float_safe 로 행 단위 처리 → 결과는 기존과 동일
+- chunksize 를 주면 CSV(또는 리뷰 컬럼형 저장소)를 청크 단위로 읽고 정제해서 흘려보냄
+    · 중복 제거(product_name, customer_name, review, 첫 행 유지)는 청크를 넘어 64bit 해시 집합으로 판정
+      (해시 충돌 확률 ≈ 행수² / 2^65 — 1천만 행에서도 10^-5 미만)
+- add_review_id: 정제된 행마다 고정 리뷰 id (중복 제거 키 3컬럼의 해시) → 단계 결과를 행 순서 대신 id 로 병합
+- 기존 노트북 구현은 *_legacy 로 유지 (bench/bench_clean.py 의 결과 동일성/단계별 속도 비교용)
+
+사용 예)
+    df = load_and_clean(INPUT_CSV)                       # 기존과 같은 DataFrame
+    df = load_and_clean(INPUT_CSV, chunksize=200_000)    # 수백만 행: 청크 스트리밍
+    df = advanced_skin_type_extraction(df)
+    df = add_review_id(df)                               # review_id 컬럼 (맨 앞)
+"""
+
+import os, re, hashlib
+
+import numpy as np
+import pandas as pd
+
+DROP_COLS = ["product_brand", "product_link", "rating_text"]
+TEXT_COLS = ["product_name","customer_name","skin_type","skin_tone","skin_concerns","review","gender"]
+KEEP_COLS = ["product_name","customer_name","skin_type","skin_tone","skin_concerns","review","date","rating","gender"]
+DEDUP_COLS = ["product_name","customer_name","review"]
+TYPE_GROUP = r"(건성|지성|복합성|민감성|수부지|약건성|중성|트러블성)"
+
+# =========================
+# 1) 기존 유틸 (행 단위) — 노트북 (2) 셀과 동일
+# =========================
+def normalize_text(s: str) -> str:
+    if pd.isna(s): return ""
+    t = str(s).replace("\r\n","\n").replace("\r","\n").strip()
+    t = re.sub(r"\n{3,}", "\n\n", t)
+    return re.sub(r"[ ]{2,}", " ", t)
+
+def parse_date_to_dot(s: str) -> str:
+    if pd.isna(s) or not str(s).strip(): return ""
+    dt = pd.to_datetime(str(s).strip(), errors="coerce")
+    return str(s) if pd.isna(dt) else dt.strftime("%Y.%m.%d")
+
+def to_float_safe(x):
+    try: return float(str(x).strip())
+    except Exception: return None
+
+def extract_hangul(text: str) -> str:
+    if pd.isna(text): return ""
+    return re.sub(r"[^ ㄱ-ㅣ가-힣]+", " ", str(text)).strip()
+
+# =========================
+# 2) 벡터화 버전
+# =========================
+def normalize_text_col(s: pd.Series) -> pd.Series:
+    t = s.fillna("").astype(str)
+    t = t.str.replace("\r\n", "\n", regex=False).str.replace("\r", "\n", regex=False).str.strip()
+    t = t.str.replace(r"\n{3,}", "\n\n", regex=True)
+    return t.str.replace(r"[ ]{2,}", " ", regex=True)
+
+def parse_date_col(s: pd.Series) -> pd.Series:
+    """컬럼 전체를 '%Y.%m.%d' 로 한 번에 파싱. 빈값 → "", 형식이 다른 값만 parse_date_to_dot 로."""
+    str_dtype = pd.Series(["a"]).dtype  # apply(parse_date_to_dot) 결과와 같은 dtype (pandas 3 부터 str)
+    raw = s.astype(object)
+    blank = raw.isna() | (raw.astype(str).str.strip() == "")
+    stripped = raw.astype(str).str.strip()
+    dt = pd.to_datetime(stripped.where(~blank), format="%Y.%m.%d", errors="coerce")
+    out = dt.dt.strftime("%Y.%m.%d").astype(object)
+    out[blank] = ""
+    rest = dt.isna() & ~blank
+    if rest.any():
+        out[rest] = raw[rest].map(parse_date_to_dot)
+    return out.astype(str_dtype)
+
+def to_float_col(s: pd.Series) -> pd.Series:
+    if pd.api.types.is_float_dtype(s):
+        return s.astype("float64")  # float(str(x)) 는 float 값을 그대로 돌려줌
+    num = pd.to_numeric(s.astype(str).str.strip(), errors="coerce")
+    rest = num.isna() & s.notna()
+    if rest.any():  # '1_000', 'infinity' 처럼 float() 만 받는 값
+        num[rest] = s[rest].map(to_float_safe).astype("float64")
+    return num.astype("float64")
+
+def extract_hangul_col(s: pd.Series) -> pd.Series:
+    return s.fillna("").astype(str).str.replace(r"[^ ㄱ-ㅣ가-힣]+", " ", regex=True).str.strip()
+
+def clean_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """load_and_clean 의 정제 단계(중복 제거 제외). 인덱스는 0부터 다시 매김."""
+    df = df.drop(columns=[c for c in DROP_COLS if c in df.columns])
+    for c in TEXT_COLS:
+        df[c] = normalize_text_col(df[c])
+    df["date"] = parse_date_col(df["date"])
+    df["rating"] = to_float_col(df["rating"])
+    df["review"] = extract_hangul_col(df["review"])
+    df = df[df["review"].str.len() > 0].reset_index(drop=True)
+    df["skin_type"] = df["skin_type"].where(df["skin_type"].str.strip() != "", "None")
+    return df
+
+# =========================
+# 3) 로드 (한 번에 / 청크)
+# =========================
+def iter_raw_chunks(input_path, chunksize):
+    """CSV → pd.read_csv 청크, 디렉터리(리뷰 컬럼형 저장소) → 필요한 컬럼만 배치 단위로."""
+    if os.path.isdir(input_path):
+        from pipeline.review_store import review_dataset, to_csv_frame
+        dataset = review_dataset(input_path)
+        table = dataset.to_table(columns=KEEP_COLS + ["seq"]).sort_by("seq").drop(["seq"])
+        for batch in table.to_batches(max_chunksize=chunksize):
+            yield to_csv_frame(batch.to_pandas())
+        return
+    yield from pd.read_csv(input_path, encoding="utf-8-sig", chunksize=chunksize)
+
+def _row_hash(df):
+    return pd.util.hash_pandas_object(df[DEDUP_COLS], index=False).to_numpy()
+
+def iter_clean_chunks(input_path, chunksize=200_000, verbose=True):
+    """정제 + 전역 중복 제거된 청크를 차례로 내보낸다 (메모리에는 청크 1개 + 해시 집합만)."""
+    seen = set()  # 행 해시(int). 청크마다 O(청크 크기) — 정렬 배열 병합은 청크마다 전체를 다시 정렬
+    n_in = n_before = n_out = 0
+    for raw in iter_raw_chunks(input_path, chunksize):
+        n_in += len(raw)
+        df = clean_frame(raw)
+        n_before += len(df)
+        h = _row_hash(df)
+        # 처음 나온 해시만 True (청크 안 중복도 첫 행만, drop_duplicates 와 같은 규칙)
+        keep = np.fromiter((x not in seen and not seen.add(x) for x in h.tolist()), dtype=bool, count=len(h))
+        df = df[keep]
+        n_out += len(df)
+        yield df
+    if verbose:
+        print(f"[로드] 행:{n_in}")
+        if n_before != n_out:
+            print(f"[중복제거] {n_before-n_out}건 제거 → {n_out}건 남음")
+
+def load_and_clean(input_path, chunksize=None):
+    """
+    노트북 (3) 단계와 같은 결과. input_path 가 디렉터리면 리뷰 컬럼형 저장소(pipeline/review_store.py).
+    chunksize 를 주면 청크 스트리밍(정제된 결과만 모아서 반환).
+    """
+    if chunksize:
+        parts = list(iter_clean_chunks(input_path, chunksize))
+        df = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=KEEP_COLS)
+        print(f"[정제 완료] 최종 데이터 크기: {df.shape}")
+        return df
+
+    if os.path.isdir(input_path):
+        from pipeline.review_store import load_reviews
+        df = load_reviews(input_path, columns=KEEP_COLS, csv_compat=True)
+    else:
+        df = pd.read_csv(input_path, encoding="utf-8-sig")
+    print(f"[로드] 행:{len(df)}")
+    df = clean_frame(df)
+    before = len(df)
+    df = df.drop_duplicates(subset=DEDUP_COLS).reset_index(drop=True)
+    if before != len(df):
+        print(f"[중복제거] {before-len(df)}건 제거 → {len(df)}건 남음")
+    print(f"[정제 완료] 최종 데이터 크기: {df.shape}")
+    return df
+
+# =========================
+# 4) 피부타입 자동 추출 (노트북 (4) 단계)
+# =========================
+def advanced_skin_type_extraction(df: pd.DataFrame) -> pd.DataFrame:
+    """skin_type 이 'None' 인 행만 리뷰에서 첫 피부타입 단어를 찾아 채움 (str.extract 1회)."""
+    mask = df["skin_type"].astype(str).str.strip().eq("None")
+    found = df.loc[mask, "review"].fillna("").astype(str).str.extract(TYPE_GROUP, expand=False)
+    df.loc[mask, "skin_type"] = found.replace("수부지", "지성").fillna("None")
+    print("✅ 피부 타입 자동 추출 완료!")
+    return df
+
+# =========================
+# 5) 리뷰 id (단계 간 병합 키)
+# =========================
+def review_id_col(df: pd.DataFrame) -> pd.Series:
+    """
+    DEDUP_COLS(상품명, 작성자, 리뷰)의 blake2b 8byte hex. 정제 후 값 기준이라 같은 리뷰는 언제 다시 정제해도 같은 id.
+    중복 제거 뒤에는 행마다 유일 (64bit: 1천만 행에서 충돌 확률 ~3x10^-6)
+    """
+    cols = [df[c].fillna("").astype(str).tolist() for c in DEDUP_COLS]
+    ids = [hashlib.blake2b("\x1f".join(v).encode("utf-8"), digest_size=8).hexdigest() for v in zip(*cols)]
+    return pd.Series(ids, index=df.index, name="review_id")
+
+def add_review_id(df: pd.DataFrame) -> pd.DataFrame:
+    if "review_id" not in df.columns:
+        df.insert(0, "review_id", review_id_col(df))
+    return df
+
+# =========================
+# 6) 기존 구현 (비교용)
+# =========================
+def load_and_clean_legacy(input_path):
+    df = pd.read_csv(input_path, encoding="utf-8-sig")
+    print(f"[로드] 행:{len(df)}")
+    for col in DROP_COLS:
+        if col in df.columns:
+            df.drop(columns=[col], inplace=True)
+    for c in TEXT_COLS:
+        df[c] = df[c].apply(normalize_text)
+    df["date"] = df["date"].apply(parse_date_to_dot)
+    df["rating"] = df["rating"].apply(to_float_safe)
+    df["review"] = df["review"].apply(extract_hangul)
+    df = df[df["review"].str.len() > 0].reset_index(drop=True)
+    df["skin_type"] = df["skin_type"].apply(lambda x: "None" if (pd.isna(x) or str(x).strip()=="") else str(x))
+    before = len(df)
+    df = df.drop_duplicates(subset=DEDUP_COLS).reset_index(drop=True)
+    if before != len(df):
+        print(f"[중복제거] {before-len(df)}건 제거 → {len(df)}건 남음")
+    print(f"[정제 완료] 최종 데이터 크기: {df.shape}")
+    return df
+
+def advanced_skin_type_extraction_legacy(df: pd.DataFrame) -> pd.DataFrame:
+    patterns = [re.compile(rf"{TYPE_GROUP}")]
+
+    def extract_from_text(text):
+        s = "" if pd.isna(text) else str(text)
+        for p in patterns:
+            m = p.search(s)
+            if m:
+                val = m.group(m.lastindex or 1)
+                return "지성" if val == "수부지" else val
+        return "None"
+
+    mask = df["skin_type"].astype(str).str.strip().eq("None")
+    df.loc[mask, "skin_type"] = df.loc[mask, "review"].apply(extract_from_text)
+    print("✅ 피부 타입 자동 추출 완료!")
+    return df
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+증분 재크롤링용 체크포인트 저장소 (sqlite, 표준 라이브러리만)
+- 상품×성별 high-water mark: 지금까지 본 가장 최신 date + SEEN 시그니처(해시)
+  → 다음 실행에서 '이미 아는 리뷰만 있는 페이지'를 만나면 그 성별 페이지 넘김을 멈춘다
+- 실행(run)별 진행 상황: 상품×성별 마지막으로 기록한 페이지 / 완료 여부
+  → 중단된 크롤을 START_AT 없이 그 상품·그 페이지부터 재개
+- 기록 순서: CSV append → commit_page (같은 페이지를 두 번 쓰는 일은 재개 직후 1페이지로 한정)
+- 최신 date 는 성별을 끝까지 돌았을 때만 hwm 에 반영 → 중간에 끊긴 크롤을 재개할 때
+  이번 실행 1페이지의 날짜 때문에 남은 (더 오래된) 페이지를 '이미 본 것'으로 오판하지 않음
+"""
+
+import time, sqlite3, hashlib
+
+from pipeline.oy_reviews import extract_goods_no, review_sig
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen (
+    product_key TEXT NOT NULL, gender TEXT NOT NULL, sig TEXT NOT NULL,
+    PRIMARY KEY (product_key, gender, sig)
+);
+CREATE TABLE IF NOT EXISTS hwm (
+    product_key TEXT NOT NULL, gender TEXT NOT NULL,
+    newest_date TEXT NOT NULL, updated_at REAL NOT NULL,
+    PRIMARY KEY (product_key, gender)
+);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL, finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS progress (
+    run_id INTEGER NOT NULL, product_key TEXT NOT NULL, gcode TEXT NOT NULL,
+    last_page INTEGER NOT NULL DEFAULT 0, done INTEGER NOT NULL DEFAULT 0,
+    max_date TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (run_id, product_key, gcode)
+);
+"""
+
+def product_key(product):
+    """상품 식별키: goodsNo (링크 파라미터 순서/추적 파라미터가 달라도 같은 상품)."""
+    link = product.get("product_link", "")
+    return extract_goods_no(link) or link
+
+def sig_hash(sig):
+    return hashlib.sha1("\x1f".join(map(str, sig)).encode("utf-8")).hexdigest()[:20]
+
+def _is_date(s):
+    return len(s) == 10 and s[4] == "." and s[7] == "."
+
+def page_is_stale(page_rows, known, newest_date=""):
+    """
+    페이지의 모든 리뷰가 이미 아는 리뷰(또는 high-water mark 보다 오래된 날짜)면 True.
+    날짜는 'YYYY.MM.DD' 문자열이라 사전순 비교 = 날짜 비교. 같은 날짜는 새 리뷰일 수 있어 제외.
+    """
+    if not page_rows:
+        return False
+    for r in page_rows:
+        if sig_hash(review_sig(r)) in known:
+            continue
+        d = r.get("date", "")
+        if newest_date and _is_date(d) and d < newest_date:
+            continue
+        return False
+    return True
+
+
+class CrawlState:
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.run_id = None
+
+    def close(self):
+        self.conn.close()
+
+    # ---- 실행(run) ----
+    def start_run(self, resume=True):
+        """끝나지 않은 직전 실행이 있으면 이어받고, 없으면 새 실행. 반환: (run_id, 재개 여부)."""
+        row = self.conn.execute(
+            "SELECT run_id FROM runs WHERE finished_at IS NULL ORDER BY run_id DESC LIMIT 1"
+        ).fetchone()
+        if resume and row:
+            self.run_id = row[0]
+            return self.run_id, True
+        with self.conn:
+            cur = self.conn.execute("INSERT INTO runs(started_at) VALUES (?)", (time.time(),))
+        self.run_id = cur.lastrowid
+        return self.run_id, False
+
+    def attach_run(self, run_id):
+        """워커 프로세스 등에서 이미 시작된 실행에 붙는다(읽기 위주)."""
+        self.run_id = run_id
+
+    def finish_run(self):
+        with self.conn:
+            self.conn.execute("UPDATE runs SET finished_at=? WHERE run_id=?", (time.time(), self.run_id))
+
+    # ---- high-water mark ----
+    def known_sigs(self, key, glabel):
+        cur = self.conn.execute("SELECT sig FROM seen WHERE product_key=? AND gender=?", (key, glabel))
+        return {r[0] for r in cur}
+
+    def filter_unseen(self, key, glabel, rows):
+        """아직 기록되지 않은 행만 (writer 가 CSV append 직전에 호출 → 재시도/재개 때도 중복 기록 없음)."""
+        if not rows:
+            return []
+        hashes = [sig_hash(review_sig(r)) for r in rows]
+        marks = ",".join("?" * len(hashes))
+        cur = self.conn.execute(
+            f"SELECT sig FROM seen WHERE product_key=? AND gender=? AND sig IN ({marks})",
+            (key, glabel, *hashes),
+        )
+        have = {r[0] for r in cur}
+        return [r for r, h in zip(rows, hashes) if h not in have]
+
+    def newest_date(self, key, glabel):
+        row = self.conn.execute(
+            "SELECT newest_date FROM hwm WHERE product_key=? AND gender=?", (key, glabel)
+        ).fetchone()
+        return row[0] if row else ""
+
+    # ---- 진행 상황 ----
+    def gender_done(self, key, gcode):
+        row = self.conn.execute(
+            "SELECT done FROM progress WHERE run_id=? AND product_key=? AND gcode=?",
+            (self.run_id, key, gcode),
+        ).fetchone()
+        return bool(row and row[0])
+
+    def resume_page(self, key, gcode):
+        """이번 실행에서 이 상품·성별의 다음에 읽을 페이지 (처음이면 1)."""
+        row = self.conn.execute(
+            "SELECT last_page FROM progress WHERE run_id=? AND product_key=? AND gcode=?",
+            (self.run_id, key, gcode),
+        ).fetchone()
+        return (row[0] + 1) if row else 1
+
+    def done_products(self, n_genders=2):
+        cur = self.conn.execute(
+            "SELECT product_key FROM progress WHERE run_id=? AND done=1 "
+            "GROUP BY product_key HAVING COUNT(*) >= ?",
+            (self.run_id, n_genders),
+        )
+        return {r[0] for r in cur}
+
+    def commit_page(self, key, gcode, glabel, page_no, rows, last=False):
+        """CSV 에 쓴 직후 호출: 시그니처/진행 페이지(+성별 완료 시 최신 날짜)를 한 트랜잭션으로 기록."""
+        dates = [r["date"] for r in rows if _is_date(r.get("date", ""))]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO seen(product_key, gender, sig) VALUES (?,?,?)",
+                [(key, glabel, sig_hash(review_sig(r))) for r in rows],
+            )
+            self.conn.execute(
+                "INSERT INTO progress(run_id, product_key, gcode, last_page, done, max_date) VALUES (?,?,?,?,?,?) "
+                "ON CONFLICT(run_id, product_key, gcode) DO UPDATE SET "
+                "last_page=MAX(last_page, excluded.last_page), done=MAX(done, excluded.done), "
+                "max_date=MAX(max_date, excluded.max_date)",
+                (self.run_id, key, gcode, page_no, int(last), max(dates) if dates else ""),
+            )
+            if last:
+                row = self.conn.execute(
+                    "SELECT max_date FROM progress WHERE run_id=? AND product_key=? AND gcode=?",
+                    (self.run_id, key, gcode),
+                ).fetchone()
+                if row and row[0]:
+                    self.conn.execute(
+                        "INSERT INTO hwm(product_key, gender, newest_date, updated_at) VALUES (?,?,?,?) "
+                        "ON CONFLICT(product_key, gender) DO UPDATE SET "
+                        "newest_date=MAX(newest_date, excluded.newest_date), updated_at=excluded.updated_at",
+                        (key, glabel, row[0], time.time()),
+                    )
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+리뷰 임베딩 저장소 (텍스트 해시 → 행, memmap 벡터 행렬) + 상품 벡터 증분 집계
+- 노트북을 다시 돌릴 때 KoBERT 로 전체 리뷰를 다시 인코딩하지 않도록, 이미 인코딩한 텍스트는 저장소에서 읽음
+  → 새로 수집됐거나 바뀐 리뷰만 인코딩. 새 리뷰가 없으면 모델(transformer)을 아예 로드하지 않음
+- 디렉터리 구성 (모델마다 하위 디렉터리 1개 — 같은 텍스트라도 모델/양자화가 다르면 다른 벡터)
+    <root>/<모델>/meta.json      : 모델 이름, 차원, dtype, 행 수 n (n 까지만 유효 — 쓰다 멈춰도 다음 열 때 잘라냄)
+    <root>/<모델>/keys.bin       : 행마다 텍스트 blake2b 16바이트 해시
+    <root>/<모델>/vectors.bin    : (n, dim) float32|float16 (np.memmap)
+    <root>/<모델>/items/<이름>.npz, .vec.npy : 상품 벡터 집계 상태 (상품 목록, 가중합, 반영된 (상품, 행, 가중치))
+- 추가는 뒤에 붙이기만 함 (append-only). 쓰는 프로세스는 1개라고 가정
+- update_items: 지난번 반영분과 이번 (상품, 리뷰 행, 평점) 목록의 차이만 가중합에 더하고/빼서 상품 벡터 갱신
+
+사용 예)
+    store = EmbeddingStore.open(EMBED_STORE_DIR, "monologg/kobert-int8")
+    rows = store.ensure(df["review"].tolist(), lambda: ReviewEncoder("monologg/kobert", quantize=True))
+    items, X_item = store.update_items(df["item_id"], rows, weights=df["rating"], items=item_text_df["item_id"])
+"""
+
+import os, re, json, hashlib
+
+import numpy as np
+
+KEY_BYTES = 16
+
+def text_key(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=KEY_BYTES).digest()
+
+def _write_json(path, obj):
+    tmp = os.path.join(os.path.dirname(path), "." + os.path.basename(path))
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)
+
+# =========================
+# 1) 텍스트 → 벡터 저장소
+# =========================
+class EmbeddingStore:
+    def __init__(self, path, meta):
+        self.path = path
+        self.meta = meta
+        self._vectors = None
+        self._sorted_keys = self._sorted_rows = None
+        self.stats = {"hit": 0, "encoded": 0}
+
+    @classmethod
+    def open(cls, root, model_name, dtype="float32"):
+        """model_name 마다 하위 디렉터리. dtype 은 처음 만들 때만 쓰임 (float16 → 용량 절반)."""
+        path = os.path.join(root, re.sub(r"[^\w.-]+", "_", model_name))
+        os.makedirs(os.path.join(path, "items"), exist_ok=True)
+        meta_path = os.path.join(path, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+        else:
+            meta = {"model": model_name, "dim": None, "dtype": np.dtype(dtype).name, "n": 0}
+            _write_json(meta_path, meta)
+        return cls(path, meta)
+
+    def __len__(self):
+        return self.meta["n"]
+
+    @property
+    def dim(self):
+        return self.meta["dim"]
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    @property
+    def vectors(self):
+        """(n, dim) 읽기 전용 memmap."""
+        if self._vectors is None:
+            n = self.meta["n"]
+            if n == 0:
+                self._vectors = np.zeros((0, self.dim or 0), dtype=self.meta["dtype"])
+            else:
+                self._vectors = np.memmap(self._file("vectors.bin"), dtype=self.meta["dtype"], mode="r",
+                                          shape=(n, self.dim))
+        return self._vectors
+
+    # ---- 조회 ----
+    def keys_of(self, texts):
+        return np.array([text_key(t) for t in texts], dtype=f"S{KEY_BYTES}")
+
+    def _index(self):
+        if self._sorted_keys is None:
+            n = self.meta["n"]
+            keys = np.fromfile(self._file("keys.bin"), dtype=f"S{KEY_BYTES}", count=n) if n else \
+                np.zeros(0, dtype=f"S{KEY_BYTES}")
+            order = np.argsort(keys, kind="stable")
+            self._sorted_keys, self._sorted_rows = keys[order], order.astype(np.int64)
+        return self._sorted_keys, self._sorted_rows
+
+    def rows_of(self, keys):
+        """해시 → 행 번호 (없으면 -1)."""
+        sk, sr = self._index()
+        keys = np.asarray(keys, dtype=f"S{KEY_BYTES}")
+        if len(sk) == 0:
+            return np.full(len(keys), -1, dtype=np.int64)
+        pos = np.minimum(np.searchsorted(sk, keys), len(sk) - 1)
+        return np.where(sk[pos] == keys, sr[pos], -1)
+
+    # ---- 추가 ----
+    def append(self, keys, vecs):
+        vecs = np.asarray(vecs)
+        n = self.meta["n"]
+        if self.meta["dim"] is None:
+            self.meta["dim"] = int(vecs.shape[1])
+        elif vecs.shape[1] != self.meta["dim"]:
+            raise ValueError(f"벡터 차원 {vecs.shape[1]} != 저장소 차원 {self.meta['dim']}")
+        itemsize = np.dtype(self.meta["dtype"]).itemsize
+        for name, data, size in (("keys.bin", np.asarray(keys, dtype=f"S{KEY_BYTES}"), KEY_BYTES),
+                                 ("vectors.bin", vecs.astype(self.meta["dtype"]), itemsize * self.meta["dim"])):
+            with open(self._file(name), "ab") as f:
+                f.truncate(n * size)  # meta 이후에 쓰다 만 꼬리 제거
+                f.seek(n * size)
+                f.write(np.ascontiguousarray(data).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+        self.meta["n"] = n + len(vecs)
+        _write_json(self._file("meta.json"), self.meta)
+        self._vectors = self._sorted_keys = self._sorted_rows = None
+
+    def ensure(self, texts, make_encoder, block=20_000):
+        """
+        texts 의 행 번호 배열 (입력 순서). 저장소에 없는 텍스트만 make_encoder() 로 만든 인코더(.encode)로 인코딩.
+        모두 있으면 make_encoder 를 호출하지 않음 (모델 로드 없음). block 건마다 저장 → 중간에 멈춰도 이어서
+        """
+        texts = ["" if t is None else str(t) for t in texts]
+        keys = self.keys_of(texts)
+        rows = self.rows_of(keys)
+        miss = np.flatnonzero(rows < 0)
+        self.stats["hit"] += len(texts) - len(miss)
+        if len(miss):
+            _, first = np.unique(keys[miss], return_index=True)
+            todo = np.sort(miss[first])
+            encoder = make_encoder()
+            for b in range(0, len(todo), block):
+                idx = todo[b:b + block]
+                self.append(keys[idx], encoder.encode([texts[i] for i in idx]))
+            self.stats["encoded"] += len(todo)
+            rows = self.rows_of(keys)
+        return rows
+
+    # =========================
+    # 2) 상품 벡터 (증분 집계)
+    # =========================
+    def _item_files(self, name):
+        base = os.path.join(self.path, "items", name)
+        return base + ".npz", base + ".vec.npy"
+
+    def load_items(self, name="items"):
+        """저장된 상품 벡터 (상품 목록, (m, dim) float32 memmap). 없으면 None."""
+        state_path, vec_path = self._item_files(name)
+        if not os.path.exists(vec_path):
+            return None
+        with np.load(state_path) as z:
+            items = z["items"].tolist()
+        return items, np.load(vec_path, mmap_mode="r")
+
+    def update_items(self, item_keys, rows, weights=None, items=None, name="items", rebuild=False):
+        """
+        리뷰(상품 키, 저장소 행, 가중치) 목록 → 상품 벡터 (가중 평균 후 L2 정규화, float32 memmap).
+        지난번 목록과 달라진 (상품, 행, 가중치) 만큼만 가중합을 고침. rebuild=True 면 처음부터 다시 합산
+        items: 결과 행 순서 (없으면 정렬된 고유 키). 반환: (상품 목록, 벡터)
+        """
+        keys = [str(k) for k in item_keys]
+        items = sorted(set(keys)) if items is None else [str(k) for k in items]
+        pos = {k: i for i, k in enumerate(items)}
+        codes = np.fromiter((pos.get(k, -1) for k in keys), dtype=np.int64, count=len(keys))
+        w = np.ones(len(keys), dtype=np.float32) if weights is None else \
+            np.nan_to_num(np.asarray(weights, dtype=np.float32), nan=0.0)
+        rows = np.asarray(rows, dtype=np.int64)
+        keep = (codes >= 0) & (rows >= 0)
+        rec_dtype = [("item", np.int64), ("row", np.int64), ("w", np.float32)]
+        new = np.zeros(int(keep.sum()), dtype=rec_dtype)
+        new["item"], new["row"], new["w"] = codes[keep], rows[keep], w[keep]
+
+        dim = self.dim or 0
+        sums = np.zeros((len(items), dim), dtype=np.float64)
+        old = np.zeros(0, dtype=rec_dtype)
+        state_path, vec_path = self._item_files(name)
+        if os.path.exists(state_path) and not rebuild:
+            with np.load(state_path) as z:
+                old_items, old_sums, old = z["items"].tolist(), z["sums"], z["contrib"]
+            remap = np.array([pos.get(k, -1) for k in old_items], dtype=np.int64)
+            hit = remap >= 0
+            sums[remap[hit]] = old_sums[hit]
+            old = old[remap[old["item"]] >= 0] if len(old) else old
+            old["item"] = remap[old["item"]]
+
+        # 차이 = 이번 목록 - 지난 목록 (중복 리뷰는 개수로)
+        both = np.concatenate([old, new])
+        sign = np.concatenate([-np.ones(len(old), dtype=np.int64), np.ones(len(new), dtype=np.int64)])
+        delta = np.zeros(0, dtype=rec_dtype)
+        if len(both):
+            uniq, inv = np.unique(both, return_inverse=True)
+            net = np.zeros(len(uniq), dtype=np.int64)
+            np.add.at(net, inv.ravel(), sign)
+            nz = net != 0
+            delta, net = uniq[nz], net[nz]
+            if len(delta):
+                contrib = np.asarray(self.vectors[delta["row"]], dtype=np.float64) * (delta["w"] * net)[:, None]
+                np.add.at(sums, delta["item"], contrib)
+        self.stats["item_delta"] = int(len(delta))
+
+        norm = np.linalg.norm(sums, axis=1, keepdims=True)
+        vec = (sums / np.maximum(norm, 1e-9)).astype(np.float32)
+        tmp_state = os.path.join(os.path.dirname(state_path), "." + os.path.basename(state_path))
+        tmp_vec = os.path.join(os.path.dirname(vec_path), "." + os.path.basename(vec_path))
+        with open(tmp_state, "wb") as f:
+            np.savez(f, items=np.array(items, dtype=str), sums=sums, contrib=new)
+        with open(tmp_vec, "wb") as f:
+            np.save(f, vec)
+        os.replace(tmp_state, state_path)
+        os.replace(tmp_vec, vec_path)
+        return items, np.load(vec_path, mmap_mode="r")
+
+    def report(self):
+        s = self.stats
+        print(f"🗂 임베딩 저장소 {os.path.basename(self.path)}: {len(self):,}개 벡터, 이번 조회 {s['hit']:,}건 재사용 / "
+              f"{s['encoded']:,}건 새로 인코딩, 상품 벡터 변경분 {s.get('item_delta', 0):,}건")
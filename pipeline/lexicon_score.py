@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+감성사전 배치 채점 (predict_lexicon 대체: 정규화 정규식 축소 + 프로세스 풀 + 청크 스트리밍)
+- normalize_text: 감성분석 노트북 C 셀과 같은 결과를 정규식 2번으로
+    · URL/멘션/해시태그 패턴은 'http'/'www.'/'@'/'#' 가 있을 때만 (대부분의 리뷰는 건너뜀)
+    · 이모지 패턴은 생략: 이모지는 마지막 허용문자 필터에서 어차피 공백이 됨
+    · 허용문자 필터 + 공백 압축을 정규식 1개로 (허용되지 않는 문자/공백이 이어진 구간 → 공백 1개)
+- LexiconBatchScorer: 워커 프로세스마다 LexiconScorer(pipeline/token_match.py) 1개 (initializer 로 1회 전달)
+    · tokenize_many=None → 정규화/간이 토큰화/채점을 워커에서 한 번에 (텍스트 → 점수만 주고받음)
+    · tokenize_many=함수 → 정규화/채점은 워커, 토큰화는 그 함수(Komoran TokenizeService: 자체 풀 + 캐시)
+- 결과는 numpy 배열 (lex_score float64, lex_pred int8: 점수 > 0 → 0(긍정), 아니면 1)
+- iter_scores / write_scores: DataFrame 청크(pd.read_csv(chunksize=...)) 를 흘려보내며 청크마다 점수 기록
+  → 1천만 리뷰도 메모리에는 청크 1개만
+
+사용 예)
+    with LexiconBatchScorer(lex_scorer, tokenize_many=tokenize_many, workers=4) as bs:
+        lex_scores, lex_labels = bs.score(df["review"])
+        bs.write_scores(pd.read_csv(DATA_PATH, chunksize=200_000), "lex_scores.csv", text_col="review")
+"""
+
+import re, time
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# =========================
+# 1) 정규화 (노트북 C 셀과 같은 결과)
+# =========================
+EMOJI_PATTERN = re.compile(
+    "[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF"
+    "\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF]+", flags=re.UNICODE)
+URL_PATTERN = re.compile(r"(http[s]?://\S+|www\.\S+)")
+MENTION_PATTERN = re.compile(r"@[A-Za-z0-9_]+")
+HASHTAG_PATTERN = re.compile(r"#[^\s#]+")
+REPEAT_PATTERN = re.compile(r"(.)\1{2,}")
+DROP_SPACE_PATTERN = re.compile(r"(?:[^0-9a-zA-Z가-힣ㄱ-ㅎㅏ-ㅣ\s\.\,\!\?\%]|\s)+")
+
+def normalize_text(s) -> str:
+    if not isinstance(s, str):
+        s = str(s) if s is not None else ""
+    s = s.lower().strip()
+    if "http" in s or "www." in s:
+        s = URL_PATTERN.sub(" ", s)
+    if "@" in s:
+        s = MENTION_PATTERN.sub(" ", s)
+    if "#" in s:
+        s = HASHTAG_PATTERN.sub(" ", s)
+    s = REPEAT_PATTERN.sub(r"\1\1", s)                   # 반복문자 축약
+    return DROP_SPACE_PATTERN.sub(" ", s).strip()
+
+def normalize_text_legacy(s) -> str:
+    if not isinstance(s, str):
+        s = str(s) if s is not None else ""
+    s = s.lower().strip()
+    s = URL_PATTERN.sub(" ", s)
+    s = MENTION_PATTERN.sub(" ", s)
+    s = HASHTAG_PATTERN.sub(" ", s)
+    s = EMOJI_PATTERN.sub(" ", s)
+    s = re.sub(r"(.)\1{2,}", r"\1\1", s)
+    s = re.sub(r"[^0-9a-zA-Z가-힣ㄱ-ㅎㅏ-ㅣ\s\.\,\!\?\%]", " ", s)
+    s = re.sub(r"\s+", " ", s).strip()
+    return s
+
+_SIMPLE_DROP = re.compile(r"[^0-9a-zA-Z가-힣\s]")
+_SPACES = re.compile(r"\s+")
+
+def simple_tokenize(sent: str):
+    """노트북 D 셀의 간이 토크나이저 (Komoran 을 못 쓸 때)."""
+    return _SPACES.sub(" ", _SIMPLE_DROP.sub(" ", sent)).strip().split()
+
+# =========================
+# 2) 워커
+# =========================
+_worker_scorer = None
+
+def _init_worker(scorer):
+    global _worker_scorer
+    _worker_scorer = scorer
+
+def _normalize_chunk(texts):
+    return [normalize_text(t) for t in texts]
+
+def _score_chunk(token_lists):
+    return np.fromiter((_worker_scorer.score(t) for t in token_lists), dtype=np.float64, count=len(token_lists))
+
+def _full_chunk(texts):
+    score = _worker_scorer.score
+    return np.fromiter((score(simple_tokenize(normalize_text(t))) for t in texts), dtype=np.float64, count=len(texts))
+
+def labels_from_scores(scores):
+    return np.where(scores > 0, 0, 1).astype(np.int8)
+
+def _as_texts(texts, text_col=None):
+    if text_col is not None and hasattr(texts, "columns"):
+        texts = texts[text_col]
+    if hasattr(texts, "fillna"):
+        return texts.fillna("").astype(str).tolist()
+    return ["" if t is None else str(t) for t in texts]
+
+# =========================
+# 3) 배치 채점
+# =========================
+class LexiconBatchScorer:
+    def __init__(self, scorer, tokenize_many=None, workers=4, chunk_size=2000):
+        """
+        scorer: LexiconScorer (사전/동의어/부정어 규칙이 컴파일된 것)
+        tokenize_many: 정규화된 문장 목록 → 토큰 목록 (None → simple_tokenize 를 워커에서)
+        workers: 1 → 현재 프로세스에서, 2 이상 → spawn 프로세스 풀
+        """
+        self.scorer = scorer
+        self.tokenize_many = tokenize_many
+        self.workers = max(1, int(workers))
+        self.chunk_size = chunk_size
+        self.stats = {"texts": 0, "sec": 0.0}
+        self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=mp.get_context("spawn"),
+                initializer=_init_worker, initargs=(self.scorer,),
+            )
+        return self._pool
+
+    def _map(self, fn, items):
+        if self.workers == 1:
+            _init_worker(self.scorer)
+            return [fn(items)]
+        parts = [items[i:i + self.chunk_size] for i in range(0, len(items), self.chunk_size)]
+        return list(self._get_pool().map(fn, parts))
+
+    def score(self, texts, text_col=None):
+        """텍스트 목록(list / Series / DataFrame+text_col) → (lex_score, lex_pred) numpy 배열."""
+        t0 = time.perf_counter()
+        texts = _as_texts(texts, text_col)
+        if not texts:
+            scores = np.empty(0, dtype=np.float64)
+        elif self.tokenize_many is None:
+            scores = np.concatenate(self._map(_full_chunk, texts))
+        else:
+            sents = [s for part in self._map(_normalize_chunk, texts) for s in part]
+            scores = np.concatenate(self._map(_score_chunk, self.tokenize_many(sents)))
+        self.stats["texts"] += len(texts)
+        self.stats["sec"] += time.perf_counter() - t0
+        return scores, labels_from_scores(scores)
+
+    def iter_scores(self, chunks, text_col=None):
+        """청크 스트림(DataFrame 청크 또는 텍스트 목록) → 청크마다 (lex_score, lex_pred)."""
+        for chunk in chunks:
+            yield self.score(chunk, text_col)
+
+    def write_scores(self, chunks, out_path, text_col=None):
+        """청크마다 점수를 CSV(lex_score, lex_pred, 입력 순서)로 이어 씀. 반환: 기록한 행 수."""
+        n = 0
+        with open(out_path, "w", encoding="utf-8") as f:
+            f.write("lex_score,lex_pred\n")
+            for scores, labels in self.iter_scores(chunks, text_col):
+                f.writelines(f"{s!r},{l}\n" for s, l in zip(scores.tolist(), labels.tolist()))
+                n += len(scores)
+                print(f"  ↳ 채점 {n:,}건 ({self.rate():.0f}건/s)")
+        return n
+
+    def rate(self):
+        return self.stats["texts"] / self.stats["sec"] if self.stats["sec"] else 0.0
+
+    def report(self):
+        print(f"📊 감성사전 채점: {self.stats['texts']}건 / {self.stats['sec']:.1f}s, "
+              f"{self.rate():.0f}건/s, 워커 {self.workers}")
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,360 @@
+# -*- coding: utf-8 -*-
+"""
+올리브영 리뷰 목록(#gdasList) 추출 공용 로직
+- 스킨 태그 3분할(split_skin_tags), 평점 파싱(parse_rating_to_float), CSV 컬럼 정의
+- 페이지 추출: execute_script 1회로 리뷰 10건을 구조화(JSON)해서 가져옴 (기존: 리뷰당 ~10회 왕복)
+- 기존 요소별 find_element 방식(extract_review_page_legacy)은 벤치마크/비교용으로 유지
+- 브라우저 없이 받은 리뷰 목록 HTML(AJAX 조각/저장본)은 parse_review_list_html 로 같은 구조로 파싱
+- 검색/카테고리 상품 목록 HTML 은 parse_product_list_html (크롤러 parse_product_cards 와 같은 dict)
+"""
+
+import re
+from html.parser import HTMLParser
+
+# =========================
+# 1) CSV 컬럼
+# =========================
+REVIEW_FIELDS = [
+    "product_name","product_brand","product_link",
+    "customer_name",
+    "skin_type","skin_tone","skin_concerns",
+    "review","date","rating_text","rating","gender"
+]
+
+# =========================
+# 2) 유틸
+# =========================
+def parse_rating_to_float(text: str):
+    if not text:
+        return None
+    nums = re.findall(r'(\d+(?:\.\d+)?)', text)
+    if not nums:
+        return None
+    try:
+        return float(nums[-1])
+    except:
+        return None
+
+# =========================
+# 3) 스킨 태그 분리(피부타입/피부톤/피부고민)
+# =========================
+SKIN_TYPE_SET = {"지성","건성","복합성","민감성","약건성","트러블성","중성"}
+SKIN_TONE_SET = {"쿨톤","웜톤","봄웜톤","여름쿨톤","가을웜톤","겨울쿨톤","봄원톤"}
+SKIN_CONCERN_SET = {
+    "잡티","미백","주름","각질","트러블","블랙헤드","피지과다","민감성",
+    "모공","탄력","홍조","아토피","다크서클"
+}
+ALIAS = {
+    "봄원톤":"봄웜톤",
+    "여드름":"트러블",
+    "여드름성":"트러블성",
+    "트러블성피부":"트러블성",
+    "민감성피부":"민감성",
+}
+
+def _norm_token(s: str) -> str:
+    t = (s or "").strip().replace(" ", "")
+    return ALIAS.get(t, t)
+
+def split_skin_tags(span_texts):
+    skin_type = ""
+    skin_tone = ""
+    concerns = []
+    seen = set()
+    for raw in span_texts:
+        tok = _norm_token(raw)
+        if not tok or tok in seen:
+            continue
+        seen.add(tok)
+        if not skin_type and tok in SKIN_TYPE_SET:
+            skin_type = tok
+            continue
+        if not skin_tone and tok in SKIN_TONE_SET:
+            skin_tone = "봄웜톤" if tok == "봄원톤" else tok
+            continue
+        if tok in SKIN_CONCERN_SET:
+            concerns.append(tok)
+    if skin_type == "민감성":
+        concerns = [c for c in concerns if c != "민감성"]
+    return skin_type, skin_tone, (" / ".join(concerns) if concerns else "")
+
+# =========================
+# 4) 원시 추출값 → CSV 행
+# =========================
+# raw = {"customer_name", "tags": [...], "review", "date", "rating_text"}
+def build_review_row(raw, glabel):
+    skin_type_val, skin_tone_val, skin_concerns_val = split_skin_tags(raw.get("tags") or [])
+    rating_text = raw.get("rating_text") or ""
+    rating_val = ""
+    if rating_text:
+        parsed = parse_rating_to_float(rating_text)
+        rating_val = parsed if parsed is not None else ""
+    name, date = raw.get("customer_name"), raw.get("date")
+    return {
+        "customer_name": "Anonymous" if name is None else name,
+        "skin_type": skin_type_val,
+        "skin_tone": skin_tone_val,
+        "skin_concerns": skin_concerns_val,
+        "review": raw.get("review", ""),
+        "date": "N/A" if date is None else date,
+        "rating_text": rating_text,
+        "rating": rating_val,
+        "gender": glabel,
+    }
+
+def extract_goods_no(link):
+    """상품 링크에서 goodsNo 추출 (없으면 "")."""
+    m = re.search(r"[?&]goodsNo=([A-Za-z0-9]+)", link or "")
+    return m.group(1) if m else ""
+
+def review_sig(row):
+    """성별 내 중복 판정 키 (기존 SEEN 과 동일: 이름, 날짜, 본문, 성별)."""
+    return (row["customer_name"], row["date"], row["review"], row["gender"])
+
+def rows_from_raw(raw_items, glabel, seen):
+    """페이지 원시 추출값 → 행 목록. seen(SEEN)에 있는 시그니처는 건너뛰고 새 것만 추가."""
+    out = []
+    for raw in raw_items:
+        row = build_review_row(raw, glabel)
+        sig = review_sig(row)
+        if sig in seen:
+            continue
+        seen.add(sig)
+        out.append(row)
+    return out
+
+# =========================
+# 5) 페이지 추출 (execute_script 1회)
+# =========================
+# - 셀렉터는 기존 find_element 경로와 동일, 텍스트는 innerText.trim() (= WebElement.text.strip())
+# - 이름 요소 없음 → null(→ Anonymous), 날짜 없음 → null(→ N/A), 평점은 title 우선
+REVIEW_LIST_JS = r"""
+const txt = (el) => (el ? (el.innerText || "").trim() : null);
+const out = [];
+document.querySelectorAll("#gdasList > li").forEach((li) => {
+  try {
+    const uid = li.querySelector("div.info > div > p.info_user > a.id");
+    const tags = Array.from(li.querySelectorAll("div.info > div > p.tag > span"))
+      .map((s) => (s.innerText || "").trim()).filter((t) => t);
+    const body = li.querySelector("div.review_cont > div.txt_inner");
+    const date = li.querySelector("div.review_cont > div.score_area > span.date");
+    const pt = li.querySelector("div.review_cont > div.score_area > span.review_point > span");
+    out.push({
+      customer_name: uid ? txt(uid) : null,
+      tags: tags,
+      review: body ? txt(body) : "",
+      date: date ? txt(date) : null,
+      rating_text: pt ? ((pt.getAttribute("title") || pt.innerText || "").trim()) : "",
+    });
+  } catch (e) { /* 기존 루프의 except: continue 와 동일 */ }
+});
+return out;
+"""
+
+def extract_review_page(driver):
+    """현재 #gdasList 의 리뷰 전부를 WebDriver 왕복 1회로 가져온다."""
+    return driver.execute_script(REVIEW_LIST_JS) or []
+
+def extract_review_page_legacy(driver):
+    """기존 요소별 추출(리뷰당 find_element ~10회). 벤치마크/회귀 비교용."""
+    from selenium.webdriver.common.by import By
+
+    out = []
+    for it in driver.find_elements(By.CSS_SELECTOR, "#gdasList > li"):
+        try:
+            if it.find_elements(By.CSS_SELECTOR, "div.info > div > p.info_user > a.id"):
+                customer_name = it.find_element(By.CSS_SELECTOR, "div.info > div > p.info_user > a.id").text.strip()
+            else:
+                customer_name = None
+
+            spans = it.find_elements(By.CSS_SELECTOR, "div.info > div > p.tag > span")
+            span_texts = [s.text.strip() for s in spans if s.text.strip()]
+
+            review_text = ""
+            if it.find_elements(By.CSS_SELECTOR, "div.review_cont > div.txt_inner"):
+                review_text = it.find_element(By.CSS_SELECTOR, "div.review_cont > div.txt_inner").text.strip()
+
+            date = None
+            if it.find_elements(By.CSS_SELECTOR, "div.review_cont > div.score_area > span.date"):
+                date = it.find_element(By.CSS_SELECTOR, "div.review_cont > div.score_area > span.date").text.strip()
+
+            rating_text = ""
+            rt = it.find_elements(By.CSS_SELECTOR, "div.review_cont > div.score_area > span.review_point > span")
+            if rt:
+                rating_text = (rt[0].get_attribute("title") or rt[0].text or "").strip()
+
+            out.append({
+                "customer_name": customer_name,
+                "tags": span_texts,
+                "review": review_text,
+                "date": date,
+                "rating_text": rating_text,
+            })
+        except Exception:
+            continue
+    return out
+
+# =========================
+# 6) 오프라인 HTML 파싱 (브라우저 없이, 표준 라이브러리만)
+# =========================
+# - REVIEW_LIST_JS 와 같은 셀렉터/필드. innerText 는 근사치:
+#   소스 공백은 1칸으로, <br> 은 줄바꿈, 블록 요소 경계는 줄바꿈 1개로 접음
+_VOID_TAGS = {"br","img","input","meta","link","hr","source","wbr","area","col","embed","param","track"}
+_BLOCK_TAGS = {
+    "div","p","li","ul","ol","dl","dt","dd","table","tbody","thead","tr","td","th",
+    "section","article","header","footer","h1","h2","h3","h4","h5","h6","form","fieldset",
+}
+_AUTO_CLOSE = {"li","p","dt","dd"}  # 같은 태그가 다시 열리면 앞의 것을 닫는다
+_BLOCK_MARK = "\x00"
+
+class _Node:
+    __slots__ = ("tag", "attrs", "children", "parent")
+
+    def __init__(self, tag, attrs, parent):
+        self.tag, self.attrs, self.children, self.parent = tag, attrs, [], parent
+
+    @property
+    def classes(self):
+        return set((self.attrs.get("class") or "").split())
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = _Node("#root", {}, None)
+        self.cur = self.root
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _AUTO_CLOSE and self.cur.tag == tag:
+            self.cur = self.cur.parent
+        node = _Node(tag, dict(attrs), self.cur)
+        self.cur.children.append(node)
+        if tag not in _VOID_TAGS:
+            self.cur = node
+
+    def handle_startendtag(self, tag, attrs):
+        self.cur.children.append(_Node(tag, dict(attrs), self.cur))
+
+    def handle_endtag(self, tag):
+        n = self.cur
+        while n is not None and n.tag != tag:
+            n = n.parent
+        if n is not None and n.parent is not None:
+            self.cur = n.parent
+
+    def handle_data(self, data):
+        self.cur.children.append(data)
+
+def _iter_nodes(node):
+    for c in node.children:
+        if isinstance(c, _Node):
+            yield c
+            yield from _iter_nodes(c)
+
+def _parse_step(step):
+    tag, *classes = step.strip().split(".")
+    return tag, set(classes)
+
+def _match(node, step):
+    tag, classes = step
+    return isinstance(node, _Node) and tag in ("", node.tag) and classes <= node.classes
+
+def _select(node, selector):
+    """'a.b > c > d.e' 형태(첫 단계는 하위 전체, 이후는 자식 결합자)만 지원."""
+    steps = [_parse_step(s) for s in selector.split(">")]
+    cur = [n for n in _iter_nodes(node) if _match(n, steps[0])]
+    for st in steps[1:]:
+        cur = [c for n in cur for c in n.children if _match(c, st)]
+    return cur
+
+def _inner_text(node):
+    parts = []
+
+    def walk(n):
+        for c in n.children:
+            if isinstance(c, str):
+                parts.append(re.sub(r"\s+", " ", c))
+            elif c.tag == "br":
+                parts.append("\n")
+            elif c.tag in ("script", "style"):
+                continue
+            else:
+                block = c.tag in _BLOCK_TAGS
+                if block: parts.append(_BLOCK_MARK)
+                walk(c)
+                if block: parts.append(_BLOCK_MARK)
+
+    walk(node)
+    text = re.sub(rf"[ ]*{_BLOCK_MARK}[{_BLOCK_MARK} ]*", "\n", "".join(parts).replace("\n", " \n "))
+    lines = [ln.strip() for ln in text.split("\n")]
+    return "\n".join(lines).strip()
+
+def _first(node, selector):
+    found = _select(node, selector)
+    return found[0] if found else None
+
+def _review_items(root):
+    for n in _iter_nodes(root):
+        if n.attrs.get("id") == "gdasList":
+            return [c for c in n.children if isinstance(c, _Node) and c.tag == "li"]
+    # AJAX 조각: 가장 바깥쪽 li 들
+    out = []
+    for n in _iter_nodes(root):
+        if n.tag != "li":
+            continue
+        p = n.parent
+        while p is not None and p.tag != "li":
+            p = p.parent
+        if p is None:
+            out.append(n)
+    return out
+
+def parse_review_list_html(html):
+    """리뷰 목록 HTML(전체 페이지 / #gdasList / li 조각) → extract_review_page 와 같은 원시 dict 목록."""
+    tb = _TreeBuilder()
+    tb.feed(html or "")
+    tb.close()
+    out = []
+    for li in _review_items(tb.root):
+        uid = _first(li, "div.info > div > p.info_user > a.id")
+        body = _first(li, "div.review_cont > div.txt_inner")
+        date = _first(li, "div.review_cont > div.score_area > span.date")
+        pt = _first(li, "div.review_cont > div.score_area > span.review_point > span")
+        tags = [_inner_text(s) for s in _select(li, "div.info > div > p.tag > span")]
+        out.append({
+            "customer_name": _inner_text(uid) if uid is not None else None,
+            "tags": [t for t in tags if t],
+            "review": _inner_text(body) if body is not None else "",
+            "date": _inner_text(date) if date is not None else None,
+            "rating_text": ((pt.attrs.get("title") or _inner_text(pt)).strip() if pt is not None else ""),
+        })
+    return out
+
+def _product_cards(root):
+    # 검색 결과: ul#w_cate_prd_list > li.flag.li_result, 카테고리 목록: ul.cate_prd_list > li
+    for n in _iter_nodes(root):
+        if n.tag == "ul" and n.attrs.get("id") == "w_cate_prd_list":
+            return [c for c in n.children if isinstance(c, _Node) and {"flag", "li_result"} <= c.classes]
+    return _select(root, "ul.cate_prd_list > li")
+
+def parse_product_list_html(html, base_url="https://www.oliveyoung.co.kr"):
+    """상품 목록 HTML → parse_product_cards 와 같은 dict 목록 (링크 없는 카드는 제외)."""
+    tb = _TreeBuilder()
+    tb.feed(html or "")
+    tb.close()
+    out = []
+    for li in _product_cards(tb.root):
+        name = _first(li, ".tx_name")
+        brand = _first(li, ".tx_brand")
+        a = _first(li, "a")
+        link = (a.attrs.get("href") or "").strip() if a is not None else ""
+        if not extract_goods_no(link) and a is not None and a.attrs.get("data-ref-goodsno"):
+            link = f"/store/goods/getGoodsDetail.do?goodsNo={a.attrs['data-ref-goodsno']}"
+        if link.startswith("/"):
+            link = base_url.rstrip("/") + link
+        if link and not link.lower().startswith("javascript"):
+            out.append({
+                "product_name": _inner_text(name) if name is not None else "N/A",
+                "product_brand": _inner_text(brand) if brand is not None else "N/A",
+                "product_link": link,
+            })
+    return out
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+"""
+추천 API 서버 (asyncio, 표준 라이브러리만) — 노트북 전역 변수 대신 게시된 추천 모델을 한 번 읽어서 응답
+- 모델 게시: publish_model(root, rec) → <root>/<버전>/ (BatchRecommender.save) + <root>/LATEST (임시 파일 → rename)
+- 엔드포인트 (GET, JSON)
+    /recommend?user_id=&k=10&content_weight=0.5&threshold=0.1 : recommend_hybrid_skin_filtered 와 같은 결과
+    /reload               : LATEST 즉시 확인 / /stats : p50·p99 지연, 캐시 적중률, 모델 버전 / /health
+- 채점(numpy)은 스레드 풀에서 → 이벤트 루프는 요청 수신/응답만
+- 캐시: (user, k, content_weight, threshold) → 결과, LRU(cache_size) + TTL(ttl 초), 모델 버전이 바뀌면 비움
+    · 사용자 프로필(좋아한 상품, 본 상품, 피부 프로필)은 게시된 모델에 고정 → 새 리뷰 반영은 다시 게시(publish_model)로
+      (사용자별 캐시만 지워서는 같은 모델로 같은 답을 다시 계산할 뿐이라 그런 엔드포인트는 두지 않음)
+- 모델 교체: poll 초마다 LATEST 확인 → 새 버전을 스레드에서 로드한 뒤 참조만 바꿈
+  (처리 중인 요청은 이전 모델 객체로 끝까지 → 교체 중에도 요청이 실패하지 않음)
+
+실행: python -m pipeline.rec_service --root ./recsys_model --port 8080
+사용 예)
+    publish_model("./recsys_model", BatchRecommender.from_frame(df, items, X_item_txt, cf_scorer, skin_idx))
+    curl "http://127.0.0.1:8080/recommend?user_id=user01&k=10"
+"""
+
+import os, json, time, asyncio, argparse, hashlib
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+import numpy as np
+
+from pipeline.batch_recommend import BatchRecommender
+
+# =========================
+# 1) 모델 게시 / 로드
+# =========================
+def publish_model(root, rec):
+    """rec(BatchRecommender) → 새 버전 디렉터리 + LATEST 갱신. 반환: 버전 이름."""
+    os.makedirs(root, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    tmp = os.path.join(root, f".{stamp}-{os.getpid()}")
+    rec.save(tmp)
+    h = hashlib.sha1(str(time.time_ns()).encode())
+    with open(os.path.join(tmp, "X_item.npy"), "rb") as f:
+        h.update(f.read(1 << 20))
+    version = f"{stamp}-{h.hexdigest()[:8]}"
+    os.replace(tmp, os.path.join(root, version))
+    with open(os.path.join(root, ".LATEST"), "w") as f:
+        f.write(version)
+    os.replace(os.path.join(root, ".LATEST"), os.path.join(root, "LATEST"))
+    return version
+
+def latest_version(root):
+    with open(os.path.join(root, "LATEST")) as f:
+        return f.read().strip()
+
+# =========================
+# 2) 캐시 / 지표
+# =========================
+class ResultCache:
+    """LRU + TTL."""
+
+    def __init__(self, max_size=100_000, ttl=600.0):
+        self.max_size, self.ttl = max_size, ttl
+        self._data = OrderedDict()   # key → (만료 시각, 값)
+        self.hits = self.misses = 0
+
+    def get(self, key, now):
+        item = self._data.get(key)
+        if item is None or item[0] < now:
+            if item is not None:
+                self._drop(key)
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return item[1]
+
+    def put(self, key, value, now):
+        self._data[key] = (now + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._drop(next(iter(self._data)))
+
+    def _drop(self, key):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+class LatencyWindow:
+    def __init__(self, size=10_000):
+        self._ms = deque(maxlen=size)
+        self.count = 0
+
+    def add(self, sec):
+        self._ms.append(sec * 1e3)
+        self.count += 1
+
+    def percentiles(self, qs=(50, 99)):
+        if not self._ms:
+            return {f"p{q}": 0.0 for q in qs}
+        arr = np.fromiter(self._ms, dtype=np.float64, count=len(self._ms))
+        return {f"p{q}": float(np.percentile(arr, q)) for q in qs}
+
+# =========================
+# 3) 서버
+# =========================
+class BadRequest(ValueError):
+    pass
+
+def _param(q, name, cast, default, lo=None, hi=None):
+    raw = q.get(name)
+    if raw is None or raw == "":
+        return default
+    try:
+        val = cast(raw)
+    except ValueError:
+        raise BadRequest(f"{name} 값이 잘못됨: {raw!r}")
+    if (lo is not None and val < lo) or (hi is not None and val > hi):
+        raise BadRequest(f"{name} 범위 밖: {raw!r} ({lo}~{hi})")
+    return val
+
+class RecService:
+    def __init__(self, root, cache_size=100_000, ttl=600.0, threads=4, poll=5.0):
+        self.root = root
+        self.cache = ResultCache(cache_size, ttl)
+        self.latency = LatencyWindow()
+        self.executor = ThreadPoolExecutor(max_workers=threads)
+        self.poll = poll
+        self.model, self.version = None, None
+        self.errors = self.reloads = 0
+        self._reload_lock = None
+
+    def load_latest(self):
+        """LATEST 가 가리키는 버전을 (현재와 다르면) 로드 → (버전, 모델) 또는 None. 스레드에서 호출."""
+        version = latest_version(self.root)
+        if version == self.version:
+            return None
+        return version, BatchRecommender.load(os.path.join(self.root, version), workers=1)
+
+    async def reload(self):
+        async with self._reload_lock:
+            loaded = await asyncio.get_running_loop().run_in_executor(self.executor, self.load_latest)
+            if loaded is None:
+                return False
+            self.version, self.model = loaded   # 참조 교체 — 처리 중인 요청은 이전 모델로 끝남
+            self.cache.clear()
+            self.reloads += 1
+            print(f"🔄 추천 모델 {self.version} 로드 (상품 {len(self.model.items):,}, 사용자 {len(self.model.users):,})")
+            return True
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.poll)
+            try:
+                await self.reload()
+            except Exception as e:  # 게시 중인 디렉터리 등 → 다음 주기에 다시
+                print(f"⚠️ 모델 다시 읽기 실패: {e!r}")
+
+    # ---- 요청 처리 ----
+    async def recommend(self, q):
+        user_id = q.get("user_id")
+        if not user_id:
+            raise BadRequest("user_id 가 필요합니다")
+        k = _param(q, "k", int, 10, 1, 100)
+        model, version = self.model, self.version
+        cw = _param(q, "content_weight", float, model.content_weight, 0.0, 1.0)
+        thr = _param(q, "threshold", float, model.skin_threshold, 0.0, 1.0)
+        key = (user_id, k, cw, thr)
+        now = time.monotonic()
+        items = self.cache.get(key, now)
+        cached = items is not None
+        if not cached:
+            items = await asyncio.get_running_loop().run_in_executor(self.executor, model.recommend, user_id, k, cw, thr)
+            if version == self.version:   # 도중에 모델이 바뀌었으면 캐시에 넣지 않음
+                self.cache.put(key, items, now)
+        return {"user_id": user_id, "version": version, "cached": cached,
+                "items": [{"item": it, "score": round(s, 6)} for it, s in items]}
+
+    def stats(self):
+        return {"version": self.version, "requests": self.latency.count, "errors": self.errors,
+                "reloads": self.reloads, "cache_size": len(self.cache), "cache_hit_rate": self.cache.hit_rate(),
+                **{f"{k}_ms": v for k, v in self.latency.percentiles().items()}}
+
+    async def route(self, path, q):
+        if path == "/recommend":
+            t0 = time.perf_counter()
+            out = await self.recommend(q)
+            self.latency.add(time.perf_counter() - t0)
+            return out
+        if path == "/reload":
+            return {"reloaded": await self.reload(), "version": self.version}
+        if path == "/stats":
+            return self.stats()
+        if path == "/health":
+            return {"ok": self.model is not None, "version": self.version}
+        return None
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                method, target, *_ = line.decode("latin-1").split(" ") + [""]
+                headers = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = h.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if int(headers.get("content-length") or 0):
+                    await reader.readexactly(int(headers["content-length"]))
+                parts = urlsplit(target)
+                q = {k: v[0] for k, v in parse_qs(parts.query).items()}
+                try:
+                    body = await self.route(parts.path, q)
+                    status = "200 OK" if body is not None else "404 Not Found"
+                    body = body if body is not None else {"error": "not found"}
+                except BadRequest as e:
+                    status, body = "400 Bad Request", {"error": str(e)}
+                except Exception as e:
+                    self.errors += 1
+                    status, body = "500 Internal Server Error", {"error": repr(e)}
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                close = headers.get("connection", "").lower() == "close"
+                writer.write((f"HTTP/1.1 {status}\r\nContent-Type: application/json; charset=utf-8\r\n"
+                              f"Content-Length: {len(data)}\r\nConnection: {'close' if close else 'keep-alive'}\r\n\r\n"
+                              ).encode("latin-1") + data)
+                await writer.drain()
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8080):
+        self._reload_lock = asyncio.Lock()
+        await self.reload()
+        server = await asyncio.start_server(self.handle, host, port, backlog=1024)
+        watcher = asyncio.create_task(self._watch())
+        print(f"🚀 추천 서버 http://{host}:{server.sockets[0].getsockname()[1]} (모델 {self.version})", flush=True)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+            self.executor.shutdown(wait=False)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--root", default="./recsys_model")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8080)
+    ap.add_argument("--threads", type=int, default=4)
+    ap.add_argument("--cache-size", type=int, default=100_000)
+    ap.add_argument("--ttl", type=float, default=600.0)
+    ap.add_argument("--poll", type=float, default=5.0)
+    args = ap.parse_args()
+    svc = RecService(args.root, cache_size=args.cache_size, ttl=args.ttl, threads=args.threads, poll=args.poll)
+    try:
+        asyncio.run(svc.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
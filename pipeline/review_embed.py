@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+리뷰 단위 KoBERT 임베딩 (길이 정렬 배치 + 토큰 예산 + CPU int8 동적 양자화) → 상품 벡터 집계
+- 기존 encode_texts(item_text_df["text"]) 는 상품 리뷰 전체를 이어 붙인 문자열을 통째로 토큰화한 뒤 128 토큰에서
+  잘라서 앞쪽 리뷰 몇 개만 반영됨 → 리뷰마다 임베딩하고 상품별로 (평점 가중) 평균
+- 배치: 청크(chunk_size 건)마다 토큰화 → 길이순 정렬 → 토큰 예산(max_batch_tokens = 배치 크기 × 패딩 길이) 안에서
+  배치 구성 → 패딩 최소, 활성화 메모리 상한 고정. 결과는 입력 순서대로 out 배열(np.memmap 가능)에 씀
+- 풀링은 attention_mask 평균 (기존 .mean(dim=1) 은 패딩 위치까지 평균 → 같은 리뷰도 배치 구성에 따라 값이 달라짐)
+- quantize=True: torch 동적 양자화(nn.Linear → int8), CPU 전용. 서버(GPU 없음)용
+- stats: 리뷰/초, 실제 토큰 수, 패딩 토큰 비율
+
+사용 예)
+    enc = ReviewEncoder("monologg/kobert", quantize=True)
+    vecs = enc.encode(df["review"].tolist())
+    enc.report()
+    items, X_item = aggregate_items(vecs, df["item_id"], weights=df["rating"], items=item_text_df["item_id"])
+"""
+
+import time
+
+import numpy as np
+
+try:
+    import torch
+    from transformers import AutoTokenizer, AutoModel
+    HAS_TORCH = True
+except ImportError:
+    HAS_TORCH = False
+
+def pick_device():
+    if torch.backends.mps.is_available():
+        return "mps"
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+def quantize_dynamic_int8(model):
+    q = getattr(getattr(torch, "ao", None), "quantization", None) or torch.quantization
+    return q.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+# =========================
+# 1) 인코더
+# =========================
+class ReviewEncoder:
+    def __init__(self, model_name="monologg/kobert", device=None, quantize=False, max_length=128,
+                 max_batch_tokens=8192, max_batch_size=64, chunk_size=4096, num_threads=None):
+        """
+        quantize: True → CPU 에서 int8 동적 양자화 모델 (device 무시)
+        max_batch_tokens: 배치 1개의 (배치 크기 × 패딩 길이) 상한 → 활성화 메모리 상한
+        chunk_size: 한 번에 토큰화하는 리뷰 수 (토큰 id 리스트 메모리 상한)
+        """
+        if not HAS_TORCH:
+            raise ImportError("torch, transformers 가 필요합니다: pip install torch transformers")
+        if num_threads:
+            torch.set_num_threads(num_threads)
+        self.model_name = model_name
+        self.quantized = bool(quantize)
+        self.max_length = max_length
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_size = max_batch_size
+        self.chunk_size = chunk_size
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModel.from_pretrained(model_name).eval()
+        if self.quantized:
+            device = "cpu"
+            model = quantize_dynamic_int8(model)
+        self.device = torch.device(device or pick_device())
+        self.model = model.to(self.device)
+        self.dim = int(model.config.hidden_size)
+        self.stats = {"texts": 0, "tokens": 0, "padded": 0, "batches": 0, "sec": 0.0}
+
+    def _batches(self, order, lengths):
+        """길이 오름차순 인덱스 → 토큰 예산 안의 배치들 (배치 마지막 원소가 가장 김)."""
+        batch = []
+        for j in order:
+            L = lengths[j]
+            if batch and ((len(batch) + 1) * L > self.max_batch_tokens or len(batch) >= self.max_batch_size):
+                yield batch
+                batch = []
+            batch.append(j)
+        if batch:
+            yield batch
+
+    def encode(self, texts, out=None):
+        """texts → (n, dim) float32 L2 정규화 벡터 (입력 순서). out: 미리 만든 (n, dim) 배열/np.memmap 에 기록."""
+        texts = ["" if t is None else str(t) for t in texts]
+        n = len(texts)
+        if out is None:
+            out = np.zeros((n, self.dim), dtype=np.float32)
+        t0 = time.perf_counter()
+        with torch.no_grad():
+            self._encode_into(texts, out)
+        self.stats["texts"] += n
+        self.stats["sec"] += time.perf_counter() - t0
+        return out
+
+    def _encode_into(self, texts, out):
+        for c0 in range(0, len(texts), self.chunk_size):
+            chunk = texts[c0:c0 + self.chunk_size]
+            enc = self.tokenizer(chunk, truncation=True, max_length=self.max_length, padding=False)
+            keys = list(enc.keys())
+            lengths = [len(x) for x in enc["input_ids"]]
+            order = np.argsort(lengths, kind="stable")
+            for batch in self._batches(order, lengths):
+                feats = [{k: enc[k][j] for k in keys} for j in batch]
+                inputs = self.tokenizer.pad(feats, return_tensors="pt").to(self.device)
+                hidden = self.model(**inputs).last_hidden_state
+                mask = inputs["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+                emb = (hidden * mask).sum(1) / mask.sum(1).clamp(min=1.0)
+                emb = torch.nn.functional.normalize(emb, p=2, dim=1)
+                out[c0 + np.asarray(batch)] = emb.float().cpu().numpy()
+                self.stats["tokens"] += sum(lengths[j] for j in batch)
+                self.stats["padded"] += len(batch) * lengths[batch[-1]]
+                self.stats["batches"] += 1
+
+    def rate(self):
+        return self.stats["texts"] / self.stats["sec"] if self.stats["sec"] else 0.0
+
+    def report(self):
+        s = self.stats
+        pad = 1 - s["tokens"] / s["padded"] if s["padded"] else 0.0
+        kind = "int8 동적 양자화" if self.quantized else "fp32"
+        print(f"🧠 리뷰 임베딩({kind}, {self.device}): {s['texts']}건 / {s['sec']:.1f}s, {self.rate():.1f}건/s, "
+              f"배치 {s['batches']}개, 패딩 {pad:.1%}")
+
+def encode_texts_legacy(texts, tokenizer, model, device, batch_size=16):
+    """추천 노트북 기존 encode_texts (입력 순서 고정 배치, 패딩 포함 평균) — 벤치 비교용."""
+    output_vectors = []
+    with torch.no_grad():
+        for i in range(0, len(texts), batch_size):
+            batch_texts = texts[i:i + batch_size]
+            encodings = tokenizer(batch_texts, padding=True, truncation=True, max_length=128, return_tensors="pt").to(device)
+            mean_pooled_emb = model(**encodings).last_hidden_state.mean(dim=1)
+            output_vectors.append(torch.nn.functional.normalize(mean_pooled_emb, p=2, dim=1).cpu())
+    return torch.vstack(output_vectors).numpy()
+
+# =========================
+# 2) 상품 벡터 집계
+# =========================
+def aggregate_items(review_vecs, item_keys, weights=None, items=None):
+    """
+    리뷰 벡터 → 상품 벡터 (가중 평균 후 L2 정규화).
+    item_keys: 리뷰마다 상품 키, weights: 리뷰 가중치(예: rating, 없으면 1)
+    items: 결과 행 순서 (예: item_text_df["item_id"]). 없으면 정렬된 고유 키. 리뷰가 없는 상품은 0 벡터
+    반환: (items 목록, (len(items), dim) float32)
+    """
+    keys = np.asarray(item_keys, dtype=object)
+    if items is None:
+        items = sorted(set(keys.tolist()) - {None})
+    items = list(items)
+    pos = {k: i for i, k in enumerate(items)}
+    codes = np.fromiter((pos.get(k, -1) for k in keys.tolist()), dtype=np.int64, count=len(keys))
+    w = np.ones(len(keys), dtype=np.float32) if weights is None else \
+        np.nan_to_num(np.asarray(weights, dtype=np.float32), nan=0.0)
+    keep = codes >= 0
+    codes, w = codes[keep], w[keep]
+    vecs = np.asarray(review_vecs)[keep]
+
+    out = np.zeros((len(items), vecs.shape[1] if vecs.ndim == 2 else 0), dtype=np.float32)
+    if len(codes):
+        order = np.argsort(codes, kind="stable")
+        sc = codes[order]
+        starts = np.flatnonzero(np.r_[True, sc[1:] != sc[:-1]])
+        out[sc[starts]] = np.add.reduceat(vecs[order] * w[order, None], starts, axis=0)
+    norm = np.linalg.norm(out, axis=1, keepdims=True)
+    return items, out / np.maximum(norm, 1e-9)
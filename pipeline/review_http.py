@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+브라우저 없이 리뷰 목록 AJAX 를 직접 호출하는 비동기 크롤 엔진
+- 브라우저에서 filterBtn → sati_type5(F/M) 라디오 → 적용, div.pageing 클릭이 하는 일은
+  결국 리뷰 목록 AJAX 재호출뿐이므로 같은 요청을 aiohttp 로 직접 보낸다
+- keep-alive 커넥션 풀(세션 1개 공유) + 동시 요청 세마포어 + 호스트별 적응형 속도 제한
+  (응답 지연/오류에 따라 요청 속도를 올리고 내림 → pipeline/throttle.py)
+- 응답 HTML 은 parse_review_list_html → rows_from_raw 로 처리 → append_reviews_to_csv 와 같은 행
+- record_dir 를 주면 응답을 저장 → bench/replay_server.py 로 그대로 재생해 테스트
+- state(CrawlState) 를 주면 증분 모드: 최신순 정렬, 재개 페이지부터, 이미 아는 리뷰만 있는 페이지에서 종료
+
+사용 예)
+    rows_by_product = asyncio.run(crawl_products_http(products, on_product=append_fn))
+"""
+
+import os, time, asyncio
+from urllib.parse import urlsplit
+
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+from pipeline.oy_reviews import (
+    parse_review_list_html, rows_from_raw, build_review_row, extract_goods_no, review_sig,
+)
+from pipeline.crawl_state import product_key, page_is_stale, sig_hash
+from pipeline.throttle import AdaptiveRateLimiter, WaitStats
+
+# =========================
+# 1) 엔드포인트/파라미터
+# =========================
+BASE_URL = "https://www.oliveyoung.co.kr"
+REVIEW_LIST_PATH = "/store/goods/getGdasList.do"
+GENDERS = [("F","여성"), ("M","남성")]
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119 Safari/537.36"
+)
+
+MAX_CONCURRENCY = 8       # 전체 동시 요청 수
+HOST_MIN_INTERVAL = 0.25  # 같은 호스트로 요청 사이 시작 간격(초) — 적응형 제한의 초기값 (0 이면 제한 없음)
+HOST_MAX_RATE = 8.0       # 응답이 빨라도 호스트당 초당 요청 상한
+TARGET_LATENCY = 1.0      # 응답 지연 EWMA 가 이보다 길면 속도를 줄임(초)
+MAX_PAGES = 500           # 성별당 페이지 상한(무한루프 방지)
+GDAS_SORT_DEFAULT = "05"  # 기본 정렬(브라우저 첫 화면과 동일)
+GDAS_SORT_LATEST = "02"   # 최신순 (증분 모드)
+REQUEST_TIMEOUT = 15
+RETRIES = 2
+
+def review_list_params(goods_no, gcode, page_idx, sort=GDAS_SORT_DEFAULT):
+    # 필터 패널(#filterDiv) 폼 값과 같은 이름으로 보낸다. sati_type5 = 성별(F/M)
+    return {
+        "goodsNo": goods_no,
+        "gdasSort": sort,
+        "itemNo": "all_search",
+        "pageIdx": str(page_idx),
+        "sati_type5": gcode,
+        "colData": "",
+        "keywordGdasSeqs": "",
+        "type": "",
+        "point": "",
+        "hashTag": "",
+        "optionValue": "",
+        "cTypeLength": "0",
+    }
+
+# =========================
+# 2) 호스트별 적응형 속도 제한
+# =========================
+class HostLimiters:
+    """호스트마다 AdaptiveRateLimiter 1개. 초기 속도 = 1/min_interval."""
+
+    def __init__(self, min_interval=HOST_MIN_INTERVAL, stats=None):
+        self.min_interval = min_interval
+        self.stats = stats
+        self._by_host = {}
+
+    def get(self, url):
+        if self.min_interval <= 0:
+            return None
+        host = urlsplit(url).netloc
+        if host not in self._by_host:
+            rate = 1.0 / self.min_interval
+            self._by_host[host] = AdaptiveRateLimiter(
+                rate=rate, burst=2, min_rate=min(0.5, rate), max_rate=max(HOST_MAX_RATE, rate),
+                target_latency=TARGET_LATENCY, stats=self.stats,
+            )
+        return self._by_host[host]
+
+    def snapshot(self):
+        return {h: lim.snapshot() for h, lim in self._by_host.items()}
+
+# =========================
+# 3) 엔진
+# =========================
+class ReviewHttpEngine:
+    def __init__(self, base_url=BASE_URL, max_concurrency=MAX_CONCURRENCY,
+                 host_min_interval=HOST_MIN_INTERVAL, record_dir=None):
+        if not HAS_AIOHTTP:
+            raise ImportError("aiohttp 가 필요합니다: pip install aiohttp")
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrency = max_concurrency
+        self.sem = asyncio.Semaphore(max_concurrency)
+        self.wait_stats = WaitStats()
+        self.limiters = HostLimiters(host_min_interval, self.wait_stats)
+        self.record_dir = record_dir
+        self.session = None
+        self.stats = {"requests": 0, "bytes": 0, "errors": 0}
+        if record_dir:
+            os.makedirs(record_dir, exist_ok=True)
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(
+            limit=self.max_concurrency, limit_per_host=self.max_concurrency,
+            keepalive_timeout=30, ttl_dns_cache=300,
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+            headers={"User-Agent": USER_AGENT, "X-Requested-With": "XMLHttpRequest",
+                     "Accept-Language": "ko-KR,ko;q=0.9"},
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+
+    async def fetch_page(self, goods_no, gcode, page_idx, referer="", sort=GDAS_SORT_DEFAULT):
+        body = await self.fetch_text(REVIEW_LIST_PATH, review_list_params(goods_no, gcode, page_idx, sort), referer)
+        if body and self.record_dir:
+            self._record(goods_no, gcode, page_idx, body)
+        return body
+
+    async def fetch_text(self, path, params=None, referer=""):
+        """base_url+path GET (세마포어 + 호스트 속도 제한 + 재시도). 200 → 본문, 404 → "", 실패 → None."""
+        url = self.base_url + path
+        headers = {"Referer": referer} if referer else None
+        limiter = self.limiters.get(url)
+        for attempt in range(RETRIES + 1):
+            async with self.sem:
+                if limiter is not None:
+                    await limiter.acquire_async()
+                t = time.monotonic()
+                try:
+                    async with self.session.get(url, params=params, headers=headers) as resp:
+                        body = await resp.text()
+                        self.stats["requests"] += 1
+                        self.stats["bytes"] += len(body.encode("utf-8"))
+                        # 429/5xx 는 서버가 버거워한다는 신호 → 속도를 곱셈 감소
+                        if limiter is not None:
+                            limiter.observe(time.monotonic() - t, ok=resp.status < 429)
+                        if resp.status == 200:
+                            return body
+                        if resp.status == 404:
+                            return ""
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    if limiter is not None:
+                        limiter.observe(time.monotonic() - t, timeout=True)
+            self.stats["errors"] += 1
+            t = time.monotonic()
+            await asyncio.sleep(1.0 * (attempt + 1))
+            self.wait_stats.add("retry_backoff", time.monotonic() - t)
+        return None
+
+    def _record(self, goods_no, gcode, page_idx, body):
+        path = os.path.join(self.record_dir, f"{goods_no}_{gcode}_{page_idx}.html")
+        with open(path, "w", encoding="utf-8") as fw:
+            fw.write(body)
+
+    async def crawl_gender(self, product, gcode, glabel, state=None, on_page=None):
+        """
+        성별 1개를 끝까지. 빈 페이지 또는 새 리뷰가 없는 페이지(마지막 페이지 반복)에서 멈춤.
+        on_page(gcode, glabel, page_no, rows, last) 는 페이지마다 호출(증분 모드 기록용).
+        """
+        goods_no = extract_goods_no(product.get("product_link", ""))
+        key = product_key(product)
+        rows, SEEN = [], set()
+        known, hwm_date, start_page, sort = set(), "", 1, GDAS_SORT_DEFAULT
+        if state is not None:
+            if state.gender_done(key, gcode):
+                return rows
+            known = state.known_sigs(key, glabel)
+            hwm_date = state.newest_date(key, glabel)
+            start_page = state.resume_page(key, gcode)
+            sort = GDAS_SORT_LATEST
+
+        for page_idx in range(start_page, MAX_PAGES + 1):
+            body = await self.fetch_page(goods_no, gcode, page_idx, product.get("product_link", ""), sort)
+            if body is None:
+                print(f"❌ 리뷰 목록 요청 실패 ({product['product_name']} / {glabel} / p.{page_idx})")
+                break  # 성별 미완료로 남겨 다음 실행에서 이 페이지부터 재개
+            raw_items = parse_review_list_html(body)
+            new_rows = rows_from_raw(raw_items, glabel, SEEN)
+            last = not new_rows
+            if state is not None:
+                last = last or page_is_stale([build_review_row(r, glabel) for r in raw_items], known, hwm_date)
+                new_rows = [r for r in new_rows if sig_hash(review_sig(r)) not in known]
+            rows.extend(new_rows)
+            if on_page is not None:
+                on_page(gcode, glabel, page_idx, new_rows, last)
+            if last:
+                break
+        return rows
+
+    async def crawl_product(self, product, state=None, on_page=None):
+        if not extract_goods_no(product.get("product_link", "")):
+            print(f"⚠️ goodsNo 없음 → 건너뜀: {product.get('product_link')}")
+            return []
+        # 여성 → 남성 순서 유지 (기존 CSV 와 같은 행 순서)
+        parts = await asyncio.gather(*(self.crawl_gender(product, g, l, state, on_page) for g, l in GENDERS))
+        return [r for part in parts for r in part]
+
+async def crawl_products_http(products, on_product=None, state=None, on_page=None, **engine_kwargs):
+    """
+    상품 전체를 동시에 크롤링. on_product(product, rows) / on_page(product, gcode, glabel, page_no, rows, last)
+    는 이벤트 루프 스레드에서 호출되므로 CSV append 가 자연히 직렬화된다.
+    """
+    results = {}
+    async with ReviewHttpEngine(**engine_kwargs) as eng:
+        async def one(idx, product):
+            page_cb = None
+            if on_page is not None:
+                page_cb = lambda *page: on_page(product, *page)
+            rows = await eng.crawl_product(product, state, page_cb)
+            results[idx] = rows
+            if on_product is not None:
+                on_product(product, rows)
+            print(f"  ↳ ({idx}/{len(products)}) {product['product_name']} 수집 리뷰 수: {len(rows)}")
+
+        await asyncio.gather(*(one(i, p) for i, p in enumerate(products, 1)))
+        print(f"✅ HTTP 엔진: 요청 {eng.stats['requests']} / {eng.stats['bytes']/1e6:.1f}MB / 오류 {eng.stats['errors']}")
+        for host, snap in eng.limiters.snapshot().items():
+            print(f"   - {host}: 최종 {snap['rate']:.2f} req/s (지연 EWMA {snap['latency_ewma'] or 0:.2f}s)")
+        # 동시 요청들의 대기 시간 합(벽시계보다 클 수 있음)
+        for label, v in eng.wait_stats.summary()["by_label"].items():
+            print(f"   - {label}: 누적 {v['sec']:.1f}s ({v['n']}회)")
+    return [results[i] for i in range(1, len(products) + 1)]
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+리뷰 컬럼형 저장소 (Parquet, 수집일 파티션 + 파일 안에서 상품별 정렬)
+- 디렉터리 구조: <root>/crawl_date=YYYY-MM-DD/part-*.parquet  (hive 파티션)
+- 파일 안의 행은 product_key(goodsNo) 순으로 정렬, row group 마다 product_key 최소/최대 통계
+  → 상품 필터는 해당 row group 만 읽음. 상품마다 디렉터리/파일을 따로 두면 지금 규모(상품당 ~100행)
+    에서는 파일당 고정 비용 때문에 CSV 보다 느려져서 상품 단위는 파일 안의 정렬로 나눔
+- 반복값이 많은 컬럼(product_name, skin_type, skin_tone, gender, ...)은 dictionary 인코딩
+- rating 은 float32, date 는 date32 로 저장 → 읽을 때 타입 추론/문자열 파싱 없음
+- seq: 기록 순서(int64). 여러 파일을 읽어도 CSV 와 같은 행 순서로 복원
+- 증분 모드는 페이지마다 작은 파일이 생김 → 실행이 끝나면 compact() 로 수집일마다 파일 1개로 합침
+- load_reviews(columns=..., products=..., crawl_dates=...): 필요한 컬럼/파티션만 읽음
+  csv_compat=True 면 pd.read_csv(리뷰 CSV) 와 같은 모양(REVIEW_FIELDS 순서, 빈 문자열/N/A → NaN)
+
+사용 예)
+    store = ReviewStore(REVIEW_STORE_DIR)
+    store.append(product, rows)      # append_reviews_to_csv 와 같은 (product, rows)
+    store.close()
+    df = load_reviews(REVIEW_STORE_DIR, columns=["product_name", "review", "rating"])
+"""
+
+import os, time, uuid, datetime
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    import pyarrow.dataset as ds
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+from pipeline.oy_reviews import REVIEW_FIELDS
+from pipeline.crawl_state import product_key
+
+# =========================
+# 1) 스키마
+# =========================
+# 상품/스킨태그/성별/평점문자열은 값 종류가 적어 dictionary 인코딩 (파일 크기 ↓, pandas 에서는 category)
+DICT_COLS = ["product_name", "product_brand", "product_link", "skin_type", "skin_tone", "rating_text", "gender"]
+PARTITION_COLS = ["crawl_date"]
+ROW_GROUP_ROWS = 256_000  # 대용량에서 row group 통계로 상품 필터가 건너뛸 수 있는 단위
+
+# pd.read_csv 기본 na_values 중 리뷰 CSV 에 실제로 나올 수 있는 값 (csv_compat 용)
+_CSV_NA = {"", "N/A", "NA", "n/a", "NULL", "null", "NaN", "nan", "None", "<NA>", "#N/A"}
+
+def review_schema():
+    str_dict = pa.dictionary(pa.int32(), pa.string())
+    fields = []
+    for name in REVIEW_FIELDS:
+        if name == "date":
+            fields.append((name, pa.date32()))
+        elif name == "rating":
+            fields.append((name, pa.float32()))
+        elif name in DICT_COLS:
+            fields.append((name, str_dict))
+        else:
+            fields.append((name, pa.string()))
+    fields.append(("product_key", pa.string()))  # 정렬/통계용 (파일 안에서는 parquet 가 알아서 사전 인코딩)
+    fields.append(("seq", pa.int64()))
+    return pa.schema(fields)
+
+def _parse_date(s):
+    """'YYYY.MM.DD' → date. 'N/A'/빈값/형식 다름 → None."""
+    try:
+        y, m, d = str(s).split(".")
+        return datetime.date(int(y), int(m), int(d))
+    except (ValueError, TypeError):
+        return None
+
+def _to_float(x):
+    try:
+        return float(x)
+    except (ValueError, TypeError):
+        return None
+
+# =========================
+# 2) 쓰기
+# =========================
+class ReviewStore:
+    """
+    append_reviews_to_csv 대체 writer. 행을 모았다가 flush 때 (상품, 기록 순)으로 정렬해 파일 1개로 쓴다.
+    - flush_rows: 버퍼 행 수가 이보다 많아지면 자동 flush
+    - durable=True: append 마다 바로 flush (증분 모드 — 체크포인트 commit 전에 디스크에 있어야 함)
+    """
+
+    def __init__(self, root, crawl_date=None, flush_rows=20_000, durable=False, compression="zstd"):
+        if not HAS_PYARROW:
+            raise ImportError("pyarrow 가 필요합니다: pip install pyarrow")
+        self.root = root
+        self.crawl_date = crawl_date or datetime.date.today().isoformat()
+        self.flush_rows = flush_rows
+        self.durable = durable
+        self.compression = compression
+        self.schema = review_schema()
+        self._buf = []
+        self._seq = time.time_ns()  # 실행이 달라도 나중 실행의 seq 가 더 큼
+        os.makedirs(root, exist_ok=True)
+
+    def append(self, product, rows):
+        if not rows:
+            return
+        key = product_key(product)
+        for r in rows:
+            self._buf.append((key, product, r, self._seq))
+            self._seq += 1
+        if self.durable or len(self._buf) >= self.flush_rows:
+            self.flush()
+
+    def _table(self, items):
+        cols = {name: [] for name in REVIEW_FIELDS}
+        keys, seqs = [], []
+        for key, product, r, seq in sorted(items, key=lambda x: (x[0], x[3])):
+            for name in ("product_name", "product_brand", "product_link"):
+                cols[name].append(product.get(name, ""))
+            for name in ("customer_name", "skin_type", "skin_tone", "skin_concerns", "review", "rating_text", "gender"):
+                cols[name].append(r.get(name, ""))
+            cols["date"].append(_parse_date(r.get("date", "")))
+            cols["rating"].append(_to_float(r.get("rating", "")))
+            keys.append(key)
+            seqs.append(seq)
+        arrays = [pa.array(cols[name], type=self.schema.field(name).type) for name in REVIEW_FIELDS]
+        arrays.append(pa.array(keys, type=self.schema.field("product_key").type))
+        arrays.append(pa.array(seqs, type=pa.int64()))
+        return pa.Table.from_arrays(arrays, schema=self.schema)
+
+    def flush(self):
+        if not self._buf:
+            return
+        part_dir = os.path.join(self.root, f"crawl_date={self.crawl_date}")
+        _write_part(self._table(self._buf), part_dir, self.compression)
+        self._buf = []
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _write_part(table, part_dir, compression="zstd"):
+    os.makedirs(part_dir, exist_ok=True)
+    name = f"part-{uuid.uuid4().hex[:12]}.parquet"
+    tmp = os.path.join(part_dir, "." + name)  # 점(.)으로 시작 → 쓰다 끊겨도 로더가 읽지 않음
+    pq.write_table(table, tmp, compression=compression, row_group_size=ROW_GROUP_ROWS)
+    os.replace(tmp, os.path.join(part_dir, name))
+
+def compact(root, crawl_date=None, compression="zstd"):
+    """
+    수집일 파티션마다 part 파일들(증분 모드의 페이지 단위 flush)을 (상품, 기록 순) 정렬 파일 1개로 합친다.
+    합친 파일을 먼저 쓰고 원본을 지움 → 그 사이에 끊겨 같은 행이 두 번 남아도 다음 compact 가 seq 로 걸러냄
+    """
+    for date_dir in sorted(os.listdir(root)):
+        if not date_dir.startswith("crawl_date=") or (crawl_date and date_dir != f"crawl_date={crawl_date}"):
+            continue
+        d = os.path.join(root, date_dir)
+        parts = sorted(p for p in os.listdir(d) if p.endswith(".parquet") and not p.startswith("."))
+        if len(parts) < 2:
+            continue
+        table = pa.concat_tables([pq.read_table(os.path.join(d, p)) for p in parts])
+        table = table.sort_by([("seq", "ascending")])
+        seq = table.column("seq").to_numpy()
+        if len(seq) > 1 and (seq[1:] == seq[:-1]).any():
+            keep = np.concatenate([[True], seq[1:] != seq[:-1]])
+            table = table.filter(pa.array(keep))
+        table = table.sort_by([("product_key", "ascending"), ("seq", "ascending")])
+        _write_part(table, d, compression)
+        for p in parts:
+            os.remove(os.path.join(d, p))
+
+# =========================
+# 3) 읽기
+# =========================
+def review_dataset(root):
+    partitioning = ds.partitioning(pa.schema([("crawl_date", pa.string())]), flavor="hive")
+    return ds.dataset(root, format="parquet", partitioning=partitioning, ignore_prefixes=[".", "_"])
+
+def load_reviews(root, columns=None, products=None, crawl_dates=None, csv_compat=False, ordered=True):
+    """
+    필요한 컬럼/파티션만 읽어 DataFrame 으로.
+    - columns: 읽을 컬럼 (None → 전체). crawl_date(파티션), product_key 도 지정 가능
+    - products: goodsNo(product_key) 목록 → 해당 row group 만, crawl_dates: 'YYYY-MM-DD' 목록 → 해당 디렉터리만
+    - csv_compat: pd.read_csv(리뷰 CSV) 와 같은 dtype/결측 표현으로 변환
+    - ordered: 기록 순서(seq)로 정렬 (False 면 파일 순서 그대로 — 대용량 집계용)
+    """
+    if not HAS_PYARROW:
+        raise ImportError("pyarrow 가 필요합니다: pip install pyarrow")
+    dataset = review_dataset(root)
+    filt = None
+    if products is not None:
+        filt = ds.field("product_key").isin(list(products))
+    if crawl_dates is not None:
+        f2 = ds.field("crawl_date").isin(list(crawl_dates))
+        filt = f2 if filt is None else (filt & f2)
+    read_cols = None
+    if columns is not None:
+        read_cols = list(dict.fromkeys(list(columns) + (["seq"] if ordered else [])))
+    table = dataset.to_table(columns=read_cols, filter=filt)
+    if ordered:
+        table = table.sort_by("seq")
+    if columns is not None and "seq" not in columns and ordered:
+        table = table.drop(["seq"])
+    df = table.to_pandas()
+    return to_csv_frame(df) if csv_compat else df
+
+def to_csv_frame(df):
+    """load_reviews 결과 → pd.read_csv(리뷰 CSV) 와 같은 모양 (object 문자열, 결측은 NaN, date 는 'YYYY.MM.DD')."""
+    import pandas as pd
+
+    str_dtype = pd.Series(["a"]).dtype  # pandas 3 부터 read_csv 문자열 컬럼은 object 가 아니라 str
+    out = {}
+    for name in REVIEW_FIELDS:
+        if name not in df.columns:
+            continue
+        s = df[name]
+        if name == "rating":
+            out[name] = s.astype("float64")
+            continue
+        if name == "date":
+            # 날짜 종류는 수천 개 → 고유값만 문자열로 바꿔서 펼침 (행마다 strftime 하지 않음)
+            codes, uniq = pd.factorize(s)
+            fmt = pd.to_datetime(pd.Series(uniq, dtype=object)).dt.strftime("%Y.%m.%d").to_numpy(dtype=object)
+            s = pd.Series(np.where(codes >= 0, fmt.take(codes.clip(0)) if len(fmt) else None, None), index=s.index)
+        s = s.astype(str_dtype)
+        out[name] = s.where(~s.isin(_CSV_NA))
+    return pd.DataFrame(out, index=df.index).reset_index(drop=True)
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+감성 모델 저장/로드 (버전 디렉터리 1개 = 벡터라이저 + 분류기 + 임계값 + 컴파일된 감성사전)
+- 디렉터리 구성
+    <root>/LATEST                 : 최신 버전 이름
+    <root>/<버전>/manifest.json    : 형식 버전, 모델 종류, 임계값, pred 기준, 학습 지표, 파일 해시
+    <root>/<버전>/coef.npy         : 분류기 가중치 (float64), intercept 는 manifest
+    <root>/<버전>/vocab.json, idf.npy : TF-IDF 모델 (어휘 = 열 순서)
+    <root>/<버전>/lexicon.pkl      : LexiconScorer (pipeline/token_match.py, trie 컴파일 결과 그대로)
+- 버전 이름 = 저장 시각 + 가중치 해시 → 같은 모델을 다시 저장해도 구분, 점 접두 임시 디렉터리에 쓰고 rename
+- 로드는 manifest 만 읽음. coef/idf 는 np.load(mmap_mode="r"), 어휘/사전은 처음 쓸 때 읽음
+- TF-IDF 모델 채점은 sklearn 없이 numpy 로 (TfidfVectorizer 기본 토큰 규칙/l2 정규화 + LogisticRegression 과 같은 값)
+  → 요청 경로에서 sklearn import(수백 ms) 없이 기동. 해싱 모델(스트리밍 학습)은 처음 쓸 때 sklearn 을 import
+
+사용 예)
+    save_sentiment_model(MODEL_DIR, vect, clf, threshold=thr, lex_scorer=lex_scorer, metrics={...})
+    model = SentimentModel.load(MODEL_DIR)
+    out = model.score(["촉촉하고 순해요", "따가워요"])   # {"ml_prob", "ml_pred", "lex_score", "lex_pred", "pred"}
+    model.close()   # komoran 모델이 직접 띄운 TokenizeService 정리 (with SentimentModel.load(...) as model: 도 가능)
+"""
+
+import os, re, json, time, pickle, shutil, hashlib
+from collections import Counter
+
+import numpy as np
+
+from pipeline.lexicon_score import normalize_text, simple_tokenize
+
+FORMAT_VERSION = 1
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")  # sklearn CountVectorizer 기본 token_pattern
+
+# =========================
+# 1) 저장
+# =========================
+def _sha1(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def keep_pos(sent, morphs):
+    """감성분석 노트북 D 셀 _keep_pos: 명사/동사/형용사/부사만, 없으면 공백 분리."""
+    out = [w for w, p in morphs if p.startswith(("NN", "VV", "VA")) or p in ("MAG", "MAJ")]
+    return out if out else sent.split()
+
+def save_sentiment_model(root, vect, clf, threshold=0.5, lex_scorer=None, tokenizer="simple",
+                         pred_source="lexicon", metrics=None):
+    """
+    vect: 학습된 TfidfVectorizer 또는 HashingVectorizer, clf: LogisticRegression / SGDClassifier (이진)
+    tokenizer: 감성사전을 만들 때 쓴 토크나이저 ("komoran" | "simple") — 채점 때 같은 것을 씀
+    pred_source: score() 의 "pred" 기준 ("lexicon" = 감성 노트북 senti_labeled_df 의 pred 와 같음 | "ml")
+    반환: 버전 이름
+    """
+    coef = np.asarray(clf.coef_, dtype=np.float64).ravel()
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "threshold": float(threshold),
+        "intercept": float(np.ravel(clf.intercept_)[0]),
+        "classes": [int(c) for c in clf.classes_],
+        "classifier": type(clf).__name__,
+        "tokenizer": tokenizer,
+        "pred_source": pred_source,
+        "metrics": metrics or {},
+        "n_features": int(coef.shape[0]),
+    }
+    params = vect.get_params()
+    if hasattr(vect, "vocabulary_"):
+        if params.get("analyzer") != "word" or params.get("sublinear_tf") or params.get("norm") != "l2" \
+                or params.get("stop_words") or params.get("token_pattern") != TOKEN_PATTERN.pattern:
+            raise ValueError("numpy 채점은 TfidfVectorizer 기본 설정(word, l2, 불용어 없음)만 지원")
+        manifest["vectorizer"] = {"kind": "tfidf", "ngram_range": list(params["ngram_range"]),
+                                  "lowercase": bool(params["lowercase"])}
+    else:
+        manifest["vectorizer"] = {"kind": "hashing", "params": {k: params[k] for k in (
+            "analyzer", "ngram_range", "n_features", "alternate_sign", "norm", "lowercase")}}
+        manifest["vectorizer"]["params"]["ngram_range"] = list(params["ngram_range"])
+
+    version = time.strftime("%Y%m%d-%H%M%S") + "-" + hashlib.sha1(coef.tobytes()).hexdigest()[:8]
+    os.makedirs(root, exist_ok=True)
+    tmp = os.path.join(root, "." + version)
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    np.save(os.path.join(tmp, "coef.npy"), coef)
+    if manifest["vectorizer"]["kind"] == "tfidf":
+        terms = [None] * len(vect.vocabulary_)
+        for term, j in vect.vocabulary_.items():
+            terms[j] = term
+        with open(os.path.join(tmp, "vocab.json"), "w", encoding="utf-8") as f:
+            json.dump(terms, f, ensure_ascii=False)
+        np.save(os.path.join(tmp, "idf.npy"), np.asarray(vect.idf_, dtype=np.float64))
+    if lex_scorer is not None:
+        with open(os.path.join(tmp, "lexicon.pkl"), "wb") as f:
+            pickle.dump(lex_scorer, f, protocol=pickle.HIGHEST_PROTOCOL)
+    manifest["files"] = {name: _sha1(os.path.join(tmp, name)) for name in sorted(os.listdir(tmp))}
+    with open(os.path.join(tmp, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, os.path.join(root, version))
+    with open(os.path.join(root, ".LATEST"), "w") as f:
+        f.write(version)
+    os.replace(os.path.join(root, ".LATEST"), os.path.join(root, "LATEST"))
+    return version
+
+def list_versions(root):
+    return sorted(d for d in os.listdir(root)
+                  if not d.startswith(".") and os.path.exists(os.path.join(root, d, "manifest.json")))
+
+# =========================
+# 2) 로드 / 채점
+# =========================
+class SentimentModel:
+    def __init__(self, path, manifest, tokenize_many=None):
+        self.path = path
+        self.manifest = manifest
+        self.version = os.path.basename(path)
+        self.threshold = manifest["threshold"]
+        self.intercept = manifest["intercept"]
+        self._tokenize_many = tokenize_many
+        self._coef = self._idf = self._vocab = self._hasher = None
+        self._tok_service = None  # tokenize_many 를 안 넘긴 komoran 모델이 직접 띄운 서비스 (close 에서 정리)
+        self._lexicon = False  # False = 아직 안 읽음, None = 사전 없음
+
+    @classmethod
+    def load(cls, root, version=None, tokenize_many=None):
+        """root: save_sentiment_model 의 root (LATEST 사용) 또는 버전 디렉터리. manifest 만 읽는다."""
+        if version is None and not os.path.exists(os.path.join(root, "manifest.json")):
+            with open(os.path.join(root, "LATEST")) as f:
+                version = f.read().strip()
+        path = os.path.join(root, version) if version else root
+        with open(os.path.join(path, "manifest.json"), encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest["format_version"] > FORMAT_VERSION:
+            raise ValueError(f"모델 형식 {manifest['format_version']} 은 이 코드({FORMAT_VERSION})보다 새 버전")
+        return cls(path, manifest, tokenize_many)
+
+    # ---- 지연 로드 ----
+    @property
+    def coef(self):
+        if self._coef is None:
+            self._coef = np.load(os.path.join(self.path, "coef.npy"), mmap_mode="r")
+        return self._coef
+
+    def _tfidf(self):
+        if self._vocab is None:
+            self._idf = np.load(os.path.join(self.path, "idf.npy"), mmap_mode="r")
+            with open(os.path.join(self.path, "vocab.json"), encoding="utf-8") as f:
+                self._vocab = {t: j for j, t in enumerate(json.load(f))}
+        return self._vocab, self._idf
+
+    @property
+    def lexicon(self):
+        if self._lexicon is False:
+            p = os.path.join(self.path, "lexicon.pkl")
+            self._lexicon = None
+            if os.path.exists(p):
+                with open(p, "rb") as f:
+                    self._lexicon = pickle.load(f)
+        return self._lexicon
+
+    def _tokenizer(self):
+        if self._tokenize_many is None:
+            if self.manifest.get("tokenizer") == "komoran":
+                from pipeline.tokenize_service import TokenizeService  # JVM 기동 → 감성사전 채점을 처음 쓸 때만
+                svc = self._tok_service = TokenizeService(None, workers=1)
+                self._tokenize_many = lambda sents: [keep_pos(s, m) for s, m in zip(sents, svc.pos_many(sents))]
+            else:
+                self._tokenize_many = lambda sents: [simple_tokenize(s) for s in sents]
+        return self._tokenize_many
+
+    # ---- ML ----
+    def _decision_tfidf(self, sents):
+        vocab, idf = self._tfidf()
+        coef = self.coef
+        lo, hi = self.manifest["vectorizer"]["ngram_range"]
+        lower = self.manifest["vectorizer"]["lowercase"]
+        out = np.full(len(sents), self.intercept, dtype=np.float64)
+        for i, s in enumerate(sents):
+            toks = TOKEN_PATTERN.findall(s.lower() if lower else s)
+            grams = Counter()
+            for n in range(lo, hi + 1):
+                for k in range(len(toks) - n + 1):
+                    j = vocab.get(toks[k] if n == 1 else " ".join(toks[k:k + n]))
+                    if j is not None:
+                        grams[j] += 1
+            if not grams:
+                continue
+            idx = np.fromiter(grams.keys(), dtype=np.int64, count=len(grams))
+            w = np.fromiter(grams.values(), dtype=np.float64, count=len(grams)) * idf[idx]
+            norm = np.sqrt(w @ w)
+            if norm > 0:
+                out[i] += (w @ coef[idx]) / norm
+        return out
+
+    def _decision_hashing(self, sents):
+        if self._hasher is None:
+            from sklearn.feature_extraction.text import HashingVectorizer
+            p = dict(self.manifest["vectorizer"]["params"])
+            p["ngram_range"] = tuple(p["ngram_range"])
+            self._hasher = HashingVectorizer(**p)
+        X = self._hasher.transform(sents)
+        return X @ np.asarray(self.coef) + self.intercept
+
+    def predict_proba(self, texts, normalized=False):
+        sents = list(texts) if normalized else [normalize_text(t) for t in texts]
+        if not sents:
+            return np.empty(0, dtype=np.float64)
+        if self.manifest["vectorizer"]["kind"] == "tfidf":
+            d = self._decision_tfidf(sents)
+        else:
+            d = self._decision_hashing(sents)
+        return 1.0 / (1.0 + np.exp(-d))
+
+    # ---- 통합 ----
+    def score(self, texts, lexicon=True):
+        """
+        texts → {"ml_prob", "ml_pred", "lex_score", "lex_pred", "pred"} (numpy 배열, 라벨 0=긍정 1=부정)
+        lexicon=False 면 감성사전 채점(토큰화)을 건너뜀 → ML 만 (가장 빠름)
+        """
+        texts = ["" if t is None else str(t) for t in texts]
+        sents = [normalize_text(t) for t in texts]
+        prob = self.predict_proba(sents, normalized=True)
+        out = {"ml_prob": prob, "ml_pred": (prob >= self.threshold).astype(np.int8)}
+        if lexicon and self.lexicon is not None:
+            toks = self._tokenizer()(sents) if sents else []
+            lex = np.fromiter((self.lexicon.score(t) for t in toks), dtype=np.float64, count=len(toks))
+            out["lex_score"] = lex
+            out["lex_pred"] = np.where(lex > 0, 0, 1).astype(np.int8)
+        src = "lex_pred" if self.manifest.get("pred_source") == "lexicon" and "lex_pred" in out else "ml_pred"
+        out["pred"] = out[src]
+        return out
+
+    def close(self):
+        if self._tok_service is not None:
+            self._tok_service.close()
+            self._tok_service = self._tokenize_many = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        m = self.manifest
+        return (f"SentimentModel({self.version}, {m['vectorizer']['kind']}+{m['classifier']}, "
+                f"threshold={self.threshold:.3f}, pred={m.get('pred_source')})")
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+감성 ML 베이스라인 학습 (감성분석 노트북 K 셀의 TF-IDF + LogisticRegression 5-fold)
+- train_parallel_folds: TF-IDF 는 전체에 1번 fit(기존과 동일) → fold 들을 joblib(loky) 워커에서 동시에
+    · 큰 희소행렬은 joblib 이 memmap 으로 워커에 공유 (fold 마다 복사하지 않음)
+    · 결과(확률/예측)는 순차 루프와 같음 (fold 분할/모델 설정 동일)
+- train_streaming: 디스크에서 리뷰 청크를 여러 번 읽으며 학습 (문서-단어 행렬 전체를 만들지 않음)
+    · HashingVectorizer(1~2-gram, 어휘 사전 없음) + SGDClassifier(log_loss).partial_fit
+    · fold = 행 번호 해시 % n_splits, fold 모델 k개를 같은 청크 벡터로 함께 학습 → 마지막 패스에서 out-of-fold 확률
+    · class_weight="balanced" 는 첫 패스(라벨만)에서 센 클래스 수로 sample_weight 를 줘서 맞춤
+    · fit_full=True 면 전체 데이터 모델도 함께 학습 (감성 모델 저장용)
+- 두 방식 모두 {"probs", "preds", "folds": [{fold, f1, sec, rss_mb}], "sec", "peak_rss_mb"} 반환
+  → 노트북의 print_report / find_best_threshold 로 같은 지표 출력
+
+사용 예)
+    res = train_parallel_folds(X_text, y, n_jobs=-1)
+    res = train_streaming(lambda: pd.read_csv(DATA_PATH, chunksize=200_000), prepare_chunk)
+    report_folds(res)
+"""
+
+import sys, time
+
+import numpy as np
+
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:  # Windows
+    HAS_RESOURCE = False
+
+from sklearn.model_selection import StratifiedKFold
+from sklearn.feature_extraction.text import TfidfVectorizer, HashingVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.metrics import f1_score
+from joblib import Parallel, delayed
+
+VECT_PARAMS = dict(analyzer="word", ngram_range=(1, 2), min_df=3, max_features=100_000)
+CLF_PARAMS = dict(max_iter=500, class_weight="balanced", solver="liblinear")
+
+# =========================
+# 1) 메모리 측정
+# =========================
+def peak_rss_mb(children=False):
+    """현재 프로세스(children=True 면 종료된 자식 포함) 최대 RSS(MB). resource 가 없으면 nan."""
+    if not HAS_RESOURCE:
+        return float("nan")
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    rss = resource.getrusage(who).ru_maxrss
+    return rss / 1e6 if sys.platform == "darwin" else rss / 1e3  # macOS 는 byte, Linux 는 KB
+
+def report_folds(res, title="ML"):
+    for f in res["folds"]:
+        print(f"[{title} Fold {f['fold']}] F1: {f['f1']:.4f}  {f['sec']:.1f}s  peak RSS {f['rss_mb']:.0f}MB")
+    print(f"⏱ {title} 학습 {res['sec']:.1f}s, 최대 RSS {res['peak_rss_mb']:.0f}MB")
+
+# =========================
+# 2) 병렬 fold (행렬 1번 fit + 공유)
+# =========================
+def _fit_fold(fold, X, y, tr, va, clf_params):
+    t0 = time.perf_counter()
+    clf = LogisticRegression(**clf_params)
+    clf.fit(X[tr], y[tr])
+    p = clf.predict_proba(X[va])[:, 1]
+    return fold, va, p, time.perf_counter() - t0, peak_rss_mb()
+
+def _fit_all(X, y, clf_params):
+    clf = LogisticRegression(**clf_params)
+    return clf.fit(X, y)
+
+def train_parallel_folds(texts, y, n_splits=5, n_jobs=-1, seed=42, vect_params=None, clf_params=None, threshold=0.5,
+                         fit_full=False):
+    """
+    texts: 정규화된 리뷰 목록, y: 0/1 라벨. n_jobs=-1 → 코어 수만큼 fold 동시 학습 (n_jobs=1 → 기존 순차 루프).
+    반환 dict 에 vect(학습된 TfidfVectorizer), X(희소행렬)도 포함.
+    fit_full=True 면 전체 데이터 모델(full_model)도 fold 들과 같은 워커 풀에서 함께 학습 (감성 모델 저장용)
+    """
+    t0 = time.perf_counter()
+    y = np.asarray(y)
+    vect = TfidfVectorizer(**(vect_params or VECT_PARAMS))
+    X = vect.fit_transform(texts)
+    skf = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=seed)
+    jobs = [delayed(_fit_fold)(fold, X, y, tr, va, clf_params or CLF_PARAMS)
+            for fold, (tr, va) in enumerate(skf.split(X, y), 1)]
+    if fit_full:
+        jobs.append(delayed(_fit_all)(X, y, clf_params or CLF_PARAMS))
+    out = Parallel(n_jobs=n_jobs, backend="loky", max_nbytes="1M")(jobs)
+    full = out.pop() if fit_full else None
+
+    probs = np.zeros(len(y), dtype=float)
+    preds = np.zeros_like(y)
+    folds = []
+    for fold, va, p, sec, rss in sorted(out, key=lambda r: r[0]):
+        probs[va] = p
+        preds[va] = (p >= threshold).astype(int)
+        folds.append({"fold": fold, "f1": f1_score(y[va], preds[va]), "sec": sec, "rss_mb": rss})
+    return {"probs": probs, "preds": preds, "folds": folds, "vect": vect, "X": X, "full_model": full,
+            "sec": time.perf_counter() - t0,
+            "peak_rss_mb": max([peak_rss_mb()] + [f["rss_mb"] for f in folds])}
+
+# =========================
+# 3) 스트리밍 (해싱 + SGD, 청크 단위)
+# =========================
+def _fold_of(idx, n_splits, seed):
+    """행 번호 → fold (패스가 달라도 같은 값). Knuth 곱셈 해시."""
+    h = (idx.astype(np.uint64) * np.uint64(2654435761) + np.uint64(seed)) & np.uint64(0xFFFFFFFF)
+    return (h % np.uint64(n_splits)).astype(np.int64)
+
+def make_hashing_vectorizer(n_features=2 ** 20):
+    # TfidfVectorizer(ngram_range=(1,2)) 와 같은 토큰 규칙, 어휘 사전 없이 해시 → 고정 크기
+    return HashingVectorizer(analyzer="word", ngram_range=(1, 2), n_features=n_features,
+                             alternate_sign=False, norm="l2")
+
+def make_sgd(seed=42, alpha=1e-5):
+    return SGDClassifier(loss="log_loss", alpha=alpha, random_state=seed)
+
+def train_streaming(make_chunks, prepare_chunk, n_splits=5, epochs=3, seed=42, n_features=2 ** 20,
+                    alpha=1e-5, threshold=0.5, fit_full=False):
+    """
+    make_chunks: 호출할 때마다 청크 iterator 를 새로 만드는 함수 (예: lambda: pd.read_csv(path, chunksize=...))
+    prepare_chunk: 청크 → (정규화된 텍스트 목록, 0/1 라벨 배열)
+    메모리: 청크 1개 + 모델 k(+1)개(n_features float64) + 행당 확률 1개
+    """
+    t0 = time.perf_counter()
+    vect = make_hashing_vectorizer(n_features)
+    classes = np.array([0, 1])
+
+    # 1패스: 라벨만 세서 class_weight="balanced" 와 같은 가중치
+    counts = np.zeros(2, dtype=np.int64)
+    n = 0
+    for chunk in make_chunks():
+        _, yc = prepare_chunk(chunk)
+        counts += np.bincount(np.asarray(yc, dtype=np.int64), minlength=2)[:2]
+        n += len(yc)
+    weight = n / (2.0 * np.maximum(counts, 1))
+
+    models = [make_sgd(seed, alpha) for _ in range(n_splits)]
+    full = make_sgd(seed, alpha) if fit_full else None
+    fold_sec = np.zeros(n_splits)
+    for epoch in range(epochs):
+        start = 0
+        for chunk in make_chunks():
+            texts, yc = prepare_chunk(chunk)
+            yc = np.asarray(yc, dtype=np.int64)
+            X = vect.transform(texts)
+            fold = _fold_of(np.arange(start, start + len(yc)), n_splits, seed)
+            sw = weight[yc]
+            for k, m in enumerate(models):
+                t = time.perf_counter()
+                tr = fold != k
+                if tr.any():
+                    m.partial_fit(X[tr], yc[tr], classes=classes, sample_weight=sw[tr])
+                fold_sec[k] += time.perf_counter() - t
+            if full is not None:
+                full.partial_fit(X, yc, classes=classes, sample_weight=sw)
+            start += len(yc)
+        print(f"  ↳ epoch {epoch + 1}/{epochs} ({start:,}행, {time.perf_counter() - t0:.1f}s)")
+
+    # 마지막 패스: 각 행을 자기 fold 를 빼고 학습한 모델로 예측 (out-of-fold)
+    probs = np.zeros(n, dtype=float)
+    ys = np.zeros(n, dtype=np.int64)
+    folds_all = np.zeros(n, dtype=np.int64)
+    start = 0
+    for chunk in make_chunks():
+        texts, yc = prepare_chunk(chunk)
+        X = vect.transform(texts)
+        sl = slice(start, start + len(yc))
+        fold = _fold_of(np.arange(sl.start, sl.stop), n_splits, seed)
+        for k, m in enumerate(models):
+            va = fold == k
+            if va.any():
+                t = time.perf_counter()
+                probs[sl][va] = m.predict_proba(X[va])[:, 1]
+                fold_sec[k] += time.perf_counter() - t
+        ys[sl] = yc
+        folds_all[sl] = fold
+        start += len(yc)
+
+    preds = (probs >= threshold).astype(int)
+    rss = peak_rss_mb()
+    folds = [{"fold": k + 1, "f1": f1_score(ys[folds_all == k], preds[folds_all == k]),
+              "sec": fold_sec[k], "rss_mb": rss} for k in range(n_splits)]
+    return {"probs": probs, "preds": preds, "y": ys, "folds": folds, "vect": vect, "models": models,
+            "full_model": full, "sec": time.perf_counter() - t0, "peak_rss_mb": rss}
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+피부 적합도 인덱스 — filter_items_by_skin_compatibility / seen_items 를 DataFrame 접근 없이
+- 기존: 요청마다 df[df.user_id == user_id].tail(1) 전체 스캔 + 피봇 3개를 열마다 threshold 비교 + seen_items 도 전체 스캔
+- 데이터 갱신 때 1번 만들어 저장 (fingerprint 가 같으면 다시 읽기만):
+    · 사용자 → 최신 피부 프로필 (피부타입/톤/고민 카테고리 id, 마지막 리뷰 기준 = tail(1))
+    · 사용자 → 본 상품 (CSR: seen_ptr, seen_idx) → 요청 때 비트마스크로
+    · 피봇 = (상품 수, 카테고리 수) float64 행렬 (get_ratio_pivot 과 같은 값, 열 = 카테고리 id)
+- 후보 = 세 항목의 "비율 >= threshold" 비트마스크 OR (threshold 별로 packbits 캐시) → 사용자당 O(상품 수 / 8)
+- 결과는 기존 함수와 같음: 모르는 사용자 / 후보 0개 → 전체 상품
+
+사용 예)
+    skin_idx = SkinIndex.load_or_build(SKIN_INDEX_PATH, df, items=item_text_df["item_id"])
+    mask = skin_idx.candidate_mask(user_id, threshold=0.1) & ~skin_idx.seen_mask(user_id)
+    skin_idx.candidates(user_id, 0.1)    # set — filter_items_by_skin_compatibility 와 같은 결과
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+FACETS = ("skin_type", "skin_tone", "skin_concerns")
+FORMAT_VERSION = 1
+
+def data_fingerprint(df, facets=FACETS):
+    """인덱스에 쓰는 컬럼 내용 해시 → 데이터가 바뀌면 다시 만듦."""
+    cols = [c for c in ("user_id", "item_id") + tuple(facets) if c in df.columns]
+    h = pd.util.hash_pandas_object(df[cols], index=False).to_numpy()
+    return f"{len(df)}-{int(h.sum(dtype=np.uint64)):x}-{int((h * np.arange(1, len(h) + 1, dtype=np.uint64)).sum(dtype=np.uint64)):x}"
+
+# =========================
+# 1) 인덱스
+# =========================
+class SkinIndex:
+    def __init__(self, items, users, facets, cats, ratios, profile, seen_ptr, seen_idx, fingerprint=""):
+        self.items, self.users, self.facets = list(items), list(users), list(facets)
+        self.cats, self.ratios = cats, ratios          # facet → [카테고리], facet → (n_items, n_cats) float64
+        self.profile = profile                          # (n_users, n_facets) int32, 카테고리 id (-1 = 없음)
+        self.seen_ptr, self.seen_idx = seen_ptr, seen_idx
+        self.fingerprint = fingerprint
+        self.item_index = {it: i for i, it in enumerate(self.items)}
+        self.user_index = {u: i for i, u in enumerate(self.users)}
+        self._masks = {}                                # threshold → facet → (n_cats, ceil(n_items/8)) uint8
+
+    @property
+    def n_items(self):
+        return len(self.items)
+
+    @classmethod
+    def build(cls, df, items=None, facets=FACETS):
+        """df: user_id, item_id, 피부 컬럼 (결측은 노트북처럼 미리 "Unknown"). items: 상품 순서 (item_text_df)."""
+        items = sorted(df["item_id"].dropna().unique()) if items is None else list(items)
+        item_index = {it: i for i, it in enumerate(items)}
+        icode = df["item_id"].map(item_index).fillna(-1).to_numpy(dtype=np.int64)
+        valid = (icode >= 0) & df["user_id"].notna().to_numpy()  # get_ratio_pivot 의 count() 는 user_id 결측 제외
+
+        # 사용자: 마지막 등장 행 (tail(1))
+        ucodes, users = pd.factorize(df["user_id"])
+        last_row = np.full(len(users), -1, dtype=np.int64)
+        has_user = ucodes >= 0
+        last_row[ucodes[has_user]] = np.flatnonzero(has_user)  # 같은 사용자는 뒤 행이 덮어씀
+
+        cats, ratios = {}, {}
+        profile = np.full((len(users), len(facets)), -1, dtype=np.int32)
+        for f, col in enumerate(facets):
+            if col not in df.columns:
+                cats[col], ratios[col] = [], np.zeros((len(items), 0))
+                continue
+            values = df[col].astype(str).to_numpy()
+            cat_list = sorted(set(values[valid].tolist()))
+            cat_index = {c: j for j, c in enumerate(cat_list)}
+            ccode = np.fromiter((cat_index.get(v, -1) for v in values), dtype=np.int64, count=len(values))
+            counts = np.bincount(icode[valid] * len(cat_list) + ccode[valid],
+                                 minlength=len(items) * len(cat_list)).reshape(len(items), len(cat_list))
+            totals = np.maximum(counts.sum(axis=1, keepdims=True), 1)
+            cats[col], ratios[col] = cat_list, counts / totals
+            profile[:, f] = ccode[last_row]
+
+        # 본 상품 CSR (사용자별 고유 상품 인덱스)
+        pairs = np.unique(np.stack([ucodes[has_user], icode[has_user]], axis=1), axis=0)
+        pairs = pairs[pairs[:, 1] >= 0]
+        seen_ptr = np.zeros(len(users) + 1, dtype=np.int64)
+        np.add.at(seen_ptr, pairs[:, 0] + 1, 1)
+        return cls(items, users.tolist(), facets, cats, ratios, profile, np.cumsum(seen_ptr),
+                   pairs[:, 1].astype(np.int32), fingerprint=data_fingerprint(df, facets))
+
+    # ---- 저장 / 로드 ----
+    def save(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        arrays = {"format_version": np.array(FORMAT_VERSION), "fingerprint": np.array(self.fingerprint),
+                  "items": np.array(self.items, dtype=str), "users": np.array(self.users, dtype=str),
+                  "facets": np.array(self.facets, dtype=str), "profile": self.profile,
+                  "seen_ptr": self.seen_ptr, "seen_idx": self.seen_idx}
+        for col in self.facets:
+            arrays[f"cats__{col}"] = np.array(self.cats[col], dtype=str)
+            arrays[f"ratios__{col}"] = self.ratios[col]
+        tmp = os.path.join(os.path.dirname(os.path.abspath(path)), "." + os.path.basename(path))
+        with open(tmp, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as z:
+            if int(z["format_version"]) > FORMAT_VERSION:
+                raise ValueError(f"피부 인덱스 형식 {int(z['format_version'])} 은 이 코드보다 새 버전")
+            facets = z["facets"].tolist()
+            return cls(z["items"].tolist(), z["users"].tolist(), facets,
+                       {c: z[f"cats__{c}"].tolist() for c in facets}, {c: z[f"ratios__{c}"] for c in facets},
+                       z["profile"], z["seen_ptr"], z["seen_idx"], fingerprint=str(z["fingerprint"]))
+
+    @classmethod
+    def load_or_build(cls, path, df, items=None, facets=FACETS):
+        """저장된 인덱스의 fingerprint 가 df 와 같으면 읽고, 아니면 다시 만들어 저장."""
+        fp = data_fingerprint(df, facets)
+        if os.path.exists(path):
+            idx = cls.load(path)
+            if idx.fingerprint == fp and (items is None or idx.items == [str(i) for i in items]):
+                return idx
+        idx = cls.build(df, items=items, facets=facets)
+        idx.save(path)
+        return idx
+
+    # ---- 조회 ----
+    def _facet_masks(self, threshold):
+        m = self._masks.get(threshold)
+        if m is None:
+            m = {col: np.packbits(self.ratios[col].T >= threshold, axis=1) for col in self.facets}
+            self._masks[threshold] = m
+        return m
+
+    def seen_mask(self, user_id):
+        """본 상품 bool 마스크 (items 순서)."""
+        out = np.zeros(self.n_items, dtype=bool)
+        u = self.user_index.get(user_id)
+        if u is not None:
+            out[self.seen_idx[self.seen_ptr[u]:self.seen_ptr[u + 1]]] = True
+        return out
+
+    def candidate_mask(self, user_id, threshold=0.1):
+        """피부 프로필 후보 bool 마스크. 모르는 사용자 / 후보 0개 → 전체 True (기존 함수와 같음)."""
+        u = self.user_index.get(user_id)
+        if u is None:
+            return np.ones(self.n_items, dtype=bool)
+        masks = self._facet_masks(threshold)
+        acc = np.zeros((self.n_items + 7) // 8, dtype=np.uint8)
+        for f, col in enumerate(self.facets):
+            c = self.profile[u, f]
+            if c >= 0:
+                acc |= masks[col][c]
+        out = np.unpackbits(acc, count=self.n_items).astype(bool)
+        return out if out.any() else np.ones(self.n_items, dtype=bool)
+
+    def candidate_masks(self, user_ids, threshold=0.1):
+        """candidate_mask 를 사용자 여러 명에 대해 한 번에 → (len(user_ids), n_items) bool."""
+        u = np.fromiter((self.user_index.get(x, -1) for x in user_ids), dtype=np.int64, count=len(user_ids))
+        masks = self._facet_masks(threshold)
+        acc = np.zeros((len(u), (self.n_items + 7) // 8), dtype=np.uint8)
+        known = u >= 0
+        for f, col in enumerate(self.facets):
+            c = np.where(known, self.profile[np.maximum(u, 0), f], -1)
+            has = c >= 0
+            if has.any():
+                acc[has] |= masks[col][c[has]]
+        out = np.unpackbits(acc, axis=1, count=self.n_items).astype(bool)
+        out[~out.any(axis=1)] = True
+        return out
+
+    def seen_masks(self, user_ids):
+        out = np.zeros((len(user_ids), self.n_items), dtype=bool)
+        for r, x in enumerate(user_ids):
+            u = self.user_index.get(x)
+            if u is not None:
+                out[r, self.seen_idx[self.seen_ptr[u]:self.seen_ptr[u + 1]]] = True
+        return out
+
+    def candidates(self, user_id, threshold=0.1):
+        mask = self.candidate_mask(user_id, threshold)
+        return {self.items[i] for i in np.flatnonzero(mask)}
+
+    def seen_items(self, user_id):
+        return {self.items[i] for i in np.flatnonzero(self.seen_mask(user_id))}
@@ -0,0 +1,404 @@
+# -*- coding: utf-8 -*-
+"""
+단계 실행기 (내용 해시 캐시 + 독립 단계 병렬) — 노트북을 손으로 순서대로 다시 돌리는 대신
+- Stage(name, fn, inputs, outputs, params, options): 입력/출력 = 아티팩트 이름 (파일 또는 디렉터리)
+    · 입력은 다른 단계의 출력 이름이거나 소스(sources={이름: 경로}, 크롤링 CSV / 사전 txt 등)
+    · fn(ctx): ctx.inp[이름] 을 읽고 ctx.out[이름] 에 씀. 모듈 최상위 함수 (워커 프로세스로 보냄)
+    · params 는 키에 들어감 (결과가 바뀌는 설정), options 는 안 들어감 (워커 수, 캐시 위치 등 실행 설정)
+- 단계 키 = sha1(단계 이름, version, 코드 해시, params, 입력 아티팩트의 내용 해시)
+    · 코드 해시 = fn 과 fn 이 부르는 같은 모듈 함수의 소스 + 그 안에서 import 하는 pipeline 모듈 파일 내용(import 를 따라 끝까지)
+    · 자동으로 못 찾는 모듈(동적 import 등)은 Stage(..., modules=["pipeline.x"]) 로 직접 지정
+    · 결과: <root>/<단계>/<키 앞 16자>/<출력 이름> + _stage.json (출력 내용 해시, 소요 시간)
+    · 같은 키의 결과가 있으면 건너뜀. 상위 단계를 다시 돌려도 출력 내용이 같으면 하위 단계는 그대로 건너뜀
+    · 임시 디렉터리에 쓰고 끝나면 rename → 중간에 죽은 단계는 다음 실행에서 처음부터
+- 소스 파일 해시는 (크기, mtime) 가 같으면 <root>/.digests.json 에 저장된 값 재사용 (1GB CSV 를 매번 읽지 않음)
+- 실행: 의존 단계가 끝난 단계부터 workers 개 프로세스(spawn)로 동시에. workers=1 → 현재 프로세스에서 차례로
+    · 실패한 단계의 하위 단계는 실행하지 않고, 나머지 독립 단계는 끝까지 → 마지막에 StageFailed
+
+사용 예)
+    runner = StageRunner("./artifacts", stages, sources={"raw_reviews": INPUT_CSV}, workers=3)
+    runner.plan()                        # 실행/건너뜀 예정 목록
+    runner.run(targets=["svd"])          # svd 와 그 상위 단계만
+    runner.path("merged_output")         # 최신 결과 경로
+"""
+
+import os, ast, json, time, shutil, hashlib, inspect, textwrap, importlib.util
+import multiprocessing as mp
+from concurrent.futures import Future, ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+# =========================
+# 1) 내용 해시
+# =========================
+def _file_digest(path, cache=None):
+    st = os.stat(path)
+    sig = [st.st_size, st.st_mtime_ns]
+    hit = cache.get(path) if cache is not None else None
+    if hit and hit[:2] == sig:
+        return hit[2]
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    digest = h.hexdigest()
+    if cache is not None:
+        cache[path] = sig + [digest]
+    return digest
+
+def content_digest(path, cache=None):
+    """파일 → 내용 해시, 디렉터리 → (상대 경로, 파일 해시) 목록의 해시, 없음 → 'missing'."""
+    path = os.path.abspath(path)
+    if not os.path.exists(path):
+        return "missing"
+    if os.path.isfile(path):
+        return _file_digest(path, cache)
+    h = hashlib.blake2b(digest_size=16)
+    for d, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            p = os.path.join(d, name)
+            h.update(f"{os.path.relpath(p, path)}\0{_file_digest(p, cache)}\n".encode("utf-8"))
+    return h.hexdigest()
+
+# =========================
+# 2) 단계
+# =========================
+class StageFailed(RuntimeError):
+    pass
+
+CODE_PACKAGES = ("pipeline",)  # 코드 해시에 내용을 넣을 패키지 (서드파티 라이브러리는 제외)
+
+def _imported_modules(src, packages=CODE_PACKAGES, package=None):
+    """소스의 import 문(함수 안 지연 import 포함) 중 packages 아래 모듈 이름 집합."""
+    try:
+        tree = ast.parse(src)
+    except SyntaxError:
+        return set()
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(a.name for a in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level and package:  # from .x import y
+                parts = package.split(".")
+                base = ".".join(parts[:len(parts) - node.level + 1] + ([base] if base else []))
+            names.add(base)
+            names.update(f"{base}.{a.name}" for a in node.names)  # from pipeline import clean
+    return {n for n in names if n.split(".")[0] in packages}
+
+def _module_file(name):
+    """모듈 이름 → .py 경로 (최상위 패키지 위치만 찾고 모듈 자체는 import 하지 않음). 모듈이 아니면 None."""
+    top, *rest = name.split(".")
+    try:
+        spec = importlib.util.find_spec(top)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.submodule_search_locations:
+        return spec.origin if spec is not None and not rest and (spec.origin or "").endswith(".py") else None
+    for base in spec.submodule_search_locations:
+        p = os.path.join(base, *rest)
+        for cand in (p + ".py", os.path.join(p, "__init__.py")):
+            if os.path.isfile(cand):
+                return cand
+    return None
+
+def _local_helpers(fn):
+    """fn 이 이름으로 부르는 같은 모듈의 함수들 (중첩 함수/람다의 코드까지)."""
+    code_objs, names = [getattr(fn, "__code__", None)], set()
+    while code_objs:
+        co = code_objs.pop()
+        if co is None:
+            continue
+        names.update(co.co_names)
+        code_objs.extend(c for c in co.co_consts if inspect.iscode(c))
+    g = getattr(fn, "__globals__", {})
+    return [g[n] for n in sorted(names)
+            if inspect.isfunction(g.get(n)) and g[n].__module__ == fn.__module__ and g[n] is not fn]
+
+def code_digest(fn, modules=(), packages=CODE_PACKAGES):
+    """fn(+같은 모듈 도우미 함수) 소스와 import 하는 packages 모듈 파일 내용을 따라가며 모은 해시."""
+    parts, todo_fn, mods = {}, [fn], set(modules)
+    while todo_fn:
+        f = todo_fn.pop()
+        name = f"fn {f.__module__}.{f.__qualname__}"
+        if name in parts:
+            continue
+        try:
+            src = inspect.getsource(f)
+        except (OSError, TypeError):
+            src = name
+        parts[name] = hashlib.sha1(src.encode("utf-8")).hexdigest()
+        mods |= _imported_modules(textwrap.dedent(src), packages, f.__module__.rpartition(".")[0])
+        todo_fn.extend(_local_helpers(f))
+    done = set()
+    while mods:
+        name = mods.pop()
+        path = _module_file(name)
+        if path is None or path in done:
+            continue
+        done.add(path)
+        with open(path, "rb") as fh:
+            data = fh.read()
+        parts[f"mod {name}"] = hashlib.sha1(data).hexdigest()
+        mods |= _imported_modules(data.decode("utf-8", "replace"), packages, name.rpartition(".")[0])
+    # 이름순으로 합침 (set 순회 순서는 실행마다 다름)
+    return hashlib.sha1("".join(f"{k}\0{v}\n" for k, v in sorted(parts.items())).encode("utf-8")).hexdigest()
+
+class Stage:
+    def __init__(self, name, fn, inputs=(), outputs=(), params=None, options=None, version=1, modules=()):
+        self.name, self.fn = name, fn
+        self.inputs, self.outputs = list(inputs), list(outputs)
+        self.params, self.options = dict(params or {}), dict(options or {})
+        self.version = version
+        self.modules = list(modules)  # 자동으로 못 찾는 코드 의존 모듈 (예: "pipeline.cf_update")
+
+    def code_hash(self):
+        return code_digest(self.fn, self.modules)
+
+    def key(self, input_digests):
+        payload = {"stage": self.name, "version": self.version, "code": self.code_hash(), "params": self.params,
+                   "inputs": {k: input_digests[k] for k in self.inputs}}
+        return hashlib.sha1(json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+
+    def __repr__(self):
+        return f"Stage({self.name}: {self.inputs} → {self.outputs})"
+
+class StageContext:
+    """fn 에 넘기는 값 (워커로 pickle 되므로 경로/설정만)."""
+
+    def __init__(self, name, inp, out, params, options):
+        self.name, self.inp, self.out, self.params, self.options = name, inp, out, params, options
+
+def _run_stage(fn, ctx):
+    t0 = time.perf_counter()
+    fn(ctx)
+    return time.perf_counter() - t0
+
+# =========================
+# 3) 실행기
+# =========================
+class StageRunner:
+    def __init__(self, root, stages, sources=None, workers=1):
+        self.root = os.path.abspath(root)
+        self.stages = {s.name: s for s in stages}
+        self.sources = {k: os.path.abspath(v) for k, v in (sources or {}).items()}
+        self.workers = max(1, int(workers))
+        self.producer = {}
+        for s in stages:
+            for o in s.outputs:
+                if o in self.producer or o in self.sources:
+                    raise ValueError(f"아티팩트 이름 중복: {o}")
+                self.producer[o] = s.name
+        for s in stages:
+            missing = [i for i in s.inputs if i not in self.producer and i not in self.sources]
+            if missing:
+                raise ValueError(f"{s.name}: 입력 {missing} 을 만드는 단계/소스가 없음")
+        self._order = self._toposort()
+        self.results = {}
+
+    # ---- 그래프 ----
+    def deps(self, name):
+        return {self.producer[i] for i in self.stages[name].inputs if i in self.producer}
+
+    def _toposort(self):
+        order, state = [], {}
+
+        def visit(n):
+            if state.get(n) == 1:
+                raise ValueError(f"순환 의존: {n}")
+            if state.get(n) == 2:
+                return
+            state[n] = 1
+            for d in sorted(self.deps(n)):
+                visit(d)
+            state[n] = 2
+            order.append(n)
+
+        for n in self.stages:
+            visit(n)
+        return order
+
+    def _needed(self, targets):
+        if not targets:
+            return list(self._order)
+        need, todo = set(), list(targets)
+        while todo:
+            n = todo.pop()
+            if n not in self.stages:
+                raise KeyError(f"알 수 없는 단계: {n}")
+            if n not in need:
+                need.add(n)
+                todo.extend(self.deps(n))
+        return [n for n in self._order if n in need]
+
+    # ---- 저장 위치 ----
+    def stage_dir(self, name, key):
+        return os.path.join(self.root, name, key[:16])
+
+    def _load_digests(self):
+        try:
+            with open(os.path.join(self.root, ".digests.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_digests(self, cache):
+        os.makedirs(self.root, exist_ok=True)
+        tmp = os.path.join(self.root, f".digests.json.{os.getpid()}")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp, os.path.join(self.root, ".digests.json"))
+
+    def _done(self, name, key):
+        try:
+            with open(os.path.join(self.stage_dir(name, key), "_stage.json"), encoding="utf-8") as f:
+                meta = json.load(f)
+            return meta if meta.get("key") == key else None
+        except (OSError, ValueError):
+            return None
+
+    def _set_latest(self, name, key):
+        tmp = os.path.join(self.root, name, f".LATEST.{os.getpid()}")
+        with open(tmp, "w") as f:
+            f.write(key[:16])
+        os.replace(tmp, os.path.join(self.root, name, "LATEST"))
+
+    def path(self, artifact):
+        """아티팩트의 최신 결과 경로 (소스면 소스 경로)."""
+        if artifact in self.sources:
+            return self.sources[artifact]
+        name = self.producer[artifact]
+        with open(os.path.join(self.root, name, "LATEST")) as f:
+            return os.path.join(self.root, name, f.read().strip(), artifact)
+
+    # ---- 실행 ----
+    def plan(self, targets=None, force=()):
+        """(단계, 'skip'|'run', 키 또는 None) 목록. 상위가 실행 예정이면 하위 키는 아직 알 수 없음(None)."""
+        cache = self._load_digests()
+        digests = {k: content_digest(p, cache) for k, p in self.sources.items()}
+        out = []
+        for name in self._needed(targets):
+            s = self.stages[name]
+            if any(i not in digests for i in s.inputs):
+                out.append((name, "run", None))
+                continue
+            key = s.key(digests)
+            meta = None if name in force else self._done(name, key)
+            if meta is None:
+                out.append((name, "run", key))
+            else:
+                digests.update(meta["outputs"])
+                out.append((name, "skip", key))
+        for name, action, key in out:
+            print(f"  {'⏭ ' if action == 'skip' else '▶ '}{name:<14}{action:<6}{(key or '(상위 단계 결과에 따라)')[:16]}")
+        return out
+
+    def run(self, targets=None, force=(), verbose=True):
+        """targets(없으면 전체)와 상위 단계를 실행. 반환: {단계: {"status", "sec", "key", "dir"}}."""
+        force = set(force)
+        cache = self._load_digests()
+        digests = {k: content_digest(p, cache) for k, p in self.sources.items()}
+        self._save_digests(cache)
+        pending = self._needed(targets)
+        running, failed, results = {}, set(), {}
+        pool = None
+        if self.workers > 1:
+            pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=mp.get_context("spawn"))
+        t_all = time.perf_counter()
+        try:
+            while pending or running:
+                # 준비된 단계 → 건너뛰거나 실행
+                for name in list(pending):
+                    s = self.stages[name]
+                    deps = self.deps(name)
+                    if deps & failed:
+                        pending.remove(name)
+                        failed.add(name)
+                        results[name] = {"status": "blocked", "sec": 0.0, "key": None, "dir": None}
+                        continue
+                    if any(i not in digests for i in s.inputs) or (pool is not None and len(running) >= self.workers):
+                        continue
+                    pending.remove(name)
+                    key = s.key(digests)
+                    meta = None if name in force else self._done(name, key)
+                    if meta is not None:
+                        digests.update(meta["outputs"])
+                        self._set_latest(name, key)
+                        results[name] = {"status": "skipped", "sec": 0.0, "key": key, "dir": self.stage_dir(name, key)}
+                        if verbose:
+                            print(f"⏭ {name}: 같은 입력/설정의 결과 있음 ({key[:16]})")
+                        continue
+                    final = self.stage_dir(name, key)
+                    tmp = os.path.join(self.root, name, f".{key[:16]}.tmp-{os.getpid()}")
+                    shutil.rmtree(tmp, ignore_errors=True)
+                    os.makedirs(tmp)
+                    inp = {i: (self.sources[i] if i in self.sources else self.path(i)) for i in s.inputs}
+                    ctx = StageContext(name, inp, {o: os.path.join(tmp, o) for o in s.outputs}, s.params, s.options)
+                    if verbose:
+                        print(f"▶ {name} 시작 ({key[:16]})", flush=True)
+                    if pool is None:
+                        running[name] = (key, tmp, final, _run_inline(ctx, s.fn))
+                    else:
+                        running[name] = (key, tmp, final, pool.submit(_run_stage, s.fn, ctx))
+                if not running:
+                    if pending:  # 입력이 끝내 준비되지 않는 단계 (상위 실패)
+                        for name in pending:
+                            failed.add(name)
+                            results[name] = {"status": "blocked", "sec": 0.0, "key": None, "dir": None}
+                        pending = []
+                    continue
+                futs = {v[3]: n for n, v in running.items()}
+                done, _ = wait(list(futs), return_when=FIRST_COMPLETED)
+                for fut in done:
+                    name = futs[fut]
+                    key, tmp, final, _ = running.pop(name)
+                    s = self.stages[name]
+                    try:
+                        sec = fut.result()
+                        missing = [o for o in s.outputs if not os.path.exists(os.path.join(tmp, o))]
+                        if missing:
+                            raise StageFailed(f"{name}: 출력 {missing} 이 만들어지지 않음")
+                    except Exception as e:
+                        failed.add(name)
+                        shutil.rmtree(tmp, ignore_errors=True)
+                        results[name] = {"status": "failed", "sec": 0.0, "key": key, "dir": None, "error": repr(e)}
+                        print(f"❌ {name} 실패: {e!r}")
+                        continue
+                    out_digests = {o: content_digest(os.path.join(tmp, o)) for o in s.outputs}
+                    with open(os.path.join(tmp, "_stage.json"), "w", encoding="utf-8") as f:
+                        json.dump({"key": key, "stage": name, "params": s.params, "outputs": out_digests,
+                                   "sec": sec, "finished": time.strftime("%Y-%m-%dT%H:%M:%S")},
+                                  f, ensure_ascii=False, indent=1, default=str)
+                    shutil.rmtree(final, ignore_errors=True)
+                    os.replace(tmp, final)
+                    self._set_latest(name, key)
+                    digests.update(out_digests)
+                    results[name] = {"status": "ran", "sec": sec, "key": key, "dir": final}
+                    if verbose:
+                        print(f"✅ {name} 완료 {sec:.1f}s", flush=True)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+        self.results = results
+        if verbose:
+            self.report(time.perf_counter() - t_all)
+        bad = {n: r for n, r in results.items() if r["status"] in ("failed", "blocked")}
+        if bad:
+            raise StageFailed(f"실패/중단된 단계: {sorted(bad)}")
+        return results
+
+    def report(self, total=None):
+        ran = [n for n, r in self.results.items() if r["status"] == "ran"]
+        skipped = [n for n, r in self.results.items() if r["status"] == "skipped"]
+        print(f"⏱ 단계 실행 {len(ran)}개 / 건너뜀 {len(skipped)}개"
+              + (f", 전체 {total:.1f}s" if total is not None else "")
+              + (f" (단계 합 {sum(self.results[n]['sec'] for n in ran):.1f}s)" if ran else ""))
+
+def _run_inline(ctx, fn):
+    """workers=1: 현재 프로세스에서 바로 실행 → 끝난 Future (풀 실행과 같은 처리 경로)."""
+    fut = Future()
+    try:
+        fut.set_result(_run_stage(fn, ctx))
+    except Exception as e:
+        fut.set_exception(e)
+    return fut
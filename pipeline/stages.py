@@ -0,0 +1,379 @@
+# -*- coding: utf-8 -*-
+"""
+수집 → 전처리 → 감성 → 추천 단계 정의 (pipeline/stage_runner.py 로 실행) — 노트북 4개의 계산 부분을 단계로
+- 단계 (입력 → 출력)
+    clean      : raw_reviews                              → reviews_clean.parquet  (load_and_clean + 피부타입 추출 + review_id)
+    tokenize   : reviews_clean (+ user_dict)              → tokens_pos            (Komoran, 전처리 노트북 (5))
+    compound   : reviews_clean, tokens_pos (+ stopwords)  → ntoken_tokens, Ntoken_review.csv  (합성/불용어, (6)~(8))
+    lexicon    : reviews_clean, pos/neg 단어              → lex_scores.parquet, lex_scorer.pkl  (감성 노트북 E~I)
+    sentiment  : reviews_clean, lex_scores, lex_scorer    → ml_scores.parquet, sentiment_model  (K: TF-IDF 5-fold + 저장)
+    merge      : Ntoken_review.csv, lex_scores            → merged_output.csv     (review_id 로 조인, pred = 감성사전 라벨)
+    embed      : merged_output                            → item_vectors.npz      (추천 노트북 3: 리뷰 임베딩 → 상품 벡터)
+    svd        : merged_output                            → svd.npz               (추천 노트북 4: SVD → SVDScorer)
+                 --cf-incremental: 새 review_id 만 fold-in + warm start, 드리프트가 크면 전체 학습 (pipeline/cf_update.py)
+    skin       : merged_output                            → skin_index.npz        (추천 노트북 5: 피부 비율 피봇)
+    recommender: merged_output, item_vectors, svd, skin_index → rec_model         (BatchRecommender.save, rec_service 게시용)
+- tokenize ∥ lexicon ∥ sentiment, embed ∥ svd ∥ skin 는 서로 독립 → workers 개까지 동시에
+- 병합: 기존 pd.concat([ntoken_df, pred_col], axis=1) (행 위치) 대신 review_id 1:1 조인 (빠진 id 가 있으면 실패)
+- 노트북에 있던 상수(합성 패턴, 동의어, 부정어/강도부사)는 아래 기본값 = 노트북 값. 바꾸면 키가 바뀌어 그 단계부터 다시
+
+실행: python -m pipeline.stages --raw 여드름_크림_reviews_flat.csv --root ./artifacts --workers 3
+      python -m pipeline.stages --raw ... --plan                      # 실행/건너뜀 예정만
+      python -m pipeline.stages --raw ... --targets merge --export ./추천시스템   # merged_output.csv 복사
+"""
+
+import os, sys, pickle, shutil, argparse, unicodedata
+
+import numpy as np
+import pandas as pd
+
+from pipeline.stage_runner import Stage, StageRunner, StageFailed
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 전처리 노트북 (6)
+COMPOUND_PATTERNS = [
+    [(["아", "벤", "느"], "아벤느"), (["리얼", "베리", "어"], "리얼베리어"), (["수분", "부족", "지성"], "수부지"),
+     (["피부", "진정", "효과"], "진정"), (["민", "감성", "피부"], "민감성")],
+    [(["수분", "크림"], "수분크림"), (["수분", "감"], "수분감"), (["진정", "효과"], "진정효과"),
+     (["속", "건조"], "속건조"), (["좁쌀", "여드름"], "좁쌀여드름")],
+]
+EXTRA_STOPWORDS = ["아벤느", "리얼베리어", "바이오힐보", "라로슈포", "올리브영"]
+NOUN_TAGS = ["NNP", "NNG"]
+OUT_COLS = ["review_id", "product_name", "customer_name", "skin_type", "skin_tone", "skin_concerns",
+            "review", "date", "rating", "gender", "tokens", "Ntoken_review"]
+# 감성 노트북 F, H
+SYN_MAP = {"흡수해요": "흡수", "스며들어": "흡수", "스며듦": "흡수", "따갑": "자극", "촉촉": "보습", "건조함": "건조"}
+NEGATIONS = ["안", "못", "별로", "그다지", "전혀", "아니", "않"]
+INT_POS = ["매우", "진짜", "정말", "완전", "엄청", "굉장히"]
+INT_NEG = ["약간", "조금", "그냥"]
+MERGED_USECOLS = ["review_id", "product_name", "customer_name", "skin_type", "skin_tone", "skin_concerns",
+                  "review", "rating", "pred"]
+
+# =========================
+# 1) 공용
+# =========================
+def repo_path(folder, name):
+    """저장소의 한글 폴더(macOS 에서 온 NFD 이름 포함) 안의 파일 경로. 폴더가 없으면 그대로 이어 붙임."""
+    for entry in os.listdir(ROOT):
+        if unicodedata.normalize("NFC", entry) == folder:
+            return os.path.join(ROOT, entry, name)
+    return os.path.join(ROOT, folder, name)
+
+def _sentiment_tokenizer(kind, options):
+    """감성 노트북 D 셀: komoran → TokenizeService + keep_pos, simple → 간이 토크나이저. (tokenize_many, 서비스)"""
+    from pipeline.lexicon_score import simple_tokenize
+    if kind == "simple":
+        return (lambda sents: [simple_tokenize(s) for s in sents]), None
+    from pipeline.tokenize_service import TokenizeService
+    from pipeline.sentiment_model import keep_pos
+    tok = TokenizeService(options.get("token_cache"), workers=options.get("workers", 1))
+    return (lambda sents: [keep_pos(s, m) for s, m in zip(sents, tok.pos_many(sents))]), tok
+
+def load_txt_lexicon(pos_path, neg_path, tokenize_many):
+    """감성 노트북 E 셀 load_txt_lexicon (단어 → tokenize 결과 튜플, 긍정 1.0 / 부정 -1.0, 부정이 뒤에 덮어씀)."""
+    lex = {}
+    for path, w in ((pos_path, 1.0), (neg_path, -1.0)):
+        if not os.path.exists(path):
+            print(f"[WARN] not found: {path}")
+            continue
+        with open(path, encoding="utf-8") as f:
+            words = [line.strip() for line in f if line.strip()]
+        for toks in tokenize_many(words):
+            if toks:
+                lex[tuple(toks)] = w
+    return lex
+
+def read_merged(path, usecols=MERGED_USECOLS):
+    """merged_output.csv → 추천 노트북 컬럼 이름(user_id, item_id) + 피부 컬럼 결측 'Unknown' (추천 노트북 5)."""
+    df = pd.read_csv(path, usecols=lambda c: c in usecols, dtype={"review_id": str})
+    df = df.rename(columns={"customer_name": "user_id", "product_name": "item_id"})
+    for col in ["skin_type", "skin_tone", "skin_concerns"]:
+        if col in df.columns:
+            df[col] = df[col].fillna("Unknown").astype(str)
+    return df
+
+def merge_predictions(ntoken_df, scores_df, on="review_id", cols=("pred",)):
+    """ntoken_df 행 순서 그대로 scores_df[cols] 를 review_id 로 붙임 (1:1, 빠진 id 가 있으면 ValueError)."""
+    cols = list(cols)
+    for name, d in (("ntoken", ntoken_df), ("scores", scores_df)):
+        if on not in d.columns:
+            raise ValueError(f"{name} 에 {on} 컬럼이 없습니다 (전처리/감성 노트북을 review_id 포함 버전으로 다시 저장)")
+    merged = ntoken_df.drop(columns=[c for c in cols if c in ntoken_df.columns]).merge(
+        scores_df[[on] + cols], on=on, how="left", validate="one_to_one")
+    missing = merged[cols[0]].isna().sum()
+    if missing:
+        raise ValueError(f"{on} {missing}건이 점수 쪽에 없음 (입력 데이터가 서로 다른 실행에서 나옴)")
+    return merged
+
+# =========================
+# 2) 단계 함수 (fn(ctx): 워커 프로세스에서 실행)
+# =========================
+def run_clean(ctx):
+    from pipeline.clean import load_and_clean, advanced_skin_type_extraction, add_review_id
+    df = load_and_clean(ctx.inp["raw_reviews"], chunksize=ctx.options.get("chunksize"))
+    df = add_review_id(advanced_skin_type_extraction(df))
+    df.to_parquet(ctx.out["reviews_clean.parquet"], index=False)
+
+def run_tokenize(ctx):
+    from pipeline.tokenize_service import TokenizeService, HAS_KONLPY
+    from pipeline.token_store import save_token_columns
+    if not HAS_KONLPY:
+        raise RuntimeError("konlpy(Komoran) 가 없어 형태소 분석을 할 수 없습니다")
+    reviews = pd.read_parquet(ctx.inp["reviews_clean.parquet"], columns=["review"])["review"].tolist()
+    userdic = ctx.inp.get("user_dict.txt")
+    with TokenizeService(ctx.options.get("token_cache"), workers=ctx.options.get("workers", 1),
+                         userdic=userdic if userdic and os.path.exists(userdic) else None) as tok:
+        pos = tok.pos_many(reviews)
+        tok.report()
+    save_token_columns(pd.DataFrame({"tokens": pos}), ctx.out["tokens_pos"], columns=["tokens"])
+
+def run_compound(ctx):
+    from pipeline.token_match import CompoundMerger
+    from pipeline.token_store import TokenCorpus, save_token_columns
+    df = pd.read_parquet(ctx.inp["reviews_clean.parquet"])
+    col = TokenCorpus.open(ctx.inp["tokens_pos"], mmap=False)["tokens"]
+    tags = set(ctx.params["noun_tags"])
+    pairs = [col.pairs(i) for i in range(len(col))]
+    sw = set(ctx.params["extra_stopwords"])
+    sw_path = ctx.inp.get("stopwords.txt")
+    if sw_path and os.path.exists(sw_path):
+        sw.update(pd.read_csv(sw_path, header=None)[0].astype(str).tolist())
+    merger = CompoundMerger([{tuple(k): v for k, v in stage} for stage in ctx.params["patterns"]],
+                            stopwords=sw, min_len=ctx.params["min_len"])
+    df["tokens"] = pairs
+    df["Ntoken_review"] = [merger([w for w, t in p if t in tags]) for p in pairs]
+    save_token_columns(df, ctx.out["ntoken_tokens"], columns=["tokens", "Ntoken_review"])
+    df[[c for c in OUT_COLS if c in df.columns]].to_csv(ctx.out["Ntoken_review.csv"], index=False, encoding="utf-8-sig")
+
+def run_lexicon(ctx):
+    from pipeline.lexicon_score import LexiconBatchScorer
+    from pipeline.token_match import LexiconScorer
+    p = ctx.params
+    tokenize_many, tok = _sentiment_tokenizer(p["tokenizer"], ctx.options)
+    try:
+        lexicon = load_txt_lexicon(ctx.inp["pos_words.txt"], ctx.inp["neg_words.txt"], tokenize_many)
+        scorer = LexiconScorer(lexicon, max_n=p["max_n"], syn_map=p["syn_map"], negations=p["negations"],
+                               int_pos=p["int_pos"], int_neg=p["int_neg"])
+        df = pd.read_parquet(ctx.inp["reviews_clean.parquet"], columns=["review_id", "review"])
+        with LexiconBatchScorer(scorer, tokenize_many=tokenize_many if tok is not None else None,
+                                workers=ctx.options.get("workers", 1)) as bs:
+            scores, labels = bs.score(df, "review")
+            bs.report()
+    finally:
+        if tok is not None:
+            tok.close()
+    pd.DataFrame({"review_id": df["review_id"], "lex_score": scores, "lex_pred": labels}).to_parquet(
+        ctx.out["lex_scores.parquet"], index=False)
+    with open(ctx.out["lex_scorer.pkl"], "wb") as f:
+        pickle.dump(scorer, f)
+
+def run_sentiment(ctx):
+    from sklearn.metrics import f1_score, roc_auc_score, precision_recall_curve
+    from pipeline.lexicon_score import normalize_text
+    from pipeline.sentiment_train import train_parallel_folds, report_folds
+    from pipeline.sentiment_model import save_sentiment_model
+    p = ctx.params
+    df = pd.read_parquet(ctx.inp["reviews_clean.parquet"], columns=["review_id", "review", "rating"])
+    lex = pd.read_parquet(ctx.inp["lex_scores.parquet"])
+    if not lex["review_id"].equals(df["review_id"]):
+        lex = df[["review_id"]].merge(lex, on="review_id", how="left", validate="one_to_one")
+    y = (df["rating"].astype(float) < 4).astype(int).to_numpy()
+    texts = df["review"].fillna("").astype(str).map(normalize_text).tolist()
+    res = train_parallel_folds(texts, y, n_splits=p["n_splits"], n_jobs=ctx.options.get("workers", 1), seed=p["seed"],
+                               fit_full=True)
+    report_folds(res, title="ML")
+    pr, rc, th = precision_recall_curve(y, res["probs"])  # 감성 노트북 find_best_threshold
+    f1s = (2 * pr * rc / (pr + rc + 1e-12))[:-1]
+    threshold = float(th[f1s.argmax()]) if len(th) else 0.5
+    with open(ctx.inp["lex_scorer.pkl"], "rb") as f:
+        lex_scorer = pickle.load(f)
+    save_sentiment_model(ctx.out["sentiment_model"], res["vect"], res["full_model"], threshold=threshold,
+                         lex_scorer=lex_scorer, tokenizer=p["tokenizer"], pred_source="lexicon",
+                         metrics={"ml_mode": "parallel", "rows": int(len(y)), "ml_f1": float(f1_score(y, res["preds"])),
+                                  "ml_auc": float(roc_auc_score(y, res["probs"])),
+                                  "lex_f1": float(f1_score(y, lex["lex_pred"].to_numpy()))})
+    pd.DataFrame({"review_id": df["review_id"], "ml_prob": res["probs"], "ml_pred": res["preds"]}).to_parquet(
+        ctx.out["ml_scores.parquet"], index=False)
+
+def run_merge(ctx):
+    ntoken = pd.read_csv(ctx.inp["Ntoken_review.csv"], dtype={"review_id": str})
+    scores = pd.read_parquet(ctx.inp["lex_scores.parquet"]).rename(columns={"lex_pred": "pred"})
+    merged = merge_predictions(ntoken, scores)
+    merged["pred"] = merged["pred"].astype(int)
+    merged.to_csv(ctx.out["merged_output.csv"], index=False)
+
+def _items_of(df):
+    return sorted(df["item_id"].unique())  # item_text_df = groupby("item_id") 순서
+
+def run_embed(ctx):
+    from pipeline.embed_store import EmbeddingStore
+    from pipeline.review_embed import ReviewEncoder
+    p = ctx.params
+    df = read_merged(ctx.inp["merged_output.csv"], ["product_name", "review", "rating"])
+    items = _items_of(df)
+    store = EmbeddingStore.open(ctx.options["embed_store"], p["model_name"] + ("-int8" if p["quantize"] else ""))
+    rows = store.ensure(df["review"].fillna("").astype(str).tolist(),
+                        lambda: ReviewEncoder(p["model_name"], quantize=p["quantize"], max_length=p["max_length"]))
+    _, X = store.update_items(df["item_id"], rows, weights=df["rating"], items=items)
+    store.report()
+    np.savez(ctx.out["item_vectors.npz"], items=np.array(items, dtype=str), X=np.asarray(X))
+
+def run_svd(ctx):
+    from pipeline.cf_score import SVDScorer
+    from pipeline.cf_update import IncrementalSVD
+    p = ctx.params
+    df = read_merged(ctx.inp["merged_output.csv"], ["review_id", "customer_name", "product_name", "rating", "pred"])
+    df["rating_aug"] = (df["rating"].astype(float) + 0.5 * df.get("pred", 0)).clip(0.5, 5.0)
+    state_dir = ctx.options.get("cf_state") if "review_id" in df.columns else None
+    if p.get("incremental") and state_dir:
+        upd = IncrementalSVD.load(state_dir)
+        if upd is not None:
+            rep = upd.update(df, epochs=p["warm_epochs"])
+            IncrementalSVD.report(rep, "[svd] ")
+            if not rep["retrain"]:
+                upd.save(state_dir)
+                upd.scorer.save(ctx.out["svd.npz"])
+                return
+
+    from surprise import Dataset, Reader, SVD
+    data = Dataset.load_from_df(df[["user_id", "item_id", "rating_aug"]], Reader(rating_scale=(0.5, 5.0)))
+    algo = SVD(n_factors=p["n_factors"], n_epochs=p["n_epochs"], random_state=p["seed"])
+    algo.fit(data.build_full_trainset())
+    scorer = SVDScorer.from_surprise(algo)
+    scorer.save(ctx.out["svd.npz"])
+    if state_dir:  # 다음 실행의 증분 기준
+        IncrementalSVD.from_fit(scorer, df).save(state_dir)
+
+def run_skin(ctx):
+    from pipeline.skin_index import SkinIndex
+    df = read_merged(ctx.inp["merged_output.csv"])
+    SkinIndex.build(df, items=_items_of(df)).save(ctx.out["skin_index.npz"])
+
+def run_recommender(ctx):
+    from pipeline.batch_recommend import BatchRecommender
+    from pipeline.cf_score import SVDScorer
+    from pipeline.skin_index import SkinIndex
+    p = ctx.params
+    df = read_merged(ctx.inp["merged_output.csv"])
+    with np.load(ctx.inp["item_vectors.npz"]) as z:
+        items, X = z["items"].tolist(), z["X"]
+    rec = BatchRecommender.from_frame(df, items, X, SVDScorer.load(ctx.inp["svd.npz"]),
+                                      SkinIndex.load(ctx.inp["skin_index.npz"]), min_rating=p["min_rating"],
+                                      content_weight=p["content_weight"], skin_threshold=p["skin_threshold"], workers=1)
+    rec.save(ctx.out["rec_model"])
+
+# =========================
+# 3) 그래프
+# =========================
+def resolve_tokenizer(kind="auto"):
+    """auto → konlpy 가 있으면 komoran (키에 들어가는 값이라 실행 전에 정함)."""
+    if kind != "auto":
+        return kind
+    from pipeline.tokenize_service import HAS_KONLPY
+    return "komoran" if HAS_KONLPY else "simple"
+
+def build_stages(tokenizer="auto", model_name="monologg/kobert", quantize=True, workers=1, token_cache=None,
+                 embed_store="./embed_store", chunksize=None, cf_state=None, cf_incremental=False):
+    """
+    노트북 기본값의 단계 목록. workers = 단계 안 워커 수 (결과에 영향 없음 → 키에 안 들어감).
+    cf_state: SVD 증분 상태 디렉터리 (전체 학습 때마다 기준 저장), cf_incremental: 그 상태에서 증분 갱신.
+    """
+    tokenizer = resolve_tokenizer(tokenizer)
+    opt = {"workers": workers, "token_cache": token_cache}
+    svd_params = {"n_factors": 64, "n_epochs": 20, "seed": 42}
+    if cf_incremental:
+        svd_params.update(incremental=True, warm_epochs=3)
+    return [
+        Stage("clean", run_clean, ["raw_reviews"], ["reviews_clean.parquet"], options={"chunksize": chunksize}),
+        Stage("tokenize", run_tokenize, ["reviews_clean.parquet", "user_dict.txt"], ["tokens_pos"], options=opt),
+        Stage("compound", run_compound, ["reviews_clean.parquet", "tokens_pos", "stopwords.txt"],
+              ["ntoken_tokens", "Ntoken_review.csv"],
+              params={"patterns": COMPOUND_PATTERNS, "extra_stopwords": EXTRA_STOPWORDS, "noun_tags": NOUN_TAGS,
+                      "min_len": 2}),
+        Stage("lexicon", run_lexicon, ["reviews_clean.parquet", "pos_words.txt", "neg_words.txt"],
+              ["lex_scores.parquet", "lex_scorer.pkl"], options=opt,
+              params={"tokenizer": tokenizer, "max_n": 3, "syn_map": SYN_MAP, "negations": NEGATIONS,
+                      "int_pos": INT_POS, "int_neg": INT_NEG}),
+        Stage("sentiment", run_sentiment, ["reviews_clean.parquet", "lex_scores.parquet", "lex_scorer.pkl"],
+              ["ml_scores.parquet", "sentiment_model"], options=opt,
+              params={"tokenizer": tokenizer, "n_splits": 5, "seed": 42}),
+        Stage("merge", run_merge, ["Ntoken_review.csv", "lex_scores.parquet"], ["merged_output.csv"]),
+        Stage("embed", run_embed, ["merged_output.csv"], ["item_vectors.npz"], options={"embed_store": embed_store},
+              params={"model_name": model_name, "quantize": quantize, "max_length": 128}),
+        Stage("svd", run_svd, ["merged_output.csv"], ["svd.npz"], options={"cf_state": cf_state}, params=svd_params),
+        Stage("skin", run_skin, ["merged_output.csv"], ["skin_index.npz"]),
+        Stage("recommender", run_recommender, ["merged_output.csv", "item_vectors.npz", "svd.npz", "skin_index.npz"],
+              ["rec_model"], params={"content_weight": 0.6, "skin_threshold": 0.1, "min_rating": 4.0}),
+    ]
+
+def default_sources(raw):
+    return {"raw_reviews": raw,
+            "user_dict.txt": repo_path("데이터 전처리", "user_dict.txt"),
+            "stopwords.txt": repo_path("데이터 전처리", "stopwords.txt"),
+            "pos_words.txt": repo_path("감성분석", "combined_pos_words.txt"),
+            "neg_words.txt": repo_path("감성분석", "combined_neg_words.txt")}
+
+def export(runner, artifacts, dest):
+    """최신 결과를 dest 로 복사 (노트북이 읽는 이름 그대로: merged_output.csv 등). 반환: 복사한 경로 목록."""
+    os.makedirs(dest, exist_ok=True)
+    out = []
+    for name in artifacts:
+        src, dst = runner.path(name), os.path.join(dest, name)
+        if os.path.isdir(src):
+            shutil.rmtree(dst, ignore_errors=True)
+            shutil.copytree(src, dst)
+        else:
+            shutil.copy2(src, dst)
+        out.append(dst)
+    return out
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--raw", required=True, help="크롤링 CSV 또는 리뷰 컬럼형 저장소 디렉터리")
+    ap.add_argument("--root", default="./artifacts")
+    ap.add_argument("--workers", type=int, default=3, help="동시에 실행할 단계 수")
+    ap.add_argument("--stage-workers", type=int, default=1, help="단계 안 워커 수 (Komoran/감성사전/fold)")
+    ap.add_argument("--targets", default="", help="쉼표 구분 (기본: 전체)")
+    ap.add_argument("--force", default="", help="결과가 있어도 다시 실행할 단계 (쉼표 구분)")
+    ap.add_argument("--plan", action="store_true")
+    ap.add_argument("--tokenizer", default="auto", choices=["auto", "komoran", "simple"])
+    ap.add_argument("--model-name", default="monologg/kobert")
+    ap.add_argument("--no-quantize", action="store_true")
+    ap.add_argument("--token-cache", default=os.path.join(ROOT, ".cache", "komoran_pos.sqlite"))
+    ap.add_argument("--embed-store", default=repo_path("추천시스템", "embed_store"))
+    ap.add_argument("--chunksize", type=int, default=0)
+    ap.add_argument("--cf-state", default=os.path.join(ROOT, ".cache", "cf_state"), help="SVD 증분 상태 디렉터리")
+    ap.add_argument("--cf-incremental", action="store_true", help="SVD 를 새 리뷰만 증분 갱신 (드리프트가 크면 전체 학습)")
+    ap.add_argument("--source", action="append", default=[], help="소스 경로 바꾸기 (예: pos_words.txt=./pos.txt)")
+    ap.add_argument("--export", default=None, help="merged_output.csv / Ntoken_review.csv 를 복사할 디렉터리")
+    args = ap.parse_args()
+
+    if args.token_cache:
+        os.makedirs(os.path.dirname(args.token_cache), exist_ok=True)
+    stages = build_stages(args.tokenizer, args.model_name, quantize=not args.no_quantize, workers=args.stage_workers,
+                          token_cache=args.token_cache, embed_store=args.embed_store, chunksize=args.chunksize or None,
+                          cf_state=args.cf_state, cf_incremental=args.cf_incremental)
+    sources = default_sources(args.raw)
+    for spec in args.source:
+        name, _, path = spec.partition("=")
+        if name not in sources:
+            ap.error(f"알 수 없는 소스: {name} (가능: {sorted(sources)})")
+        sources[name] = path
+    runner = StageRunner(args.root, stages, sources=sources, workers=args.workers)
+    targets = [t for t in args.targets.split(",") if t]
+    if args.plan:
+        runner.plan(targets, force=[f for f in args.force.split(",") if f])
+        return
+    try:
+        runner.run(targets, force=[f for f in args.force.split(",") if f])
+    except StageFailed as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    if args.export:
+        names = [n for n in ("Ntoken_review.csv", "merged_output.csv") if runner.producer[n] in runner.results]
+        for path in export(runner, names, args.export):
+            print(f"📦 {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+크롤러 스로틀링: 고정 랜덤 sleep 대신 '준비 완료 조건 대기 + 적응형 토큰 버킷'
+- AdaptiveRateLimiter: 초당 rate 개 토큰(버스트 burst). 관측한 응답 지연/오류율로 rate 를 조정
+    · 정상 + 지연이 목표 이하 → rate += increase (가산 증가)
+    · 지연 EWMA 가 목표 초과 → rate *= 0.9
+    · 오류/타임아웃 → rate *= backoff (곱셈 감소)
+- WaitStats: 실행 동안 '기다린 시간'(스로틀/준비 대기/sleep)과 '일한 시간'(= 벽시계 - 대기)을 집계
+  → 워커/엔진별 summary() 를 합쳐 속도 개선을 수치로 비교
+"""
+
+import time, asyncio, threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+# =========================
+# 1) 대기/작업 시간 집계
+# =========================
+class WaitStats:
+    def __init__(self):
+        self.t0 = time.monotonic()
+        self.wait = defaultdict(float)
+        self.count = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def add(self, label, seconds):
+        with self._lock:
+            self.wait[label] += seconds
+            self.count[label] += 1
+
+    @contextmanager
+    def waiting(self, label):
+        t = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add(label, time.monotonic() - t)
+
+    def sleep(self, seconds, label="sleep"):
+        if seconds > 0:
+            with self.waiting(label):
+                time.sleep(seconds)
+
+    def summary(self):
+        wall = time.monotonic() - self.t0
+        waited = sum(self.wait.values())
+        return {
+            "wall": wall,
+            "wait": waited,
+            "work": max(0.0, wall - waited),
+            "by_label": {k: {"sec": v, "n": self.count[k]} for k, v in self.wait.items()},
+        }
+
+    @staticmethod
+    def merge(summaries):
+        out = {"wall": 0.0, "wait": 0.0, "work": 0.0, "by_label": {}}
+        for s in summaries:
+            for k in ("wall", "wait", "work"):
+                out[k] += s[k]
+            for label, v in s["by_label"].items():
+                agg = out["by_label"].setdefault(label, {"sec": 0.0, "n": 0})
+                agg["sec"] += v["sec"]; agg["n"] += v["n"]
+        return out
+
+    @staticmethod
+    def report(summary, tag=""):
+        wall = summary["wall"] or 1e-9
+        print(f"{tag}⏱ 대기 {summary['wait']:.1f}s ({summary['wait']/wall:.0%}) / "
+              f"작업 {summary['work']:.1f}s ({summary['work']/wall:.0%}) / 전체 {summary['wall']:.1f}s")
+        for label, v in sorted(summary["by_label"].items(), key=lambda kv: -kv[1]["sec"]):
+            print(f"{tag}   - {label:<16} {v['sec']:8.1f}s  ({v['n']}회, 평균 {v['sec']/max(v['n'],1):.2f}s)")
+
+# =========================
+# 2) 적응형 토큰 버킷
+# =========================
+class AdaptiveRateLimiter:
+    def __init__(self, rate=1.0, burst=2, min_rate=0.2, max_rate=4.0,
+                 target_latency=1.5, increase=0.05, backoff=0.5, stats=None):
+        self.rate, self.burst = rate, burst
+        self.min_rate, self.max_rate = min_rate, max_rate
+        self.target_latency, self.increase, self.backoff = target_latency, increase, backoff
+        self.stats = stats
+        self.tokens = float(burst)
+        self.last = time.monotonic()
+        self.lat_ewma = None
+        self.err_ewma = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """토큰 1개 예약. 바로 못 쓰면 기다려야 할 초를 반환(음수 잔고로 순서 보장)."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            self.tokens -= 1.0
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def acquire(self):
+        delay = self._reserve()
+        if delay > 0:
+            if self.stats is not None:
+                self.stats.sleep(delay, "throttle")
+            else:
+                time.sleep(delay)
+
+    async def acquire_async(self):
+        delay = self._reserve()
+        if delay > 0:
+            t = time.monotonic()
+            await asyncio.sleep(delay)
+            if self.stats is not None:
+                self.stats.add("throttle", time.monotonic() - t)
+
+    def observe(self, latency=None, ok=True, timeout=False):
+        """요청/대기 1건의 결과를 반영해 rate 조정."""
+        with self._lock:
+            if latency is not None:
+                self.lat_ewma = latency if self.lat_ewma is None else 0.8 * self.lat_ewma + 0.2 * latency
+            failed = timeout or not ok
+            self.err_ewma = 0.8 * self.err_ewma + (0.2 if failed else 0.0)
+            if failed:
+                self.rate = max(self.min_rate, self.rate * self.backoff)
+            elif self.lat_ewma is not None and self.lat_ewma > self.target_latency:
+                self.rate = max(self.min_rate, self.rate * 0.9)
+            else:
+                self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def snapshot(self):
+        with self._lock:
+            return {"rate": self.rate, "latency_ewma": self.lat_ewma, "error_rate": self.err_ewma}
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+토큰 시퀀스 매칭 엔진 (토큰 trie, 1회 컴파일 → 리뷰마다 1회 순회)
+- TokenTrie: 토큰 n-gram → 값. 위치마다 trie 를 따라 내려가다 자식이 없으면 바로 멈춤
+    · 기존 greedy_longest_match 는 위치마다 n=max_n..1 의 tuple 슬라이스 + dict 조회 → max_n 에 비례
+    · trie 는 실제로 이어지는 사전 항목이 있을 때만 한 단계 더 내려감 → MAX_N 을 키워도 비용이 거의 같음
+- LexiconScorer (감성분석): 동의어 치환(SYN_MAP) + 부정어/강도부사 판별 + 최장일치 채점을 한 번에
+- CompoundMerger (전처리): patterns_3 → patterns_2 단어 합성 + 불용어/한 글자 제거
+    · 단계별 trie 치환은 새 리스트에 쓰면서 진행 (기존 del tokens[...] 의 O(n²) 없음)
+- 결과는 노트북 기존 함수와 동일 (*_legacy 로 같은 모듈에 두고 bench/bench_token_match.py 에서 비교)
+
+사용 예)
+    scorer = LexiconScorer(lexicon, max_n=MAX_N, syn_map=SYN_MAP,
+                           negations=NEGATIONS, int_pos=INT_POS, int_neg=INT_NEG)
+    scorer.score(tokens)                 # score_by_lexicon 과 같은 값
+    merger = CompoundMerger([patterns_3, patterns_2], stopwords=sw)
+    merger(tokens)                       # compound_words + 불용어 제거와 같은 결과
+"""
+
+_END = None  # trie 노드에서 값을 담는 키 (토큰은 문자열이라 겹치지 않음)
+
+# =========================
+# 1) 토큰 trie
+# =========================
+class TokenTrie:
+    def __init__(self, items=None, max_n=None):
+        """items: {(토큰, ...): 값}. max_n 보다 긴 항목은 무시 (build_ngram_index 와 같은 동작)."""
+        self.root = {}
+        self.max_n = max_n
+        self.size = 0
+        for seq, value in (items or {}).items():
+            self.add(seq, value)
+
+    def add(self, seq, value):
+        seq = tuple(seq)
+        if not seq or (self.max_n is not None and len(seq) > self.max_n):
+            return
+        node = self.root
+        for tok in seq:
+            node = node.setdefault(tok, {})
+        if _END not in node:
+            self.size += 1
+        node[_END] = value
+
+    def __len__(self):
+        return self.size
+
+    def longest_at(self, tokens, i):
+        """tokens[i:] 로 시작하는 가장 긴 항목 → (끝 위치, 값), 없으면 None."""
+        node = self.root.get(tokens[i])
+        if node is None:
+            return None
+        best = None
+        j, L = i + 1, len(tokens)
+        while True:
+            if _END in node:
+                best = (j, node[_END])
+            if j >= L:
+                return best
+            node = node.get(tokens[j])
+            if node is None:
+                return best
+            j += 1
+
+    def matches(self, tokens):
+        """왼쪽부터 최장일치, 겹치지 않게 → [(시작, 끝, n-gram, 값), ...] (greedy_longest_match 와 같은 모양)."""
+        root = self.root
+        out = []
+        i, L = 0, len(tokens)
+        while i < L:
+            if tokens[i] in root:
+                hit = self.longest_at(tokens, i)
+                if hit is not None:
+                    out.append((i, hit[0], tuple(tokens[i:hit[0]]), hit[1]))
+                    i = hit[0]
+                    continue
+            i += 1
+        return out
+
+    def rewrite(self, tokens):
+        """매칭 구간을 값(토큰 1개)으로 바꾼 새 리스트. 치환 결과는 이 단계에서 다시 매칭하지 않음."""
+        root = self.root
+        out = []
+        i, L = 0, len(tokens)
+        while i < L:
+            if tokens[i] in root:
+                hit = self.longest_at(tokens, i)
+                if hit is not None:
+                    out.append(hit[1])
+                    i = hit[0]
+                    continue
+            out.append(tokens[i])
+            i += 1
+        return out
+
+# =========================
+# 2) 감성사전 채점 (감성분석 노트북 G~I 단계)
+# =========================
+class LexiconScorer:
+    def __init__(self, lexicon, max_n=3, syn_map=None, negations=(), int_pos=(), int_neg=(),
+                 pos_boost=1.15, neg_damp=0.9):
+        """lexicon: {(토큰, ...): 가중치} — load_txt_lexicon 결과 (build_ngram_index 결과 dict 도 가능)."""
+        if lexicon and all(isinstance(k, int) for k in lexicon):  # {n: {ngram: w}} (ng_idx)
+            lexicon = {g: w for part in lexicon.values() for g, w in part.items()}
+        self.trie = TokenTrie(lexicon, max_n=max_n)
+        self.syn_map = dict(syn_map or {})
+        self.negations, self.int_pos, self.int_neg = set(negations), set(int_pos), set(int_neg)
+        self.pos_boost, self.neg_damp = pos_boost, neg_damp
+
+    def normalize(self, tokens):
+        syn = self.syn_map
+        return [syn.get(t, t) for t in tokens] if syn else list(tokens)
+
+    def matches(self, tokens):
+        return self.trie.matches(self.normalize(tokens))
+
+    def score(self, tokens):
+        """score_by_lexicon 과 같은 값: 동의어 치환 → 최장일치 합 → 부정어/강도부사 보정."""
+        syn = self.syn_map
+        root = self.trie.root
+        toks = []
+        neg = boost = damp = False
+        for t in tokens:
+            t = syn.get(t, t)
+            toks.append(t)
+            if t in self.negations: neg = True
+            if t in self.int_pos: boost = True
+            if t in self.int_neg: damp = True
+        total = 0.0
+        i, L = 0, len(toks)
+        while i < L:
+            if toks[i] in root:
+                hit = self.trie.longest_at(toks, i)
+                if hit is not None:
+                    total += hit[1]
+                    i = hit[0]
+                    continue
+            i += 1
+        if neg:
+            total = -total if total > 0 else total
+        if boost:
+            total *= self.pos_boost
+        if damp:
+            total *= self.neg_damp
+        return float(total)
+
+    def score_many(self, token_lists):
+        return [self.score(t) for t in token_lists]
+
+# =========================
+# 3) 단어 합성 + 불용어 제거 (전처리 노트북 (6)~(7) 단계)
+# =========================
+class CompoundMerger:
+    def __init__(self, stages, stopwords=(), min_len=2):
+        """
+        stages: 합성 패턴 dict 목록, 앞 단계부터 적용 (예: [patterns_3, patterns_2]).
+                앞 단계에서 합쳐진 단어도 다음 단계 패턴에 쓰일 수 있음 (기존 compound_words 와 같은 순서)
+        stopwords/min_len: 합성 후 제거할 단어 / 최소 글자 수 (기존: len(t) > 1)
+        """
+        self.stages = [TokenTrie(p) for p in stages]
+        self.stopwords = set(stopwords)
+        self.min_len = min_len
+
+    def merge(self, tokens):
+        for trie in self.stages:
+            if len(trie):
+                tokens = trie.rewrite(tokens)
+        return list(tokens)
+
+    def __call__(self, tokens):
+        sw, n = self.stopwords, self.min_len
+        return [t for t in self.merge(tokens) if t not in sw and len(t) >= n]
+
+# =========================
+# 4) 기존 구현 (비교용) — 노트북 셀과 동일
+# =========================
+def build_ngram_index_legacy(lex, max_n=3):
+    idx = {n: {} for n in range(1, max_n+1)}
+    for ngram, w in lex.items():
+        n = min(len(ngram), max_n)
+        idx[n][ngram] = w
+    return idx
+
+def greedy_longest_match_legacy(tokens, ngram_index, max_n=3):
+    i, L = 0, len(tokens)
+    matches = []
+    while i < L:
+        found = None
+        for n in range(min(max_n, L - i), 0, -1):
+            cand = tuple(tokens[i:i+n])
+            if cand in ngram_index[n]:
+                found = (i, i+n, cand, ngram_index[n][cand])
+                break
+        if found:
+            matches.append(found)
+            i = found[1]
+        else:
+            i += 1
+    return matches
+
+def score_by_lexicon_legacy(tokens, ngram_index, max_n=3, syn_map=None, negations=(), int_pos=(), int_neg=()):
+    toks = [(syn_map or {}).get(t, t) for t in tokens]
+    total = 0.0
+    for (s, e, ng, w) in greedy_longest_match_legacy(toks, ngram_index, max_n=max_n):
+        total += w
+    if any(t in negations for t in toks):
+        total = -total if total > 0 else total
+    if any(t in int_pos for t in toks):
+        total *= 1.15
+    if any(t in int_neg for t in toks):
+        total *= 0.9
+    return float(total)
+
+def compound_words_legacy(tokens, patterns_3, patterns_2):
+    i = 0
+    while i < len(tokens) - 2:
+        gram = tuple(tokens[i:i+3])
+        if gram in patterns_3:
+            tokens[i] = patterns_3[gram]
+            del tokens[i+1:i+3]
+        i += 1
+    i = 0
+    while i < len(tokens) - 1:
+        gram = tuple(tokens[i:i+2])
+        if gram in patterns_2:
+            tokens[i] = patterns_2[gram]
+            del tokens[i+1]
+        i += 1
+    return tokens
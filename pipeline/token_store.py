@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+토큰 컬럼 저장소 (공유 어휘 + CSR int32 배열, memmap)
+- 전처리 결과의 tokens([(형태소, 품사), ...]) / Ntoken_review([명사, ...]) 를 CSV 의 리스트 문자열 대신
+  어휘 id 배열로 저장 → 감성분석/추천에서 literal_eval 없이 바로 사용
+- 디렉터리 구성
+    vocab.json               : 형태소 문자열 목록 (모든 컬럼이 공유, id = 위치)
+    tags.json                : 품사 태그 목록
+    <col>.offsets.npy (int64): 행 i 의 토큰 = ids[offsets[i]:offsets[i+1]]
+    <col>.ids.npy     (int32)
+    <col>.pos.npy     (uint8): 품사 id (tokens 처럼 (형태소, 품사) 쌍인 컬럼만)
+    meta.json                : 행 수, 컬럼별 품사 유무
+- 읽기는 np.load(mmap_mode="r") → 행마다 파이썬 객체를 만들지 않고, 필요한 행만 tokens()/joined() 로 변환
+
+사용 예)
+    save_token_columns(df, TOKENS_DIR, columns=["tokens", "Ntoken_review"])
+    corpus = TokenCorpus.open(TOKENS_DIR)
+    corpus["Ntoken_review"].joined(0)        # '수분크림 보습 ...'
+    corpus["tokens"].words(0)                # ['수분', '크림', ...] (_to_token_list 와 같은 결과)
+"""
+
+import os, json
+from ast import literal_eval
+
+import numpy as np
+
+# =========================
+# 1) 컬럼 (읽기 전용 뷰)
+# =========================
+class TokenColumn:
+    def __init__(self, vocab, tags, offsets, ids, pos=None):
+        self.vocab, self.tags = vocab, tags
+        self.offsets, self._ids, self._pos = offsets, ids, pos
+        self._vocab_arr = None
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def has_pos(self):
+        return self._pos is not None
+
+    def lengths(self):
+        return np.diff(self.offsets)
+
+    def ids(self, i):
+        """행 i 의 어휘 id (memmap 뷰, 복사 없음)."""
+        return self._ids[self.offsets[i]:self.offsets[i + 1]]
+
+    def pos_ids(self, i):
+        return self._pos[self.offsets[i]:self.offsets[i + 1]]
+
+    def words(self, i):
+        vocab = self.vocab
+        return [vocab[j] for j in self.ids(i).tolist()]
+
+    def pairs(self, i):
+        """[(형태소, 품사), ...] — komoran.pos 결과 모양 (품사가 있는 컬럼만)."""
+        vocab, tags = self.vocab, self.tags
+        return [(vocab[j], tags[t]) for j, t in zip(self.ids(i).tolist(), self.pos_ids(i).tolist())]
+
+    def tokens(self, i):
+        """원래 컬럼 값과 같은 모양: 품사 컬럼 → pairs, 아니면 words."""
+        return self.pairs(i) if self.has_pos else self.words(i)
+
+    def joined(self, i, sep=" "):
+        return sep.join(self.words(i))
+
+    def _vocab_array(self):
+        if self._vocab_arr is None:
+            self._vocab_arr = np.asarray(self.vocab, dtype=object)
+        return self._vocab_arr
+
+    def iter_words(self, block=100_000):
+        """전체 행 순회. 블록마다 어휘 조회를 한 번에 (행마다 id → 문자열 변환 반복 없음)."""
+        vocab = self._vocab_array()
+        for b0 in range(0, len(self), block):
+            b1 = min(b0 + block, len(self))
+            offs = self.offsets[b0:b1 + 1]
+            flat = vocab.take(self._ids[offs[0]:offs[-1]]).tolist()
+            offs = (offs - offs[0]).tolist()
+            for k in range(b1 - b0):
+                yield flat[offs[k]:offs[k + 1]]
+
+    def iter_joined(self, sep=" ", block=100_000):
+        for words in self.iter_words(block):
+            yield sep.join(words)
+
+# =========================
+# 2) 코퍼스 (여러 컬럼 + 공유 어휘)
+# =========================
+class TokenCorpus:
+    def __init__(self, vocab, tags, columns, n_rows):
+        self.vocab, self.tags = vocab, tags
+        self.columns = columns
+        self.n_rows = n_rows
+
+    def __getitem__(self, col):
+        return self.columns[col]
+
+    def __contains__(self, col):
+        return col in self.columns
+
+    def __len__(self):
+        return self.n_rows
+
+    @classmethod
+    def open(cls, path, mmap=True):
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(os.path.join(path, "vocab.json"), encoding="utf-8") as f:
+            vocab = json.load(f)
+        with open(os.path.join(path, "tags.json"), encoding="utf-8") as f:
+            tags = json.load(f)
+        mode = "r" if mmap else None
+        columns = {}
+        for col, info in meta["columns"].items():
+            offsets = np.load(os.path.join(path, f"{col}.offsets.npy"), mmap_mode=mode)
+            ids = np.load(os.path.join(path, f"{col}.ids.npy"), mmap_mode=mode)
+            pos = np.load(os.path.join(path, f"{col}.pos.npy"), mmap_mode=mode) if info["has_pos"] else None
+            columns[col] = TokenColumn(vocab, tags, offsets, ids, pos)
+        return cls(vocab, tags, columns, meta["n_rows"])
+
+# =========================
+# 3) 쓰기
+# =========================
+def _as_list(val):
+    """셀 값 → 토큰 리스트. CSV 에서 읽은 리스트 문자열이면 literal_eval (기존 파일 변환용)."""
+    if isinstance(val, str):
+        try:
+            val = literal_eval(val)
+        except Exception:
+            return []
+    if isinstance(val, (list, tuple)):
+        return list(val)
+    return []
+
+def build_token_columns(columns):
+    """
+    columns: {컬럼명: 행별 토큰 리스트} — 토큰은 '형태소' 또는 ('형태소', '품사').
+    반환: TokenCorpus (메모리 배열)
+    """
+    vocab, vocab_id = [], {}
+    tags, tag_id = [], {}
+    out, n_rows = {}, None
+    for col, rows in columns.items():
+        rows = [_as_list(r) for r in rows]
+        n_rows = len(rows) if n_rows is None else n_rows
+        if len(rows) != n_rows:
+            raise ValueError(f"컬럼 {col} 행 수 {len(rows)} != {n_rows}")
+        has_pos = any(r and isinstance(r[0], (list, tuple)) for r in rows)
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        ids, pos = [], []
+        for i, r in enumerate(rows):
+            for tok in r:
+                w, t = (tok[0], tok[1]) if has_pos else (tok, None)
+                j = vocab_id.get(w)
+                if j is None:
+                    j = vocab_id[w] = len(vocab)
+                    vocab.append(w)
+                ids.append(j)
+                if has_pos:
+                    k = tag_id.get(t)
+                    if k is None:
+                        k = tag_id[t] = len(tags)
+                        tags.append(t)
+                    pos.append(k)
+            offsets[i + 1] = len(ids)
+        pos_arr = None
+        if has_pos:
+            pos_arr = np.asarray(pos, dtype=np.uint8 if len(tags) <= 256 else np.uint16)
+        out[col] = TokenColumn(vocab, tags, offsets, np.asarray(ids, dtype=np.int32), pos_arr)
+    return TokenCorpus(vocab, tags, out, n_rows or 0)
+
+def save_corpus(corpus, path):
+    os.makedirs(path, exist_ok=True)
+    meta = {"n_rows": corpus.n_rows, "columns": {}}
+    for col, c in corpus.columns.items():
+        np.save(os.path.join(path, f"{col}.offsets.npy"), np.asarray(c.offsets))
+        np.save(os.path.join(path, f"{col}.ids.npy"), np.asarray(c._ids))
+        if c.has_pos:
+            np.save(os.path.join(path, f"{col}.pos.npy"), np.asarray(c._pos))
+        meta["columns"][col] = {"has_pos": c.has_pos}
+    with open(os.path.join(path, "vocab.json"), "w", encoding="utf-8") as f:
+        json.dump(corpus.vocab, f, ensure_ascii=False)
+    with open(os.path.join(path, "tags.json"), "w", encoding="utf-8") as f:
+        json.dump(corpus.tags, f, ensure_ascii=False)
+    # meta.json 을 마지막에 → 쓰다 끊긴 디렉터리는 open 단계에서 바로 실패
+    with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+def save_token_columns(df, path, columns=("tokens", "Ntoken_review")):
+    """DataFrame 의 토큰 컬럼들을 공유 어휘 CSR 형식으로 저장 (행 순서 = df 행 순서)."""
+    corpus = build_token_columns({c: df[c].tolist() for c in columns if c in df.columns})
+    save_corpus(corpus, path)
+    return corpus
+
+def convert_csv(csv_path, path, columns=("tokens", "Ntoken_review")):
+    """기존 Ntoken_review.csv(리스트 문자열) → 토큰 저장소 (1회 변환)."""
+    import pandas as pd
+    df = pd.read_csv(csv_path, encoding="utf-8-sig", usecols=lambda c: c in columns)
+    return save_token_columns(df, path, columns)
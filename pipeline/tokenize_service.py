@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+Komoran 형태소 분석 서비스 (프로세스 풀 + 디스크 캐시)
+- 워커 프로세스마다 Komoran 1개 (JVM 도 워커마다 따로 → spawn 방식, fork 금지)
+- 캐시 키 = sha1(태거 설정 + 텍스트) : 태거 설정 = konlpy 버전 + 사용자 사전 파일 내용 해시
+    · 같은 리뷰(중복/이전 실행에서 본 리뷰)는 다시 분석하지 않음. 사용자 사전이 바뀌면 키도 바뀜
+    · 텍스트는 호출 측에서 정규화한 그대로 (전처리: extract_hangul 결과, 감성분석: normalize_text 결과)
+- 캐시는 sqlite 1개 파일 (쓰기는 메인 프로세스에서만)
+- 반환값은 komoran.pos(text) 와 같은 [(형태소, 품사), ...]
+
+사용 예)
+    tok = TokenizeService(TOKEN_CACHE, workers=4, userdic="./user_dict.txt")
+    df["tokens_pos"] = tok.pos_many(df["review"].tolist())
+    tok.close()
+"""
+
+import os, json, time, sqlite3, hashlib
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import konlpy
+    from konlpy.tag import Komoran
+    HAS_KONLPY = True
+except ImportError:
+    HAS_KONLPY = False
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pos_cache (
+    key BLOB PRIMARY KEY, pos TEXT NOT NULL
+);
+"""
+
+# =========================
+# 1) 태거 설정 / 캐시 키
+# =========================
+def tagger_config(userdic=None):
+    dic_hash = None
+    if userdic and os.path.exists(userdic):
+        with open(userdic, "rb") as f:
+            dic_hash = hashlib.sha1(f.read()).hexdigest()
+    return {
+        "tagger": "komoran",
+        "konlpy": getattr(konlpy, "__version__", "") if HAS_KONLPY else "",
+        "userdic": dic_hash,
+    }
+
+def config_key(cfg):
+    return hashlib.sha1(json.dumps(cfg, sort_keys=True).encode("utf-8")).hexdigest()
+
+def text_key(cfg_key, text):
+    return hashlib.sha1(f"{cfg_key}\x00{text}".encode("utf-8")).digest()[:16]
+
+def _encode(pos):
+    return json.dumps(pos, ensure_ascii=False, separators=(",", ":"))
+
+def _decode(s):
+    return [tuple(p) for p in json.loads(s)]
+
+# =========================
+# 2) 워커 (프로세스마다 Komoran 1개)
+# =========================
+_worker_tagger = None
+
+def _make_komoran(userdic):
+    return Komoran(userdic=userdic) if userdic and os.path.exists(userdic) else Komoran()
+
+def _init_worker(userdic):
+    global _worker_tagger
+    _worker_tagger = _make_komoran(userdic)
+
+def _pos_chunk(texts):
+    return [[tuple(p) for p in _worker_tagger.pos(t)] if t else [] for t in texts]
+
+def _worker_pid(delay):
+    # initializer(Komoran 기동)가 끝난 프로세스만 작업을 받음 → pid 가 돌아왔다면 그 워커는 준비 완료
+    time.sleep(delay)
+    return os.getpid()
+
+# =========================
+# 3) 서비스
+# =========================
+class TokenizeService:
+    def __init__(self, cache_path=None, workers=1, userdic=None, chunk_size=256):
+        """
+        cache_path: sqlite 캐시 파일 (None → 캐시 없이 메모리에서만 중복 제거)
+        workers: 1 → 현재 프로세스에서 Komoran 1개, 2 이상 → 프로세스 풀
+        """
+        if not HAS_KONLPY:
+            raise ImportError("konlpy 가 필요합니다: pip install konlpy (Java 필요)")
+        self.userdic = userdic
+        self.cfg = tagger_config(userdic)
+        self.cfg_key = config_key(self.cfg)
+        self.workers = max(1, int(workers))
+        self.chunk_size = chunk_size
+        self.stats = {"texts": 0, "unique": 0, "cache_hits": 0, "analyzed": 0, "sec": 0.0}
+        self._tagger = None
+        self._pool = None
+        self.conn = None
+        if cache_path:
+            self.conn = sqlite3.connect(cache_path, timeout=30)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(SCHEMA)
+
+    # ---- 내부 ----
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=mp.get_context("spawn"),
+                initializer=_init_worker, initargs=(self.userdic,),
+            )
+        return self._pool
+
+    def _analyze(self, texts):
+        if self.workers == 1:
+            if self._tagger is None:
+                self._tagger = _make_komoran(self.userdic)
+            return [[tuple(p) for p in self._tagger.pos(t)] if t else [] for t in texts]
+        chunks = [texts[i:i + self.chunk_size] for i in range(0, len(texts), self.chunk_size)]
+        out = []
+        for part in self._get_pool().map(_pos_chunk, chunks):
+            out.extend(part)
+        return out
+
+    def _cache_get(self, keys):
+        found = {}
+        if self.conn is None:
+            return found
+        for i in range(0, len(keys), 500):
+            batch = keys[i:i + 500]
+            marks = ",".join("?" * len(batch))
+            for k, v in self.conn.execute(f"SELECT key, pos FROM pos_cache WHERE key IN ({marks})", batch):
+                found[bytes(k)] = v
+        return found
+
+    def _cache_put(self, items):
+        if self.conn is None or not items:
+            return
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO pos_cache(key, pos) VALUES (?,?)", items)
+
+    # ---- 공개 API ----
+    def warm_up(self):
+        """태거(JVM) 기동만 미리. 풀이면 워커 전부가 Komoran 을 띄울 때까지 기다림. 반환: 준비된 워커 수."""
+        if self.workers == 1:
+            if self._tagger is None:
+                self._tagger = _make_komoran(self.userdic)
+            return 1
+        pool, pids = self._get_pool(), set()
+        while len(pids) < self.workers:  # 먼저 뜬 워커가 작업을 다 가져가면 한 번 더
+            pids.update(pool.map(_worker_pid, [0.05] * self.workers))
+        return len(pids)
+
+    def pos_many(self, texts):
+        """texts 각각의 komoran.pos 결과 목록 (입력 순서 유지)."""
+        t0 = time.perf_counter()
+        texts = ["" if t is None else str(t) for t in texts]
+        uniq = list(dict.fromkeys(texts))
+        keys = [text_key(self.cfg_key, t) for t in uniq]
+        cached = self._cache_get(keys)
+
+        result = {}
+        todo = []
+        for t, k in zip(uniq, keys):
+            if k in cached:
+                result[t] = _decode(cached[k])
+            else:
+                todo.append((t, k))
+        if todo:
+            analyzed = self._analyze([t for t, _ in todo])
+            self._cache_put([(k, _encode(pos)) for (t, k), pos in zip(todo, analyzed)])
+            for (t, _), pos in zip(todo, analyzed):
+                result[t] = pos
+
+        self.stats["texts"] += len(texts)
+        self.stats["unique"] += len(uniq)
+        self.stats["cache_hits"] += len(uniq) - len(todo)
+        self.stats["analyzed"] += len(todo)
+        self.stats["sec"] += time.perf_counter() - t0
+        return [list(result[t]) for t in texts]
+
+    def pos(self, text):
+        return self.pos_many([text])[0]
+
+    def report(self):
+        s = self.stats
+        rate = s["texts"] / s["sec"] if s["sec"] else 0.0
+        print(f"🔤 형태소 분석: {s['texts']}건 (고유 {s['unique']}, 캐시 적중 {s['cache_hits']}, "
+              f"새로 분석 {s['analyzed']}) / {s['sec']:.1f}s, {rate:.0f}건/s, 워커 {self.workers}")
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -5,16 +5,25 @@ OliveYoung '여드름' 크림 다건 + 리뷰 전량(끝까지) 크롤링
 - 리뷰: 성별(여성→남성) 필터 각각 끝까지 수집
 - 스킨 태그 3분할: skin_type / skin_tone / skin_concerns
 - 평점(원문/숫자) 포함, 드라이버 예외 시 재생성 후 1회 재시도
+- ENGINE="http" 이면 리뷰는 브라우저 없이 리뷰 목록 AJAX 직접 호출(pipeline/review_http.py)
+- INCREMENTAL=True 이면 상품×성별 체크포인트(CRAWL_STATE_DB)로 새 리뷰만 append, 중단 지점(상품·페이지)부터 재개
+- NUM_WORKERS > 1 이면 워커별 독립 드라이버 풀로 상품 병렬 크롤링(CSV 기록은 메인 프로세스 1곳)
+- DRIVER_PROFILE="light" 이면 headless + 이미지/CSS/분석 스크립트 차단 프로필, 드라이버 오류 시 새 탭 → 안 되면 브라우저 재시작
+- 고정 sleep 대신 '준비 완료 조건'(목록 교체/요소 등장)만큼 기다리고, 요청 속도는 적응형 토큰 버킷(LIMITER)으로 조절
+- SEARCH_PLAN: (키워드, cateId2, 카테고리 이름) 목록 → 쿼리별 목록 수집 후 goodsNo 로 전역 중복 제거 (pipeline/catalog.py)
+    · 여러 쿼리에 나온 상품도 리뷰는 1번만, 상품 목록 CSV 에 그 상품을 찾은 쿼리들(queries) 기록
+    · LIST_ENGINE="http" 이면 목록 페이지를 브라우저 없이 동시에 요청
+- OUTPUT_FORMAT="parquet"/"both" 이면 리뷰를 수집일 파티션 Parquet(REVIEW_STORE_DIR)로도 저장 (pipeline/review_store.py)
 - CSV 컬럼:
   product_name, product_brand, product_link, customer_name,
   skin_type, skin_tone, skin_concerns, review, date,
   rating_text, rating, gender
 """
 
-import os, re, csv, time, random
-from urllib.parse import quote
+import os, sys, csv, time, asyncio
+import multiprocessing as mp
+import queue
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -23,57 +32,122 @@ from selenium.common.exceptions import (
     StaleElementReferenceException, InvalidSessionIdException
 )
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline.oy_reviews import (
+    REVIEW_FIELDS, extract_review_page, rows_from_raw, build_review_row, review_sig,
+)
+from pipeline.crawl_state import CrawlState, product_key, page_is_stale, sig_hash
+from pipeline.throttle import WaitStats, AdaptiveRateLimiter
+from pipeline.review_store import ReviewStore, compact
+from pipeline.chrome_profile import start_driver, fresh_tab, drain_network_bytes, DriverMetrics
+from pipeline.review_http import crawl_products_http
+from pipeline.catalog import make_plan, build_search_url as plan_search_url, CatalogTable, crawl_catalog_http, write_catalog_csv
+
 # =========================
 # 0) 드라이버/환경 설정
 # =========================
 def make_driver():
-    options = webdriver.ChromeOptions()
-    # options.add_argument("--headless")  # 필요 시 활성화
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--lang=ko-KR")
-    options.add_argument(
-        "user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119 Safari/537.36"
-    )
-    d = webdriver.Chrome(options=options)
-    w = WebDriverWait(d, 12)
-    return d, w
-
-driver, wait = make_driver()
+    # DRIVER_PROFILE: "full" = 기존 창 모드 Chrome, "light" = headless + 이미지/CSS/분석·광고 요청 차단
+    return start_driver(DRIVER_PROFILE, metrics=DRIVER_METRICS if COLLECT_DRIVER_METRICS else None)
+
+# 프로세스마다 자기 드라이버를 가진다 (메인: 목록/순차 모드, 풀 워커: 각자 make_driver)
+driver, wait = None, None
+
+# 대기 시간 집계 + 요청 속도 제한도 프로세스마다 (spawn 워커는 모듈을 새로 import → 각자 초기화)
+# 페이지 이동/필터/페이지 넘김 클릭 전에 토큰 1개. 목록 갱신이 느려지거나 타임아웃 나면 속도를 줄인다.
+WAIT_STATS = WaitStats()
+LIMITER = AdaptiveRateLimiter(rate=1.0, burst=2, min_rate=0.2, max_rate=3.0,
+                              target_latency=1.5, stats=WAIT_STATS)
+DRIVER_METRICS = DriverMetrics()  # 시작 시간/페이지 로드/전송 바이트/RSS (프로세스별)
 
 # =========================
 # 1) 파라미터/경로
 # =========================
 keyword = "여드름"
 items_per_page = 48
-MAX_STARTCOUNT_PAGES = 1  # startCount 방식 최대 페이지수
+MAX_STARTCOUNT_PAGES = 1  # startCount 방식 최대 페이지수 (쿼리당)
 PAGINATOR_MAX_CLICKS  = 60
 
+# 크롤 계획: (키워드, cateId2, 카테고리 이름). cateId2 가 None 이면 카테고리 필터 없이 전체 검색
+# 쿼리가 늘어도 리뷰 크롤링은 고유 상품(goodsNo) 수만큼만
+SEARCH_PLAN = make_plan([
+    (keyword, "100000100010015", "크림"),
+], pages=MAX_STARTCOUNT_PAGES)
+LIST_ENGINE = "selenium"  # "selenium" → 쿼리마다 브라우저로(startCount → 페이지네이터), "http" → 목록 페이지 동시 요청
+
 START_AT = 0
 MAX_PRODUCTS = None
 
+ENGINE = "selenium"      # "selenium" → 브라우저로 필터/페이지 클릭, "http" → 리뷰 목록 AJAX 직접 호출(aiohttp)
+NUM_WORKERS = 1          # 1 → 기존 순차 모드, 2 이상 → 멀티 드라이버 풀 모드
+MAX_POLITE_WORKERS = 4   # 사이트 부하 방지용 동시 세션 상한 (NUM_WORKERS가 커도 여기서 자름)
+WORKER_STAGGER = 3.0     # 워커 시작 간격(초) — 동시에 몰려서 접속하지 않도록
+DRIVER_PROFILE = "full"  # "full" → 기존 창 모드, "light" → headless + 리소스 차단(워커당 메모리/전송량 절감)
+COLLECT_DRIVER_METRICS = False  # True → 드라이버 시작 시간 + 상품/페이지당 전송 바이트 집계(performance 로그, 측정할 때만)
+                                #   프로파일끼리 비교는 bench/bench_driver_profile.py (항상 켜고 잼)
+
 BASE_DIR = "/Users/Shared/최종선_교수님/Face_skin_disease/trash/crawlcode/크롤링data"
 CSV_PATH = os.path.join(BASE_DIR, "여드름_크림_reviews_flat.csv")
 PRODUCT_LIST_CSV = os.path.join(BASE_DIR, "여드름_크림_list.csv")
+
+# 리뷰 출력: "csv" → 기존 CSV, "parquet" → 컬럼형 저장소(상품×수집일 파티션), "both" → 둘 다
+OUTPUT_FORMAT = "csv"
+REVIEW_STORE_DIR = os.path.join(BASE_DIR, "여드름_크림_reviews_parquet")
+REVIEW_STORE = None  # 메인 프로세스(단일 writer)에서만 생성
+
+# 증분 모드: CSV 를 비우지 않고 새 리뷰만 append. 리뷰는 최신순으로 보고,
+# '이미 아는 리뷰만 있는 페이지'에서 그 성별을 멈춘다. 끊긴 실행은 다음 실행이 이어받는다.
+INCREMENTAL = False
+CRAWL_STATE_DB = os.path.join(BASE_DIR, "여드름_크림_crawl_state.sqlite")
 os.makedirs(BASE_DIR, exist_ok=True)
 
 # =========================
 # 2) 유틸
 # =========================
-def sleep_smart(a=1.0, b=2.0):
-    time.sleep(random.uniform(a, b))
-
-def parse_rating_to_float(text: str):
-    if not text:
-        return None
-    nums = re.findall(r'(\d+(?:\.\d+)?)', text)
-    if not nums:
-        return None
+def wait_ready(cond, timeout=12, label="ready", poll=0.1, network=True):
+    """
+    cond 가 참이 될 때까지만 대기(고정 sleep 대신). 걸린 시간은 WAIT_STATS 에 기록.
+    network=True(요청 뒤 응답 대기)일 때만 LIMITER 에 지연/타임아웃을 알린다
+    (패널 열림·라디오 선택 같은 DOM 대기의 타임아웃은 서버 부하가 아니므로 속도를 줄이지 않음)
+    """
+    t = time.monotonic()
     try:
-        return float(nums[-1])
-    except:
-        return None
+        WebDriverWait(driver, timeout, poll_frequency=poll).until(cond)
+        ok = True
+    except TimeoutException:
+        ok = False
+    dt = time.monotonic() - t
+    WAIT_STATS.add(label, dt)
+    if network:
+        LIMITER.observe(dt, timeout=not ok)
+    return ok
+
+def review_list_marker():
+    """현재 리뷰 목록의 첫 항목. 목록이 AJAX 로 다시 그려지면 stale 이 된다. 빈 목록이면 None."""
+    els = driver.find_elements(By.CSS_SELECTOR, "#gdasList > li")
+    return els[0] if els else None
+
+def list_replaced(marker):
+    """
+    새 리뷰 목록 렌더 완료 조건.
+    - marker(클릭 전 첫 항목)가 있으면: marker 가 DOM 에서 떨어지고 #gdasList 가 있을 때
+    - 빈 목록에서 시작했으면: #gdasList 에 항목이 생길 때
+    """
+    def _cond(d):
+        if marker is None:
+            return bool(d.find_elements(By.CSS_SELECTOR, "#gdasList > li"))
+        try:
+            marker.is_enabled()
+            return False
+        except StaleElementReferenceException:
+            return bool(d.find_elements(By.CSS_SELECTOR, "#gdasList"))
+    return _cond
+
+def throttled_get(url):
+    LIMITER.acquire()
+    t = time.monotonic()
+    driver.get(url)
+    DRIVER_METRICS.add_page_load(time.monotonic() - t)
 
 def safe_click(el):
     try:
@@ -86,56 +160,27 @@ def safe_click(el):
         except Exception:
             return False
 
-def recreate_driver():
+def recreate_driver(cold=False):
+    """드라이버 복구: 세션이 살아 있으면 새 탭으로 교체(수백 ms), 안 되면(또는 cold) 브라우저 재시작."""
     global driver, wait
+    if not cold and driver is not None:
+        try:
+            fresh_tab(driver)
+            DRIVER_METRICS.tab_recoveries += 1
+            return
+        except Exception:
+            pass
     try:
         driver.quit()
     except Exception:
         pass
     driver, wait = make_driver()
+    DRIVER_METRICS.cold_restarts += 1
 
 # =========================
 # 3) 스킨 태그 분리(피부타입/피부톤/피부고민)
 # =========================
-SKIN_TYPE_SET = {"지성","건성","복합성","민감성","약건성","트러블성","중성"}
-SKIN_TONE_SET = {"쿨톤","웜톤","봄웜톤","여름쿨톤","가을웜톤","겨울쿨톤","봄원톤"}
-SKIN_CONCERN_SET = {
-    "잡티","미백","주름","각질","트러블","블랙헤드","피지과다","민감성",
-    "모공","탄력","홍조","아토피","다크서클"
-}
-ALIAS = {
-    "봄원톤":"봄웜톤",
-    "여드름":"트러블",
-    "여드름성":"트러블성",
-    "트러블성피부":"트러블성",
-    "민감성피부":"민감성",
-}
-
-def _norm_token(s: str) -> str:
-    t = (s or "").strip().replace(" ", "")
-    return ALIAS.get(t, t)
-
-def split_skin_tags(span_texts):
-    skin_type = ""
-    skin_tone = ""
-    concerns = []
-    seen = set()
-    for raw in span_texts:
-        tok = _norm_token(raw)
-        if not tok or tok in seen:
-            continue
-        seen.add(tok)
-        if not skin_type and tok in SKIN_TYPE_SET:
-            skin_type = tok
-            continue
-        if not skin_tone and tok in SKIN_TONE_SET:
-            skin_tone = "봄웜톤" if tok == "봄원톤" else tok
-            continue
-        if tok in SKIN_CONCERN_SET:
-            concerns.append(tok)
-    if skin_type == "민감성":
-        concerns = [c for c in concerns if c != "민감성"]
-    return skin_type, skin_tone, (" / ".join(concerns) if concerns else "")
+# SKIN_*_SET / ALIAS / split_skin_tags 는 pipeline/oy_reviews.py 로 이동 (HTTP 엔진·벤치마크와 공유)
 
 # =========================
 # 4) CSV 초기화 / Append  (gender 및 3컬럼 포함)
@@ -144,12 +189,7 @@ def init_reviews_csv(path=CSV_PATH):
     with open(path, "w", newline="", encoding="utf-8-sig") as fw:
         writer = csv.DictWriter(
             fw,
-            fieldnames=[
-                "product_name","product_brand","product_link",
-                "customer_name",
-                "skin_type","skin_tone","skin_concerns",
-                "review","date","rating_text","rating","gender"
-            ]
+            fieldnames=REVIEW_FIELDS
         )
         writer.writeheader()
 
@@ -159,12 +199,7 @@ def append_reviews_to_csv(product, reviews, path=CSV_PATH):
     with open(path, "a", newline="", encoding="utf-8-sig") as fa:
         writer = csv.DictWriter(
             fa,
-            fieldnames=[
-                "product_name","product_brand","product_link",
-                "customer_name",
-                "skin_type","skin_tone","skin_concerns",
-                "review","date","rating_text","rating","gender"
-            ]
+            fieldnames=REVIEW_FIELDS
         )
         for r in reviews:
             writer.writerow({
@@ -182,30 +217,37 @@ def append_reviews_to_csv(product, reviews, path=CSV_PATH):
                 "gender":        r.get("gender",""),
             })
 
-def write_product_list_csv(products, path=PRODUCT_LIST_CSV):
-    with open(path, "w", newline="", encoding="utf-8-sig") as fw:
-        writer = csv.DictWriter(fw, fieldnames=["product_name","product_brand","product_link"])
-        writer.writeheader()
-        for p in products:
-            writer.writerow(p)
+def append_reviews(product, reviews, path=CSV_PATH):
+    """OUTPUT_FORMAT 에 따라 CSV 및/또는 컬럼형 저장소에 기록."""
+    if OUTPUT_FORMAT in ("csv", "both"):
+        append_reviews_to_csv(product, reviews, path)
+    if REVIEW_STORE is not None:
+        REVIEW_STORE.append(product, reviews)
+
+def write_review_page(state, product, gcode, glabel, page_no, rows, last, path=CSV_PATH):
+    """증분 모드 writer: 아직 기록 안 된 행만 append → 체크포인트 commit. 기록 행 수 반환."""
+    key = product_key(product)
+    rows = state.filter_unseen(key, glabel, rows)
+    append_reviews(product, rows, path)
+    state.commit_page(key, gcode, glabel, page_no, rows, last)
+    return len(rows)
 
 # =========================
 # 5) 상품 목록 (startCount → paginator fallback)
 # =========================
 def wait_cards_loaded(timeout=12):
-    end = time.time() + timeout
     sels = [
         "ul#w_cate_prd_list li.flag.li_result",
         "ul.cate_prd_list li",
         "div.prd_info .tx_name",
     ]
-    while time.time() < end:
+    def _cards(d):
         for sel in sels:
-            if driver.find_elements(By.CSS_SELECTOR, sel):
+            if d.find_elements(By.CSS_SELECTOR, sel):
                 return True
-        driver.execute_script("window.scrollBy(0, 900);")
-        sleep_smart(0.2, 0.4)
-    return False
+        d.execute_script("window.scrollBy(0, 900);")  # 지연 로딩 유도
+        return False
+    return wait_ready(_cards, timeout, "cards", poll=0.3)
 
 def parse_product_cards():
     cards = driver.find_elements(By.CSS_SELECTOR, "ul#w_cate_prd_list li.flag.li_result")
@@ -232,28 +274,16 @@ def parse_product_cards():
             continue
     return out
 
-def build_search_url(start_count=0):
-    q = quote(keyword)
-    return (
-        "https://www.oliveyoung.co.kr/store/search/getSearchMain.do?"
-        f"startCount={start_count}"
-        "&sort=RANK%2FDESC&goods_sort=WEIGHT%2FDESC%2CRANK%2FDESC"
-        "&collection=ALL&reQuery="
-        "&viewtype=image&category=&catename=LCTG_ID&catedepth=1&rt="
-        f"&listnum={items_per_page}&tmp_requery=&tmp_requery2="
-        "&categoryDepthValue=2&cateId=10000010001&cateId2=100000100010015"
-        "&BenefitAll_CHECK="
-        f"&query={q}&realQuery={q}"
-        "&selectCateNm=%ED%81%AC%EB%A6%BC+%EC%B9%B4%ED%85%8C%EA%B3%A0%EB%A6%AC%EC%97%90"
-        "&typeChk=thum"
-    )
-
-def crawl_product_list_startcount():
+def build_search_url(start_count=0, query=None):
+    # query 없이 부르면 SEARCH_PLAN 첫 쿼리 (기존: 여드름 / 크림 카테고리 고정 URL 과 같은 값)
+    return plan_search_url(query or SEARCH_PLAN[0], start_count, items_per_page)
+
+def crawl_product_list_startcount(query=None):
     products, seen = [], set()
-    for i in range(MAX_STARTCOUNT_PAGES):
+    for i in range((query or SEARCH_PLAN[0])["pages"]):
         start_count = i * items_per_page
         try:
-            driver.get(build_search_url(start_count))
+            throttled_get(build_search_url(start_count, query))
         except WebDriverException as e:
             print(f"❌ 이동 실패(startCount={start_count}): {e}")
             continue
@@ -271,10 +301,19 @@ def crawl_product_list_startcount():
             break
     return products
 
-def crawl_product_list_paginator():
+def first_card():
+    els = driver.find_elements(By.CSS_SELECTOR, "ul#w_cate_prd_list li, ul.cate_prd_list li")
+    return els[0] if els else None
+
+def wait_cards_replaced(first):
+    """페이지 넘김 후 이전 첫 카드가 사라질 때까지 (wait_cards_loaded 가 옛 카드를 새 카드로 착각하지 않도록)."""
+    if first is not None:
+        wait_ready(EC.staleness_of(first), 10, "list_page")
+
+def crawl_product_list_paginator(query=None):
     products, seen = [], set()
     try:
-        driver.get(build_search_url(0))
+        throttled_get(build_search_url(0, query))
     except WebDriverException as e:
         print(f"❌ 첫 페이지 이동 실패: {e}")
         return products
@@ -292,8 +331,10 @@ def crawl_product_list_paginator():
         for a in pager_links:
             label = (a.get_attribute("aria-label") or a.text or "").strip()
             if "다음" in label or "next" in label.lower():
+                first = first_card()
+                LIMITER.acquire()
                 if safe_click(a):
-                    clicks += 1; sleep_smart(1.0, 1.6)
+                    clicks += 1; wait_cards_replaced(first)
                     if wait_cards_loaded(10):
                         added_here = 0
                         for p in parse_product_cards():
@@ -310,8 +351,10 @@ def crawl_product_list_paginator():
             num_links.sort(key=lambda x: x[0])
             clicked_numeric = False
             for _, a in reversed(num_links):
+                first = first_card()
+                LIMITER.acquire()
                 if safe_click(a):
-                    clicks += 1; sleep_smart(1.0, 1.6)
+                    clicks += 1; wait_cards_replaced(first)
                     if wait_cards_loaded(10):
                         added_here = 0
                         for p in parse_product_cards():
@@ -324,11 +367,11 @@ def crawl_product_list_paginator():
     print(f"✅ 페이지네이터 방식 수집 완료: {len(products)}개")
     return products
 
-def crawl_product_list():
-    products = crawl_product_list_startcount()
+def crawl_product_list(query=None):
+    products = crawl_product_list_startcount(query)
     if len(products) <= items_per_page:
         print("ℹ️ startCount 결과가 적어 페이지네이터로 재시도")
-        products = crawl_product_list_paginator()
+        products = crawl_product_list_paginator(query)
     unique, seen = [], set()
     for p in products:
         key = (p["product_name"], p["product_link"])
@@ -337,6 +380,19 @@ def crawl_product_list():
     print(f"✅ 최종 상품 수집: {len(unique)}개")
     return unique
 
+def crawl_catalog(plan=SEARCH_PLAN):
+    """계획의 쿼리별 목록 → goodsNo 기준 CatalogTable (selenium: 쿼리 순서대로, http: 목록 페이지 동시 요청)."""
+    if LIST_ENGINE == "http":
+        return asyncio.run(crawl_catalog_http(plan, items_per_page=items_per_page))
+    table = CatalogTable()
+    for query in plan:
+        print(f"▶ [{query['label']}] 상품 목록")
+        added = table.add_many(crawl_product_list(query), query["label"])
+        print(f"  ↳ 신규 {added}개 (누적 고유 상품 {len(table)}개)")
+    s = table.summary()
+    print(f"✅ 카탈로그: 쿼리 {len(plan)}개 / 카드 {s['cards']} → 고유 상품 {s['unique']} (여러 쿼리에 나온 상품 {s['multi_query']})")
+    return table
+
 # =========================
 # 6) 리뷰 필터(성별) 적용 (nth-child 금지, 속성 기반 + 적용버튼 다각도 시도)
 # =========================
@@ -351,7 +407,7 @@ def open_filter_panel():
         if cand: btn = cand[0]
     if btn:
         driver.execute_script("arguments[0].click();", btn)
-        sleep_smart(0.4, 0.8)
+        wait_ready(EC.visibility_of_element_located((By.ID, "filterDiv")), 4, "filter_panel", network=False)
 
 def ensure_first_review_page():
     """필터 적용 후 1페이지로 강제 이동(있으면)."""
@@ -361,8 +417,10 @@ def ensure_first_review_page():
         for a in links:
             t = (a.text or "").strip()
             if t == "1":
-                safe_click(a)
-                sleep_smart(0.4, 0.8)
+                marker = review_list_marker()
+                LIMITER.acquire()
+                if safe_click(a):
+                    wait_ready(list_replaced(marker), 8, "first_page", network=False)  # 이미 1페이지면 다시 안 그려짐
                 break
     except NoSuchElementException:
         pass
@@ -374,6 +432,7 @@ def apply_gender_filter(gcode: str):  # 'F' or 'M'
     - 클릭 실패 시 JS 강제 체크 + change 이벤트
     - 적용/검색 버튼을 다양한 셀렉터·텍스트로 시도
     """
+    marker = review_list_marker()  # 적용 전 목록 → 적용 후 교체되었는지로 로딩 완료 판단
     open_filter_panel()
 
     target_for = "sati_type5_1" if gcode == "F" else "sati_type5_2"
@@ -395,14 +454,12 @@ def apply_gender_filter(gcode: str):  # 'F' or 'M'
     # 2) 보이게 스크롤
     try:
         driver.execute_script("arguments[0].scrollIntoView({block:'center'});", el)
-        time.sleep(0.2)
     except Exception:
         pass
 
     # 3) 선택(라벨 → 인풋 → JS 강제)
     try:
         driver.execute_script("arguments[0].click();", el)
-        time.sleep(0.2)
     except Exception:
         pass
 
@@ -411,18 +468,17 @@ def apply_gender_filter(gcode: str):  # 'F' or 'M'
         try:
             if not radio.is_selected():
                 driver.execute_script("arguments[0].click();", radio)
-                time.sleep(0.2)
-            if not radio.is_selected():
+            if not wait_ready(lambda d: radio.is_selected(), 1, "filter_select", network=False):
                 driver.execute_script("""
                     const r=arguments[0];
                     r.checked=true;
                     r.dispatchEvent(new Event('change',{bubbles:true}));
                 """, radio)
-                time.sleep(0.2)
         except Exception:
             pass
 
     # 4) 적용/검색 버튼 여러 후보 시도
+    LIMITER.acquire()
     apply_clicked = False
     apply_candidates = [
         "#filterDiv .btnArea .btnGreen",
@@ -451,37 +507,109 @@ def apply_gender_filter(gcode: str):  # 'F' or 'M'
         except Exception:
             pass
 
-    # 5) 리스트 갱신 대기 + 1페이지 보정
-    try:
-        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "#gdasList")))
-        sleep_smart(0.6, 1.0)
-    except TimeoutException:
-        pass
+    # 5) 리스트 갱신(기존 목록 교체) 대기 + 1페이지 보정
+    if apply_clicked:
+        wait_ready(list_replaced(marker), 10, "filter_apply")
+    else:
+        wait_ready(EC.presence_of_element_located((By.CSS_SELECTOR, "#gdasList")), 10, "filter_apply")
     ensure_first_review_page()
 
 # =========================
 # 7) 리뷰 크롤링(성별별, 끝까지)
 # =========================
-def crawl_reviews_for_product(product):
+def click_next_review_page(page_no):
+    """리뷰 페이저에서 page_no+1 (없으면 '다음') 클릭. 성공 여부 반환."""
+    try:
+        pager = driver.find_element(By.CSS_SELECTOR, "#gdasContentsArea div.pageing")
+        links = pager.find_elements(By.CSS_SELECTOR, "a")
+    except NoSuchElementException:
+        return False
+
+    marker = review_list_marker()
+    def _go(a):
+        LIMITER.acquire()
+        if not safe_click(a):
+            return False
+        wait_ready(list_replaced(marker), 10, "next_page")
+        return True
+
+    for a in links:
+        t = (a.text or "").strip()
+        if t.isdigit():
+            try:
+                if int(t) == page_no + 1:
+                    if _go(a):
+                        return True
+                    break
+            except:
+                pass
+    for a in links:
+        label = (a.get_attribute("aria-label") or a.text or "").strip()
+        if "다음" in label or "next" in label.lower():
+            if _go(a):
+                return True
+            break
+    return False
+
+def apply_latest_sort():
+    """리뷰 정렬을 최신순으로 (증분 모드: 새 리뷰가 앞 페이지에 오도록)."""
+    cand = driver.find_elements(By.XPATH, "//*[@id='gdasContentsArea']//a[contains(., '최신')]")
+    marker = review_list_marker()
+    if cand:
+        LIMITER.acquire()
+    if cand and safe_click(cand[0]):
+        wait_ready(list_replaced(marker), 8, "sort")
+        return True
+    print("⚠️ 최신순 정렬 버튼을 못 찾음 → 기본 정렬로 진행")
+    return False
+
+def crawl_reviews_for_product(product, state=None, on_page=None):
+    """
+    state(CrawlState) 가 있으면 증분 모드:
+      - 이번 실행에서 끝난 성별은 건너뛰고, 끊긴 성별은 기록된 다음 페이지부터
+      - 이미 아는 리뷰만 있는 페이지(page_is_stale)에서 그 성별 종료
+    on_page(gcode, glabel, page_no, rows, last) 는 페이지마다 호출(증분 모드의 CSV/체크포인트 기록용).
+    """
     all_reviews = []
+    n_pages = 0
     url = product["product_link"]
+    key = product_key(product)
 
-    driver.get(url)
-    sleep_smart(1.2, 1.8)
+    if COLLECT_DRIVER_METRICS:
+        drain_network_bytes(driver)  # 이전 상품/목록 페이지 로그는 버림 → 이 상품 바이트만 집계
+    throttled_get(url)
 
-    tab = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "#reviewInfo > a")))
+    with WAIT_STATS.waiting("product_tab"):
+        tab = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "#reviewInfo > a")))
     safe_click(tab)
-    sleep_smart(0.8, 1.2)
+    wait_ready(EC.presence_of_element_located((By.CSS_SELECTOR, "#gdasList")), 12, "review_tab")
 
     for gcode, glabel in [("F","여성"), ("M","남성")]:
+        if state is not None and state.gender_done(key, gcode):
+            continue
         try:
             apply_gender_filter(gcode)
+            if state is not None:
+                apply_latest_sort()
         except Exception as e:
             print(f"⚠️ 성별 필터 적용 실패({glabel}): {e}")
             continue
 
         page_no = 1
         SEEN = set()
+        known, hwm_date = set(), ""
+        if state is not None:
+            known = state.known_sigs(key, glabel)
+            hwm_date = state.newest_date(key, glabel)
+            start_page = state.resume_page(key, gcode)
+            while page_no < start_page and click_next_review_page(page_no):
+                page_no += 1
+            if page_no < start_page:
+                # 재개 지점까지 못 감 = 그 사이 페이지가 줄었음 → 성별 완료로 기록
+                if on_page: on_page(gcode, glabel, page_no, [], True)
+                continue
+            if start_page > 1:
+                print(f"  ↪ 재개: {glabel} p.{start_page}")
 
         while True:
             try:
@@ -490,126 +618,252 @@ def crawl_reviews_for_product(product):
                 print(f"❌ 리뷰 목록 로딩 실패 ({product['product_name']} / {glabel} / p.{page_no})")
                 break
 
-            items = driver.find_elements(By.CSS_SELECTOR, "#gdasList > li")
-
-            for it in items:
-                try:
-                    if it.find_elements(By.CSS_SELECTOR, "div.info > div > p.info_user > a.id"):
-                        customer_name = it.find_element(By.CSS_SELECTOR, "div.info > div > p.info_user > a.id").text.strip()
-                    else:
-                        customer_name = "Anonymous"
-
-                    spans = it.find_elements(By.CSS_SELECTOR, "div.info > div > p.tag > span")
-                    span_texts = [s.text.strip() for s in spans if s.text.strip()]
-                    skin_type_val, skin_tone_val, skin_concerns_val = split_skin_tags(span_texts)
-
-                    review_text = ""
-                    if it.find_elements(By.CSS_SELECTOR, "div.review_cont > div.txt_inner"):
-                        review_text = it.find_element(By.CSS_SELECTOR, "div.review_cont > div.txt_inner").text.strip()
-
-                    date = "N/A"
-                    if it.find_elements(By.CSS_SELECTOR, "div.review_cont > div.score_area > span.date"):
-                        date = it.find_element(By.CSS_SELECTOR, "div.review_cont > div.score_area > span.date").text.strip()
-
-                    rating_text, rating_val = "", ""
-                    rt = it.find_elements(By.CSS_SELECTOR, "div.review_cont > div.score_area > span.review_point > span")
-                    if rt:
-                        rating_text = (rt[0].get_attribute("title") or rt[0].text or "").strip()
-                        parsed = parse_rating_to_float(rating_text)
-                        rating_val = parsed if parsed is not None else ""
-
-                    sig = (customer_name, date, review_text, glabel)
-                    if sig in SEEN:
-                        continue
-                    SEEN.add(sig)
-
-                    all_reviews.append({
-                        "customer_name": customer_name,
-                        "skin_type": skin_type_val,
-                        "skin_tone": skin_tone_val,
-                        "skin_concerns": skin_concerns_val,
-                        "review": review_text,
-                        "date": date,
-                        "rating_text": rating_text,
-                        "rating": rating_val,
-                        "gender": glabel,
-                    })
-                except (StaleElementReferenceException, Exception):
-                    continue
-
-            # 다음 페이지
+            # 페이지 전체를 execute_script 1회로 추출 → 스킨태그/평점 파싱과 SEEN 중복제거는 메모리에서
             try:
-                pager = driver.find_element(By.CSS_SELECTOR, "#gdasContentsArea div.pageing")
-                links = pager.find_elements(By.CSS_SELECTOR, "a")
-            except NoSuchElementException:
-                break
-
-            next_clicked = False
-            for a in links:
-                t = (a.text or "").strip()
-                if t.isdigit():
-                    try:
-                        if int(t) == page_no + 1:
-                            if safe_click(a):
-                                sleep_smart(0.7, 1.1)
-                                page_no += 1
-                                next_clicked = True
-                            break
-                    except:
-                        pass
-            if not next_clicked:
-                for a in links:
-                    label = (a.get_attribute("aria-label") or a.text or "").strip()
-                    if "다음" in label or "next" in label.lower():
-                        if safe_click(a):
-                            sleep_smart(0.7, 1.1)
-                            page_no += 1
-                            next_clicked = True
-                        break
-            if not next_clicked:
+                raw_items = extract_review_page(driver)
+            except StaleElementReferenceException:
+                raw_items = []
+            new_rows = rows_from_raw(raw_items, glabel, SEEN)
+            n_pages += 1
+
+            stale = False
+            if state is not None:
+                stale = page_is_stale([build_review_row(r, glabel) for r in raw_items], known, hwm_date)
+                new_rows = [r for r in new_rows if sig_hash(review_sig(r)) not in known]
+            all_reviews.extend(new_rows)
+
+            last = stale or not click_next_review_page(page_no)
+            if on_page:
+                on_page(gcode, glabel, page_no, new_rows, last)
+            if stale:
+                print(f"  ↳ {glabel} p.{page_no}: 이미 수집된 리뷰만 → 증분 종료")
+            if last:
                 break
+            page_no += 1
 
+    if COLLECT_DRIVER_METRICS:
+        DRIVER_METRICS.end_product(driver, n_pages)
     return all_reviews
 
 # =========================
-# 8) 메인
+# 8) 상품 단위 크롤링 + 드라이버 복구
 # =========================
-try:
-    print("▶ 상품 목록 수집 시작")
-    products = crawl_product_list()
-
-    if MAX_PRODUCTS is not None:
-        products = products[START_AT: START_AT + MAX_PRODUCTS]
-    elif START_AT:
-        products = products[START_AT:]
+def crawl_product_with_retry(product, tag="", state=None, on_page=None):
+    """드라이버 예외 시 (현재 프로세스의) 드라이버를 재생성하고 1회 재시도. 실패하면 None."""
+    try:
+        return crawl_reviews_for_product(product, state, on_page)
+    except (InvalidSessionIdException, WebDriverException) as e:
+        cold = isinstance(e, InvalidSessionIdException)  # 세션이 죽었으면 새 탭도 못 연다
+        print(f"{tag}⚠️ 드라이버 오류 → {'브라우저 재시작' if cold else '새 탭'} 후 재시도: {e}")
+        recreate_driver(cold)
+        try:
+            # 증분 모드면 이미 기록한 페이지 다음부터 이어서
+            return crawl_reviews_for_product(product, state, on_page)
+        except Exception as e2:
+            print(f"{tag}❌ 재시도 실패: {e2}")
+            return None
 
-    print(f"총 수집 대상 상품 수: {len(products)}")
-    write_product_list_csv(products, PRODUCT_LIST_CSV)
-    print(f"상품 리스트 저장: {PRODUCT_LIST_CSV}")
+# =========================
+# 9) 멀티 드라이버 풀 (워커 N개 + 단일 CSV writer)
+# =========================
+# - 워커는 별도 프로세스: 모듈 전역 driver/wait 가 프로세스마다 따로 있으므로
+#   recreate_driver() 는 해당 워커의 세션만 교체한다(다른 워커에 영향 없음).
+# - 상품은 공유 task 큐로 분배, 결과는 result 큐로 메인에 모아 메인만 CSV에 append.
+def _pool_worker(wid, task_q, result_q, run_id=None):
+    global driver, wait
+    tag = f"[W{wid}] "
+    state = None
+    if run_id is not None:
+        # 워커는 체크포인트를 읽기만 하고(재개 페이지/아는 리뷰), 기록은 메인 writer 가 한다
+        state = CrawlState(CRAWL_STATE_DB)
+        state.attach_run(run_id)
+    WAIT_STATS.sleep(wid * WORKER_STAGGER, "stagger")
+    try:
+        driver, wait = make_driver()
+    except Exception as e:
+        print(f"{tag}❌ 드라이버 시작 실패: {e}")
+        result_q.put(("done", wid, None, None))
+        return
+    try:
+        while True:
+            task = task_q.get()
+            if task is None:
+                break
+            idx, product = task
+            print(f"{tag}🔍 ({idx}) 리뷰 크롤링: {product['product_name']}")
+            on_page = None
+            if state is not None:
+                on_page = (lambda g, gl, pn, rows, last, idx=idx:
+                           result_q.put(("page", wid, idx, (g, gl, pn, rows, last))))
+            try:
+                rs = crawl_product_with_retry(product, tag, state, on_page)
+            except Exception as e:  # 탭/필터 등 드라이버 외 오류는 해당 상품만 실패 처리
+                print(f"{tag}❌ 상품 크롤링 실패: {e}")
+                rs = None
+            result_q.put(("ok" if rs is not None else "fail", wid, idx, rs))
+    finally:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        if state is not None:
+            state.close()
+        result_q.put(("stats", wid, None, {"wait": WAIT_STATS.summary(), "driver": DRIVER_METRICS.summary()}))
+        result_q.put(("done", wid, None, None))
 
-    init_reviews_csv(CSV_PATH)
+def run_crawl_pool(products, csv_path=CSV_PATH, num_workers=NUM_WORKERS, state=None):
+    n = max(1, min(num_workers, MAX_POLITE_WORKERS, len(products)))
+    print(f"▶ 풀 모드: 워커 {n}개 (요청 {num_workers}, 상한 {MAX_POLITE_WORKERS})")
 
+    ctx = mp.get_context("spawn")  # mac/linux 동일 동작 (fork 시 드라이버 핸들 공유 위험)
+    task_q, result_q = ctx.Queue(), ctx.Queue()
     for idx, product in enumerate(products, 1):
-        print(f"\n🔍 ({idx}/{len(products)}) 리뷰 크롤링: {product['product_name']}")
+        task_q.put((idx, product))
+    for _ in range(n):
+        task_q.put(None)
+
+    run_id = state.run_id if state is not None else None
+    workers = [ctx.Process(target=_pool_worker, args=(wid, task_q, result_q, run_id), daemon=True)
+               for wid in range(n)]
+    for p in workers:
+        p.start()
+
+    done, ok, failed, total_reviews = 0, 0, [], 0
+    wait_summaries, driver_summaries = [], []
+    while done < n:
         try:
-            rs = crawl_reviews_for_product(product)
-        except (InvalidSessionIdException, WebDriverException) as e:
-            print(f"⚠️ 드라이버 오류 → 재생성 후 재시도: {e}")
-            recreate_driver()
-            try:
-                rs = crawl_reviews_for_product(product)
-            except Exception as e2:
-                print(f"❌ 재시도 실패: {e2}")
-                continue
-        append_reviews_to_csv(product, rs, CSV_PATH)
-        print(f"  ↳ 수집 리뷰 수: {len(rs)}")
-        sleep_smart(2.0, 3.5)
-
-    print(f"\n✅ 완료! 리뷰 CSV 저장: {CSV_PATH}")
+            kind, wid, idx, rs = result_q.get(timeout=10)
+        except queue.Empty:
+            if not any(p.is_alive() for p in workers):
+                print("⚠️ 모든 워커가 종료됨 (done 신호 누락)")
+                break
+            continue
+        if kind == "done":
+            done += 1
+            continue
+        if kind == "stats":
+            wait_summaries.append(rs["wait"])
+            driver_summaries.append(rs["driver"])
+            continue
+        product = products[idx - 1]
+        if kind == "page":
+            total_reviews += write_review_page(state, product, *rs, path=csv_path)
+            continue
+        if kind == "fail":
+            failed.append(idx)
+            continue
+        if state is None:  # 증분 모드는 페이지 단위로 이미 기록됨
+            append_reviews(product, rs, csv_path)
+            total_reviews += len(rs)
+        ok += 1
+        print(f"  ↳ [W{wid}] ({idx}/{len(products)}) {product['product_name']} 수집 리뷰 수: {len(rs)}")
+
+    for p in workers:
+        p.join(timeout=30)
+    print(f"✅ 풀 완료: 성공 {ok} / 실패 {len(failed)} / 리뷰 {total_reviews}")
+    if failed:
+        print(f"  실패 상품 idx: {failed}")
+    if wait_summaries:
+        WaitStats.report(WaitStats.merge(wait_summaries), "[풀] ")
+        DriverMetrics.report(DriverMetrics.merge(driver_summaries), "[풀] ")
+    return ok, failed
 
-finally:
+# =========================
+# 10) 메인
+# =========================
+if __name__ == "__main__":
     try:
-        driver.quit()
-    except:
-        pass
-    print("브라우저 종료")
+        if LIST_ENGINE != "http":
+            driver, wait = make_driver()
+        print(f"▶ 상품 목록 수집 시작 (쿼리 {len(SEARCH_PLAN)}개)")
+        products = crawl_catalog(SEARCH_PLAN).products()
+
+        if MAX_PRODUCTS is not None:
+            products = products[START_AT: START_AT + MAX_PRODUCTS]
+        elif START_AT:
+            products = products[START_AT:]
+
+        print(f"총 수집 대상 상품 수: {len(products)}")
+        write_catalog_csv(products, PRODUCT_LIST_CSV)
+        print(f"상품 리스트 저장: {PRODUCT_LIST_CSV}")
+
+        state = None
+        if INCREMENTAL:
+            state = CrawlState(CRAWL_STATE_DB)
+            run_id, resumed = state.start_run()
+            done_keys = state.done_products()
+            if resumed:
+                print(f"↪ 중단된 실행 #{run_id} 재개: 완료 상품 {len(done_keys)}개 건너뜀")
+            products = [p for p in products if product_key(p) not in done_keys]
+            if OUTPUT_FORMAT != "parquet" and not os.path.exists(CSV_PATH):
+                init_reviews_csv(CSV_PATH)
+        elif OUTPUT_FORMAT != "parquet":
+            init_reviews_csv(CSV_PATH)
+        if OUTPUT_FORMAT in ("parquet", "both"):
+            # 증분 모드는 체크포인트 commit 전에 파일이 있어야 하므로 append 마다 flush (끝나면 compact)
+            REVIEW_STORE = ReviewStore(REVIEW_STORE_DIR, durable=state is not None)
+
+        if driver is not None and (ENGINE == "http" or (NUM_WORKERS > 1 and len(products) > 1)):
+            # 목록 수집용 드라이버는 리뷰 단계에서 필요 없으므로 먼저 반납
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            driver, wait = None, None
+
+        if ENGINE == "http":
+            t0 = time.time()
+            if state is None:
+                asyncio.run(crawl_products_http(
+                    products, on_product=lambda p, rs: append_reviews(p, rs, CSV_PATH)))
+            else:
+                asyncio.run(crawl_products_http(
+                    products, state=state,
+                    on_page=lambda p, *page: write_review_page(state, p, *page, path=CSV_PATH)))
+            print(f"⏱ HTTP 엔진 소요: {time.time() - t0:.1f}s")
+        elif NUM_WORKERS > 1 and len(products) > 1:
+            t0 = time.time()
+            run_crawl_pool(products, CSV_PATH, NUM_WORKERS, state)
+            print(f"⏱ 풀 소요: {time.time() - t0:.1f}s")
+        else:
+            if driver is None:  # LIST_ENGINE="http" 이면 리뷰 단계에서 처음 띄움
+                driver, wait = make_driver()
+            for idx, product in enumerate(products, 1):
+                print(f"\n🔍 ({idx}/{len(products)}) 리뷰 크롤링: {product['product_name']}")
+                on_page = None
+                if state is not None:
+                    on_page = (lambda g, gl, pn, rows, last, p=product:
+                               write_review_page(state, p, g, gl, pn, rows, last, CSV_PATH))
+                rs = crawl_product_with_retry(product, state=state, on_page=on_page)
+                if rs is None:
+                    continue
+                if state is None:
+                    append_reviews(product, rs, CSV_PATH)
+                print(f"  ↳ 수집 리뷰 수: {len(rs)}")
+            WaitStats.report(WAIT_STATS.summary())
+            DriverMetrics.report(DRIVER_METRICS.summary())
+            print(f"   최종 요청 속도: {LIMITER.snapshot()['rate']:.2f}/s")
+
+        if state is not None:
+            left = [p for p in products if product_key(p) not in state.done_products()]
+            if left:
+                print(f"⚠️ 미완료 상품 {len(left)}개 → 다음 실행에서 이어서 재개")
+            else:
+                state.finish_run()
+            state.close()
+
+        if REVIEW_STORE is not None:
+            REVIEW_STORE.close()
+            compact(REVIEW_STORE_DIR, crawl_date=REVIEW_STORE.crawl_date)
+            print(f"✅ 리뷰 Parquet 저장: {REVIEW_STORE_DIR}")
+        print(f"\n✅ 완료! 리뷰 CSV 저장: {CSV_PATH}")
+
+    finally:
+        if REVIEW_STORE is not None:
+            REVIEW_STORE.close()  # 중간에 끊겨도 버퍼에 모인 행은 기록
+        try:
+            if driver is not None:
+                driver.quit()
+        except:
+            pass
+        print("브라우저 종료")